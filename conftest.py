@@ -42,6 +42,19 @@ def _isolate_event_bus_sqlite_queue(tmp_path, monkeypatch):
     monkeypatch.setenv("EVENT_BUS_SQLITE_PATH", str(tmp_path / "event_bus_queue.db"))
 
 
+@pytest.fixture(autouse=True)
+def _isolate_discovery_manifest(tmp_path, monkeypatch):
+    """
+    Keep every test off the project's discovery manifest.
+
+    Kernel() defaults MICROCOREOS_DISCOVERY_CACHE to .microcoreos/discovery.json
+    under the project root (microcoreos/discovery.py). Tests that boot a Kernel against a
+    tmp project, or monkeypatch the import machinery, must neither read a
+    manifest recorded by another test nor leave one behind in the repo.
+    """
+    monkeypatch.setenv("MICROCOREOS_DISCOVERY_CACHE", str(tmp_path / "discovery.json"))
+
+
 # ─── Tools by injection name ──────────────────────────────────────────
 #
 # A plugin never builds a tool: it names one in `__init__` and the Kernel
@@ -0,0 +1,105 @@
+"""Bus bench — in-process publish→deliver throughput, in events per second.
+
+Publishes --events events through an EventBusTool on the default in-process
+driver and counts how fast they reach their subscribers, for the shapes the
+dispatch path distinguishes:
+
+- one:     one subscriber
+- fan-out: 8 independent subscribers, every one gets every event
+- group:   4 competing consumers in one group (round-robin)
+- keyed:   one subscriber, publishes under 16 ordering keys
+
+  python dev_infra/bench_bus.py                       # 20k events per case
+  python dev_infra/bench_bus.py --events 100000
+  python dev_infra/bench_bus.py --min-eps 20000       # exit 1 if a case is slower (CI gate)
+
+Each case is the best of --repeat runs. A delivery counts once per
+subscriber that receives it, so fan-out reports deliveries, not publishes.
+Run from the repo root. No dependencies beyond the standard library.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.event_bus.event_bus_tool import EventBusTool  # noqa: E402
+
+CASES = ("one", "fan-out", "group", "keyed")
+
+
+def _subscribers(case: str, count) -> list:
+    """Bound handlers of distinct classes: the bus derives each one's default
+    group from its identity, so same-named handlers would compete instead."""
+    async def on_tick(self, event):
+        count()
+    n = {"fan-out": 8, "group": 4}.get(case, 1)
+    return [type(f"BenchSub{i}", (), {"on_tick": on_tick})().on_tick for i in range(n)]
+
+
+async def _run(case: str, events: int) -> float:
+    bus = EventBusTool()
+    await bus.setup()
+    done = asyncio.Event()
+    received = 0
+    expected = events * (8 if case == "fan-out" else 1)
+
+    def count():
+        nonlocal received
+        received += 1
+        if received == expected:
+            done.set()
+
+    for callback in _subscribers(case, count):
+        await bus.subscribe("bench.tick", callback,
+                            group="workers" if case == "group" else None)
+
+    start = time.perf_counter()
+    for i in range(events):
+        if case == "keyed":
+            await bus.publish("bench.tick", {"i": i}, key=f"k{i % 16}")
+        else:
+            await bus.publish("bench.tick", {"i": i})
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await bus.shutdown()
+    return expected / elapsed
+
+
+def measure(case: str, events: int, repeat: int) -> float:
+    best = 0.0
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):   # publish() logs every event
+            best = max(best, asyncio.run(_run(case, events)))
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--case", choices=CASES, action="append",
+                        help="run only this case (repeatable)")
+    parser.add_argument("--min-eps", type=float, default=None,
+                        help="fail when a case delivers fewer events per second")
+    args = parser.parse_args()
+
+    print(f"{args.events} events per run, best of {args.repeat}")
+    print(f"{'case':<10} {'deliveries/s':>13}")
+    worst = float("inf")
+    for case in args.case or CASES:
+        eps = measure(case, args.events, args.repeat)
+        worst = min(worst, eps)
+        print(f"{case:<10} {eps:>13.0f}")
+
+    if args.min_eps is not None and worst < args.min_eps:
+        print(f"FAIL: slowest case {worst:.0f}/s < {args.min_eps:.0f}/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
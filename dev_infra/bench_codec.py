@@ -0,0 +1,80 @@
+"""Codec bench — envelope encode/decode throughput and bytes on the wire.
+
+Runs every codec × compression the distributed drivers can use
+(tools/event_bus/codec.py) over envelopes of a few payload shapes:
+
+- small:   a typical business event, a handful of fields
+- records: 200 rows of numbers and short strings (a report, a batch)
+- text:    ~16 KB of prose (a document, a rendered template)
+
+  python dev_infra/bench_codec.py
+  python dev_infra/bench_codec.py --shape records --seconds 1
+
+Encode counts EnvelopeCodec.encode() (serialize + compress); decode counts
+EnvelopeCodec.decode() back into a validated EventEnvelope — what a driver
+pays per message on each side. Codecs whose package is not installed are
+listed as such. Run from the repo root.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.event_bus.codec import CODECS, COMPRESSIONS, EnvelopeCodec  # noqa: E402
+from tools.event_bus.envelope import EventEnvelope  # noqa: E402
+
+SHAPES = ("small", "records", "text")
+
+
+def _payload(shape: str) -> dict:
+    if shape == "small":
+        return {"user_id": 4211, "email": "ada@example.com", "plan": "pro", "trial": False}
+    if shape == "records":
+        return {"rows": [{"id": i, "sku": f"SKU-{i:05d}", "qty": i % 7, "price": i * 1.25,
+                          "active": i % 3 == 0} for i in range(200)]}
+    words = "the bus carries every event between plugins without them knowing each other"
+    return {"body": " ".join(words.split() * 220)}
+
+
+def _rate(fn, seconds: float) -> float:
+    n, start = 0, time.perf_counter()
+    while True:
+        for _ in range(50):
+            fn()
+        n += 50
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return n / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", choices=SHAPES, action="append",
+                        help="run only this payload shape (repeatable)")
+    parser.add_argument("--seconds", type=float, default=0.3,
+                        help="time spent measuring each direction of each codec")
+    args = parser.parse_args()
+
+    for shape in args.shape or SHAPES:
+        envelope = EventEnvelope(event="bench.codec", payload=_payload(shape), emitter="bench")
+        print(f"\n{shape} payload")
+        print(f"{'codec':<16} {'bytes':>8} {'encode/s':>10} {'decode/s':>10}")
+        for name in CODECS:
+            for compression in COMPRESSIONS:
+                label = name if compression == "none" else f"{name}+{compression}"
+                try:
+                    codec = EnvelopeCodec(name, compression, compress_min_bytes=0)
+                except ImportError as e:
+                    print(f"{label:<16} {'—':>8}  not installed ({e.msg.rsplit(': ', 1)[-1]})")
+                    continue
+                body, wire_label = codec.encode(envelope)
+                encode = _rate(lambda: codec.encode(envelope), args.seconds)
+                decode = _rate(lambda: codec.decode(body, wire_label, EventEnvelope), args.seconds)
+                print(f"{label:<16} {len(body):>8} {encode:>10.0f} {decode:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
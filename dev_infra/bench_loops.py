@@ -0,0 +1,109 @@
+"""Loop bench — asyncio vs uvloop (MICROCOREOS_LOOP) on the same project.
+
+Two numbers per loop:
+
+- HTTP: boots `microcoreos run` on a scratch port with MICROCOREOS_LOOP set,
+  and drives keep-alive GET load at it (the bench_workers.py load generator).
+- Bus: in this process, publishes --events events through an in-process
+  EventBusTool, on a loop built the way `microcoreos run` builds it, and
+  counts deliveries per second.
+
+  python dev_infra/bench_loops.py                          # /system/status, 20k events
+  python dev_infra/bench_loops.py --path /ping --seconds 20 --events 100000
+
+Run from a project root with uvloop installed (`uv add uvloop`); without it
+the uvloop cases are skipped, not silently run on asyncio.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_workers import measure, wait_for_port  # noqa: E402
+from microcoreos.cli import LOOPS, loop_factory  # noqa: E402
+
+
+def http_case(loop: str, args) -> float:
+    env = dict(os.environ, MICROCOREOS_LOOP=loop, HTTP_PORT=str(args.port), HTTP_LOG_LEVEL="error")
+    proc = subprocess.Popen([sys.executable, "-m", "microcoreos.cli", "run"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.port)
+        time.sleep(args.warmup)
+        return measure(args.port, args.path, args.seconds, args.connections, args.clients)["rps"]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+async def _deliver(events: int) -> float:
+    from tools.event_bus.event_bus_tool import EventBusTool
+
+    bus = EventBusTool()
+    await bus.setup()
+    done = asyncio.Event()
+    received = 0
+
+    async def on_tick(payload):
+        nonlocal received
+        received += 1
+        if received == events:
+            done.set()
+
+    await bus.subscribe("bench.tick", on_tick)
+    start = time.perf_counter()
+    for i in range(events):
+        await bus.publish("bench.tick", {"i": i})
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await bus.shutdown()
+    return events / elapsed
+
+
+def bus_case(loop: str, events: int) -> float:
+    os.environ["MICROCOREOS_LOOP"] = loop
+    with contextlib.redirect_stdout(io.StringIO()):   # publish() logs every event
+        with asyncio.Runner(loop_factory=loop_factory()) as runner:
+            return runner.run(_deliver(events))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/system/status")
+    parser.add_argument("--port", type=int, default=5098)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    try:
+        import uvloop  # noqa: F401
+        loops = LOOPS
+    except ImportError:
+        print("uvloop is not installed (uv add uvloop): measuring asyncio only.")
+        loops = ("asyncio",)
+
+    print(f"GET {args.path}  ·  {args.connections} keep-alive connections  ·  "
+          f"{args.seconds:.0f}s per case  ·  {args.events} bus events")
+    results = {}
+    for loop in loops:
+        rps = http_case(loop, args)
+        eps = bus_case(loop, args.events)
+        results[loop] = (rps, eps)
+        print(f"{loop:<10} {rps:>10.0f} req/s   {eps:>10.0f} events/s")
+    if len(results) == 2 and all(results["asyncio"]):
+        (base_rps, base_eps), (uv_rps, uv_eps) = results["asyncio"], results["uvloop"]
+        print(f"uvloop:    {uv_rps / base_rps:.2f}x HTTP   {uv_eps / base_eps:.2f}x bus")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Workers bench — HTTP throughput of `microcoreos run` vs `run --workers N`.
+
+Boots the project in this directory twice on a scratch port — once as the
+single-process baseline, once under the supervisor — and drives the same
+keep-alive GET load at both. What it answers: how much of the box the extra
+workers actually buy on YOUR endpoints, not on a hello-world.
+
+  python dev_infra/bench_workers.py                        # 4 workers, /system/status
+  python dev_infra/bench_workers.py --workers 8 --path /ping --seconds 20
+  python dev_infra/bench_workers.py --connections 256 --clients 8
+
+The load generator runs in --clients processes of its own (one Python process
+saturates well before 16 workers do); keep them on cores the server is not
+using when the numbers matter. Run from a project root. No dependencies beyond
+the standard library.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+
+def wait_for_port(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"nothing listening on :{port} after {timeout:.0f}s")
+
+
+async def _connection(port: int, path: str, stop_at: float, counts: list) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    try:
+        while time.monotonic() < stop_at:
+            writer.write(request)
+            await writer.drain()
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            counts[0] += 1
+            if not headers.startswith(b"HTTP/1.1 2"):
+                counts[1] += 1
+    finally:
+        writer.close()
+
+
+def _client(args) -> tuple[int, int]:
+    port, path, seconds, connections = args
+
+    async def main():
+        counts = [0, 0]
+        stop_at = time.monotonic() + seconds
+        await asyncio.gather(*[_connection(port, path, stop_at, counts) for _ in range(connections)])
+        return counts
+
+    ok, bad = asyncio.run(main())
+    return ok, bad
+
+
+def measure(port: int, path: str, seconds: float, connections: int, clients: int) -> dict:
+    per_client = max(1, connections // clients)
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.map(_client, [(port, path, seconds, per_client)] * clients)
+    total = sum(r[0] for r in results)
+    errors = sum(r[1] for r in results)
+    return {"requests": total, "non_2xx": errors, "rps": total / seconds}
+
+
+def run_case(label: str, workers: int, args) -> dict:
+    env = dict(os.environ, HTTP_PORT=str(args.port), HTTP_LOG_LEVEL="error")
+    cmd = [sys.executable, "-m", "microcoreos.cli", "run"]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.port)
+        time.sleep(args.warmup)   # every worker booted, not just the first
+        result = measure(args.port, args.path, args.seconds, args.connections, args.clients)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+    print(f"{label:<22} {result['rps']:>10.0f} req/s   "
+          f"({result['requests']} requests, {result['non_2xx']} non-2xx)")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--path", default="/system/status")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    print(f"GET {args.path}  ·  {args.connections} keep-alive connections  ·  "
+          f"{args.clients} load processes  ·  {args.seconds:.0f}s per case")
+    base = run_case("single process", 1, args)
+    multi = run_case(f"--workers {args.workers}", args.workers, args)
+    if base["rps"]:
+        print(f"speedup: {multi['rps'] / base['rps']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,7 +25,7 @@ class ToolDocDriftLinterPlugin(BasePlugin):
     # Methods defined in BaseTool or Python internals that shouldn't be documented
     IGNORED_METHODS = {
         "setup", "name", "get_interface_description", "on_boot_complete",
-        "on_instrument", "shutdown", "on_boot"
+        "on_instrument", "drain", "shutdown", "on_boot"
     }
 
     def __init__(self, container, logger):
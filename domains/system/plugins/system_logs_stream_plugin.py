@@ -1,6 +1,6 @@
 import asyncio
 import json
-from microcoreos import BasePlugin
+from microcoreos import BasePlugin, track_sizes
 
 
 class SystemLogsStreamPlugin(BasePlugin):
@@ -15,6 +15,7 @@ class SystemLogsStreamPlugin(BasePlugin):
         self._queues: set = set()
 
     async def on_boot(self):
+        track_sizes(self._identity or type(self).__name__, self._sizes)
         self.logger.add_sink(self._on_log)
         self.http.add_sse_endpoint(
             "/system/logs/stream",
@@ -36,6 +37,9 @@ class SystemLogsStreamPlugin(BasePlugin):
         except RuntimeError:
             pass
 
+    def _sizes(self) -> dict:
+        return {"sse_clients": len(self._queues), "queued": sum(q.qsize() for q in list(self._queues))}
+
     async def _stream(self, data: dict):
         queue = asyncio.Queue(maxsize=200)
         self._queues.add(queue)
@@ -0,0 +1,66 @@
+from typing import Optional
+from pydantic import BaseModel
+from microcoreos import BasePlugin
+
+
+# ── Modelos ───────────────────────────────────────────────────────────────────
+
+class LoopOffender(BaseModel):
+    identity: str
+    coroutine: str
+    where: str
+    count: int
+    total_ms: float
+    max_ms: float
+    last_seen: float
+
+class LoopStats(BaseModel):
+    enabled: bool
+    threshold_ms: float
+    samples: int
+    lag_ms: dict[str, float]
+    stalls: int
+    offenders: list[LoopOffender]
+
+class SystemLoopResponse(BaseModel):
+    success: bool
+    window_seconds: Optional[float] = None
+    data: Optional[LoopStats] = None
+    error: Optional[str] = None
+
+
+# ── Plugin ────────────────────────────────────────────────────────────────────
+
+class SystemLoopPlugin(BasePlugin):
+    """
+    GET /system/loop — event loop lag percentiles over ?window=<seconds>
+    (default 60, max 300) and the ?top=<n> (default 10) handlers that blocked
+    the loop longest, by plugin identity, coroutine and line
+    (tools/system/loop_monitor.py).
+    """
+
+    def __init__(self, http, registry):
+        self.http = http
+        self.registry = registry
+
+    async def on_boot(self):
+        self.http.add_endpoint(
+            "/system/loop", "GET", self.execute,
+            tags=["System"],
+            response_model=SystemLoopResponse,
+        )
+
+    async def execute(self, data: dict, context=None):
+        try:
+            window = float(data.get("window", 60))
+            top = int(data.get("top", 10))
+        except (TypeError, ValueError):
+            return {"success": False, "error": "window and top must be numbers"}
+        if top < 1:
+            return {"success": False, "error": "top must be at least 1"}
+        try:
+            return {"success": True, "window_seconds": window,
+                    "data": self.registry.get_loop_stats(window, top)}
+        except Exception as e:
+            print(f"[SystemLoop] Error: {e}")
+            return {"success": False, "error": "Could not retrieve loop stats"}
@@ -0,0 +1,164 @@
+from typing import Optional
+from pydantic import BaseModel
+from microcoreos import BasePlugin
+
+
+# ── Modelos ───────────────────────────────────────────────────────────────────
+
+class MemorySnapshot(BaseModel):
+    id: int
+    taken_at: float
+    size: int
+    count: int
+
+class MemoryReport(BaseModel):
+    tracing: bool
+    frames: int
+    traced_bytes: int
+    peak_bytes: int
+    tracemalloc_bytes: int
+    snapshots: list[MemorySnapshot]
+    sizes: Optional[dict[str, dict]] = None
+
+class MemoryDiffRow(BaseModel):
+    where: Optional[str] = None
+    owner: Optional[str] = None
+    size_diff: int
+    size: int
+    count_diff: int
+    count: int
+
+class MemoryDiff(BaseModel):
+    from_id: int
+    to_id: int
+    group_by: str
+    seconds: float
+    size_diff: int
+    top: list[MemoryDiffRow]
+
+class SystemMemoryResponse(BaseModel):
+    success: bool
+    data: Optional[MemoryReport] = None
+    error: Optional[str] = None
+
+class SystemMemorySnapshotResponse(BaseModel):
+    success: bool
+    data: Optional[MemorySnapshot] = None
+    error: Optional[str] = None
+
+class SystemMemoryDiffResponse(BaseModel):
+    success: bool
+    data: Optional[MemoryDiff] = None
+    error: Optional[str] = None
+
+
+# ── Plugin ────────────────────────────────────────────────────────────────────
+
+class SystemMemoryPlugin(BasePlugin):
+    """
+    Leak hunting on a live process (tools/system/memory.py):
+
+        GET  /system/memory                  — traced memory, snapshots, container sizes
+        POST /system/memory/tracing          — ?enabled=true&frames=25 (false: off)
+        POST /system/memory/snapshots        — take one (tracing must be on)
+        GET  /system/memory/diff?from=1&to=2 — growth between two snapshots,
+                                               &group_by=line|owner &top=20
+
+    Tracing is off by default: while on, every allocation is slower. Container
+    sizes (trace log, pending tasks, state namespaces, SSE queues) need none.
+    The POSTs change the process: they need `Authorization: Bearer
+    $SYSTEM_ADMIN_TOKEN`, and answer 401 while that is unset.
+    """
+
+    def __init__(self, http, registry):
+        self.http = http
+        self.registry = registry
+
+    async def on_boot(self):
+        self.http.add_endpoint(
+            "/system/memory", "GET", self.get_report,
+            tags=["System"],
+            response_model=SystemMemoryResponse,
+        )
+        self.http.add_endpoint(
+            "/system/memory/tracing", "POST", self.set_tracing,
+            tags=["System"],
+            response_model=SystemMemoryResponse,
+            auth_validator=self.registry.validate_admin_token,
+        )
+        self.http.add_endpoint(
+            "/system/memory/snapshots", "POST", self.take_snapshot,
+            tags=["System"],
+            response_model=SystemMemorySnapshotResponse,
+            auth_validator=self.registry.validate_admin_token,
+        )
+        self.http.add_endpoint(
+            "/system/memory/diff", "GET", self.diff,
+            tags=["System"],
+            response_model=SystemMemoryDiffResponse,
+        )
+
+    async def get_report(self, data: dict, context=None):
+        try:
+            return {"success": True, "data": self.registry.get_memory_report()}
+        except Exception as e:
+            print(f"[SystemMemory] Error: {e}")
+            return {"success": False, "error": "Could not retrieve the memory report"}
+
+    async def set_tracing(self, data: dict, context=None):
+        enabled = str(data.get("enabled", "true")).lower() in ("1", "true", "yes")
+        try:
+            frames = int(data.get("frames", 25))
+        except (TypeError, ValueError):
+            return {"success": False, "error": "frames must be a number"}
+        if not 1 <= frames <= 100:
+            return {"success": False, "error": "frames must be between 1 and 100"}
+        try:
+            if enabled:
+                report = self.registry.start_memory_tracing(frames)
+            else:
+                report = self.registry.stop_memory_tracing()
+        except RuntimeError as e:   # already tracing with another frame limit
+            if context:
+                context.set_status(409)
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            print(f"[SystemMemory] Error: {e}")
+            return {"success": False, "error": "Could not change memory tracing"}
+        return {"success": True, "data": report}
+
+    async def take_snapshot(self, data: dict, context=None):
+        try:
+            snapshot = await self.registry.take_memory_snapshot()
+        except RuntimeError as e:   # tracing is off
+            if context:
+                context.set_status(409)
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            print(f"[SystemMemory] Error: {e}")
+            return {"success": False, "error": "Could not take a memory snapshot"}
+        return {"success": True, "data": snapshot}
+
+    async def diff(self, data: dict, context=None):
+        try:
+            from_id, to_id = int(data["from"]), int(data["to"])
+            top = int(data.get("top", 20))
+        except KeyError:
+            return {"success": False, "error": "from and to are required snapshot ids"}
+        except (TypeError, ValueError):
+            return {"success": False, "error": "from, to and top must be numbers"}
+        group_by = data.get("group_by", "line")
+        if group_by not in ("line", "owner"):
+            return {"success": False, "error": "group_by must be 'line' or 'owner'"}
+        if top < 1:
+            return {"success": False, "error": "top must be at least 1"}
+        try:
+            result = await self.registry.diff_memory_snapshots(from_id, to_id, group_by, top)
+        except KeyError as e:
+            if context:
+                context.set_status(404)
+            return {"success": False, "error": e.args[0]}
+        except Exception as e:
+            print(f"[SystemMemory] Error: {e}")
+            return {"success": False, "error": "Could not diff the memory snapshots"}
+        return {"success": True, "data": result}
@@ -2,7 +2,7 @@ import asyncio
 import json
 from typing import Optional
 from pydantic import BaseModel
-from microcoreos import BasePlugin
+from microcoreos import BasePlugin, track_sizes
 
 
 # ── Modelos ───────────────────────────────────────────────────────────────────
@@ -19,14 +19,69 @@ class SystemMetricsResponse(BaseModel):
     data: Optional[list[MetricRecord]] = None
     error: Optional[str] = None
 
+class LatencyStats(BaseModel):
+    tool: str
+    method: str
+    count: int
+    errors: int
+    error_rate: float
+    latency_ms: dict[str, float]
+    coalesced: int = 0
+    coalesce_ratio: float = 0.0
+
+class ExecutorStats(BaseModel):
+    pool: str
+    size: int
+    active: int
+    queued: int
+    completed: int
+    errors: int
+    wait_ms: dict[str, float]
+    run_ms: dict[str, float]
+
+class SystemExecutorsResponse(BaseModel):
+    success: bool
+    window_seconds: Optional[float] = None
+    data: Optional[list[ExecutorStats]] = None
+    error: Optional[str] = None
+
+class ConcurrencyStats(BaseModel):
+    owner: str
+    limit: int
+    in_flight: int
+    waiting: int
+    accepted: int
+    rejected: int
+    deferred: int
+    decreases: int
+    baseline_ms: Optional[float] = None
+
+class SystemConcurrencyResponse(BaseModel):
+    success: bool
+    data: Optional[list[ConcurrencyStats]] = None
+    error: Optional[str] = None
+
+class SystemLatencyResponse(BaseModel):
+    success: bool
+    window_seconds: Optional[float] = None
+    data: Optional[list[LatencyStats]] = None
+    error: Optional[str] = None
+
 
 # ── Plugin ────────────────────────────────────────────────────────────────────
 
 class SystemMetricsPlugin(BasePlugin):
     """
-    Exposes tool call metrics in two ways:
-    1. GET /system/metrics        — last 1000 records (snapshot).
-    2. GET /system/metrics/stream — SSE stream, one record per tool call.
+    Exposes tool call metrics in five ways:
+    1. GET /system/metrics         — last 1000 records (snapshot).
+    2. GET /system/metrics/stream  — SSE stream, one record per tool call.
+    3. GET /system/metrics/latency — p50/p90/p95/p99, counts, error rate and
+       single-flight coalescing per (tool, method) over ?window=<seconds>
+       (default 60, max 300).
+    4. GET /system/metrics/executors — per thread pool: size, busy threads,
+       queue depth, and wait/run time percentiles over ?window=<seconds>.
+    5. GET /system/metrics/concurrency — per plugin with a concurrency limit:
+       the current limit, in flight, and requests shed / deliveries deferred.
 
     Each record: {tool, method, duration_ms, success, timestamp}
     duration_ms uses time.perf_counter() — microsecond precision.
@@ -38,6 +93,7 @@ class SystemMetricsPlugin(BasePlugin):
         self._queues: set = set()
 
     async def on_boot(self):
+        track_sizes(self._identity or type(self).__name__, self._sizes)
         self.registry.add_metrics_sink(self._on_metric)
 
         self.http.add_endpoint(
@@ -45,6 +101,21 @@ class SystemMetricsPlugin(BasePlugin):
             tags=["System"],
             response_model=SystemMetricsResponse,
         )
+        self.http.add_endpoint(
+            "/system/metrics/latency", "GET", self.get_latency,
+            tags=["System"],
+            response_model=SystemLatencyResponse,
+        )
+        self.http.add_endpoint(
+            "/system/metrics/executors", "GET", self.get_executors,
+            tags=["System"],
+            response_model=SystemExecutorsResponse,
+        )
+        self.http.add_endpoint(
+            "/system/metrics/concurrency", "GET", self.get_concurrency,
+            tags=["System"],
+            response_model=SystemConcurrencyResponse,
+        )
         self.http.add_sse_endpoint(
             "/system/metrics/stream",
             generator=self._stream,
@@ -74,6 +145,43 @@ class SystemMetricsPlugin(BasePlugin):
             print(f"[SystemMetrics] Error: {e}")
             return {"success": False, "error": "Could not retrieve metrics"}
 
+    async def get_latency(self, data: dict, context=None):
+        """Latency percentiles per (tool, method) over a sliding window."""
+        try:
+            window = float(data.get("window", 60))
+        except (TypeError, ValueError):
+            return {"success": False, "error": "window must be a number of seconds"}
+        try:
+            return {"success": True, "window_seconds": window,
+                    "data": self.registry.get_latency_stats(window)}
+        except Exception as e:
+            print(f"[SystemMetrics] Error: {e}")
+            return {"success": False, "error": "Could not retrieve latency stats"}
+
+    async def get_executors(self, data: dict, context=None):
+        """Saturation of the thread pools that run sync work."""
+        try:
+            window = float(data.get("window", 60))
+        except (TypeError, ValueError):
+            return {"success": False, "error": "window must be a number of seconds"}
+        try:
+            return {"success": True, "window_seconds": window,
+                    "data": self.registry.get_executor_stats(window)}
+        except Exception as e:
+            print(f"[SystemMetrics] Error: {e}")
+            return {"success": False, "error": "Could not retrieve executor stats"}
+
+    async def get_concurrency(self, data: dict, context=None):
+        """Adaptive concurrency limits, and what they shed or deferred."""
+        try:
+            return {"success": True, "data": self.registry.get_concurrency_stats()}
+        except Exception as e:
+            print(f"[SystemMetrics] Error: {e}")
+            return {"success": False, "error": "Could not retrieve concurrency stats"}
+
+    def _sizes(self) -> dict:
+        return {"sse_clients": len(self._queues), "queued": sum(q.qsize() for q in list(self._queues))}
+
     async def _stream(self, data: dict):
         queue = asyncio.Queue(maxsize=200)
         self._queues.add(queue)
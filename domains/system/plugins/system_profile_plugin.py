@@ -0,0 +1,71 @@
+import json
+from microcoreos import BasePlugin
+
+
+class SystemProfilePlugin(BasePlugin):
+    """
+    POST /system/profile — samples every thread's stack for ?seconds=N and
+    answers with a flamegraph-ready profile (tools/system/profiler.py):
+
+        curl -X POST 'localhost:5000/system/profile?seconds=10' > out.collapsed
+        curl -X POST 'localhost:5000/system/profile?seconds=10&format=speedscope' \\
+            > out.speedscope.json    # open in https://www.speedscope.app
+
+    Query: seconds (default 10, max 60), interval_ms (default 10, 1-1000),
+    format (collapsed | speedscope), idle (true keeps waiting threads).
+    Each sample is attributed to the plugin identity doing the work.
+
+    Nothing runs between requests. The request itself lasts `seconds`; one
+    profile at a time — a second answers 409. It needs `Authorization: Bearer
+    $SYSTEM_ADMIN_TOKEN`, and answers 401 while that is unset.
+    """
+
+    FORMATS = {
+        "collapsed": ("text/plain; charset=utf-8", "profile.collapsed"),
+        "speedscope": ("application/json", "profile.speedscope.json"),
+    }
+
+    def __init__(self, http, registry):
+        self.http = http
+        self.registry = registry
+
+    async def on_boot(self):
+        self.http.add_endpoint(
+            "/system/profile", "POST", self.execute,
+            tags=["System"],
+            timeout=70.0,   # outlasts the longest profile (60s)
+            auth_validator=self.registry.validate_admin_token,
+        )
+
+    async def execute(self, data: dict, context=None):
+        try:
+            seconds = float(data.get("seconds", 10))
+            interval_ms = float(data.get("interval_ms", 10))
+        except (TypeError, ValueError):
+            return {"success": False, "error": "seconds and interval_ms must be numbers"}
+        if not 0 < seconds <= 60:
+            return {"success": False, "error": "seconds must be > 0 and <= 60"}
+        if not 1 <= interval_ms <= 1000:
+            return {"success": False, "error": "interval_ms must be between 1 and 1000"}
+        fmt = data.get("format", "collapsed")
+        if fmt not in self.FORMATS:
+            return {"success": False, "error": f"format must be one of {sorted(self.FORMATS)}"}
+        idle = str(data.get("idle", "false")).lower() in ("1", "true", "yes")
+
+        try:
+            result = await self.registry.profile(seconds, interval_ms, idle, fmt)
+        except RuntimeError as e:   # ProfilerBusyError
+            if context:
+                context.set_status(409)
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            print(f"[SystemProfile] Error: {e}")
+            return {"success": False, "error": "Could not profile"}
+
+        if context is None:
+            return {"success": True, "data": result}
+        media_type, filename = self.FORMATS[fmt]
+        body = result if isinstance(result, str) else json.dumps(result)
+        context.set_header("Content-Disposition", f'attachment; filename="{filename}"')
+        context.set_binary_response(body.encode(), media_type)
+        return {"success": True}
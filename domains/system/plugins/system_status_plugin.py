@@ -15,6 +15,7 @@ class PluginStatus(BaseModel):
     status: str
     error: Optional[str] = None
     tools: list[str] = []
+    resources: Optional[dict] = None
 
 
 class SystemStatusData(BaseModel):
@@ -43,6 +44,7 @@ class SystemStatusPlugin(BasePlugin):
     async def execute(self, data: dict, context=None):
         try:
             dump = self.registry.get_system_dump()
+            usage = self.registry.get_resource_usage()
 
             tools = [
                 ToolStatus(name=name, **info).model_dump()
@@ -55,7 +57,8 @@ class SystemStatusPlugin(BasePlugin):
                     domain=info.get("domain"),
                     status=info.get("status", "UNKNOWN"),
                     error=info.get("error"),
-                    tools=info.get("dependencies", [])
+                    tools=info.get("dependencies", []),
+                    resources=usage.get(name),
                 ).model_dump()
                 for name, info in dump.get("plugins", {}).items()
             ]
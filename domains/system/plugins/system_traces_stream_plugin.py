@@ -1,6 +1,6 @@
 import asyncio
 import json
-from microcoreos import BasePlugin
+from microcoreos import BasePlugin, track_sizes
 
 
 class SystemTracesStreamPlugin(BasePlugin):
@@ -37,6 +37,7 @@ class SystemTracesStreamPlugin(BasePlugin):
         self._queues: set = set()
 
     async def on_boot(self):
+        track_sizes(self._identity or type(self).__name__, self._sizes)
         self.event_bus.add_listener(self._on_event)
         self.http.add_sse_endpoint(
             "/system/traces/stream",
@@ -93,6 +94,9 @@ class SystemTracesStreamPlugin(BasePlugin):
         except RuntimeError:
             pass
 
+    def _sizes(self) -> dict:
+        return {"sse_clients": len(self._queues), "queued": sum(q.qsize() for q in list(self._queues))}
+
     async def _stream(self, data: dict):
         queue = asyncio.Queue(maxsize=200)
         self._queues.add(queue)
@@ -6,7 +6,7 @@ class BlockingBootPlugin(BasePlugin):
     This plugin simulates a heavy synchronous task (like video processing or 
     heavy DB migrations) during the on_boot phase.
     
-    Thanks to the new Kernel Guard (asyncio.to_thread), this SHOULD NOT
+    Thanks to the Kernel Guard (a thread of the chaos domain pool), this SHOULD NOT
     freeze the main system while it runs.
     """
     def __init__(self, logger):
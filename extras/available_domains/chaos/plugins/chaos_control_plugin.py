@@ -301,7 +301,7 @@ class ChaosControlPlugin(BasePlugin):
     # and must never be faulted.
     _IGNORED_TOOL_METHODS = {
         "setup", "name", "get_interface_description", "on_boot_complete",
-        "on_instrument", "shutdown", "on_boot",
+        "on_instrument", "drain", "shutdown", "on_boot",
     }
 
     def __init__(self, http, event_bus, container, logger):
@@ -6,12 +6,16 @@ class StressPlugin(BasePlugin):
     """
     Demonstrates how the hybrid architecture handles heavy tasks.
     """
+    # Its own bulkhead: sync stress requests queue in this pool and never
+    # take the threads of the rest of the chaos domain (or anyone else's).
+    executor_pool = "stress"
+
     def __init__(self, http, logger):
         self.http = http
         self.logger = logger
 
     async def on_boot(self):
-        # 1. Synchronous Blocking (will be offloaded to threadpool by http tool)
+        # 1. Synchronous Blocking (offloaded to the "stress" pool by the http tool)
         self.http.add_endpoint(
             path="/stress/sync",
             method="GET",
@@ -31,12 +31,11 @@ REPLACEMENT STANDARD (plugins unaffected):
 import base64
 import hashlib
 import os
-import asyncio
 import bcrypt
 import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from microcoreos import BaseTool
+from microcoreos import BaseTool, run_sync
 
 
 def _prehash(password: str) -> bytes:
@@ -108,15 +107,16 @@ class AuthTool(BaseTool):
         """
 
     async def hash_password(self, password: str) -> str:
-        # bcrypt is CPU-bound (~100ms by design) — run in a thread so it
-        # never blocks the event loop under concurrent requests.
-        return await asyncio.to_thread(
-            lambda: bcrypt.hashpw(_prehash(password), bcrypt.gensalt()).decode()
+        # bcrypt is CPU-bound (~100ms by design) — run in the "auth" pool so
+        # it never blocks the event loop, and a login burst never takes the
+        # threads other sync work needs (or waits behind theirs).
+        return await run_sync(
+            "auth", lambda: bcrypt.hashpw(_prehash(password), bcrypt.gensalt()).decode()
         )
 
     async def verify_password(self, password: str, hashed_password: str) -> bool:
-        return await asyncio.to_thread(
-            bcrypt.checkpw, _prehash(password), hashed_password.encode()
+        return await run_sync(
+            "auth", bcrypt.checkpw, _prehash(password), hashed_password.encode()
         )
 
     def create_token(self, data: dict, expires_delta: Optional[int] = None) -> str:
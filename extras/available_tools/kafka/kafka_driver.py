@@ -75,6 +75,9 @@ CONFIGURATION (env vars, read in __init__, zero I/O):
         than this) is evicted from the group and its message REDELIVERED to
         another replica: it runs TWICE. RAISE it above the worst-case handler
         duration.
+    EVENT_BUS_CODEC / EVENT_BUS_COMPRESSION — record encoding (see
+        tools/event_bus/codec.py). Anything but plain JSON is labelled by a
+        "codec" record header, which promotion from __delayed__ carries over.
 
 DELIVERY GUARANTEE: at-least-once. An offset is committed only AFTER the
 handler (including Bus-side retries/DLQ) finishes — if the replica dies
@@ -96,6 +99,7 @@ from aiokafka.errors import KafkaError, TopicAlreadyExistsError, for_code
 
 from microcoreos import ToolUnavailableError
 from tools.event_bus.event_bus_tool import EventBusDriver
+from tools.event_bus.codec import EnvelopeCodec, CODEC_HEADER
 
 
 class EventBusConnectionError(ToolUnavailableError):
@@ -107,11 +111,12 @@ class _Subscription:
     """One reader loop: (event, callback) consuming a topic via a consumer."""
 
     def __init__(self, event: str, topic: str, callback: Callable,
-                 ephemeral: bool):
+                 ephemeral: bool, batch: int = 1):
         self.event = event
         self.topic = topic
         self.callback = callback
         self.ephemeral = ephemeral  # broadcast: standalone consumer, no group
+        self.batch = batch          # records delivered (and committed) together
         self.consumer: Optional[AIOKafkaConsumer] = None
         self.task: Optional[asyncio.Task] = None
         # Set once fetch positions are pinned: a message published after
@@ -141,6 +146,8 @@ class KafkaDriver(EventBusDriver):
         self._subs: list[_Subscription] = []
         self._scheduler_consumer: Optional[AIOKafkaConsumer] = None
         self._scheduler_task: Optional[asyncio.Task] = None
+        self._draining = False
+        self._codec = EnvelopeCodec()
 
     # ─── LIFECYCLE ────────────────────────────────────────
 
@@ -242,8 +249,17 @@ class KafkaDriver(EventBusDriver):
 
     # ─── TRANSPORT: publish ───────────────────────────────
 
+    def _encode(self, envelope):
+        """(value, headers): plain JSON carries no header, as ever."""
+        value, label = self._codec.encode(envelope)
+        return value, (None if label == "json" else [(CODEC_HEADER, label.encode())])
+
+    def _decode(self, msg):
+        label = dict(msg.headers or ()).get(CODEC_HEADER)
+        return self._codec.decode(msg.value, label and label.decode(), self._envelope_cls)
+
     async def publish(self, envelope) -> None:
-        value = envelope.model_dump_json().encode()
+        value, headers = self._encode(envelope)
         if envelope.delay and envelope.delay > 0:
             # Native delay: park it in Kafka NOW (crash-safe); the fleet's
             # scheduler group promotes it when due. Keyed by delay value so
@@ -252,7 +268,7 @@ class KafkaDriver(EventBusDriver):
             try:
                 await self._ensure_topic(delayed)
                 await self._producer.send_and_wait(
-                    delayed, value, key=str(envelope.delay).encode())
+                    delayed, value, key=str(envelope.delay).encode(), headers=headers)
             except (KafkaError, OSError) as e:
                 raise EventBusConnectionError(f"Kafka cluster unreachable: {e}") from e
             return
@@ -260,7 +276,30 @@ class KafkaDriver(EventBusDriver):
         try:
             await self._ensure_topic(self._topic_for_event(envelope.event))
             await self._producer.send_and_wait(
-                self._topic_for_event(envelope.event), value, key=key)
+                self._topic_for_event(envelope.event), value, key=key, headers=headers)
+        except (KafkaError, OSError) as e:
+            raise EventBusConnectionError(f"Kafka cluster unreachable: {e}") from e
+
+    async def publish_batch(self, envelopes) -> None:
+        # send() only enqueues into the producer's per-partition batches;
+        # awaiting every delivery future together lets the whole batch go
+        # out in a few produce requests instead of one round trip per event.
+        # Same routing as publish(): delayed ones to the scheduler topic.
+        records = []
+        for envelope in envelopes:
+            value, headers = self._encode(envelope)
+            if envelope.delay and envelope.delay > 0:
+                records.append((f"{self._prefix}{self.DELAYED}", value,
+                                str(envelope.delay).encode(), headers))
+            else:
+                records.append((self._topic_for_event(envelope.event), value,
+                                envelope.key.encode() if envelope.key else None, headers))
+        try:
+            for topic in dict.fromkeys(record[0] for record in records):
+                await self._ensure_topic(topic)
+            futures = [await self._producer.send(topic, value, key=key, headers=headers)
+                       for topic, value, key, headers in records]
+            await asyncio.gather(*futures)
         except (KafkaError, OSError) as e:
             raise EventBusConnectionError(f"Kafka cluster unreachable: {e}") from e
 
@@ -306,7 +345,7 @@ class KafkaDriver(EventBusDriver):
 
     async def _promote_when_due(self, consumer, tp, msg) -> None:
         try:
-            envelope = self._envelope_cls.model_validate_json(msg.value)
+            envelope = self._decode(msg)
             due = envelope.timestamp.timestamp() + (envelope.delay or 0)
             while True:
                 wait_s = due - datetime.now(timezone.utc).timestamp()
@@ -324,7 +363,8 @@ class KafkaDriver(EventBusDriver):
             key = envelope.key.encode() if envelope.key else None
             await self._ensure_topic(self._topic_for_event(envelope.event))
             await self._producer.send_and_wait(
-                self._topic_for_event(envelope.event), msg.value, key=key)
+                self._topic_for_event(envelope.event), msg.value, key=key,
+                headers=list(msg.headers) or None)
         except (KafkaError, OSError):
             raise  # let the scheduler loop back off and re-poll (uncommitted)
         except Exception as e:
@@ -337,7 +377,8 @@ class KafkaDriver(EventBusDriver):
 
     # ─── TRANSPORT: subscribe / readers ───────────────────
 
-    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable):
+    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable,
+                        batch: int = 1):
         topic = self._topic_for_event(event_name)
         ephemeral = group is None
         try:
@@ -357,7 +398,7 @@ class KafkaDriver(EventBusDriver):
             raise EventBusConnectionError(
                 f"Cannot subscribe to Kafka topic {topic}: {e}") from e
 
-        sub = _Subscription(event_name, topic, callback, ephemeral)
+        sub = _Subscription(event_name, topic, callback, ephemeral, batch)
         sub.consumer = consumer
         sub.task = asyncio.create_task(self._reader(sub))
         self._subs.append(sub)
@@ -365,9 +406,15 @@ class KafkaDriver(EventBusDriver):
         # (subscribe reply → publish request) must never miss the reply.
         await asyncio.wait_for(sub.ready.wait(), timeout=self.READY_TIMEOUT_S)
 
+    async def subscribe_batch(self, event_name: str, group: Optional[str], callback: Callable,
+                              max_batch: int):
+        await self.subscribe(event_name, group, callback, batch=max_batch)
+
     async def _reader(self, sub: _Subscription) -> None:
         consumer = sub.consumer
-        while True:
+        # Draining: durable readers stop before their next poll (within the
+        # 1s timeout); standalone/reply readers keep going until shutdown.
+        while sub.ephemeral or not self._draining:
             try:
                 if not sub.ready.is_set() and consumer.assignment():
                     # Assignment arrived (group joined / standalone metadata):
@@ -378,7 +425,7 @@ class KafkaDriver(EventBusDriver):
                     sub.ready.set()
                 batches = await consumer.getmany(
                     timeout_ms=100 if not sub.ready.is_set() else 1000,
-                    max_records=16,
+                    max_records=max(16, sub.batch),
                 )
             except asyncio.CancelledError:
                 raise
@@ -387,33 +434,47 @@ class KafkaDriver(EventBusDriver):
                 continue
             await self._process(sub, batches)
 
+    async def stop_consuming(self) -> None:
+        self._draining = True
+        await asyncio.gather(*[s.task for s in self._subs if not s.ephemeral and s.task is not None],
+                             return_exceptions=True)
+
     async def _process(self, sub: _Subscription, batches) -> None:
-        for tp, messages in (batches or {}).items():
-            for msg in messages:
+        # One record at a time — or, for a batch subscription, sub.batch
+        # records delivered before any is awaited, so the Bus can gather
+        # them into one handler call, then committed together.
+        records = [(tp, msg) for tp, messages in (batches or {}).items() for msg in messages]
+        for start in range(0, len(records), sub.batch):
+            chunk = records[start:start + sub.batch]
+            deliveries = []
+            for tp, msg in chunk:
                 try:
-                    envelope = self._envelope_cls.model_validate_json(msg.value)
+                    envelope = self._decode(msg)
                     # The shared __replies__ topic carries foreign events:
                     # deliver only what this subscription asked for.
                     if envelope.event == sub.event:
-                        delivery = await self._deliver_hook(envelope, sub.callback)
-                        if delivery is not None:
-                            # Commit AFTER the handler (and its Bus-side
-                            # retries) finishes: a replica dying mid-handler
-                            # leaves the offset uncommitted and the group
-                            # redelivers (at-least-once).
-                            # shield(): a handler may unsubscribe US
-                            # (poisoned-handler escalation) — cancelling this
-                            # reader must not cancel the in-flight delivery
-                            # that triggered it (await cycle).
-                            await asyncio.shield(delivery)
+                        deliveries.append(await self._deliver_hook(envelope, sub.callback))
                 except Exception as e:
                     # Corrupt/foreign message: never let it kill the reader.
                     print(f"[KafkaDriver] ⚠️ Undeliverable message on {sub.topic}: {e}")
-                if not sub.ephemeral:
-                    try:
-                        await sub.consumer.commit({tp: msg.offset + 1})
-                    except (KafkaError, OSError):
-                        pass  # rebalance in flight → redelivery (at-least-once)
+            for delivery in deliveries:
+                if delivery is None:
+                    continue
+                try:
+                    # Commit AFTER the handler (and its Bus-side retries)
+                    # finishes: a replica dying mid-handler leaves the offset
+                    # uncommitted and the group redelivers (at-least-once).
+                    # shield(): a handler may unsubscribe US (poisoned-handler
+                    # escalation) — cancelling this reader must not cancel
+                    # the in-flight delivery that triggered it (await cycle).
+                    await asyncio.shield(delivery)
+                except Exception as e:
+                    print(f"[KafkaDriver] ⚠️ Undeliverable message on {sub.topic}: {e}")
+            if not sub.ephemeral:
+                try:
+                    await sub.consumer.commit({tp: msg.offset + 1 for tp, msg in chunk})
+                except (KafkaError, OSError):
+                    pass  # rebalance in flight → redelivery (at-least-once)
 
     # ─── TRANSPORT: unsubscribe ───────────────────────────
 
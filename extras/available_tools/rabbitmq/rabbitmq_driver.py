@@ -62,6 +62,9 @@ CONFIGURATION (env vars, read in __init__, zero I/O):
     RABBITMQ_CONNECT_TIMEOUT default "5" (seconds)
     RABBITMQ_BUS_EXCHANGE   default "bus"
     RABBITMQ_PREFETCH       default "16" (unacked messages in flight per queue)
+    EVENT_BUS_CODEC / EVENT_BUS_COMPRESSION — body encoding (see
+        tools/event_bus/codec.py), labelled by the standard content_type and
+        content_encoding properties (dead-lettering keeps them).
 
 DELIVERY GUARANTEE: at-least-once. A message is acked only AFTER the handler
 (including the Bus-side retries/DLQ) finishes — if the replica dies mid-handler
@@ -79,6 +82,7 @@ from aio_pika.abc import AbstractRobustConnection, AbstractRobustChannel, Abstra
 from typing import Callable, Optional
 from microcoreos import ToolUnavailableError
 from tools.event_bus.event_bus_tool import EventBusDriver
+from tools.event_bus.codec import EnvelopeCodec
 
 
 class EventBusConnectionError(ToolUnavailableError):
@@ -117,6 +121,8 @@ class RabbitMQDriver(EventBusDriver):
         self._pub_exchange: Optional[AbstractExchange] = None
         self._pub_lock = asyncio.Lock()
         self._subs: list[_Subscription] = []
+        self._handling: set[asyncio.Task] = set()   # _on_message calls in progress
+        self._codec = EnvelopeCodec()
 
     # ─── LIFECYCLE ────────────────────────────────────────
 
@@ -180,37 +186,50 @@ class RabbitMQDriver(EventBusDriver):
         return exchange
 
     async def publish(self, envelope) -> None:
-        priority = None
-        if envelope.priority is not None:
-            priority = max(0, min(self.MAX_PRIORITY, int(envelope.priority)))
-
-        message = aio_pika.Message(
-            body=envelope.model_dump_json().encode(),
-            content_type="application/json",
-            priority=priority,
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-        )
+        await self.publish_batch([envelope])
+
+    async def publish_batch(self, envelopes) -> None:
+        messages = []
+        for envelope in envelopes:
+            priority = None
+            if envelope.priority is not None:
+                priority = max(0, min(self.MAX_PRIORITY, int(envelope.priority)))
+            body, label = self._codec.encode(envelope)
+            content_type, content_encoding = self._codec.content_type(label)
+            messages.append((envelope, aio_pika.Message(
+                body=body,
+                content_type=content_type,
+                content_encoding=content_encoding,
+                priority=priority,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            )))
         try:
             # A robust channel survives reconnects but is not safe for
             # concurrent publishers — the Bus fires publishes as parallel tasks.
+            # A batch holds the lock once, for all of its messages, so nothing
+            # interleaves with it.
             async with self._pub_lock:
-                if envelope.delay and envelope.delay > 0:
-                    # Native delay: park it broker-side NOW (crash-safe); the
-                    # TTL expiry dead-letters it into the bus exchange.
-                    exchange = await self._delay_exchange(int(envelope.delay))
-                else:
-                    exchange = self._pub_exchange
-                await exchange.publish(message, routing_key=envelope.event)
+                for envelope, message in messages:
+                    if envelope.delay and envelope.delay > 0:
+                        # Native delay: park it broker-side NOW (crash-safe); the
+                        # TTL expiry dead-letters it into the bus exchange.
+                        exchange = await self._delay_exchange(int(envelope.delay))
+                    else:
+                        exchange = self._pub_exchange
+                    await exchange.publish(message, routing_key=envelope.event)
         except (aio_pika.exceptions.AMQPError, OSError) as e:
             raise EventBusConnectionError(f"RabbitMQ broker unreachable: {e}") from e
 
     # ─── TRANSPORT: subscribe / consumers ─────────────────
 
-    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable):
+    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable,
+                        batch: int = 1):
         ephemeral = group is None
 
         channel = await self._connection.channel()
-        await channel.set_qos(prefetch_count=self._prefetch)
+        # Messages are handled concurrently up to the prefetch, each acked
+        # after its delivery: a batch subscription needs room for a batch.
+        await channel.set_qos(prefetch_count=max(self._prefetch, batch))
         await self._declare_exchange(channel)
 
         if ephemeral:
@@ -237,6 +256,10 @@ class RabbitMQDriver(EventBusDriver):
         sub.consumer_tag = await queue.consume(_consumer)
         self._subs.append(sub)
 
+    async def subscribe_batch(self, event_name: str, group: Optional[str], callback: Callable,
+                              max_batch: int):
+        await self.subscribe(event_name, group, callback, batch=max_batch)
+
     def _queue_name(self, group: str) -> str:
         """Derive a valid, deterministic queue name from a Bus consumer group.
 
@@ -251,9 +274,33 @@ class RabbitMQDriver(EventBusDriver):
         prefix = f"{self._exchange_name}."
         return f"{prefix}{safe[: 256 - len(prefix) - len(digest) - 1]}.{digest}"
 
+    async def stop_consuming(self) -> None:
+        # basic.cancel on the durable queues: the broker sends no more, and
+        # what was prefetched but never handled requeues when the channel
+        # closes. Broadcast/reply queues keep consuming until shutdown.
+        for sub in self._subs:
+            if not sub.ephemeral and sub.queue is not None and sub.consumer_tag is not None:
+                try:
+                    await sub.queue.cancel(sub.consumer_tag)
+                except aio_pika.exceptions.AMQPError:
+                    pass
+                sub.consumer_tag = None
+        if self._handling:
+            await asyncio.wait(set(self._handling))
+
     async def _on_message(self, sub: _Subscription, message) -> None:
+        task = asyncio.current_task()
+        self._handling.add(task)
+        try:
+            await self._handle(sub, message)
+        finally:
+            self._handling.discard(task)
+
+    async def _handle(self, sub: _Subscription, message) -> None:
         try:
-            envelope = self._envelope_cls.model_validate_json(message.body.decode())
+            label = self._codec.label_from_content_type(message.content_type,
+                                                        message.content_encoding)
+            envelope = self._codec.decode(message.body, label, self._envelope_cls)
             delivery = await self._deliver_hook(envelope, sub.callback)
             if delivery is not None:
                 # Ack AFTER the handler (and its Bus-side retries) finishes: a
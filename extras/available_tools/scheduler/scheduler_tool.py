@@ -174,6 +174,9 @@ class SchedulerTool(BaseTool):
     def name(self) -> str:
         return "scheduler"
 
+    # The first job run should already carry spans.
+    boot_complete_after = ("telemetry",)
+
     # ─── LIFECYCLE ──────────────────────────────────────────────
 
     def __init__(self) -> None:
@@ -12,12 +12,38 @@ are boot-time machinery (`main.py`, tests), not plugin surface.
 
 from microcoreos.base_plugin import BasePlugin
 from microcoreos.base_tool import BaseTool, ToolUnavailableError
-from microcoreos.context import current_event_id_var, current_identity_var
+from microcoreos.circuit import CircuitBreaker, CircuitOpenError
+from microcoreos.concurrency import ConcurrencyLimit, concurrency_stats, limiter_for
+from microcoreos.executors import executor_stats, pool_for, run_sync
+from microcoreos.instrumentation import metered, track_sizes
+from microcoreos.offload import prepare_offload, run_in_process
+from microcoreos.context import (
+    DeadlineExceededError,
+    current_deadline_var,
+    current_event_id_var,
+    current_identity_var,
+    time_remaining,
+)
 
 __all__ = [
     "BasePlugin",
     "BaseTool",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ConcurrencyLimit",
+    "DeadlineExceededError",
     "ToolUnavailableError",
+    "concurrency_stats",
+    "current_deadline_var",
     "current_event_id_var",
     "current_identity_var",
+    "executor_stats",
+    "limiter_for",
+    "metered",
+    "pool_for",
+    "prepare_offload",
+    "run_in_process",
+    "run_sync",
+    "time_remaining",
+    "track_sizes",
 ]
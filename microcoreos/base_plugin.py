@@ -8,6 +8,16 @@ class BasePlugin(ABC):
     # (e.g. unit tests) — consumers must fall back gracefully.
     _identity: str | None = None
 
+    # Executor pool for this plugin's SYNC work — handlers, subscribers and
+    # hooks (microcoreos/executors.py). None: the pool of its domain,
+    # "domain.<name>". Name one to isolate a slow plugin from its neighbours.
+    executor_pool: str | None = None
+
+    # Adaptive concurrency limit for this plugin's HTTP handlers and bus
+    # subscribers (microcoreos/concurrency.py): a ConcurrencyLimit policy.
+    # None: no limit, unless MICROCOREOS_CONCURRENCY_LIMIT names this plugin.
+    concurrency_limit = None
+
     async def on_boot(self):
         """
         Lifecycle hook: executed when the plugin is loaded.
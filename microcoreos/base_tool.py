@@ -19,6 +19,22 @@ class ToolUnavailableError(Exception):
 
 
 class BaseTool(ABC):
+    # None (the default): on_boot_complete runs after the hook of every tool
+    # registered before this one, in registration order, as it always has.
+    # A tuple opts in to running concurrently: the hook starts as soon as the
+    # tools it names have finished theirs — `()` waits for none. Names that
+    # are not registered are ignored — a replacement tool may not exist here.
+    boot_complete_after: tuple[str, ...] | None = None
+
+    # Opt-in circuit breaker (microcoreos.CircuitBreaker): while the backend is
+    # down, calls through the proxy fail fast instead of timing out one by one.
+    circuit_breaker = None
+
+    # Async read methods whose identical concurrent calls share one in-flight
+    # backend call (microcoreos/single_flight.py). Every caller gets the same
+    # result object, so only list methods whose results callers never mutate.
+    single_flight: tuple[str, ...] = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -43,6 +59,13 @@ class BaseTool(ABC):
         """
         pass
 
+    async def drain(self, timeout: float) -> None:
+        """Optional hook: the first phase of shutdown. Stop taking NEW work from
+        outside (connections, broker messages) and wait, up to `timeout`
+        seconds, for the work already in flight. Every tool is still up while
+        this runs; shutdown() follows."""
+        pass
+
     async def shutdown(self):
         """Optional: Resource cleanup (close DB, stop server)"""
         pass
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Circuit breaker — fail fast while a tool's backend is down.
+
+ToolProxy's DEAD policy REPORTS an outage; it never stops calls. With Postgres
+or Redis unreachable, every request still waits out a full connect timeout,
+holding a worker thread or a pool slot while it does. A tool that opts in
+with a policy
+
+    class PostgresTool(BaseTool):
+        circuit_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
+gets one circuit per tool (or per method, `per_method=True`), kept by its
+ToolProxy:
+
+    CLOSED     calls go through. `failure_threshold` consecutive
+               backend failures (`trips_on`: ToolUnavailableError,
+               ConnectionError, TimeoutError) open the circuit.
+    OPEN       calls raise CircuitOpenError at once, without touching the
+               tool, for `reset_timeout` seconds.
+    HALF_OPEN  up to `half_open_probes` calls go through as probes; the rest
+               still fail fast. A probe that succeeds — or fails with a
+               business error, which proves the backend answered — counts
+               toward closing; `half_open_probes` of them close the circuit.
+               A probe that fails like an outage re-opens it.
+
+Opening marks the tool DEAD in the registry; closing restores OK through the
+proxy's usual "Recovered" path. Business errors never trip a circuit: a
+UNIQUE violation is an answer from a healthy backend.
+
+Deployers opt tools in without code changes with
+MICROCOREOS_CIRCUIT_BREAKER=db,state (or `*`), which applies the default
+policy to tools that do not declare one.
+"""
+
+import os
+import time
+import threading
+
+from microcoreos.base_tool import ToolUnavailableError
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+
+class CircuitOpenError(ToolUnavailableError):
+    """Raised instead of calling a tool whose circuit is open."""
+
+
+class CircuitBreaker:
+    """A tool's breaker POLICY. Stateless: each proxy builds its own circuits."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_probes: int = 1, per_method: bool = False,
+                 trips_on: tuple = (ToolUnavailableError, ConnectionError, TimeoutError)):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.per_method = per_method
+        self.trips_on = trips_on
+
+    def new_circuit(self, clock=time.monotonic) -> "Circuit":
+        return Circuit(self, clock)
+
+
+class Circuit:
+    """The state of one circuit. `allow()` before the call, then exactly one
+    of `on_success()` / `on_failure(e)` for every call it allowed."""
+
+    def __init__(self, policy: CircuitBreaker, clock=time.monotonic):
+        self.policy = policy
+        self.state = CLOSED
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.last_error = None
+
+    def allow(self) -> bool:
+        if self.state is CLOSED:
+            return True
+        with self._lock:
+            if self.state is OPEN:
+                if self._clock() - self._opened_at < self.policy.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+            if self.state is HALF_OPEN:
+                if self._probes_in_flight >= self.policy.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def on_success(self) -> bool:
+        """Returns True when this success closed the circuit."""
+        if self.state is CLOSED:
+            self._failures = 0
+            return False
+        with self._lock:
+            if self.state is not HALF_OPEN:
+                return False
+            self._probes_in_flight -= 1
+            self._probe_successes += 1
+            if self._probe_successes < self.policy.half_open_probes:
+                return False
+            self.state = CLOSED
+            self._failures = 0
+            return True
+
+    def on_failure(self, e: BaseException) -> bool:
+        """Returns True when this failure opened the circuit."""
+        if not isinstance(e, self.policy.trips_on):
+            # The backend answered; as far as availability goes, that is a success.
+            self.on_success()
+            return False
+        with self._lock:
+            self.last_error = e
+            if self.state is HALF_OPEN:
+                self._probes_in_flight -= 1
+                return self._open()
+            if self.state is OPEN:
+                return False
+            self._failures += 1
+            if self._failures >= self.policy.failure_threshold:
+                return self._open()
+            return False
+
+    def release(self) -> None:
+        """The allowed call ended with neither answer (cancelled): free its probe slot."""
+        if self.state is HALF_OPEN:
+            with self._lock:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _open(self) -> bool:
+        self.state = OPEN
+        self._opened_at = self._clock()
+        return True
+
+    def retry_in(self) -> float:
+        return max(0.0, self.policy.reset_timeout - (self._clock() - self._opened_at))
+
+
+def policy_from_env(tool_name: str):
+    """The default policy when MICROCOREOS_CIRCUIT_BREAKER names this tool (or is `*`)."""
+    names = {n.strip() for n in os.getenv("MICROCOREOS_CIRCUIT_BREAKER", "").split(",") if n.strip()}
+    if "*" in names or tool_name in names:
+        return CircuitBreaker()
+    return None
@@ -13,6 +13,7 @@ The root `main.py` and `cli.py` are thin shims over this module, so
     microcoreos                     boot the Kernel (same as `uv run main.py`)
     microcoreos run                 idem, explicit
     microcoreos run --boot-tool db  boot ONE tool in isolation and exit
+    microcoreos run --workers 8     N worker processes sharing one HTTP socket
     microcoreos dev                 boot with auto-reload on .py changes
     microcoreos status              preflight: active plan, progress, manifest age
     microcoreos plan validate       run the plan rules offline
@@ -20,6 +21,7 @@ The root `main.py` and `cli.py` are thin shims over this module, so
     microcoreos schema              print the live tables and columns
 """
 
+import os
 import sys
 import signal
 import asyncio
@@ -28,6 +30,7 @@ from microcoreos.kernel import Kernel
 from microcoreos.catalog import add
 from microcoreos.scaffold import new
 from microcoreos.upgrade import upgrade
+from microcoreos.supervisor import parse_workers, refuse_reason, supervise
 
 from microcoreos.project import (
     ensure_project_on_path,
@@ -43,6 +46,7 @@ Usage:
   microcoreos add <extra> [--no-install]          Install an extra completely
   microcoreos upgrade [--apply]                   Report/apply upstream changes
   microcoreos [run] [--boot-tool <tool_name>]     Boot the Kernel in this directory
+  microcoreos run --workers <N>                   Boot N worker processes on one socket
   microcoreos dev                                 Boot with auto-reload on .py changes
 
 The plan pipeline (docs/PARALLEL_DEVELOPMENT.md):
@@ -56,6 +60,37 @@ directory holding tools/, domains/ and plans/).
 """
 
 
+LOOPS = ("asyncio", "uvloop")
+
+
+def loop_factory():
+    """The event loop MICROCOREOS_LOOP selects: None for asyncio's own (the
+    default), uvloop.new_event_loop for `uvloop`. uvloop is the project's own
+    dependency (`uv add uvloop`, not on Windows), hence the lazy import;
+    without it, or with an unknown name, the Kernel boots on asyncio and says
+    why."""
+    name = (os.getenv("MICROCOREOS_LOOP") or "asyncio").strip().lower()
+    if name == "asyncio":
+        return None
+    if name == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            print("[MicroCoreOS] ⚠️ MICROCOREOS_LOOP=uvloop but uvloop is not installed "
+                  "(uv add uvloop) — using asyncio.")
+            return None
+        return uvloop.new_event_loop
+    print(f"[MicroCoreOS] ⚠️ Ignoring MICROCOREOS_LOOP={name!r}: expected one of {', '.join(LOOPS)}.")
+    return None
+
+
+def _run_loop(main) -> None:
+    """asyncio.run(main), on the loop MICROCOREOS_LOOP selects. Called after
+    the project's .env is loaded, so the variable can live there."""
+    with asyncio.Runner(loop_factory=loop_factory()) as runner:
+        runner.run(main)
+
+
 async def _boot_forever():
     stop_event = asyncio.Event()
     app = Kernel()
@@ -80,7 +115,8 @@ async def _boot_forever():
 
 
 def run(argv: list[str]) -> int:
-    """Boot the Kernel. With --boot-tool, boot ONE tool in isolation and exit."""
+    """Boot the Kernel. With --boot-tool, boot ONE tool in isolation and exit;
+    with --workers N, supervise N Kernels in N processes (supervisor.py)."""
     stdio_speaks_unicode()  # Reached without `main` as the reload child of `dev`.
     root = ensure_project_on_path()
     # The Kernel would otherwise discover nothing and announce "System Ready" —
@@ -96,13 +132,24 @@ def run(argv: list[str]) -> int:
             print("Usage: microcoreos run --boot-tool <tool_name>")
             return 2
         load_project_env(root)
-        asyncio.run(Kernel().boot_tool(argv[idx + 1]))
+        _run_loop(Kernel().boot_tool(argv[idx + 1]))
         return 0
 
     load_project_env(root)
 
+    workers = parse_workers(argv)
+    if workers is None:
+        print("Usage: microcoreos run --workers <N>   (N >= 1)")
+        return 2
+    if workers > 1:
+        reason = refuse_reason()
+        if reason:
+            print(f"[MicroCoreOS] 🚨 {reason}")
+            return 2
+        return supervise(workers)
+
     try:
-        asyncio.run(_boot_forever())
+        _run_loop(_boot_forever())
     except (KeyboardInterrupt, asyncio.CancelledError):
         pass
     return 0
@@ -0,0 +1,213 @@
+"""
+Adaptive concurrency limits — shed load per plugin before latency explodes.
+
+Nothing else bounds how many requests or deliveries a plugin has in flight:
+under overload everything queues on the loop and every endpoint slows down
+together. A plugin that opts in with a policy
+
+    class CheckoutPlugin(BasePlugin):
+        concurrency_limit = ConcurrencyLimit(initial_limit=20, max_limit=200)
+
+gets one limiter, keyed by its identity ("domain.ClassName") and shared by
+all its handlers:
+
+- HTTP (_process_request): over the limit, a request is answered 503 with
+  Retry-After at once, before auth or the handler run.
+- Bus (EventBusTool._do_deliver): over the limit, a delivery waits for a
+  slot. Nothing is dropped; drivers ack after delivery, so a durable
+  transport's backlog stays broker-side.
+
+The limit moves with the latency it observes (AIMD). The baseline is the
+fastest completion of the last BASELINE_SECONDS..2×BASELINE_SECONDS. A
+completion slower than `tolerance` × baseline (plus JITTER_SECONDS), or one
+that hit its deadline, cuts the limit by `backoff` — at most once per such
+completion's own duration, so one burst of slow calls cuts it once. A fast
+completion while at least half the limit was in use adds 1/limit:
+about +1 per limit's worth of calls.
+
+Deployers opt plugins in without code changes with
+MICROCOREOS_CONCURRENCY_LIMIT=orders,users.CreateUserPlugin (a domain or a
+plugin identity, or `*`), which applies the default policy to plugins that
+declare none. Only plugins: tools' own subscriptions (the bus's reply inbox)
+are never limited from the environment, or `*` would hold back replies until
+their callers time out. Plugins without a policy pay one dict lookup per call.
+
+Limiters live on the event loop thread: acquire and release are never called
+from a pool.
+"""
+
+import os
+import time
+import asyncio
+import collections
+
+from microcoreos.base_plugin import BasePlugin
+
+BASELINE_SECONDS = 30.0
+JITTER_SECONDS = 0.005
+RETRY_AFTER_SECONDS = 1
+
+
+class ConcurrencyLimit:
+    """A plugin's limit POLICY. Stateless: the limiter holds the state."""
+
+    def __init__(self, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 tolerance: float = 2.0, backoff: float = 0.9):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("need 1 <= min_limit <= initial_limit <= max_limit")
+        if tolerance < 1 or not 0 < backoff < 1:
+            raise ValueError("need tolerance >= 1 and 0 < backoff < 1")
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+
+
+class Limiter:
+    """The state of one owner's limit. `try_acquire()` (or `await acquire()`),
+    then exactly one `release(started, overloaded)` for every slot granted."""
+
+    def __init__(self, owner: str, policy: ConcurrencyLimit, clock=time.perf_counter):
+        self.owner = owner
+        self.policy = policy
+        self.limit = float(policy.initial_limit)
+        self.in_flight = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.deferred = 0
+        self.decreases = 0
+        self._clock = clock
+        self._waiters: collections.deque = collections.deque()
+        self._floor = float("inf")        # fastest completion, this window
+        self._last_floor = float("inf")   # ... and the previous one
+        self._window_start = clock()
+        self._last_decrease = float("-inf")
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait (Retry-After)."""
+        return RETRY_AFTER_SECONDS
+
+    def _capacity(self) -> int:
+        return max(self.policy.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        """A slot now, or False (counted as a rejection)."""
+        if self.in_flight < self._capacity() and not self._waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+        self.rejected += 1
+        return False
+
+    async def acquire(self) -> None:
+        """A slot, waiting in line for one when the limit is reached."""
+        if self.in_flight < self._capacity() and not self._waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return
+        self.deferred += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter     # release() hands its slot over
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)   # handed over as we were cancelled: give it back
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self.accepted += 1
+
+    def release(self, started, overloaded: bool = False) -> None:
+        """Frees the slot. `started` is the clock reading when the work began
+        (None: no latency sample); `overloaded` — it ran out of time."""
+        busy = self.in_flight
+        self.in_flight -= 1
+        if started is not None:
+            self._observe(self._clock() - started, overloaded, busy)
+        capacity = self._capacity()
+        while self._waiters and self.in_flight < capacity:
+            waiter = self._waiters.popleft()
+            if waiter.done() or waiter.get_loop().is_closed():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _observe(self, latency: float, overloaded: bool, busy: int) -> None:
+        now = self._clock()
+        if now - self._window_start >= BASELINE_SECONDS:
+            self._last_floor, self._floor = self._floor, float("inf")
+            self._window_start = now
+        self._floor = min(self._floor, latency)
+        baseline = min(self._floor, self._last_floor)
+        policy = self.policy
+        if overloaded or latency > baseline * policy.tolerance + JITTER_SECONDS:
+            if now - self._last_decrease >= latency:
+                self.limit = max(policy.min_limit, self.limit * policy.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif busy * 2 >= self.limit:
+            self.limit = min(policy.max_limit, self.limit + 1 / self.limit)
+
+    def stats(self) -> dict:
+        baseline = min(self._floor, self._last_floor)
+        return {
+            "owner": self.owner,
+            "limit": self._capacity(),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "deferred": self.deferred,
+            "decreases": self.decreases,
+            "baseline_ms": round(baseline * 1000, 3) if baseline != float("inf") else None,
+        }
+
+
+class ConcurrencyLimits:
+    """Limiters by owner identity, resolved once per owner."""
+
+    def __init__(self):
+        self._limiters: dict[str, Limiter | None] = {}
+
+    def limiter_for(self, callback, identity: str) -> Limiter | None:
+        """The limiter of the plugin that owns `callback` (a bound method whose
+        identity is "<owner>.<method>"), or None when it has no policy. The
+        environment's default applies to plugins only."""
+        owner = getattr(callback, "__self__", None)
+        key = identity.rpartition(".")[0] if owner is not None else identity
+        try:
+            return self._limiters[key]
+        except KeyError:
+            policy = getattr(owner, "concurrency_limit", None)
+            if policy is None and isinstance(owner, BasePlugin):
+                policy = policy_from_env(key)
+            limiter = self._limiters[key] = Limiter(key, policy) if policy else None
+            return limiter
+
+    def stats(self) -> list:
+        return [limiter.stats() for _, limiter in sorted(self._limiters.items()) if limiter]
+
+    def reset(self) -> None:
+        self._limiters = {}
+
+
+def policy_from_env(owner: str):
+    """The default policy when MICROCOREOS_CONCURRENCY_LIMIT names this owner,
+    its domain, or is `*`."""
+    for name in os.getenv("MICROCOREOS_CONCURRENCY_LIMIT", "").split(","):
+        name = name.strip()
+        if name and (name == "*" or owner == name or owner.startswith(name + ".")):
+            return ConcurrencyLimit()
+    return None
+
+
+concurrency_limits = ConcurrencyLimits()
+limiter_for = concurrency_limits.limiter_for
+
+
+def concurrency_stats() -> list:
+    """ConcurrencyLimits.stats() for this process."""
+    return concurrency_limits.stats()
@@ -1,10 +1,17 @@
 import time
+import asyncio
 import inspect
+import itertools
 import contextlib
 import threading
-from collections import deque
+from array import array
 from microcoreos.registry import Registry
+from microcoreos.histograms import LatencyHistograms
+from microcoreos.instrumentation import track_sizes
 from microcoreos.base_tool import ToolUnavailableError
+from microcoreos.circuit import CircuitOpenError, policy_from_env
+from microcoreos.context import DeadlineExceededError, current_deadline_var
+from microcoreos.single_flight import SingleFlight, flight_key, methods_from_env
 
 
 class ToolNotFoundError(Exception):
@@ -20,6 +27,12 @@ class ToolProxy:
     - Measure and emit call duration to a metrics sink.
     - Create tracing spans when a span factory is registered.
 
+    Everything that does not change between calls is bound ONCE per
+    (tool, method), when the wrapper is built and cached: the metric recorder
+    (`bind_metric`, a slot writer into the Container's ring) and the names.
+    The per-call cost is two perf_counter reads, a span check and the ring
+    write — see dev_infra/bench_proxy.py for what that adds over a raw call.
+
     DEAD policy (hybrid):
     - ToolUnavailableError (or subclass) → DEAD immediately. The tool itself
       declared its infrastructure unreachable.
@@ -27,17 +40,42 @@ class ToolProxy:
       violations, bad input) are indistinguishable from real failures one by one,
       so the proxy uses a streak: DEAD_THRESHOLD consecutive failures mark the
       tool DEAD. A single success resets the streak.
+
+    Circuit breaker (opt-in, see circuit.py): DEAD only reports. A tool with a
+    `circuit_breaker` policy (its class attribute, or the default one via
+    MICROCOREOS_CIRCUIT_BREAKER) also stops being called while its backend is
+    down — calls raise CircuitOpenError at once until a half-open probe
+    succeeds. Without a policy the call path is unchanged.
+
+    Single-flight (opt-in, see single_flight.py): async methods a tool lists in
+    `single_flight` (or MICROCOREOS_SINGLE_FLIGHT names) share one backend
+    call among identical concurrent calls.
+
+    Deadlines (context.current_deadline_var): a call made after the deadline
+    raises DeadlineExceededError without reaching the tool; an async call
+    still running when it passes is cancelled. Neither counts against the
+    tool's health — the caller gave up, the tool did not fail.
     """
 
     DEAD_THRESHOLD = 5
 
-    def __init__(self, tool, registry: Registry, emit_metric=None, make_span=None):
+    def __init__(self, tool, registry: Registry, emit_metric=None, make_span=None, bind_metric=None,
+                 circuit_breaker=None, single_flight=None, bind_coalesced=None):
         self._tool = tool
         self._registry = registry
         self._emit_metric = emit_metric
         self._make_span = make_span  # callable(tool, method) -> context manager
+        self._bind_metric = bind_metric  # callable(tool, method) -> record(start, end, success)
         self._wrapper_cache = {}
         self._consecutive_failures = 0
+        self._breaker = circuit_breaker or getattr(tool, "circuit_breaker", None)
+        self._circuit = self._breaker.new_circuit() if self._breaker else None
+        self._method_circuits = {}
+        # Async methods whose identical concurrent calls share one (single_flight.py).
+        self._single_flight = frozenset(
+            single_flight if single_flight is not None else getattr(tool, "single_flight", ())
+        )
+        self._bind_coalesced = bind_coalesced  # callable(tool, method) -> joined()
 
     def _record_success(self):
         self._consecutive_failures = 0
@@ -54,6 +92,28 @@ class ToolProxy:
                 f"{self._consecutive_failures} consecutive failures. Last: {e}"
             )
 
+    def _circuit_for(self, method: str):
+        """The circuit guarding `method`: None without a policy, else the tool's
+        one circuit, or the method's own with `per_method=True`."""
+        if self._breaker is None or not self._breaker.per_method:
+            return self._circuit
+        if method not in self._method_circuits:
+            self._method_circuits[method] = self._breaker.new_circuit()
+        return self._method_circuits[method]
+
+    def _circuit_open_error(self, circuit, method: str) -> CircuitOpenError:
+        return CircuitOpenError(
+            f"Circuit open for '{self._tool.name}.{method}' — not called, "
+            f"retry in {circuit.retry_in():.1f}s. Last: {circuit.last_error}"
+        )
+
+    def _circuit_failure(self, circuit, method: str, e: Exception):
+        if circuit.on_failure(e):
+            where = f"{self._tool.name}.{method}" if self._breaker.per_method else self._tool.name
+            print(f"[ToolProxy] ⚡ Circuit opened for '{where}' "
+                  f"(retry in {self._breaker.reset_timeout}s): {e}")
+            self._registry.update_tool_status(self._tool.name, "DEAD", f"Circuit open ({where}): {e}")
+
     def __setattr__(self, name, value):
         if name.startswith('_'):
             super().__setattr__(name, value)
@@ -69,64 +129,296 @@ class ToolProxy:
         if not callable(attr):
             return attr
 
-        emit = self._emit_metric
         make_span = self._make_span
+        get_deadline = current_deadline_var.get
+        wall_clock = time.time
         tool_name = self._tool.name
+        record = self._bind_recorder(tool_name, name)
+        perf_counter = time.perf_counter
+        # Lock-free: a healthy tool (the common case) must not take the
+        # registry lock on every call just to learn it has nothing to restore.
+        is_dead = self._registry.is_dead
+        proxy = self
+
+        circuit = self._circuit_for(name)
 
         if inspect.iscoroutinefunction(attr):
             async def wrapper(*args, **kwargs):
-                start = time.perf_counter()
-                span_cm = make_span(tool_name, name) if make_span else contextlib.nullcontext()
-                with span_cm:
-                    try:
+                deadline = get_deadline()
+                if deadline is not None and deadline <= wall_clock():
+                    raise self._deadline_passed(name, record)
+                if circuit is not None and not circuit.allow():
+                    if record:
+                        now = perf_counter()
+                        record(now, now, False)
+                    raise self._circuit_open_error(circuit, name)
+                start = perf_counter()
+                # No span factory → None, and no context-manager protocol at all.
+                span_cm = make_span(tool_name, name) if make_span else None
+                if span_cm is not None:
+                    span_cm.__enter__()
+                try:
+                    if deadline is None:
                         result = await attr(*args, **kwargs)
-                        self._record_success()
-                        if emit:
-                            emit(tool_name, name, (time.perf_counter() - start) * 1000, True)
-                        return result
-                    except Exception as e:
-                        if emit:
-                            emit(tool_name, name, (time.perf_counter() - start) * 1000, False)
+                    else:
+                        result = await _within(deadline, attr(*args, **kwargs), tool_name, name)
+                except BaseException as e:
+                    if isinstance(e, DeadlineExceededError):
+                        # The caller stopped waiting: says nothing about the tool's health.
+                        if record:
+                            record(start, perf_counter(), False)
+                        if circuit is not None:
+                            circuit.release()
+                    elif isinstance(e, Exception):
+                        if record:
+                            record(start, perf_counter(), False)
                         self._record_failure(e)
-                        raise e
+                        if circuit is not None:
+                            self._circuit_failure(circuit, name, e)
+                    elif circuit is not None:
+                        circuit.release()
+                    if span_cm is not None:
+                        span_cm.__exit__(type(e), e, e.__traceback__)
+                    raise
+                if circuit is not None:
+                    circuit.on_success()
+                if proxy._consecutive_failures or is_dead(tool_name):
+                    self._record_success()
+                if record:
+                    record(start, perf_counter(), True)
+                if span_cm is not None:
+                    span_cm.__exit__(None, None, None)
+                return result
         else:
             def wrapper(*args, **kwargs):
-                start = time.perf_counter()
+                # A sync call cannot be interrupted: the deadline is checked
+                # before it starts, never during. An awaitable it returns is
+                # held to the deadline like an async method.
+                deadline = get_deadline()
+                if deadline is not None and deadline <= wall_clock():
+                    raise self._deadline_passed(name, record)
+                if circuit is not None and not circuit.allow():
+                    if record:
+                        now = perf_counter()
+                        record(now, now, False)
+                    raise self._circuit_open_error(circuit, name)
+                start = perf_counter()
                 try:
                     result = attr(*args, **kwargs)
 
                     # Handle sync function returning an awaitable
-                    if inspect.isawaitable(result):
+                    if type(result) not in _NEVER_AWAITABLE and inspect.isawaitable(result):
+                        # The work runs when the awaitable does, and it may
+                        # never be awaited: hand the probe slot back and take
+                        # it again once it starts.
+                        if circuit is not None:
+                            circuit.release()
+
                         async def _monitored():
-                            inner_start = time.perf_counter()
-                            span_cm = make_span(tool_name, name) if make_span else contextlib.nullcontext()
-                            with span_cm:
+                            if circuit is not None and not circuit.allow():
+                                if inspect.iscoroutine(result):
+                                    result.close()
+                                if record:
+                                    now = perf_counter()
+                                    record(now, now, False)
+                                raise self._circuit_open_error(circuit, name)
+                            inner_start = perf_counter()
+                            span_cm = make_span(tool_name, name) if make_span else None
+                            with span_cm or _NO_SPAN:
                                 try:
-                                    r = await result
-                                    self._record_success()
-                                    if emit:
-                                        emit(tool_name, name, (time.perf_counter() - inner_start) * 1000, True)
-                                    return r
-                                except Exception as e:
-                                    if emit:
-                                        emit(tool_name, name, (time.perf_counter() - inner_start) * 1000, False)
+                                    if deadline is None:
+                                        r = await result
+                                    else:
+                                        r = await _within(deadline, result, tool_name, name)
+                                except BaseException as e:
+                                    if isinstance(e, DeadlineExceededError):
+                                        if record:
+                                            record(inner_start, perf_counter(), False)
+                                        if circuit is not None:
+                                            circuit.release()
+                                        raise
+                                    if not isinstance(e, Exception):
+                                        if circuit is not None:
+                                            circuit.release()
+                                        raise
+                                    if record:
+                                        record(inner_start, perf_counter(), False)
                                     self._record_failure(e)
+                                    if circuit is not None:
+                                        self._circuit_failure(circuit, name, e)
                                     raise
+                                if circuit is not None:
+                                    circuit.on_success()
+                                self._record_success()
+                                if record:
+                                    record(inner_start, perf_counter(), True)
+                                return r
                         return _monitored()
 
-                    self._record_success()
-                    if emit:
-                        emit(tool_name, name, (time.perf_counter() - start) * 1000, True)
-                    return result
                 except Exception as e:
-                    if emit:
-                        emit(tool_name, name, (time.perf_counter() - start) * 1000, False)
+                    if record:
+                        record(start, perf_counter(), False)
                     self._record_failure(e)
+                    if circuit is not None:
+                        self._circuit_failure(circuit, name, e)
                     raise e
+                if circuit is not None:
+                    circuit.on_success()
+                if proxy._consecutive_failures or is_dead(tool_name):
+                    self._record_success()
+                if record:
+                    record(start, perf_counter(), True)
+                return result
+
+        if name in self._single_flight and inspect.iscoroutinefunction(attr):
+            wrapper = self._coalescing(wrapper, tool_name, name)
 
         self._wrapper_cache[name] = wrapper
         return wrapper
 
+    def _coalescing(self, call, tool_name, method):
+        """`call`, with identical concurrent calls sharing one in-flight call.
+
+        The shared call runs without a deadline; each caller waits for it
+        under its own, so one impatient caller cannot fail the others.
+        """
+        flight = SingleFlight(self._bind_coalesced(tool_name, method) if self._bind_coalesced else None)
+
+        async def wrapper(*args, **kwargs):
+            key = flight_key(args, kwargs)
+            if key is None:
+                return await call(*args, **kwargs)
+            deadline = current_deadline_var.get()
+            if deadline is None:
+                return await flight.call(key, lambda: call(*args, **kwargs))
+            if deadline <= time.time():
+                raise self._deadline_passed(method, None)
+            return await _within(deadline, flight.call(key, lambda: call(*args, **kwargs)), tool_name, method)
+
+        return wrapper
+
+    def _deadline_passed(self, method: str, record) -> DeadlineExceededError:
+        if record:
+            now = time.perf_counter()
+            record(now, now, False)
+        return DeadlineExceededError(
+            f"Deadline passed before '{self._tool.name}.{method}' was called — not called."
+        )
+
+    def _bind_recorder(self, tool_name, method):
+        """record(start, end, success) for one (tool, method), or None."""
+        if self._bind_metric:
+            return self._bind_metric(tool_name, method)
+        emit = self._emit_metric
+        if emit:
+            return lambda start, end, success: emit(tool_name, method, (end - start) * 1000, success)
+        return None
+
+
+async def _within(deadline: float, awaitable, tool_name: str, method: str):
+    """Await `awaitable`, cancelling it when the wall-clock `deadline` passes."""
+    try:
+        async with asyncio.timeout(deadline - time.time()) as scope:
+            return await awaitable
+    except TimeoutError:
+        if scope.expired():
+            raise DeadlineExceededError(
+                f"'{tool_name}.{method}' cancelled: the deadline passed while it ran."
+            ) from None
+        raise
+
+
+# Shared, reusable "no span" for the rare sync-returns-awaitable path.
+_NO_SPAN = contextlib.nullcontext()
+# Result types that can never be awaited: skips inspect.isawaitable's three
+# isinstance checks for what sync tools almost always return.
+_NEVER_AWAITABLE = frozenset({type(None), dict, list, tuple, str, bytes, int, float, bool})
+
+
+class MetricsRing:
+    """The last `capacity` tool calls, in preallocated parallel arrays.
+
+    A call writes four slots — which (tool, method), duration, success, end
+    time — and allocates nothing: no record dict, no deque node. Records are
+    built only when somebody reads (get_metrics, the sink drain). Slots are
+    claimed with an atomic counter, so sync tool calls from worker threads
+    never share one; a reader racing a writer can see one half-written
+    record, which metrics tolerate.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._site = array("l", [0]) * capacity
+        self._duration_ms = array("d", [0.0]) * capacity
+        self._end = array("d", [0.0]) * capacity
+        self._success = bytearray(capacity)
+        self._seq = itertools.count()
+        self.head = 0   # sequence number of the next record
+        self.notify = None
+        self.sites: list[tuple[str, str]] = []
+        self._site_ids: dict[tuple[str, str], int] = {}
+        self._sites_lock = threading.Lock()
+        # perf_counter → wall clock, computed once: the proxy already read
+        # perf_counter at the end of the call, time.time() would be a third clock read.
+        self._epoch_offset = time.time() - time.perf_counter()
+
+    def site(self, tool: str, method: str) -> int:
+        key = (tool, method)
+        with self._sites_lock:
+            if key not in self._site_ids:
+                self._site_ids[key] = len(self.sites)
+                self.sites.append(key)
+            return self._site_ids[key]
+
+    def bind(self, tool: str, method: str, observe=None):
+        """write(start, end, success) for one (tool, method), everything pre-bound.
+
+        `observe(duration_ms, end, success)`, when given, sees every call too
+        (the latency histograms).
+
+        After each write, `notify` (when set) is called — the Container uses it
+        to schedule the sink drain and clears it while a drain is pending, so
+        a burst of calls costs one attribute read each, not one call each.
+        """
+        site = self.site(tool, method)
+        seq, capacity = self._seq, self.capacity
+        sites, durations, ends, successes = self._site, self._duration_ms, self._end, self._success
+        ring = self
+
+        def write(start: float, end: float, success: bool) -> None:
+            n = next(seq)
+            slot = n % capacity
+            sites[slot] = site
+            duration_ms = (end - start) * 1000
+            durations[slot] = duration_ms
+            ends[slot] = end
+            successes[slot] = success
+            ring.head = n + 1
+            if observe is not None:
+                observe(duration_ms, end, success)
+            notify = ring.notify
+            if notify is not None:
+                notify()
+
+        return write
+
+    def records(self, since: int = 0) -> tuple[list[dict], int]:
+        """Records with sequence >= since still in the ring, and the new cursor."""
+        head = self.head
+        first = max(since, head - self.capacity)
+        out = []
+        for seq in range(first, head):
+            slot = seq % self.capacity
+            tool, method = self.sites[self._site[slot]]
+            out.append({
+                "tool": tool,
+                "method": method,
+                "duration_ms": round(self._duration_ms[slot], 3),
+                "success": bool(self._success[slot]),
+                "timestamp": self._epoch_offset + self._end[slot],
+            })
+        return out, head
+
 
 class Container:
     """
@@ -142,35 +434,105 @@ class Container:
         self._lock = threading.RLock()
         self.registry = Registry()
         self._metrics_sinks = []
-        self._metrics_buffer = deque(maxlen=1000)
+        self._metrics_ring = MetricsRing(1000)
+        self._latency = LatencyHistograms()
+        self._sink_cursor = 0
+        self.sink_records_lost = 0
+        self._drain_lock = threading.Lock()
+        self._drain_loop = None
         self._span_factory = None
+        track_sizes("container", self._sizes)
+
+    def _sizes(self) -> dict:
+        ring = self._metrics_ring
+        return {
+            "tools": len(self._tools),
+            "metrics_ring": min(ring.head, ring.capacity),
+            "metric_sites": len(ring.sites),
+            "latency_series": len(self._latency._series),
+            "metrics_sinks": len(self._metrics_sinks),
+            "sink_backlog": ring.head - self._sink_cursor if self._metrics_sinks else 0,
+        }
 
     # ── Metrics ───────────────────────────────────────────────────────────────
 
     def add_metrics_sink(self, callback):
         """Register a sink to receive metric records on every tool call.
         Signature: callback(record: dict) — record has: tool, method, duration_ms, success, timestamp.
+
+        Sinks are called in batches, off the call path: from the event loop
+        right after the calls that produced the records (call_soon), or inline
+        when no loop is running. A sink that falls more than the ring's
+        capacity behind loses the oldest records.
         """
+        if not self._metrics_sinks:
+            self._sink_cursor = self._metrics_ring.head
         self._metrics_sinks.append(callback)
+        self._metrics_ring.notify = self._schedule_drain
 
     def get_metrics(self) -> list:
         """Return the last 1000 metric records (chronological order)."""
-        return list(self._metrics_buffer)
+        return self._metrics_ring.records()[0]
+
+    def get_latency_stats(self, window_seconds: float = 60.0) -> list:
+        """Per (tool, method): count, errors, error_rate and latency_ms
+        percentiles over the last `window_seconds` (max 300). See histograms.py."""
+        return self._latency.summary(time.perf_counter(), window_seconds)
+
+    def _bind_metric(self, tool: str, method: str):
+        """The per-(tool, method) recorder ToolProxy calls after every call."""
+        return self._metrics_ring.bind(tool, method, observe=self._latency.bind(tool, method))
+
+    def _bind_coalesced(self, tool: str, method: str):
+        """joined() for one (tool, method): counts a call single-flight served
+        from an identical in-flight call."""
+        count = self._latency.bind_coalesced(tool, method)
+        return lambda: count(time.perf_counter())
 
     def _emit_metric(self, tool: str, method: str, duration_ms: float, success: bool):
-        record = {
-            "tool": tool,
-            "method": method,
-            "duration_ms": round(duration_ms, 3),
-            "success": success,
-            "timestamp": time.time(),
-        }
-        self._metrics_buffer.append(record)
-        for sink in self._metrics_sinks:
+        end = time.perf_counter()
+        self._bind_metric(tool, method)(end - duration_ms / 1000, end, success)
+
+    def _schedule_drain(self):
+        # Until the drain runs, further writes need not schedule another.
+        self._metrics_ring.notify = None
+        try:
+            loop = asyncio.get_running_loop()
+            self._drain_loop = loop
+            loop.call_soon(self.flush_metrics)
+            return
+        except RuntimeError:
+            pass
+        # A sync tool call on a worker thread: hand the drain to the loop the
+        # sinks were last drained on, or drain right here when there is none.
+        loop = self._drain_loop
+        if loop is not None and not loop.is_closed():
             try:
-                sink(record)
-            except Exception as e:
-                print(f"[Container] Metrics sink error: {e}")
+                loop.call_soon_threadsafe(self.flush_metrics)
+                return
+            except RuntimeError:
+                pass
+        self.flush_metrics()
+
+    def flush_metrics(self):
+        """Deliver every record not yet seen by the sinks, now."""
+        if self._metrics_sinks:
+            self._metrics_ring.notify = self._schedule_drain
+        with self._drain_lock:
+            ring = self._metrics_ring
+            lost = ring.head - ring.capacity - self._sink_cursor
+            if lost > 0:
+                if not self.sink_records_lost:
+                    print(f"[Container] ⚠️ Metrics sinks fell more than {ring.capacity} calls behind "
+                          f"(the loop never yielded) — the oldest records were not delivered.")
+                self.sink_records_lost += lost
+            records, self._sink_cursor = ring.records(self._sink_cursor)
+        for record in records:
+            for sink in self._metrics_sinks:
+                try:
+                    sink(record)
+                except Exception as e:
+                    print(f"[Container] Metrics sink error: {e}")
 
     # ── Spans ─────────────────────────────────────────────────────────────────
 
@@ -183,9 +545,10 @@ class Container:
         self._span_factory = factory
 
     def _get_span_cm(self, tool: str, method: str):
+        """The span for one call, or None when no factory is registered."""
         if self._span_factory:
             return self._span_factory(tool, method)
-        return contextlib.nullcontext()
+        return None
 
     def get_raw_tools(self) -> list:
         """Return raw tool instances bypassing proxies.
@@ -194,6 +557,11 @@ class Container:
         with self._lock:
             return [proxy._tool for proxy in self._tools.values()]
 
+    def get_raw_tool(self, name: str):
+        """One tool's raw instance, bypassing its proxy — for the Kernel's own
+        lifecycle calls, which are not tool usage and must not be metered."""
+        return self.get(name)._tool
+
     # ── Registration ──────────────────────────────────────────────────────────
 
     def register(self, tool):
@@ -203,7 +571,11 @@ class Container:
             if hasattr(tool, '_set_container'):
                 tool._set_container(self)
             self._tools[tool.name] = ToolProxy(
-                tool, self.registry, self._emit_metric, self._get_span_cm
+                tool, self.registry, self._emit_metric, self._get_span_cm,
+                bind_metric=self._bind_metric,
+                circuit_breaker=getattr(tool, "circuit_breaker", None) or policy_from_env(tool.name),
+                single_flight=set(getattr(tool, "single_flight", ())) | methods_from_env(tool.name),
+                bind_coalesced=self._bind_coalesced,
             )
         print(f"[Container] Tool registered (Proxied): {tool.name}")
 
@@ -1,6 +1,27 @@
+import time
 import contextvars
 
 # Core Context variables for causality and identity tracking
 # These are neutral to both Tools and Plugins.
 current_event_id_var = contextvars.ContextVar("current_event_id", default=None)
 current_identity_var = contextvars.ContextVar("current_identity", default="system")
+
+# Time budget of the work in progress: an absolute wall-clock deadline
+# (time.time() seconds), or None when there is no budget. Wall clock, not
+# monotonic, so it means the same thing after an RPC hop to another process.
+# Seeded by the HTTP pipeline, carried by EventBusTool.request(), enforced by
+# ToolProxy.
+current_deadline_var = contextvars.ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """The current deadline passed: the work was abandoned (or never started)
+    because whoever asked for it has stopped waiting."""
+
+
+def time_remaining():
+    """Seconds left before the current deadline (<= 0 once passed), or None."""
+    deadline = current_deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
@@ -0,0 +1,158 @@
+"""
+Discovery manifest — what the last full scan found, so the next boot can skip it.
+
+Every boot used to walk `tools/` and `domains/`, import every `*_tool.py` and
+`*_plugin.py`, and run `inspect.getmembers` over each module to find its
+classes. With a few hundred plugins that walk IS the cold start. The manifest
+records the result of one full scan, per scanned directory:
+
+    files: relative path → mtime_ns, size, module, domain, and each class
+           found (name, constructor dependencies, tool name once booted)
+    dirs:  relative path → mtime_ns of every directory in the tree
+
+A recorded scan is FRESH when every directory and every file still has the
+stat it had. That check is one `os.stat` per entry and no listing: creating,
+deleting or renaming a file changes its parent directory's mtime, and editing
+one changes its own. Anything else — a missing manifest, a different format
+version, a single mismatched stat — is STALE, and the Kernel does the full
+scan and rewrites the section. There is no partial refresh: a stale manifest
+costs exactly one ordinary boot.
+
+Two things are never cached, so the cache can only ever be out of date, not
+wrong: a scan in which any import failed (the failed file's classes are
+unknown, and a boot error must keep being reported until it is fixed), and
+anything that is not a class the scan itself found.
+
+Location: MICROCOREOS_DISCOVERY_CACHE (default `.microcoreos/discovery.json`);
+a relative path is resolved against the project root, never the CWD of the
+moment, so every worker of `run --workers N` reads and writes the same file.
+Each writer replaces it atomically from its own temp file. Set it to `off` to
+always scan. A manifest that cannot be written (read-only image) is reported
+once and boot goes on.
+"""
+
+import os
+import json
+
+MANIFEST_VERSION = 1
+DEFAULT_PATH = os.path.join(".microcoreos", "discovery.json")
+
+
+def manifest_path_from_env(root: str) -> str | None:
+    """The manifest file (absolute), or None when caching is switched off."""
+    raw = os.getenv("MICROCOREOS_DISCOVERY_CACHE", DEFAULT_PATH).strip()
+    if raw.lower() in ("", "off", "false", "0", "none"):
+        return None
+    return os.path.abspath(os.path.join(root, raw))
+
+
+def _stat_key(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DiscoveryManifest:
+    """One JSON file; one section per (scanned directory, suffix)."""
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self._sections: dict[str, dict] = {}
+        self._loaded = False
+        self._dirty = False
+        self._write_failed = False
+
+    @staticmethod
+    def section_key(abs_dir: str, suffix: str) -> str:
+        return f"{abs_dir}|{suffix}"
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self._sections = data.get("sections", {})
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def fresh_entries(self, abs_dir: str, suffix: str) -> list[dict] | None:
+        """The recorded file entries (scan order) if still valid, else None."""
+        if not self.path:
+            return None
+        self._load()
+        section = self._sections.get(self.section_key(abs_dir, suffix))
+        if not section:
+            return None
+        for rel, recorded in section["dirs"].items():
+            stat = _stat_key(os.path.join(abs_dir, rel))
+            if stat is None or stat[0] != recorded:
+                return None
+        for entry in section["files"]:
+            stat = _stat_key(os.path.join(abs_dir, entry["path"]))
+            if stat is None or [stat[0], stat[1]] != [entry["mtime_ns"], entry["size"]]:
+                return None
+        return section["files"]
+
+    def module_for_tool(self, abs_dir: str, suffix: str, tool_name: str) -> tuple[str, str] | None:
+        """(module, class) of the tool registered as `tool_name`, when fresh and known."""
+        for entry in self.fresh_entries(abs_dir, suffix) or []:
+            for cls in entry["classes"]:
+                if cls.get("tool_name") == tool_name:
+                    return entry["module"], cls["name"]
+        return None
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def record(self, abs_dir: str, suffix: str, dirs: list[str], files: list[dict]) -> None:
+        """Replace one section with the result of a full, error-free scan."""
+        if not self.path:
+            return
+        self._load()
+        dir_stats = {}
+        for rel in dirs:
+            stat = _stat_key(os.path.join(abs_dir, rel))
+            if stat is None:
+                return
+            dir_stats[rel] = stat[0]
+        for entry in files:
+            stat = _stat_key(os.path.join(abs_dir, entry["path"]))
+            if stat is None:
+                return
+            entry["mtime_ns"], entry["size"] = stat
+        self._sections[self.section_key(abs_dir, suffix)] = {"dirs": dir_stats, "files": files}
+        self._dirty = True
+
+    def note_tool_name(self, module: str, class_name: str, tool_name: str) -> None:
+        """Remember which injection name a tool class registers under."""
+        self._load()
+        for section in self._sections.values():
+            for entry in section["files"]:
+                if entry["module"] != module:
+                    continue
+                for cls in entry["classes"]:
+                    if cls["name"] == class_name and cls.get("tool_name") != tool_name:
+                        cls["tool_name"] = tool_name
+                        self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty or self._write_failed:
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"   # concurrent workers: one temp file each
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "sections": self._sections}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            self._write_failed = True
+            print(f"[Kernel] ⚠️ Discovery manifest not written ({e}) — every boot will scan.")
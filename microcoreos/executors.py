@@ -0,0 +1,231 @@
+"""
+Executor pools — named, sized thread pools for all sync work (bulkheads).
+
+Sync plugin handlers, sync bus subscribers, sync lifecycle hooks, the SQLite
+event bus driver and bcrypt all used to share ONE thread pool. A single slow
+sync plugin (the chaos domain's StressPlugin sleeps 5s per request) could hold
+every thread and stall everything else that needed one — a login waiting for
+bcrypt behind a report export.
+
+Now each kind of sync work runs in a pool of its own:
+
+    domain.<name>   a plugin's sync handlers, subscribers and hooks — one pool
+                    per domain, unless the plugin names its own:
+                        class ReportPlugin(BasePlugin):
+                            executor_pool = "reports"
+    http            auth validators and WebSocket callbacks
+    event_bus       event bus transport I/O (the SQLite driver)
+    auth            password hashing
+    kernel          sync work with no owning plugin
+    default         everything else
+
+A pool is created on first use and starts threads only as work arrives. Its
+size is its bulkhead: a saturated pool queues ITS OWN work, and every other
+pool keeps its threads. Sizes come from MICROCOREOS_POOLS:
+
+    MICROCOREOS_POOLS=domain.chaos=2,auth=4,*=16    (`*`: every other pool)
+
+Defaults divide ONE thread budget, MICROCOREOS_THREAD_BUDGET (default
+min(32, cpu_count + 4), what the shared pool had). The process-wide pools
+above (http, event_bus, auth, kernel, default) may each use all of it; every
+other pool — a domain's, a plugin's own, a tool's — gets an eighth (at least
+2). Sixteen busy domains then add up to about twice the budget, not sixteen
+times it.
+
+Every pool reports queue depth, busy threads, and how long work WAITED for a
+thread vs how long it RAN (stats()) — saturation shows up as wait time long
+before it shows up as latency somewhere else.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from microcoreos.instrumentation import cpu_charge
+from microcoreos.context import current_identity_var
+from microcoreos.histograms import LatencyHistograms
+
+DEFAULT_BUDGET = min(32, (os.cpu_count() or 1) + 4)
+BUDGET_SHARE = 8
+PROCESS_POOLS = frozenset({"http", "event_bus", "auth", "kernel", "default"})
+
+
+def _budget_from_env() -> int:
+    raw = os.getenv("MICROCOREOS_THREAD_BUDGET", "").strip()
+    if not raw:
+        return DEFAULT_BUDGET
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        print(f"[Executors] ⚠️ Ignoring MICROCOREOS_THREAD_BUDGET={raw!r}: must be an integer.")
+        return DEFAULT_BUDGET
+
+
+def default_size(name: str, budget: int) -> int:
+    """A pool's size when MICROCOREOS_POOLS does not name it."""
+    if name in PROCESS_POOLS:
+        return budget
+    return min(budget, max(2, budget // BUDGET_SHARE))
+
+
+def _sizes_from_env() -> dict[str, int]:
+    sizes = {}
+    for entry in os.getenv("MICROCOREOS_POOLS", "").split(","):
+        name, _, size = entry.strip().partition("=")
+        if not name or not size.strip():
+            continue
+        try:
+            sizes[name.strip()] = max(1, int(size))
+        except ValueError:
+            print(f"[Executors] ⚠️ Ignoring MICROCOREOS_POOLS entry '{entry.strip()}': size must be an integer.")
+    return sizes
+
+
+class Pool:
+    """One named thread pool and its counters."""
+
+    def __init__(self, name: str, size: int, timings: LatencyHistograms):
+        self.name = name
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"pool-{name}")
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self._observe_wait = timings.bind(name, "wait")
+        self._observe_run = timings.bind(name, "run")
+
+    @property
+    def queued(self) -> int:
+        return self.submitted - self.started
+
+    @property
+    def active(self) -> int:
+        return self.started - self.completed
+
+    def run(self, func, *args, **kwargs) -> asyncio.Future:
+        """Run `func(*args, **kwargs)` on this pool, in a copy of the caller's
+        context (event id, identity and deadline ride along, as with to_thread)."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        queued_at = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+        future = self._executor.submit(pool_work, self, context, queued_at, func, args, kwargs)
+        future.add_done_callback(self._forget_if_cancelled)
+        return asyncio.wrap_future(future, loop=loop)
+
+    def _forget_if_cancelled(self, future) -> None:
+        # Cancelled while still queued (its awaiter gave up, or shutdown): it
+        # will never start, so it must not count as queued forever.
+        if future.cancelled():
+            with self._lock:
+                self.submitted -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def pool_work(pool: Pool, context, queued_at: float, func, args, kwargs):
+    """What a pool thread runs for each piece of work: `func` in the caller's
+    `context`, timed. A frame of this function on a thread's stack is pool
+    work, and its `context` local says whose (the profiler reads it there)."""
+    started_at = time.perf_counter()
+    with pool._lock:
+        pool.started += 1
+    pool._observe_wait((started_at - queued_at) * 1000, started_at, True)
+    ok = False
+    charge = cpu_charge()   # resource accounting, when the system tool turned it on
+    cpu_before = time.thread_time() if charge is not None else 0.0
+    try:
+        result = context.run(func, *args, **kwargs)
+        ok = True
+        return result
+    finally:
+        if charge is not None:
+            charge(context.get(current_identity_var), time.thread_time() - cpu_before)
+        ended_at = time.perf_counter()
+        with pool._lock:
+            pool.completed += 1
+        pool._observe_run((ended_at - started_at) * 1000, ended_at, ok)
+
+
+class ExecutorPools:
+    """The process's named pools."""
+
+    def __init__(self):
+        self._pools: dict[str, Pool] = {}
+        self._lock = threading.Lock()
+        self._sizes = _sizes_from_env()
+        self._budget = _budget_from_env()
+        self._timings = LatencyHistograms()
+
+    def get(self, name: str) -> Pool:
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(name)
+                if pool is None:
+                    size = (self._sizes.get(name) or self._sizes.get("*")
+                            or default_size(name, self._budget))
+                    pool = self._pools[name] = Pool(name, size, self._timings)
+        return pool
+
+    def stats(self, window_seconds: float = 60.0) -> list[dict]:
+        """Per pool: size, active, queued, completed, and wait_ms / run_ms
+        percentiles over the last `window_seconds` (max 300)."""
+        timings = {(s["tool"], s["method"]): s for s in self._timings.summary(time.perf_counter(), window_seconds)}
+        out = []
+        for name, pool in sorted(self._pools.items()):
+            wait, run = timings.get((name, "wait")), timings.get((name, "run"))
+            out.append({
+                "pool": name,
+                "size": pool.size,
+                "active": pool.active,
+                "queued": pool.queued,
+                "completed": pool.completed,
+                "errors": run["errors"] if run else 0,
+                "wait_ms": wait["latency_ms"] if wait else {},
+                "run_ms": run["latency_ms"] if run else {},
+            })
+        return out
+
+    def shutdown(self) -> None:
+        """Stop every pool; queued work is cancelled. Pools are recreated on next use."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+            self._sizes = _sizes_from_env()
+            self._budget = _budget_from_env()
+        for pool in pools.values():
+            pool.shutdown()
+
+
+executors = ExecutorPools()
+
+
+def pool_for(func, fallback: str = "default") -> str:
+    """The pool a callable's sync work belongs to: its plugin's declared
+    `executor_pool`, else its plugin's domain pool, else `fallback`."""
+    owner = getattr(func, "__self__", None)
+    if owner is None:
+        return fallback
+    declared = getattr(owner, "executor_pool", None)
+    if declared:
+        return declared
+    identity = getattr(owner, "_identity", None)
+    if identity and "." in identity:
+        return "domain." + identity.split(".", 1)[0]
+    return fallback
+
+
+def executor_stats(window_seconds: float = 60.0) -> list[dict]:
+    """ExecutorPools.stats() for this process's pools."""
+    return executors.stats(window_seconds)
+
+
+async def run_sync(pool: str, func, /, *args, **kwargs):
+    """`await asyncio.to_thread(func, ...)`, on the named pool."""
+    return await executors.get(pool).run(func, *args, **kwargs)
@@ -0,0 +1,197 @@
+"""
+Latency histograms — p50/p99 per (tool, method) over the last minutes, in
+bounded memory.
+
+The metrics ring (container.MetricsRing) holds the last 1000 calls: under real
+load that is the last fraction of a second, and it cannot answer "what is
+db.query's p99 over the last 5 minutes". These histograms can. Every call
+ToolProxy times is also counted here, in two series per (tool, method) — one
+for successes, one for failures — each cut into fixed time slots.
+
+Buckets are log-scaled: SUB_BUCKETS per power of two, so any reported
+percentile is within ~1/(2·SUB_BUCKETS) (≈6%) of the true value, from
+nanoseconds to hours, with no configured range. A slot only stores the buckets
+it saw, so memory is bounded by
+
+    (tool, method) pairs × 2 × SLOTS × buckets actually hit (≤ ~400)
+
+— the tool surface, never the call rate. Old slots fall out of a fixed-length
+deque; nothing grows with traffic.
+
+Counting happens on the call path (pre-bound per (tool, method) like the ring
+writer), so it never falls behind the way a sampled or drained feed can. Two
+threads bumping the same bucket at the same instant can lose one count — a
+metric, not a ledger.
+"""
+
+import math
+import threading
+from collections import deque
+
+# Log-bucket resolution: buckets per power of two.
+SUB_BUCKETS = 8
+# Time slots: SLOT_SECONDS each, SLOTS of them → the longest window answerable.
+SLOT_SECONDS = 10.0
+SLOTS = 30
+MAX_WINDOW_SECONDS = SLOT_SECONDS * SLOTS
+
+PERCENTILES = (50, 90, 95, 99)
+
+_ZERO_BUCKET = -(1 << 30)
+
+
+def bucket_of(duration_ms: float) -> int:
+    if duration_ms <= 0:
+        return _ZERO_BUCKET
+    mantissa, exponent = math.frexp(duration_ms)   # duration = m·2^e, m in [0.5, 1)
+    return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def bucket_value(bucket: int) -> float:
+    """The midpoint of a bucket, in ms — what a percentile in it reports."""
+    if bucket == _ZERO_BUCKET:
+        return 0.0
+    exponent, sub = divmod(bucket, SUB_BUCKETS)
+    low = math.ldexp(0.5 + sub / (2 * SUB_BUCKETS), exponent)
+    high = math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+    return (low + high) / 2
+
+
+class _Series:
+    """One (tool, method, success) series: the current slot plus the last SLOTS."""
+
+    __slots__ = ("epoch", "counts", "history")
+
+    def __init__(self):
+        self.epoch = None
+        self.counts = {}
+        self.history = deque(maxlen=SLOTS)
+
+    def rotate(self, epoch: int) -> None:
+        if self.counts:
+            self.history.append((self.epoch, self.counts))
+        self.epoch = epoch
+        self.counts = {}
+
+    def merged(self, since_epoch: int, into: dict) -> None:
+        slots = list(self.history) + [(self.epoch, self.counts)]
+        for epoch, counts in slots:
+            if epoch is not None and epoch >= since_epoch:
+                for bucket, n in list(counts.items()):
+                    into[bucket] = into.get(bucket, 0) + n
+
+
+class LatencyHistograms:
+    """Per-(tool, method) sliding-window latency histograms."""
+
+    def __init__(self):
+        self._series: dict[tuple[str, str], tuple[_Series, _Series]] = {}
+        self._coalesced: dict[tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, tool: str, method: str):
+        """observe(duration_ms, now, success) for one (tool, method).
+
+        `now` is any monotonic clock in seconds — the proxy passes the
+        perf_counter reading it already took, so counting costs no clock read.
+        """
+        key = (tool, method)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = (_Series(), _Series())
+            ok, failed = self._series[key]
+
+        frexp = math.frexp
+
+        def observe(duration_ms: float, now: float, success: bool) -> None:
+            series = ok if success else failed
+            epoch = int(now // SLOT_SECONDS)
+            if series.epoch != epoch:
+                series.rotate(epoch)
+            if duration_ms > 0:   # bucket_of(), inlined: this runs on every tool call
+                mantissa, exponent = frexp(duration_ms)
+                bucket = exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+            else:
+                bucket = _ZERO_BUCKET
+            counts = series.counts
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+        return observe
+
+    def bind_coalesced(self, tool: str, method: str):
+        """count(now) for one (tool, method): a call that joined an identical
+        in-flight call instead of reaching the tool (see single_flight.py)."""
+        key = (tool, method)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = (_Series(), _Series())
+            if key not in self._coalesced:
+                self._coalesced[key] = _Series()
+            series = self._coalesced[key]
+
+        def count(now: float) -> None:
+            epoch = int(now // SLOT_SECONDS)
+            if series.epoch != epoch:
+                series.rotate(epoch)
+            series.counts[0] = series.counts.get(0, 0) + 1
+
+        return count
+
+    def summary(self, now: float, window_seconds: float = 60.0) -> list[dict]:
+        """Counts, error rate and latency percentiles per (tool, method).
+
+        The window is rounded up to whole slots and capped at
+        MAX_WINDOW_SECONDS. Percentiles cover every call, failed or not;
+        `errors` tells them apart. Pairs with no call in the window are omitted.
+        `coalesced` counts the calls served by joining an identical in-flight
+        call; `coalesce_ratio` is their share of all calls made — the backend
+        load single-flight saved.
+        """
+        window_seconds = min(max(window_seconds, SLOT_SECONDS), MAX_WINDOW_SECONDS)
+        since_epoch = int(now // SLOT_SECONDS) - math.ceil(window_seconds / SLOT_SECONDS) + 1
+        with self._lock:
+            series = list(self._series.items())
+            coalesced_series = dict(self._coalesced)
+
+        out = []
+        for (tool, method), (ok, failed) in series:
+            ok_counts, failed_counts, joined_counts = {}, {}, {}
+            ok.merged(since_epoch, ok_counts)
+            failed.merged(since_epoch, failed_counts)
+            successes, errors = sum(ok_counts.values()), sum(failed_counts.values())
+            count = successes + errors
+            if not count:
+                continue
+            if (tool, method) in coalesced_series:
+                coalesced_series[(tool, method)].merged(since_epoch, joined_counts)
+            coalesced = joined_counts.get(0, 0)
+            merged = dict(ok_counts)
+            for bucket, n in failed_counts.items():
+                merged[bucket] = merged.get(bucket, 0) + n
+            out.append({
+                "tool": tool,
+                "method": method,
+                "count": count,
+                "errors": errors,
+                "error_rate": round(errors / count, 4),
+                "latency_ms": _percentiles(merged, count),
+                "coalesced": coalesced,
+                "coalesce_ratio": round(coalesced / (count + coalesced), 4),
+            })
+        out.sort(key=lambda r: (r["tool"], r["method"]))
+        return out
+
+
+def _percentiles(counts: dict, total: int) -> dict:
+    ordered = sorted(counts.items())
+    result = {}
+    targets = [(p, math.ceil(total * p / 100)) for p in PERCENTILES]
+    seen = 0
+    i = 0
+    for bucket, n in ordered:
+        seen += n
+        while i < len(targets) and seen >= targets[i][1]:
+            result[f"p{targets[i][0]}"] = round(bucket_value(bucket), 3)
+            i += 1
+    result["max"] = round(bucket_value(ordered[-1][0]), 3)
+    return result
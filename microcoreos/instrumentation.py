@@ -0,0 +1,72 @@
+"""
+Instrumentation seams — where optional observability plugs into the kernel.
+
+The kernel measures nothing on its own beyond ToolProxy's metrics. Resource
+accounting, memory inspection, the loop monitor and the profiler live in the
+system tool (tools/system/) and cost nothing unless it turns them on. What
+they need from the hot paths is here, and until something is installed every
+seam is a single global read:
+
+- metered(awaitable): the HTTP pipeline, bus delivery and on_boot await each
+  handler through it. Without a meter it returns `awaitable` itself.
+- cpu_charge(): the callable a pool thread reports (identity, CPU seconds) to
+  after each piece of sync work, or None — the pools then skip the clock.
+- track_sizes(name, fn): growable containers register a `() -> {name: int}`
+  reporting their sizes; tracked_sizes() reads them all. A bound method is
+  held weakly: tracking never keeps a tool alive, and the latest
+  registration under a name wins.
+
+Same pattern as Container.register_span_factory: the feature lives in a
+tool, the kernel only knows there may be a callable to call.
+"""
+
+import threading
+import weakref
+
+_meter = None
+_charge = None
+
+_sizes_lock = threading.Lock()
+_sizes: dict = {}
+
+
+def install_meter(meter, charge) -> None:
+    """meter(awaitable) -> awaitable, and charge(identity, cpu_seconds).
+    install_meter(None, None) takes them out again."""
+    global _meter, _charge
+    _meter, _charge = meter, charge
+
+
+def metered(awaitable):
+    """`await metered(handler(...))` — measured when a meter is installed."""
+    meter = _meter
+    return awaitable if meter is None else meter(awaitable)
+
+
+def cpu_charge():
+    return _charge
+
+
+def track_sizes(name: str, sizes) -> None:
+    ref = weakref.WeakMethod(sizes) if hasattr(sizes, "__self__") else (lambda: sizes)
+    with _sizes_lock:
+        _sizes[name] = ref
+
+
+def tracked_sizes() -> dict:
+    """{name: sizes()} for every live registration; a failing one reports its error."""
+    with _sizes_lock:
+        tracked = list(_sizes.items())
+    out = {}
+    for name, ref in tracked:
+        fn = ref()
+        if fn is None:
+            with _sizes_lock:
+                if _sizes.get(name) is ref:
+                    del _sizes[name]
+            continue
+        try:
+            out[name] = fn()
+        except Exception as e:
+            out[name] = {"error": str(e)}
+    return dict(sorted(out.items()))
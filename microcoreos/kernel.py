@@ -1,4 +1,5 @@
 import os
+import time
 import importlib
 import inspect
 import asyncio
@@ -6,11 +7,20 @@ from microcoreos.container import Container
 from microcoreos.base_tool import BaseTool
 from microcoreos.base_plugin import BasePlugin
 from microcoreos.context import current_identity_var
+from microcoreos.discovery import DiscoveryManifest, manifest_path_from_env
+from microcoreos.executors import executors, pool_for, run_sync
+from microcoreos.instrumentation import metered
+from microcoreos.offload import process_offload
 
 class Kernel:
     def __init__(self):
         self.container = Container()
         self.plugins = {}
+        # The project root: tools/ and domains/ are scanned here (the CLI puts
+        # it on sys.path), and the discovery manifest lives under it.
+        self.root = os.getcwd()
+        self.discovery = DiscoveryManifest(manifest_path_from_env(self.root))
+        self._import_ms = {}   # module name → ms spent importing it this process
 
     async def _call_maybe_async(self, func, *args, **kwargs):
         """
@@ -21,8 +31,8 @@ class Kernel:
         if inspect.iscoroutinefunction(func):
             return await func(*args, **kwargs)
         
-        # Call it (possibly in thread)
-        res = await asyncio.to_thread(func, *args, **kwargs)
+        # Call it in a thread of its plugin's pool (see executors.py)
+        res = await run_sync(pool_for(func, "kernel"), func, *args, **kwargs)
         
         # Handle cases where a sync func returns a coroutine (rare but possible with wrappers)
         if inspect.iscoroutine(res):
@@ -61,8 +71,19 @@ class Kernel:
             return found_classes
         package = rel_dir.replace(os.sep, ".").strip(".")
 
+        # Fast path: the manifest of the last full scan still matches the tree.
+        entries = self.discovery.fresh_entries(abs_dir, suffix)
+        if entries is not None:
+            cached = self._load_from_manifest(entries, base_class)
+            if cached is not None:
+                return cached
+
         is_domains_dir = os.path.basename(abs_dir) == "domains"
-        for root, _, files in os.walk(abs_dir):
+        scanned_dirs, scanned_files, clean = [], [], True
+        for root, dirs, files in os.walk(abs_dir):
+            # Bytecode caches hold no source; their mtimes move on every import.
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            scanned_dirs.append(os.path.relpath(root, abs_dir))
             for file in sorted(files):
                 if not file.endswith(suffix):
                     continue
@@ -72,21 +93,65 @@ class Kernel:
                 module_name = f"{package}.{relative[:-3].replace(os.sep, '.')}"
 
                 try:
-                    module = importlib.import_module(module_name)
+                    module = self._timed_import(module_name)
 
                     domain_name = None
                     if is_domains_dir:
                         domain_name = relative.split(os.sep)[0]
 
+                    classes = []
                     for _, obj in inspect.getmembers(module):
                         if inspect.isclass(obj) and issubclass(obj, base_class) and obj is not base_class:
                             if obj.__module__ == module.__name__:
                                 found_classes.append((obj, domain_name))
+                                classes.append({"name": obj.__name__, "deps": self._constructor_dependencies(obj)})
+                    scanned_files.append({"path": relative, "module": module_name,
+                                          "domain": domain_name, "classes": classes})
 
                 except Exception as e:
+                    clean = False
                     print(f"[Kernel] 🔥 Error loading file {path}: {e}")
+
+        # A scan with an import error is never recorded: the next boot must
+        # retry the file and report the error again until it is fixed.
+        if clean:
+            self.discovery.record(abs_dir, suffix, scanned_dirs, scanned_files)
+            self.discovery.save()
+        return found_classes
+
+    def _load_from_manifest(self, entries, base_class):
+        """Imports only the recorded modules that define classes; None → rescan."""
+        found_classes = []
+        for entry in entries:
+            if not entry["classes"]:
+                continue
+            try:
+                module = self._timed_import(entry["module"])
+                for cls in entry["classes"]:
+                    obj = getattr(module, cls["name"])
+                    if not (inspect.isclass(obj) and issubclass(obj, base_class)):
+                        return None
+                    found_classes.append((obj, entry["domain"]))
+            except Exception:
+                return None
         return found_classes
 
+    def _timed_import(self, module_name):
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        self._import_ms.setdefault(module_name, (time.perf_counter() - start) * 1000)
+        return module
+
+    @staticmethod
+    def _constructor_dependencies(cls):
+        """[(name, required)] for the manifest — what _resolve_plugin_dependencies will ask for."""
+        try:
+            params = inspect.signature(cls.__init__).parameters.items()
+        except (TypeError, ValueError):
+            return []
+        return [[name, p.default == inspect.Parameter.empty]
+                for name, p in params if name not in ("self", "args", "kwargs")]
+
     def _resolve_plugin_dependencies(self, plugin_cls):
         """Resolves dependencies for a plugin using type hints."""
         sig = inspect.signature(plugin_cls.__init__)
@@ -110,6 +175,9 @@ class Kernel:
 
     async def boot(self):
         print("--- [Kernel] Starting System (Async Engine) ---")
+        registry = self.container.registry
+        boot_start = time.perf_counter()
+        stages = {}
 
         # 1. Boot Tools — parallel (tools are independent by Rule 2, so setup() is safe to parallelize)
         async def _setup_tool(tool_cls):
@@ -117,35 +185,51 @@ class Kernel:
             try:
                 instance = tool_cls()
                 t_name = instance.name
+                registry.record_boot_timing("tools", t_name, "import", self._import_ms.get(tool_cls.__module__, 0.0))
+                start = time.perf_counter()
                 await self._call_maybe_async(instance.setup)
+                registry.record_boot_timing("tools", t_name, "setup", (time.perf_counter() - start) * 1000)
+                self.discovery.note_tool_name(tool_cls.__module__, tool_cls.__name__, t_name)
                 self.container.register(instance)
-                self.container.registry.register_tool(t_name, "OK")
+                registry.register_tool(t_name, "OK")
                 print(f"[Kernel] Tool ready: {t_name}")
             except Exception as e:
-                self.container.registry.register_tool(t_name, "FAIL", str(e))
+                registry.register_tool(t_name, "FAIL", str(e))
                 print(f"[Kernel] 🚨 Tool '{t_name}' failed: {e}")
 
+        stage_start = time.perf_counter()
         tool_classes = self._load_modules_from_dir("tools", BaseTool, "_tool.py")
+        stages["discovery"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
         await asyncio.gather(*[asyncio.create_task(_setup_tool(cls)) for cls, _ in tool_classes])
+        self.discovery.save()   # tool names learned this boot → boot_tool's fast path
+        stages["setup"] = (time.perf_counter() - stage_start) * 1000
 
         # 2. Boot Plugins
+        stage_start = time.perf_counter()
+        plugin_classes = self._load_modules_from_dir("domains", BasePlugin, "_plugin.py")
+        stages["discovery"] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
         boot_tasks = []
-        for plugin_cls, domain in self._load_modules_from_dir("domains", BasePlugin, "_plugin.py"):
+        for plugin_cls, domain in plugin_classes:
             class_name = plugin_cls.__name__
             p_name = f"{domain}.{class_name}" if domain else class_name
             try:
                 deps, missing = self._resolve_plugin_dependencies(plugin_cls)
                 
-                self.container.registry.register_plugin(p_name, {
+                registry.register_plugin(p_name, {
                     "dependencies": list(deps.keys()),
                     "domain": domain,
                     "class": class_name
                 })
+                registry.record_boot_timing("plugins", p_name, "import", self._import_ms.get(plugin_cls.__module__, 0.0))
 
                 if missing:
                     err = f"Missing tools: {', '.join(missing)}"
                     print(f"[Kernel] 🚨 Plugin {p_name} aborted: {err}")
-                    self.container.registry.update_plugin_status(p_name, "DEAD", err)
+                    registry.update_plugin_status(p_name, "DEAD", err)
                     continue
 
                 instance = plugin_cls(**deps)
@@ -153,38 +237,142 @@ class Kernel:
                 # plugin exactly like the registry does ("domain.ClassName").
                 instance._identity = p_name
                 self.plugins[p_name] = instance
-                self.container.registry.update_plugin_status(p_name, "RUNNING")
+                registry.update_plugin_status(p_name, "RUNNING")
 
                 async def _start(p_inst, name):
                     token = current_identity_var.set(f"{name}.on_boot")
+                    start = time.perf_counter()
                     try:
-                        await self._call_maybe_async(p_inst.on_boot)
+                        await metered(self._call_maybe_async(p_inst.on_boot))
                         print(f"[Kernel] Plugin ready: {name}")
-                        self.container.registry.update_plugin_status(name, "READY")
+                        registry.update_plugin_status(name, "READY")
                     except Exception as ex:
                         print(f"[Kernel] ⚠️ Failure in {name}: {repr(ex)}")
-                        self.container.registry.update_plugin_status(name, "DEAD", str(ex))
+                        registry.update_plugin_status(name, "DEAD", str(ex))
                     finally:
+                        registry.record_boot_timing("plugins", name, "on_boot", (time.perf_counter() - start) * 1000)
                         current_identity_var.reset(token)
 
                 boot_tasks.append(asyncio.create_task(_start(instance, p_name)))
                 
             except Exception as e:
                 print(f"[Kernel] ⚠️ Initialization error in {p_name}: {e}")
-                self.container.registry.update_plugin_status(p_name, "DEAD", str(e))
+                registry.update_plugin_status(p_name, "DEAD", str(e))
 
         # Wait for all plugins to finish booting
         if boot_tasks:
             await asyncio.gather(*boot_tasks)
+        stages["on_boot"] = (time.perf_counter() - stage_start) * 1000
 
         # 3. Finalize
-        for name in self.container.list_tools():
+        stage_start = time.perf_counter()
+        chain = await self._run_boot_complete()
+        stages["on_boot_complete"] = (time.perf_counter() - stage_start) * 1000
+
+        self._publish_boot_profile((time.perf_counter() - boot_start) * 1000, stages, chain)
+        print("--- [Kernel] System Ready ---")
+
+    async def _run_boot_complete(self):
+        """Runs every tool's on_boot_complete, concurrently where allowed.
+
+        By default a tool's hook waits for the hooks of every tool registered
+        before it — the sequential `list_tools()` order tools have always
+        relied on. A tool that declares `boot_complete_after` opts out of that:
+        its hook starts once the hooks of the tools it names have finished
+        (names not registered are ignored). A cycle cannot be scheduled, so it
+        falls back to the sequential order with a warning. Returns the critical
+        chain: the tools, in order, whose hooks the last one to finish had to
+        wait for.
+        """
+        names = self.container.list_tools()
+        after = {}
+        for i, name in enumerate(names):
+            declared = getattr(self.container.get_raw_tool(name), "boot_complete_after", None)
+            if declared is None:
+                after[name] = names[:i]
+            else:
+                after[name] = [d for d in declared if d in names and d != name]
+
+        if self._has_cycle(after):
+            print("[Kernel] ⚠️ boot_complete_after has a cycle — running on_boot_complete sequentially.")
+            after = {name: names[:i] for i, name in enumerate(names)}
+
+        registry = self.container.registry
+        finished_at, tasks = {}, {}
+        t0 = time.perf_counter()
+
+        async def _complete(name):
+            if after[name]:
+                await asyncio.gather(*[tasks[d] for d in after[name]])
+            start = time.perf_counter()
             try:
                 await self._call_maybe_async(self.container.get(name).on_boot_complete, self.container)
             except Exception as e:
                 print(f"[Kernel] Post-boot error in {name}: {e}")
+            finally:
+                registry.record_boot_timing("tools", name, "on_boot_complete", (time.perf_counter() - start) * 1000)
+                finished_at[name] = time.perf_counter() - t0
 
-        print("--- [Kernel] System Ready ---")
+        for name in names:
+            tasks[name] = asyncio.ensure_future(_complete(name))
+        if tasks:
+            await asyncio.gather(*tasks.values())
+
+        chain = []
+        current = max(finished_at, key=finished_at.get) if finished_at else None
+        while current:
+            chain.insert(0, current)
+            current = max(after[current], key=finished_at.get) if after[current] else None
+        return chain
+
+    @staticmethod
+    def _has_cycle(after):
+        state = {}   # name → 1 visiting, 2 done
+
+        def visit(name):
+            if state.get(name) == 1:
+                return True
+            if state.get(name) == 2:
+                return False
+            state[name] = 1
+            if any(visit(d) for d in after[name]):
+                return True
+            state[name] = 2
+            return False
+
+        return any(visit(name) for name in after)
+
+    def _publish_boot_profile(self, total_ms, stages, chain):
+        """Stores the boot profile in the registry and prints the critical path.
+
+        Tools set up in parallel and plugins boot in parallel, so each of those
+        stages lasts as long as its slowest member; on_boot_complete lasts as
+        long as its longest dependency chain. The critical path is those
+        members — the only ones worth making faster.
+        """
+        profile = self.container.registry.get_boot_profile()
+
+        def slowest(kind, phase):
+            timed = {n: t[phase] for n, t in profile[kind].items() if phase in t}
+            if not timed:
+                return []
+            name = max(timed, key=timed.get)
+            return [{"stage": phase, "name": name, "ms": timed[name]}]
+
+        critical = slowest("tools", "setup") + slowest("plugins", "on_boot")
+        critical += [{"stage": "on_boot_complete", "name": n,
+                      "ms": profile["tools"][n]["on_boot_complete"]} for n in chain]
+        self.container.registry.set_boot_summary({
+            "total_ms": round(total_ms, 3),
+            "stages": {k: round(v, 3) for k, v in stages.items()},
+            "critical_path": critical,
+        })
+
+        print(f"[Kernel] Boot profile: {total_ms:.0f}ms — " +
+              " · ".join(f"{k} {v:.0f}ms" for k, v in stages.items()))
+        if critical:
+            print("[Kernel] Critical path: " +
+                  " → ".join(f"{c['name']}.{c['stage']} {c['ms']:.0f}ms" for c in critical))
 
     async def boot_tool(self, tool_name: str):
         """Pipeline entry point: boot ONE tool in isolation, then exit.
@@ -195,7 +383,7 @@ class Kernel:
         tool and with which env vars is deployment configuration, not code.
         """
         print(f"--- [Kernel] Single-tool boot: '{tool_name}' ---")
-        for tool_cls, _ in self._load_modules_from_dir("tools", BaseTool, "_tool.py"):
+        for tool_cls in self._tool_candidates(tool_name):
             instance = tool_cls()
             if instance.name != tool_name:
                 continue
@@ -208,16 +396,104 @@ class Kernel:
             return
         raise RuntimeError(f"No tool named '{tool_name}' found.")
 
+    def _tool_candidates(self, tool_name):
+        """The one class a fresh manifest knows as `tool_name`, else every tool."""
+        if os.path.exists("tools"):
+            known = self.discovery.module_for_tool(os.path.abspath("tools"), "_tool.py", tool_name)
+            if known:
+                try:
+                    cls = getattr(importlib.import_module(known[0]), known[1])
+                    if inspect.isclass(cls) and issubclass(cls, BaseTool):
+                        return [cls]
+                except Exception:
+                    pass
+        return [cls for cls, _ in self._load_modules_from_dir("tools", BaseTool, "_tool.py")]
+
     async def shutdown(self):
+        """
+        Graceful stop, in three phases:
+
+        1. Drain: every tool's drain() at once, within ONE budget
+           (MICROCOREOS_DRAIN_TIMEOUT, default 10s). The http tool stops
+           accepting connections and lets in-flight requests finish; the bus
+           stops claiming broker messages and lets deliveries and publishes
+           in flight finish. Everything is still up while this runs.
+        2. Plugins: each plugin's shutdown(), one after another, as always.
+        3. Tools: every tool's shutdown() at once, except that a tool outlives
+           the tools naming it in `boot_complete_after` — they needed it to
+           boot, so they may need it to stop (telemetry closes last).
+
+        drain() and shutdown() are called on the raw tool instances, not
+        through their proxies: stopping is not tool usage, so it is neither
+        metered nor able to mark a tool DEAD or trip its circuit.
+
+        Each shutdown() gets MICROCOREOS_SHUTDOWN_TIMEOUT seconds (default 5):
+        a hung hook costs its own timeout, not the whole stop. A rolling deploy
+        needs the drain budget plus the slowest shutdown chain to fit in the
+        orchestrator's grace period (MICROCOREOS_WORKER_GRACE, 30s, under
+        `microcoreos run --workers N`).
+        """
         print("\n--- [Kernel] Shutting down ---")
+        drain_budget = _seconds_from_env("MICROCOREOS_DRAIN_TIMEOUT", 10.0)
+        hook_timeout = _seconds_from_env("MICROCOREOS_SHUTDOWN_TIMEOUT", 5.0)
+        names = self.container.list_tools()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            self._bounded(f"draining '{name}'", self.container.get_raw_tool(name).drain, drain_budget, drain_budget)
+            for name in names
+        ])
+        print(f"[Kernel] Drained in {(time.perf_counter() - start) * 1000:.0f}ms.")
+
         for name, instance in self.plugins.items():
-            try:
-                await self._call_maybe_async(instance.shutdown)
-            except Exception as e:
-                print(f"[Kernel] Error shutting down plugin '{name}': {e}")
-        for name in self.container.list_tools():
-            try:
-                await self._call_maybe_async(self.container.get(name).shutdown)
+            await self._bounded(f"shutting down plugin '{name}'", instance.shutdown, hook_timeout)
+
+        users = {name: [] for name in names}
+        for name in names:
+            for dep in getattr(self.container.get_raw_tool(name), "boot_complete_after", None) or ():
+                if dep in users and dep != name:
+                    users[dep].append(name)
+        if self._has_cycle(users):
+            print("[Kernel] ⚠️ boot_complete_after has a cycle — closing tools one at a time.")
+            users = {name: names[:i] for i, name in enumerate(names)}
+
+        tasks = {}
+
+        async def _close(name):
+            if users[name]:
+                await asyncio.gather(*[tasks[u] for u in users[name]])
+            if await self._bounded(f"closing '{name}'", self.container.get_raw_tool(name).shutdown, hook_timeout):
                 print(f"[Kernel] Tool '{name}' closed.")
-            except Exception as e:
-                print(f"[Kernel] Error closing '{name}': {e}")
\ No newline at end of file
+
+        for name in names:
+            tasks[name] = asyncio.ensure_future(_close(name))
+        if tasks:
+            await asyncio.gather(*tasks.values())
+        executors.shutdown()
+        process_offload.shutdown()
+
+    async def _bounded(self, what, hook, timeout, *args) -> bool:
+        """Runs a stop hook for at most `timeout` seconds. Never raises: one
+        failing hook must not keep the others from running."""
+        try:
+            await asyncio.wait_for(self._call_maybe_async(hook, *args), timeout)
+            return True
+        except asyncio.TimeoutError:
+            print(f"[Kernel] ⚠️ Gave up {what} after {timeout:g}s.")
+        except Exception as e:
+            print(f"[Kernel] Error {what}: {e}")
+        return False
+
+
+def _seconds_from_env(var: str, default: float) -> float:
+    raw = os.getenv(var)
+    if not raw:
+        return default
+    try:
+        seconds = float(raw)
+    except ValueError:
+        seconds = -1.0
+    if not 0 <= seconds < float("inf"):
+        print(f"[Kernel] ⚠️ Ignoring {var}={raw!r}: not a number of seconds.")
+        return default
+    return seconds
@@ -0,0 +1,180 @@
+"""
+Process offload — CPU-bound handlers on other cores.
+
+A thread pool (executors.py) keeps sync work off the event loop, but not off
+the GIL: a report renderer or image resizer running in a thread still holds
+every other thread of the process. Offloaded handlers run in a managed
+ProcessPoolExecutor instead, so one instance uses more than one core:
+
+    # domains/reports/plugins/render_plugin.py — module level, not a method  lint:no-path
+    def render_report(data: dict) -> dict:
+        return {"success": True, "data": heavy_cpu_work(data["rows"])}
+
+    self.http.add_endpoint("/reports", "POST", render_report, offload="process")
+    await self.bus.subscribe("image.uploaded", make_thumbnail, offload="process")
+
+The contract is narrower than a normal handler's, because the call crosses a
+process boundary:
+- The handler is a picklable MODULE-LEVEL function, not a bound method: a
+  plugin instance holds tools (connections, loops) that cannot be pickled.
+  Checked at registration, not at the first request.
+- HTTP: handler(data) -> dict. There is no HttpContext in the worker; the
+  usual `success: False` → 400 rule still applies to the result.
+- Bus: handler(payload) -> dict | None, the returned value becoming the RPC
+  reply as usual. It receives event.payload, not the envelope.
+- No tools in the worker: it computes, the plugin does the I/O.
+- Arguments and results are pickled. Top-level `bytes` values of at least
+  SHM_THRESHOLD bytes — in data/payload, or in the returned dict — travel
+  through shared memory instead of the pipe: one copy in, one copy out.
+
+Workers start once (forkserver where available, else spawn — never a plain
+fork of a threaded, event-looping process), and are warmed on the first
+registration so the first request does not pay for interpreter start-up.
+MICROCOREOS_PROCESS_WORKERS sizes the pool (default: cpu_count). Under
+`microcoreos run --workers N`, each worker process has its own pool.
+"""
+
+import os
+import pickle
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Bytes values at least this large go through shared memory, not the pipe.
+SHM_THRESHOLD = 64 * 1024
+
+
+class _SharedBytes:
+    """Stands in for a large bytes value parked in a shared memory block."""
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+
+def _park(value: bytes, blocks: list) -> _SharedBytes:
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(value)))
+    block.buf[:len(value)] = value
+    blocks.append(block)
+    return _SharedBytes(block.name, len(value))
+
+
+def _pack(data, blocks: list):
+    """`data` with its large top-level bytes values parked in shared memory."""
+    if not isinstance(data, dict):
+        return data
+    packed = None
+    for key, value in data.items():
+        if isinstance(value, (bytes, bytearray)) and len(value) >= SHM_THRESHOLD:
+            if packed is None:
+                packed = dict(data)
+            packed[key] = _park(value, blocks)
+    return packed if packed is not None else data
+
+
+def _unpack(data, unlink: bool):
+    """`data` with every parked value read back as bytes."""
+    if not isinstance(data, dict):
+        return data
+    out = data
+    for key, value in data.items():
+        if isinstance(value, _SharedBytes):
+            if out is data:
+                out = dict(data)
+            block = shared_memory.SharedMemory(name=value.name)
+            try:
+                out[key] = bytes(block.buf[:value.size])
+            finally:
+                block.close()
+                if unlink:
+                    block.unlink()
+    return out
+
+
+def _run_in_worker(func, data):
+    """Executed in the worker process."""
+    result = func(_unpack(data, unlink=False))
+    blocks = []
+    packed = _pack(result, blocks)
+    for block in blocks:
+        block.close()   # the parent reads, then unlinks, these
+    return packed
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+class ProcessOffload:
+    """The process's worker pool for offloaded handlers, started on demand."""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self.size = int(os.getenv("MICROCOREOS_PROCESS_WORKERS", "0") or 0) or (os.cpu_count() or 1)
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                    self._executor = ProcessPoolExecutor(max_workers=self.size, mp_context=context)
+        return self._executor
+
+    def warm(self) -> None:
+        """Start every worker now, without waiting for them."""
+        pool = self._pool()
+        for _ in range(self.size):
+            pool.submit(_warm)
+
+    async def run(self, func, data):
+        """func(data) in a worker process; large bytes via shared memory."""
+        blocks = []
+        try:
+            packed = _pack(data, blocks)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool(), _run_in_worker, func, packed)
+            return _unpack(result, unlink=True)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+process_offload = ProcessOffload()
+
+
+def prepare_offload(func) -> None:
+    """Called at registration: raise ValueError now for what could never
+    cross, and start the workers so the first call finds them warm."""
+    if getattr(func, "__self__", None) is not None:
+        raise ValueError(
+            f"offload='process' needs a module-level function, got the bound method "
+            f"{func.__qualname__}: its instance (and the tools it holds) cannot be "
+            f"sent to another process."
+        )
+    try:
+        pickle.dumps(func)
+    except Exception as e:
+        raise ValueError(
+            f"offload='process' needs a picklable, module-level function; "
+            f"{getattr(func, '__qualname__', func)!r} is not ({e})."
+        ) from None
+    process_offload.warm()
+
+
+async def run_in_process(func, data):
+    """Offload `func(data)` to the process pool (see the module docstring)."""
+    return await process_offload.run(func, data)
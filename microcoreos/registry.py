@@ -11,18 +11,34 @@ class Registry:
         self._locks = {
             "tools": threading.Lock(),
             "domains": threading.Lock(),
-            "plugins": threading.Lock()
+            "plugins": threading.Lock(),
+            "boot": threading.Lock()
         }
         self._data = {"tools": {}, "domains": {}, "plugins": {}}
+        # Names currently DEAD. Replaced (never mutated) under the tools lock,
+        # so is_dead() can read it without one — ToolProxy asks on every call.
+        self._dead = frozenset()
+        # Written once per boot by the Kernel; kept out of the system dump so
+        # the inventory shape stays what its consumers already parse.
+        self._boot_profile = {"tools": {}, "plugins": {}, "summary": {}}
 
     def register_tool(self, name: str, status: str, message: str = None):
         with self._locks["tools"]:
             self._data["tools"][name] = {"status": status, "message": message}
+            self._refresh_dead(name, status)
 
     def update_tool_status(self, name: str, status: str, message: str = None):
         with self._locks["tools"]:
             if name in self._data["tools"]:
                 self._data["tools"][name].update({"status": status, "message": message})
+                self._refresh_dead(name, status)
+
+    def _refresh_dead(self, name: str, status: str):
+        if (status == "DEAD") != (name in self._dead):
+            self._dead = self._dead ^ {name}
+
+    def is_dead(self, name: str) -> bool:
+        return name in self._dead
 
     def get_tool_status(self, name: str) -> str | None:
         with self._locks["tools"]:
@@ -51,3 +67,16 @@ class Registry:
     def get_domain_metadata(self) -> dict:
         """Returns the live reference of the domain metadata."""
         return self._data["domains"]
+
+    def record_boot_timing(self, kind: str, name: str, phase: str, ms: float):
+        """kind: "tools" | "plugins"; phase: import | setup | on_boot | on_boot_complete."""
+        with self._locks["boot"]:
+            self._boot_profile[kind].setdefault(name, {})[phase] = round(ms, 3)
+
+    def set_boot_summary(self, summary: dict):
+        with self._locks["boot"]:
+            self._boot_profile["summary"] = summary
+
+    def get_boot_profile(self) -> dict:
+        """Returns the live reference of the last boot's timing profile."""
+        return self._boot_profile
@@ -0,0 +1,99 @@
+"""
+Single-flight — identical concurrent reads share one backend call.
+
+A hot page requested 500 times at once issues the same `db.query_one(...)`
+500 times. A tool method that opts in
+
+    class SqliteTool(BaseTool):
+        single_flight = ("query", "query_one")
+
+is coalesced by its ToolProxy: while a call with the same arguments is in
+flight, further identical calls do not reach the tool — they await the call
+already running and get its result (or its exception). Once it completes the
+next call goes to the backend again; nothing is cached.
+
+Rules that follow from sharing one call:
+- Every waiter receives the SAME result object. Coalesced methods must return
+  values callers do not mutate (or callers must copy first).
+- Only reads belong here. A call that started before a write committed can
+  answer a caller that arrived after it.
+- Async methods only: a sync call has no in-flight window to join.
+- Arguments must be hashable once lists/dicts/sets are frozen; anything
+  else (an object without __hash__) just calls the tool normally.
+- A caller cancelled while waiting does not cancel the shared call: the
+  other waiters still need it.
+
+Deployers opt methods in without code changes with
+MICROCOREOS_SINGLE_FLIGHT=db.query,db.query_one.
+
+Joined calls are counted per (tool, method) in the latency stats
+(`coalesced`, `coalesce_ratio`); only the shared backend call is timed.
+"""
+
+import os
+import asyncio
+import contextvars
+
+from microcoreos.context import current_deadline_var
+
+
+def methods_from_env(tool_name: str) -> set[str]:
+    """The methods of `tool_name` listed in MICROCOREOS_SINGLE_FLIGHT (tool.method, ...)."""
+    methods = set()
+    for entry in os.getenv("MICROCOREOS_SINGLE_FLIGHT", "").split(","):
+        tool, _, method = entry.strip().partition(".")
+        if tool == tool_name and method:
+            methods.add(method)
+    return methods
+
+
+def _freeze(value):
+    """`value` as a hashable key that keeps its type: 1, 1.0 and True are
+    equal in Python but are three different calls, as are [1] and (1,)."""
+    kind = type(value)
+    if isinstance(value, (list, tuple)):
+        return kind, tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return kind, frozenset((_freeze(k), _freeze(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return kind, frozenset(_freeze(v) for v in value)
+    return kind, value
+
+
+def flight_key(args: tuple, kwargs: dict):
+    """A hashable key for one call's arguments, or None when there is none."""
+    try:
+        key = (_freeze(args), _freeze(kwargs) if kwargs else ())
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+class SingleFlight:
+    """The in-flight calls of one (tool, method), keyed by arguments."""
+
+    def __init__(self, joined=None):
+        self._flights: dict = {}
+        self._joined = joined   # callable() — counts one coalesced call
+
+    async def call(self, key, start):
+        """Await the in-flight call for `key`, or start one with `start()`."""
+        task = self._flights.get(key)
+        if task is None:
+            # Shared by callers with different deadlines: it runs under none,
+            # and each caller bounds only its own wait (ToolProxy._coalescing).
+            context = contextvars.copy_context()
+            context.run(current_deadline_var.set, None)
+            task = asyncio.get_running_loop().create_task(start(), context=context)
+            self._flights[key] = task
+            task.add_done_callback(lambda t: self._landed(key, t))
+        elif self._joined is not None:
+            self._joined()
+        return await asyncio.shield(task)
+
+    def _landed(self, key, task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()   # retrieved: every waiter may have been cancelled
@@ -0,0 +1,212 @@
+"""
+`microcoreos run --workers N` — N replicas of the monolith on one box.
+
+A booted Kernel is one process with one event loop, so it serves HTTP and
+runs every handler on ONE core. The supervisor turns a 16-core box into 16
+replicas without a container orchestrator: each worker is a complete
+`microcoreos run` in its own process — its own Kernel, its own loop, its own
+GIL — and they all accept on ONE listening socket.
+
+The socket is bound HERE, once, and inherited by every worker as a file
+descriptor (`HTTP_SOCKET_FD`). The http tool serves on that descriptor instead
+of binding its own (see HttpServerTool.on_boot_complete). Binding once is the
+portable half of the two options: SO_REUSEPORT balances better on Linux but
+means something different on every other kernel, and a stale worker of an old
+deploy could still bind the port next to the new ones. With one socket,
+a port conflict fails the supervisor before any worker boots.
+
+The supervisor itself never imports the Kernel or a tool. It only starts,
+watches and stops processes:
+
+- A worker that exits while the supervisor is running is restarted. One that
+  keeps dying right after boot (a crash loop — bad config, a missing extra)
+  is restarted with a doubling delay instead of spinning the CPU.
+- SIGTERM/SIGINT is forwarded to every worker as SIGTERM — each runs its own
+  graceful `Kernel.shutdown()` — and the supervisor waits up to
+  MICROCOREOS_WORKER_GRACE seconds before killing what is left.
+
+Workers are replicas, so ELASTIC_DEPLOYMENT.md applies to them exactly as it
+does to containers: in-memory tools (`state`, the in_process bus) are
+per-worker, and a durable single-node transport is refused outright — the
+SQLite bus driver resets rows claimed by "dead" processes at boot, and with
+N workers every boot would steal the others' in-flight deliveries.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import subprocess
+
+# The env var the http tool reads to serve on an inherited socket.
+SOCKET_FD_ENV = "HTTP_SOCKET_FD"
+# Which worker a process is (0..N-1). Informational: logs, metrics labels.
+WORKER_ID_ENV = "MICROCOREOS_WORKER_ID"
+
+# Transports that are single-process by construction.
+SINGLE_PROCESS_BUS_DRIVERS = ("sqlite",)
+
+# A worker that lived at least this long was not crash-looping: restart it
+# immediately. Shorter lives double the delay, up to the cap.
+STABLE_UPTIME = 10.0
+MAX_RESTART_DELAY = 30.0
+
+
+def parse_workers(argv: list[str]) -> int | None:
+    """The value of --workers, 1 when absent, None when it is not a positive int."""
+    if "--workers" not in argv:
+        return 1
+    idx = argv.index("--workers")
+    if idx + 1 >= len(argv):
+        return None
+    try:
+        workers = int(argv[idx + 1])
+    except ValueError:
+        return None
+    return workers if workers >= 1 else None
+
+
+def refuse_reason() -> str | None:
+    """Why this environment cannot run N workers, or None when it can."""
+    if sys.platform == "win32":
+        return "--workers needs POSIX file-descriptor inheritance (not available on Windows)."
+    driver = os.getenv("EVENT_BUS_DRIVER", "in_process").strip().lower()
+    if driver in SINGLE_PROCESS_BUS_DRIVERS:
+        return (f"EVENT_BUS_DRIVER={driver} is a single-process transport: each worker's "
+                f"boot would reclaim the others' in-flight deliveries. Use a broker driver "
+                f"(redis_streams, kafka, rabbitmq) or in_process with --workers.")
+    return None
+
+
+def bind_listener(host: str, port: int) -> socket.socket:
+    """The one listening socket every worker accepts on."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn_worker(worker_id: int, fd: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env[SOCKET_FD_ENV] = str(fd)
+    env[WORKER_ID_ENV] = str(worker_id)
+    # `-m microcoreos.cli run`, not this process' argv: the child must never
+    # see --workers, or every worker would become a supervisor.
+    return subprocess.Popen(
+        [sys.executable, "-m", "microcoreos.cli", "run"],
+        env=env, pass_fds=(fd,),
+    )
+
+
+class WorkerSupervisor:
+    """Starts N workers, restarts the ones that die, stops them together.
+
+    `spawn(worker_id)` returns a Popen-like object (poll, send_signal, kill,
+    wait); injected so the restart and shutdown policy is testable without
+    booting real Kernels.
+    """
+
+    def __init__(self, workers: int, spawn, grace: float = 30.0, clock=time.monotonic):
+        self.workers = workers
+        self._spawn = spawn
+        self._grace = grace
+        self._clock = clock
+        self._procs: dict[int, object] = {}
+        self._started_at: dict[int, float] = {}
+        self._crash_streak: dict[int, int] = {}
+        self._restart_at: dict[int, float] = {}
+        self.restarts = 0
+        self.stopping = False
+
+    def start(self) -> None:
+        for worker_id in range(self.workers):
+            self._start(worker_id)
+
+    def _start(self, worker_id: int) -> None:
+        self._procs[worker_id] = self._spawn(worker_id)
+        self._started_at[worker_id] = self._clock()
+        self._restart_at.pop(worker_id, None)
+
+    def reap(self) -> None:
+        """One supervision tick: notice dead workers, restart the due ones."""
+        now = self._clock()
+        for worker_id, proc in list(self._procs.items()):
+            if proc is None:
+                if now >= self._restart_at.get(worker_id, now):
+                    self.restarts += 1
+                    self._start(worker_id)
+                continue
+            code = proc.poll()
+            if code is None or self.stopping:
+                continue
+            uptime = now - self._started_at[worker_id]
+            if uptime >= STABLE_UPTIME:
+                self._crash_streak[worker_id] = 0
+                delay = 0.0
+            else:
+                streak = self._crash_streak.get(worker_id, 0) + 1
+                self._crash_streak[worker_id] = streak
+                delay = min(0.5 * 2 ** (streak - 1), MAX_RESTART_DELAY)
+            print(f"[Supervisor] 💥 Worker {worker_id} (pid {proc.pid}) exited with {code} "
+                  f"after {uptime:.1f}s — restarting in {delay:.1f}s.")
+            self._procs[worker_id] = None
+            self._restart_at[worker_id] = now + delay
+
+    def alive(self) -> list:
+        return [p for p in self._procs.values() if p is not None and p.poll() is None]
+
+    def stop(self) -> None:
+        """Coordinated shutdown: SIGTERM everyone, then wait out the grace period."""
+        self.stopping = True
+        for proc in self.alive():
+            try:
+                proc.send_signal(signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = self._clock() + self._grace
+        while self.alive() and self._clock() < deadline:
+            time.sleep(0.1)
+        for proc in self.alive():
+            print(f"[Supervisor] Worker pid {proc.pid} ignored SIGTERM for {self._grace:.0f}s — killing.")
+            proc.kill()
+        for proc in self._procs.values():
+            if proc is not None:
+                proc.wait()
+
+
+def supervise(workers: int) -> int:
+    """Run N workers sharing one listening socket until SIGTERM/SIGINT."""
+    host = os.getenv("HTTP_HOST", "127.0.0.1")
+    port = int(os.getenv("HTTP_PORT", 5000))
+    grace = float(os.getenv("MICROCOREOS_WORKER_GRACE", "30"))
+    try:
+        sock = bind_listener(host, port)
+    except OSError as e:
+        print(f"[Supervisor] 🚨 Cannot bind {host}:{port}: {e}")
+        return 1
+
+    fd = sock.fileno()
+    supervisor = WorkerSupervisor(workers, lambda wid: _spawn_worker(wid, fd), grace=grace)
+
+    def _on_signal(signum, frame):
+        supervisor.stopping = True
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, _on_signal)
+
+    print(f"[Supervisor] Starting {workers} workers on {host}:{port} (pid {os.getpid()}).")
+    supervisor.start()
+    try:
+        while not supervisor.stopping:
+            supervisor.reap()
+            time.sleep(0.2)
+    finally:
+        print(f"[Supervisor] Stopping {len(supervisor.alive())} workers...")
+        supervisor.stop()
+        sock.close()
+    print(f"[Supervisor] All workers stopped ({supervisor.restarts} restarts).")
+    return 0
@@ -0,0 +1,229 @@
+import pytest
+from microcoreos import BaseTool, CircuitBreaker, CircuitOpenError, ToolUnavailableError
+from microcoreos.circuit import CLOSED, HALF_OPEN, OPEN
+from microcoreos.container import Container, ToolProxy
+from microcoreos.registry import Registry
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Backend:
+    """A tool whose backend can be switched off; counts the calls that reach it."""
+
+    circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def __init__(self):
+        self.down = False
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "backend"
+
+    def query(self):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("connection refused")
+        return "row"
+
+    async def aquery(self):
+        self.calls += 1
+        if self.down:
+            raise TimeoutError("connect timeout")
+        return "row"
+
+    def deferred(self):
+        return self.aquery()
+
+    def insert(self):
+        self.calls += 1
+        raise ValueError("UNIQUE constraint failed")
+
+
+@pytest.fixture
+def registry():
+    r = Registry()
+    r.register_tool("backend", "OK")
+    return r
+
+
+def _proxy(tool, registry, clock):
+    proxy = ToolProxy(tool, registry)
+    proxy._circuit._clock = clock
+    return proxy
+
+
+def test_circuit_opens_after_threshold_and_fails_fast(registry):
+    tool, clock = Backend(), FakeClock()
+    tool.down = True
+    proxy = _proxy(tool, registry, clock)
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            proxy.query()
+    assert proxy._circuit.state is OPEN
+    assert registry.get_tool_status("backend") == "DEAD"
+
+    with pytest.raises(CircuitOpenError, match="retry in 30.0s"):
+        proxy.query()
+    assert tool.calls == 3  # the fourth call never reached the tool
+
+
+def test_half_open_probe_success_closes_and_restores_ok(registry):
+    tool, clock = Backend(), FakeClock()
+    tool.down = True
+    proxy = _proxy(tool, registry, clock)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            proxy.query()
+
+    tool.down = False
+    clock.now += 30
+    assert proxy.query() == "row"
+    assert proxy._circuit.state is CLOSED
+    assert registry.get_tool_status("backend") == "OK"
+
+
+def test_failed_probe_reopens(registry):
+    tool, clock = Backend(), FakeClock()
+    tool.down = True
+    proxy = _proxy(tool, registry, clock)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            proxy.query()
+
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        proxy.query()
+    assert proxy._circuit.state is OPEN
+    with pytest.raises(CircuitOpenError):
+        proxy.query()
+    assert tool.calls == 4
+
+
+def test_half_open_admits_only_the_configured_probes():
+    circuit = CircuitBreaker(failure_threshold=1, reset_timeout=10).new_circuit(FakeClock())
+    circuit.on_failure(ConnectionError())
+    circuit._clock.now += 10
+
+    assert circuit.allow() is True
+    assert circuit.state is HALF_OPEN
+    assert circuit.allow() is False      # one probe already in flight
+    circuit.release()                    # ...cancelled
+    assert circuit.allow() is True
+
+
+@pytest.mark.filterwarnings("ignore:coroutine 'Backend.aquery' was never awaited")
+async def test_a_probe_that_is_never_awaited_does_not_hold_the_circuit(registry):
+    tool, clock = Backend(), FakeClock()
+    tool.down = True
+    proxy = _proxy(tool, registry, clock)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            proxy.query()
+
+    tool.down = False
+    clock.now += 30
+    abandoned = proxy.deferred()
+    abandoned.close()
+    del abandoned
+    assert await proxy.deferred() == "row"
+    assert proxy._circuit.state is CLOSED
+    assert registry.get_tool_status("backend") == "OK"
+
+
+def test_business_errors_never_trip(registry):
+    tool = Backend()
+    proxy = _proxy(tool, registry, FakeClock())
+
+    for _ in range(10):
+        with pytest.raises(ValueError):
+            proxy.insert()
+    assert proxy._circuit.state is CLOSED
+    assert tool.calls == 10
+
+
+async def test_async_methods_share_the_tool_circuit(registry):
+    tool, clock = Backend(), FakeClock()
+    tool.down = True
+    proxy = _proxy(tool, registry, clock)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            await proxy.aquery()
+
+    with pytest.raises(CircuitOpenError):
+        proxy.query()
+    with pytest.raises(CircuitOpenError):
+        await proxy.aquery()
+
+    tool.down = False
+    clock.now += 30
+    assert await proxy.aquery() == "row"
+    assert registry.get_tool_status("backend") == "OK"
+
+
+def test_per_method_circuits_are_independent(registry):
+    tool = Backend()
+    tool.down = True
+    proxy = ToolProxy(tool, registry, circuit_breaker=CircuitBreaker(failure_threshold=1, per_method=True))
+
+    with pytest.raises(ConnectionError):
+        proxy.query()
+    with pytest.raises(CircuitOpenError):
+        proxy.query()
+
+    tool.down = False
+    with pytest.raises(ValueError):   # a different method: its circuit is still closed
+        proxy.insert()
+
+
+def test_tools_without_a_policy_have_no_circuit(registry):
+    class Plain:
+        name = "plain"
+
+        def op(self):
+            raise ConnectionError("down")
+
+    proxy = ToolProxy(Plain(), registry)
+    assert proxy._circuit is None
+    for _ in range(10):
+        with pytest.raises(ConnectionError):
+            proxy.op()
+
+
+def test_env_opt_in_applies_the_default_policy(monkeypatch):
+    class Plain(BaseTool):
+        name = "plain"
+
+        async def setup(self):
+            pass
+
+        def get_interface_description(self):
+            return ""
+
+    monkeypatch.setenv("MICROCOREOS_CIRCUIT_BREAKER", "other, plain")
+    container = Container()
+    container.register(Plain())
+    assert container.get("plain")._breaker.failure_threshold == 5
+
+    monkeypatch.setenv("MICROCOREOS_CIRCUIT_BREAKER", "")
+    container = Container()
+    container.register(Plain())
+    assert container.get("plain")._breaker is None
+
+
+def test_circuit_open_error_is_a_tool_unavailable_error():
+    assert issubclass(CircuitOpenError, ToolUnavailableError)
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from microcoreos import BasePlugin, ConcurrencyLimit
+from microcoreos.concurrency import ConcurrencyLimits, Limiter, JITTER_SECONDS
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def complete(limiter, clock, latency, overloaded=False):
+    """One call that took `latency` seconds, with the limit fully used."""
+    while limiter.try_acquire():
+        pass
+    started = clock.now
+    clock.now += latency
+    limiter.release(started, overloaded)
+    while limiter.in_flight:
+        limiter.release(None)
+
+
+def test_the_limit_grows_while_fast_and_shrinks_when_latency_rises():
+    clock = FakeClock()
+    limiter = Limiter("orders.CheckoutPlugin", ConcurrencyLimit(initial_limit=10), clock=clock)
+
+    for _ in range(50):
+        complete(limiter, clock, 0.010)
+    grown = limiter.limit
+    assert grown > 13
+
+    complete(limiter, clock, 0.010 * 2 + JITTER_SECONDS + 0.050)   # congested
+    assert limiter.limit == pytest.approx(grown * 0.9)
+    assert limiter.decreases == 1
+
+    complete(limiter, clock, 0.010, overloaded=True)   # hit its deadline
+    assert limiter.decreases == 2
+
+
+def test_one_burst_of_slow_calls_cuts_the_limit_once():
+    clock = FakeClock()
+    limiter = Limiter("orders.CheckoutPlugin", ConcurrencyLimit(initial_limit=20), clock=clock)
+    complete(limiter, clock, 0.010)
+
+    for _ in range(5):
+        assert limiter.try_acquire()
+    clock.now += 0.5
+    for _ in range(5):
+        limiter.release(clock.now - 0.5)   # five completions, one slow moment
+    assert limiter.decreases == 1
+
+
+def test_the_limit_stays_within_its_policy():
+    clock = FakeClock()
+    limiter = Limiter("x.Y", ConcurrencyLimit(initial_limit=2, min_limit=2, max_limit=3), clock=clock)
+    for _ in range(100):
+        complete(limiter, clock, 0.010)
+    assert limiter.stats()["limit"] == 3
+    for _ in range(10):
+        complete(limiter, clock, 1.0)
+    assert limiter.stats()["limit"] == 2
+
+
+async def test_over_the_limit_try_acquire_sheds_and_acquire_waits_in_line():
+    limiter = Limiter("x.Y", ConcurrencyLimit(initial_limit=1))
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    order = []
+
+    async def deliver(n):
+        await limiter.acquire()
+        order.append(n)
+
+    waiters = [asyncio.create_task(deliver(n)) for n in range(3)]
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 3
+
+    for _ in range(3):
+        limiter.release(None)
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiters)
+
+    assert order == [0, 1, 2]
+    stats = limiter.stats()
+    assert (stats["in_flight"], stats["rejected"], stats["deferred"]) == (1, 1, 3)
+
+
+async def test_a_cancelled_waiter_gives_its_slot_back():
+    limiter = Limiter("x.Y", ConcurrencyLimit(initial_limit=1))
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release(None)   # handed over to the waiter...
+    waiter.cancel()         # ... which is cancelled before it runs
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.in_flight == 0 and limiter.try_acquire()
+
+
+def test_limiters_come_from_the_plugin_or_the_environment(monkeypatch):
+    class CheckoutPlugin(BasePlugin):
+        concurrency_limit = ConcurrencyLimit(initial_limit=5)
+
+        async def execute(self, data, context=None): ...
+
+    class ReportPlugin(BasePlugin):
+        async def execute(self, data, context=None): ...
+
+    limits = ConcurrencyLimits()
+    checkout = limits.limiter_for(CheckoutPlugin().execute, "orders.CheckoutPlugin.execute")
+    assert checkout.stats()["limit"] == 5
+    assert limits.limiter_for(CheckoutPlugin().execute, "orders.CheckoutPlugin.execute") is checkout
+    assert limits.limiter_for(ReportPlugin().execute, "reports.ReportPlugin.execute") is None
+
+    monkeypatch.setenv("MICROCOREOS_CONCURRENCY_LIMIT", "reports")
+    limits.reset()
+    assert limits.limiter_for(ReportPlugin().execute, "reports.ReportPlugin.execute") is not None
+    assert [s["owner"] for s in limits.stats()] == ["reports.ReportPlugin"]
+
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(initial_limit=0)
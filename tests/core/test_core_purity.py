@@ -23,10 +23,18 @@ KERNEL_MODULES = [
     "__init__.py",
     "base_plugin.py",
     "base_tool.py",
+    "circuit.py",
+    "concurrency.py",
     "context.py",
     "container.py",
+    "discovery.py",
+    "executors.py",
+    "histograms.py",
+    "instrumentation.py",
     "kernel.py",
+    "offload.py",
     "registry.py",
+    "single_flight.py",
 ]
 
 # `project.py` is distribution: locating the project a command is being run AT,
@@ -35,7 +43,7 @@ KERNEL_MODULES = [
 # docs/internal/DEV_PACKAGE_SPLIT.md and the two direction tests at the bottom of this
 # file, which are what keep it from coming back.
 DISTRIBUTION_MODULES = ["cli.py", "catalog.py", "scaffold.py", "upgrade.py",
-                        "project.py"]
+                        "project.py", "supervisor.py"]
 
 
 def _imported_roots(path: Path) -> set[str]:
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import pytest
+from microcoreos import CircuitBreaker, DeadlineExceededError, current_deadline_var, time_remaining
+from microcoreos.container import ToolProxy
+from microcoreos.registry import Registry
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def deadline(seconds_from_now):
+    # Each async test runs in its own copy of the context: nothing leaks out.
+    current_deadline_var.set(time.time() + seconds_from_now)
+
+
+class Db:
+    name = "db"
+    circuit_breaker = CircuitBreaker(failure_threshold=1)
+    single_flight = ("shared",)
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+
+    def sync_op(self):
+        self.calls += 1
+        return "ok"
+
+    async def slow(self, seconds):
+        self.calls += 1
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return "done"
+
+    def deferred(self, seconds):
+        return self.slow(seconds)
+
+    async def shared(self, seconds):
+        self.calls += 1
+        await asyncio.sleep(seconds)
+        return "done"
+
+
+@pytest.fixture
+def registry():
+    r = Registry()
+    r.register_tool("db", "OK")
+    return r
+
+
+async def test_calls_past_the_deadline_never_reach_the_tool(registry):
+    tool = Db()
+    proxy = ToolProxy(tool, registry)
+    deadline(-1)
+
+    with pytest.raises(DeadlineExceededError, match="not called"):
+        proxy.sync_op()
+    with pytest.raises(DeadlineExceededError, match="not called"):
+        await proxy.slow(0)
+    assert tool.calls == 0
+
+
+async def test_async_call_is_cancelled_when_the_deadline_passes(registry):
+    tool = Db()
+    proxy = ToolProxy(tool, registry)
+    deadline(0.05)
+
+    with pytest.raises(DeadlineExceededError, match="cancelled"):
+        await proxy.slow(5)
+    assert tool.cancelled == 1
+
+
+async def test_within_the_deadline_calls_complete(registry):
+    proxy = ToolProxy(Db(), registry)
+    deadline(5)
+    assert await proxy.slow(0) == "done"
+    assert proxy.sync_op() == "ok"
+
+
+async def test_deadline_misses_do_not_count_against_the_tool(registry):
+    tool = Db()
+    proxy = ToolProxy(tool, registry)
+    deadline(0.01)
+
+    for _ in range(6):
+        with pytest.raises(DeadlineExceededError):
+            await proxy.slow(5)
+    assert registry.get_tool_status("db") == "OK"
+    assert proxy._consecutive_failures == 0
+    assert proxy._circuit.state == "CLOSED"
+
+
+async def test_an_awaitable_from_a_sync_method_is_held_to_the_deadline(registry):
+    tool = Db()
+    proxy = ToolProxy(tool, registry)
+    deadline(0.05)
+
+    with pytest.raises(DeadlineExceededError, match="cancelled"):
+        await proxy.deferred(5)
+    assert tool.cancelled == 1
+    assert registry.get_tool_status("db") == "OK"
+    assert proxy._consecutive_failures == 0
+    assert proxy._circuit.state == "CLOSED"
+
+
+async def test_one_callers_deadline_does_not_fail_a_shared_call(registry):
+    tool = Db()
+    proxy = ToolProxy(tool, registry)
+
+    async def impatient():
+        current_deadline_var.set(time.time() + 0.02)
+        return await proxy.shared(0.1)
+
+    results = await asyncio.gather(impatient(), proxy.shared(0.1), return_exceptions=True)
+    assert isinstance(results[0], DeadlineExceededError)
+    assert results[1] == "done"
+    assert tool.calls == 1
+
+
+def test_no_deadline_means_no_budget():
+    assert time_remaining() is None
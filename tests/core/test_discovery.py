@@ -0,0 +1,154 @@
+"""
+The discovery manifest (microcoreos/discovery.py): a boot that finds the tree
+unchanged imports only what the last scan found; any change is a full scan.
+"""
+
+import os
+import sys
+import json
+import inspect
+import importlib
+from pathlib import Path
+
+import pytest
+
+from microcoreos import BaseTool, BasePlugin
+from microcoreos.kernel import Kernel
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+TOOL_SRC = (
+    "from microcoreos import BaseTool\n"
+    "class {cls}(BaseTool):\n"
+    "    @property\n"
+    "    def name(self): return '{name}'\n"
+    "    async def setup(self): self.ready = True\n"
+    "    def get_interface_description(self): return 'Probe'\n"
+)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A scratch import root; the package name is unique to this test."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = f"disco_{tmp_path.name.replace('-', '_')}"
+    (tmp_path / package / "alpha").mkdir(parents=True)
+    (tmp_path / package / "alpha" / "alpha_tool.py").write_text(TOOL_SRC.format(cls="AlphaTool", name="alpha"))
+    (tmp_path / package / "alpha" / "helpers_tool.py").write_text("VALUE = 1\n")
+    return tmp_path, package
+
+
+def _bump(path):
+    """Move an mtime forward explicitly — coarse filesystem clocks hide a same-tick edit."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_an_unchanged_tree_is_loaded_from_the_manifest(project, monkeypatch):
+    root, package = project
+    first = Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+    assert [cls.__name__ for cls, _ in first] == ["AlphaTool"]
+    assert os.path.exists(os.environ["MICROCOREOS_DISCOVERY_CACHE"])
+
+    imported = []
+    real_import = importlib.import_module
+    monkeypatch.setattr(importlib, "import_module", lambda name: imported.append(name) or real_import(name))
+    monkeypatch.setattr(inspect, "getmembers", lambda *a: pytest.fail("full scan on a fresh manifest"))
+
+    second = Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+
+    assert [cls for cls, _ in second] == [cls for cls, _ in first]
+    # The module that defines no tool is not imported at all.
+    assert imported == [f"{package}.alpha.alpha_tool"]
+
+
+def test_a_new_file_makes_the_manifest_stale(project):
+    root, package = project
+    Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+
+    (root / package / "beta").mkdir()
+    (root / package / "beta" / "beta_tool.py").write_text(TOOL_SRC.format(cls="BetaTool", name="beta"))
+    _bump(root / package)
+
+    found = Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+    assert sorted(cls.__name__ for cls, _ in found) == ["AlphaTool", "BetaTool"]
+
+
+def test_an_edited_file_makes_the_manifest_stale(project, monkeypatch):
+    root, package = project
+    Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+
+    helper = root / package / "alpha" / "helpers_tool.py"
+    helper.write_text(TOOL_SRC.format(cls="HelperTool", name="helper"))
+    _bump(helper)
+    monkeypatch.delitem(sys.modules, f"{package}.alpha.helpers_tool")   # a new process
+
+    found = Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+    assert sorted(cls.__name__ for cls, _ in found) == ["AlphaTool", "HelperTool"]
+
+
+def test_a_scan_with_an_import_error_is_not_recorded(project, capsys):
+    root, package = project
+    (root / package / "alpha" / "broken_tool.py").write_text("raise ImportError('driver missing')\n")
+
+    Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+    assert not os.path.exists(os.environ["MICROCOREOS_DISCOVERY_CACHE"])
+
+    Kernel()._load_modules_from_dir(package, BaseTool, "_tool.py")
+    assert capsys.readouterr().out.count("driver missing") == 2
+
+
+def test_plugin_entries_record_domain_and_constructor_dependencies(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    plugins = tmp_path / "domains" / "disco_orders" / "plugins"
+    plugins.mkdir(parents=True)
+    (plugins / "place_order_plugin.py").write_text(
+        "from microcoreos import BasePlugin\n"
+        "class PlaceOrderPlugin(BasePlugin):\n"
+        "    def __init__(self, db, logger=None): pass\n"
+        "    async def on_boot(self): pass\n"
+    )
+
+    found = Kernel()._load_modules_from_dir("domains", BasePlugin, "_plugin.py")
+    assert [(cls.__name__, domain) for cls, domain in found] == [("PlaceOrderPlugin", "disco_orders")]
+
+    data = json.loads(Path(os.environ["MICROCOREOS_DISCOVERY_CACHE"]).read_text(encoding="utf-8"))
+    [section] = data["sections"].values()
+    [entry] = section["files"]
+    assert entry["domain"] == "disco_orders"
+    assert entry["classes"] == [{"name": "PlaceOrderPlugin", "deps": [["db", True], ["logger", False]]}]
+
+
+async def test_boot_tool_imports_only_the_named_tool_once_known(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for sub, cls, name in (("disco_one", "DiscoOneTool", "disco_one"), ("disco_two", "DiscoTwoTool", "disco_two")):
+        (tmp_path / "tools" / sub).mkdir(parents=True)
+        (tmp_path / "tools" / sub / f"{sub}_tool.py").write_text(TOOL_SRC.format(cls=cls, name=name))
+
+    booted = Kernel()
+    await booted.boot()                        # a full boot learns each tool's name
+    await booted.shutdown()
+
+    imported = []
+    real_import = importlib.import_module
+    monkeypatch.setattr(importlib, "import_module", lambda name: imported.append(name) or real_import(name))
+
+    await Kernel().boot_tool("disco_two")
+    assert imported == ["tools.disco_two.disco_two_tool"]
+
+
+def test_a_relative_manifest_path_is_anchored_at_the_project_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MICROCOREOS_DISCOVERY_CACHE", os.path.join(".microcoreos", "discovery.json"))
+    kernel = Kernel()
+    monkeypatch.chdir(tmp_path.parent)          # a later chdir must not move it
+    assert kernel.discovery.path == str(tmp_path / ".microcoreos" / "discovery.json")
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import pytest
+from microcoreos import BasePlugin, current_identity_var
+from microcoreos.executors import ExecutorPools, pool_for
+from tests.helpers.async_wait import wait_until
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def pools():
+    p = ExecutorPools()
+    yield p
+    p.shutdown()
+
+
+class OrdersPlugin(BasePlugin):
+    _identity = "orders.OrdersPlugin"
+
+    def handle(self):
+        pass
+
+
+class ReportsPlugin(BasePlugin):
+    _identity = "orders.ReportsPlugin"
+    executor_pool = "reports"
+
+    def handle(self):
+        pass
+
+
+def test_pool_for_prefers_the_declared_pool_then_the_domain():
+    assert pool_for(ReportsPlugin().handle) == "reports"
+    assert pool_for(OrdersPlugin().handle) == "domain.orders"
+    assert pool_for(lambda: None) == "default"
+    assert pool_for(lambda: None, "http") == "http"
+
+    class Unstamped(BasePlugin):   # outside the Kernel: no identity
+        def handle(self):
+            pass
+
+    assert pool_for(Unstamped().handle, "http") == "http"
+
+
+async def test_a_saturated_pool_does_not_starve_another(pools, monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_POOLS", "slow=1")
+    pools.shutdown()   # re-read sizes
+    release = threading.Event()
+
+    blocked = [pools.get("slow").run(release.wait, 5) for _ in range(3)]
+    # The other pool answers while "slow" holds its only thread.
+    assert await asyncio.wait_for(pools.get("fast").run(lambda: "ok"), 2) == "ok"
+
+    slow = pools.get("slow")
+    await wait_until(lambda: slow.active == 1)
+    assert (slow.size, slow.queued) == (1, 2)
+    release.set()
+    await asyncio.gather(*blocked)
+    assert (slow.active, slow.queued, slow.completed) == (0, 0, 3)
+
+
+def test_domain_pools_default_to_a_share_of_one_thread_budget(pools, monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_THREAD_BUDGET", "32")
+    pools.shutdown()   # re-read sizes
+    assert pools.get("http").size == 32
+    assert pools.get("default").size == 32
+    assert pools.get("domain.orders").size == 4
+    assert pools.get("reports").size == 4
+
+    monkeypatch.setenv("MICROCOREOS_THREAD_BUDGET", "3")
+    pools.shutdown()
+    assert pools.get("domain.orders").size == 2   # never below 2...
+    monkeypatch.setenv("MICROCOREOS_THREAD_BUDGET", "1")
+    pools.shutdown()
+    assert pools.get("domain.orders").size == 1   # ...nor above the budget
+
+
+async def test_work_runs_in_a_copy_of_the_callers_context(pools):
+    current_identity_var.set("orders.OrdersPlugin.handle")
+    seen = await pools.get("default").run(current_identity_var.get)
+    assert seen == "orders.OrdersPlugin.handle"
+
+
+async def test_stats_report_waits_runs_and_errors(pools):
+    def boom():
+        raise ValueError("nope")
+
+    await pools.get("p").run(lambda: 1)
+    with pytest.raises(ValueError):
+        await pools.get("p").run(boom)
+
+    [stats] = pools.stats()
+    assert stats["pool"] == "p"
+    assert stats["completed"] == 2
+    assert stats["errors"] == 1
+    assert set(stats["wait_ms"]) == {"p50", "p90", "p95", "p99", "max"}
+    assert set(stats["run_ms"]) == {"p50", "p90", "p95", "p99", "max"}
+
+
+async def test_cancelled_queued_work_stops_counting_as_queued(pools, monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_POOLS", "one=1")
+    pools.shutdown()
+    release = threading.Event()
+    pool = pools.get("one")
+
+    running = pool.run(release.wait, 5)
+    waiting = pool.run(lambda: None)
+    await wait_until(lambda: pool.active == 1)
+    assert pool.queued == 1
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert pool.queued == 0
+    release.set()
+    await running
+
+
+def test_invalid_sizes_are_ignored(monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_POOLS", "a=two,b=3,*=5")
+    pools = ExecutorPools()
+    assert pools.get("a").size == 5
+    assert pools.get("b").size == 3
+    pools.shutdown()
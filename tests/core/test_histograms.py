@@ -0,0 +1,67 @@
+"""
+Latency histograms (microcoreos/histograms.py): percentiles within the
+bucket error, sliding windows, memory bounded by the tool surface.
+"""
+
+import pytest
+
+from microcoreos import histograms
+from microcoreos.container import Container
+from microcoreos.histograms import LatencyHistograms, bucket_of, bucket_value
+
+
+@pytest.mark.parametrize("ms", [0.0031, 0.4, 1.0, 12.5, 999.0, 86_400_000.0])
+def test_a_bucket_reports_within_its_resolution(ms):
+    assert bucket_value(bucket_of(ms)) == pytest.approx(ms, rel=1 / (2 * histograms.SUB_BUCKETS))
+
+
+def test_percentiles_counts_and_error_rate():
+    hist = LatencyHistograms()
+    observe = hist.bind("db", "query")
+    for ms in range(1, 101):                  # 1..100ms, one call each
+        observe(float(ms), 5.0, ms <= 98)     # the two slowest calls fail
+
+    [stats] = hist.summary(now=5.0)
+    assert (stats["tool"], stats["method"], stats["count"], stats["errors"]) == ("db", "query", 100, 2)
+    assert stats["error_rate"] == 0.02
+    latency = stats["latency_ms"]
+    assert latency["p50"] == pytest.approx(50, rel=0.07)
+    assert latency["p99"] == pytest.approx(99, rel=0.07)
+    assert latency["max"] == pytest.approx(100, rel=0.07)
+
+
+def test_the_window_slides():
+    hist = LatencyHistograms()
+    observe = hist.bind("db", "query")
+    observe(1.0, 0.0, True)                   # slot 0
+    observe(1.0, 95.0, True)                  # slot 9
+
+    assert hist.summary(now=95.0, window_seconds=300)[0]["count"] == 2
+    assert hist.summary(now=95.0, window_seconds=10)[0]["count"] == 1
+    assert hist.summary(now=10_000.0, window_seconds=300) == []   # all aged out
+
+
+def test_memory_is_bounded_by_slots_not_calls():
+    hist = LatencyHistograms()
+    observe = hist.bind("db", "query")
+    for i in range(100_000):
+        observe(1.0 + (i % 7), i * 0.01, True)   # ~1000s of traffic
+    ok, _ = hist._series[("db", "query")]
+    assert len(ok.history) <= histograms.SLOTS
+    assert all(len(counts) <= 7 for _, counts in ok.history)
+
+
+def test_the_container_counts_every_proxied_call():
+    container = Container()
+
+    class SimpleTool:
+        name = "simple"
+        def do_work(self): pass
+
+    container.register(SimpleTool())
+    proxy = container.get("simple")
+    for _ in range(container._metrics_ring.capacity * 2):
+        proxy.do_work()
+
+    [stats] = container.get_latency_stats(60)
+    assert stats["count"] == container._metrics_ring.capacity * 2   # not capped by the ring
@@ -345,4 +345,190 @@ async def test_kernel_on_boot_complete_and_shutdown_container_passage(kernel, mo
 
     await kernel.shutdown()
     assert "tool" in shutdown_called
-    assert "plugin" in shutdown_called
\ No newline at end of file
+    assert "plugin" in shutdown_called
+
+# ─── 4. on_boot_complete scheduling and the boot profile ─────────────────────
+
+def _timed_tool(tool_name, log, delay=0.05, after=None):
+    class TimedTool(BaseTool):
+        boot_complete_after = after
+
+        @property
+        def name(self) -> str:
+            return tool_name
+        async def setup(self):
+            pass
+        def get_interface_description(self) -> str:
+            return ""
+        async def on_boot_complete(self, container):
+            log.append(("start", tool_name))
+            await asyncio.sleep(delay)
+            log.append(("end", tool_name))
+    return TimedTool
+
+
+def _only_tools(*classes):
+    def fake_load_modules(directory, base_class, suffix):
+        return [(cls, None) for cls in classes] if base_class == BaseTool else []
+    return fake_load_modules
+
+
+async def test_on_boot_complete_hooks_run_in_registration_order_by_default(kernel, monkeypatch):
+    log = []
+    monkeypatch.setattr(kernel, "_load_modules_from_dir", _only_tools(
+        _timed_tool("a", log, delay=0.03), _timed_tool("b", log, delay=0.01), _timed_tool("c", log, delay=0.0),
+    ))
+    await kernel.boot()
+    assert kernel.container.list_tools() == ["a", "b", "c"]
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")]
+
+
+async def test_hooks_that_opt_in_run_concurrently(kernel, monkeypatch):
+    log = []
+    monkeypatch.setattr(kernel, "_load_modules_from_dir",
+                        _only_tools(_timed_tool("a", log, after=()), _timed_tool("b", log, after=())))
+    await kernel.boot()
+    # Both started before either finished.
+    assert [kind for kind, _ in log[:2]] == ["start", "start"]
+
+
+async def test_a_default_hook_still_waits_for_an_opted_in_one_before_it(kernel, monkeypatch):
+    log = []
+    monkeypatch.setattr(kernel, "_load_modules_from_dir", _only_tools(
+        _timed_tool("fast", log, after=()), _timed_tool("legacy", log),
+    ))
+    await kernel.boot()
+    assert log.index(("end", "fast")) < log.index(("start", "legacy"))
+
+
+async def test_boot_complete_after_orders_the_dependent_hook(kernel, monkeypatch):
+    log = []
+    monkeypatch.setattr(kernel, "_load_modules_from_dir", _only_tools(
+        _timed_tool("server", log, after=("instrumenter", "not_installed")),
+        _timed_tool("instrumenter", log, after=()),
+    ))
+    await kernel.boot()
+    assert log.index(("end", "instrumenter")) < log.index(("start", "server"))
+
+    summary = kernel.container.registry.get_boot_profile()["summary"]
+    chain = [c["name"] for c in summary["critical_path"] if c["stage"] == "on_boot_complete"]
+    assert chain == ["instrumenter", "server"]
+
+
+async def test_a_boot_complete_cycle_falls_back_to_sequential(kernel, monkeypatch, capsys):
+    log = []
+    monkeypatch.setattr(kernel, "_load_modules_from_dir", _only_tools(
+        _timed_tool("a", log, after=("b",)), _timed_tool("b", log, after=("a",)),
+    ))
+    await kernel.boot()
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+    assert "cycle" in capsys.readouterr().out
+
+
+async def test_boot_profile_records_every_phase(kernel, monkeypatch, capsys):
+    def fake_load_modules(directory, base_class, suffix):
+        if base_class == BaseTool:
+            return [(DummyTool, None)]
+        return [(DummyPlugin, "dummy_domain")]
+
+    monkeypatch.setattr(kernel, "_load_modules_from_dir", fake_load_modules)
+    await kernel.boot()
+
+    profile = kernel.container.registry.get_boot_profile()
+    assert set(profile["tools"]["dummy"]) == {"import", "setup", "on_boot_complete"}
+    assert profile["tools"]["dummy"]["setup"] >= 10          # DummyTool.setup sleeps 10ms
+    assert set(profile["plugins"]["dummy_domain.DummyPlugin"]) == {"import", "on_boot"}
+    assert list(profile["summary"]["stages"]) == ["discovery", "setup", "on_boot", "on_boot_complete"]
+    assert [c["stage"] for c in profile["summary"]["critical_path"]] == ["setup", "on_boot", "on_boot_complete"]
+    assert "Critical path: dummy.setup" in capsys.readouterr().out
+
+
+def _stop_tool(tool_name, log, *, after=(), hang=False):
+    class StopTool(BaseTool):
+        boot_complete_after = after
+
+        @property
+        def name(self) -> str:
+            return tool_name
+        async def setup(self):
+            pass
+        def get_interface_description(self) -> str:
+            return ""
+        async def drain(self, timeout):
+            log.append(f"drain {tool_name}")
+        async def shutdown(self):
+            if hang:
+                await asyncio.sleep(3600)
+            await asyncio.sleep(0.01)
+            log.append(f"close {tool_name}")
+
+    return StopTool()
+
+
+async def test_shutdown_drains_first_and_closes_a_tool_after_its_users(kernel):
+    log = []
+
+    class StopPlugin(BasePlugin):
+        async def shutdown(self):
+            log.append("plugin")
+
+    kernel.container.register(_stop_tool("telemetry", log))
+    kernel.container.register(_stop_tool("http", log, after=("telemetry",)))
+    kernel.container.register(_stop_tool("db", log))
+    kernel.plugins["p"] = StopPlugin()
+    await kernel.shutdown()
+
+    assert set(log[:3]) == {"drain telemetry", "drain http", "drain db"}
+    assert log[3] == "plugin"
+    # http named telemetry in boot_complete_after: telemetry outlives it.
+    assert log.index("close http") < log.index("close telemetry")
+    assert set(log[4:]) == {"close telemetry", "close http", "close db"}
+
+
+async def test_a_hung_shutdown_hook_is_abandoned(kernel, monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_SHUTDOWN_TIMEOUT", "0.1")
+    log = []
+    kernel.container.register(_stop_tool("stuck", log, hang=True))
+    kernel.container.register(_stop_tool("db", log))
+
+    await asyncio.wait_for(kernel.shutdown(), timeout=5)
+    assert log == ["drain stuck", "drain db", "close db"]
+
+
+async def test_plugins_shut_down_one_after_another(kernel):
+    log = []
+
+    def _plugin(tag):
+        class SlowStopPlugin(BasePlugin):
+            async def shutdown(self):
+                log.append(f"start {tag}")
+                await asyncio.sleep(0.01)
+                log.append(f"end {tag}")
+        return SlowStopPlugin()
+
+    kernel.plugins["first"] = _plugin("first")
+    kernel.plugins["second"] = _plugin("second")
+    await kernel.shutdown()
+    assert log == ["start first", "end first", "start second", "end second"]
+
+
+async def test_stopping_a_tool_is_not_metered_and_cannot_mark_it_dead(kernel):
+    class FailingStopTool(BaseTool):
+        @property
+        def name(self) -> str:
+            return "failing_stop"
+        async def setup(self):
+            pass
+        def get_interface_description(self) -> str:
+            return ""
+        async def drain(self, timeout):
+            raise ConnectionError("backend already gone")
+        async def shutdown(self):
+            raise ConnectionError("backend already gone")
+
+    kernel.container.register(FailingStopTool())
+    kernel.container.registry.register_tool("failing_stop", "OK")
+    await kernel.shutdown()
+
+    assert kernel.container.get_metrics() == []
+    assert kernel.container.registry.get_tool_status("failing_stop") == "OK"
@@ -0,0 +1,93 @@
+import os
+import pytest
+from unittest.mock import MagicMock
+from fastapi import Request
+from starlette.datastructures import Headers
+from microcoreos import prepare_offload, run_in_process
+from microcoreos.offload import SHM_THRESHOLD, process_offload
+from tools.http_server.pipeline import _process_request
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def one_worker(monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_PROCESS_WORKERS", "1")
+    yield
+    process_offload.shutdown()
+
+
+# Module level: what crosses to a worker process is a reference to these.
+def whoami(data):
+    return {"success": True, "pid": os.getpid(), "echo": data.get("n")}
+
+
+def reverse_blob(data):
+    return {"size": len(data["blob"]), "blob": data["blob"][::-1]}
+
+
+def reject(data):
+    return {"success": False, "error": "bad input"}
+
+
+def square(payload):
+    return {"result": payload["n"] ** 2}
+
+
+async def test_the_function_runs_in_another_process():
+    result = await run_in_process(whoami, {"n": 7})
+    assert result["echo"] == 7
+    assert result["pid"] != os.getpid()
+
+
+async def test_large_bytes_cross_both_ways_through_shared_memory():
+    blob = bytes(range(256)) * (SHM_THRESHOLD // 256 + 1)
+    result = await run_in_process(reverse_blob, {"blob": blob})
+    assert result == {"size": len(blob), "blob": blob[::-1]}
+
+
+def test_what_cannot_cross_is_refused_at_registration():
+    class Plugin:
+        def handle(self, data):
+            return {}
+
+    with pytest.raises(ValueError, match="module-level"):
+        prepare_offload(Plugin().handle)
+    with pytest.raises(ValueError, match="picklable"):
+        prepare_offload(lambda data: data)
+
+
+def _request():
+    req = MagicMock(spec=Request)
+    req.query_params = {"n": "3"}
+    req.path_params = {}
+    req.headers = Headers({})
+    req.method = "GET"
+    req.url.path = "/offload"
+    return req
+
+
+async def test_an_offloaded_endpoint_answers_with_its_result():
+    res = await _process_request(_request(), None, whoami, None, set(), offload="process")
+    assert res.status_code == 200
+    assert b'"echo":"3"' in res.body
+
+    res = await _process_request(_request(), None, reject, None, set(), offload="process")
+    assert res.status_code == 400
+
+
+def test_add_endpoint_refuses_uploads_to_a_worker_process():
+    from tools.http_server.http_server_tool import HttpServerTool
+
+    with pytest.raises(ValueError, match="uploaded files"):
+        HttpServerTool().add_endpoint("/x", "POST", whoami, has_files=True, offload="process")
+
+
+async def test_an_offloaded_subscriber_answers_requests(event_bus):
+    await event_bus.subscribe("math.square", square, offload="process")
+    assert await event_bus.request("math.square", {"n": 12}, timeout=30) == {"result": 144}
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from microcoreos.container import Container, ToolProxy
+from microcoreos.registry import Registry
+from microcoreos.single_flight import flight_key, methods_from_env
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class SlowDb:
+    """query() blocks until `release` is set; counts the calls that reach it."""
+
+    name = "db"
+    single_flight = ("query",)
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def query(self, sql, params=None):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("boom")
+        return [{"sql": sql, "params": params}]
+
+    async def execute(self, sql, params=None):
+        self.calls += 1
+        await self.release.wait()
+        return 1
+
+
+async def _gather_soon(tool, *calls):
+    tasks = [asyncio.ensure_future(c) for c in calls]
+    await asyncio.sleep(0)
+    tool.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def test_identical_concurrent_calls_share_one_backend_call():
+    tool = SlowDb()
+    proxy = ToolProxy(tool, Registry())
+
+    results = await _gather_soon(tool, *(proxy.query("SELECT 1", [1]) for _ in range(50)))
+
+    assert tool.calls == 1
+    assert all(r is results[0] for r in results)
+
+
+async def test_different_arguments_are_not_coalesced():
+    tool = SlowDb()
+    proxy = ToolProxy(tool, Registry())
+
+    await _gather_soon(tool, proxy.query("SELECT 1", [1]), proxy.query("SELECT 1", [2]))
+    assert tool.calls == 2
+
+
+async def test_methods_not_listed_are_not_coalesced():
+    tool = SlowDb()
+    proxy = ToolProxy(tool, Registry())
+
+    await _gather_soon(tool, proxy.execute("UPDATE t"), proxy.execute("UPDATE t"))
+    assert tool.calls == 2
+
+
+async def test_the_shared_exception_reaches_every_waiter():
+    tool = SlowDb()
+    tool.fail = True
+    proxy = ToolProxy(tool, Registry())
+
+    results = await _gather_soon(tool, proxy.query("q"), proxy.query("q"), proxy.query("q"))
+    assert tool.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_nothing_is_cached_after_the_call_lands():
+    tool = SlowDb()
+    tool.release.set()
+    proxy = ToolProxy(tool, Registry())
+
+    await proxy.query("q")
+    await proxy.query("q")
+    assert tool.calls == 2
+
+
+async def test_a_cancelled_waiter_does_not_cancel_the_shared_call():
+    tool = SlowDb()
+    proxy = ToolProxy(tool, Registry())
+
+    first = asyncio.ensure_future(proxy.query("q"))
+    second = asyncio.ensure_future(proxy.query("q"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    tool.release.set()
+
+    assert await second == [{"sql": "q", "params": None}]
+    assert first.cancelled()
+    assert tool.calls == 1
+
+
+async def test_coalesced_calls_are_reported_in_latency_stats():
+    tool = SlowDb()
+    container = Container()
+    container.register(tool)
+    proxy = container.get("db")
+
+    await _gather_soon(tool, *(proxy.query("q") for _ in range(4)))
+
+    [stats] = container.get_latency_stats()
+    assert (stats["tool"], stats["method"], stats["count"]) == ("db", "query", 1)
+    assert stats["coalesced"] == 3
+    assert stats["coalesce_ratio"] == 0.75
+
+
+def test_flight_key_freezes_containers_and_gives_up_on_unhashables():
+    assert flight_key(("q", [1, {"a": [2]}]), {}) == flight_key(("q", [1, {"a": [2]}]), {})
+    assert flight_key((), {"b": 1, "a": 2}) == flight_key((), {"a": 2, "b": 1})
+
+    class Unhashable:
+        __hash__ = None
+
+    assert flight_key((Unhashable(),), {}) is None
+
+
+def test_flight_key_tells_equal_values_of_different_types_apart():
+    keys = [flight_key((v,), {}) for v in (1, 1.0, True, [1], (1,), {1}, frozenset({1}))]
+    assert len(set(keys)) == len(keys)
+    assert flight_key((), {"n": 1}) != flight_key((), {"n": True})
+    assert flight_key(({1: "a"},), {}) != flight_key(({True: "a"},), {})
+
+
+def test_env_opt_in(monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_SINGLE_FLIGHT", "db.query, db.query_one, state.get")
+    assert methods_from_env("db") == {"query", "query_one"}
+    assert methods_from_env("http") == set()
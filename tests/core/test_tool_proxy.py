@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from microcoreos.container import ToolProxy, Container
 from microcoreos import ToolUnavailableError
@@ -206,3 +207,58 @@ def test_proxy_setattr_delegation(registry):
     assert tool.value == 100
     # Ensure getting the attribute via proxy also reflects the new value
     assert proxy.value == 100
+
+
+def test_metrics_ring_keeps_the_last_records_in_order():
+    from microcoreos.container import MetricsRing
+    ring = MetricsRing(capacity=3)
+    writers = [ring.bind("db", "query"), ring.bind("db", "execute")]
+    for i in range(5):
+        writers[i % 2](0.0, i / 1000, i % 2 == 0)
+
+    records, cursor = ring.records()
+    assert cursor == 5
+    assert [(r["method"], r["duration_ms"], r["success"]) for r in records] == [
+        ("query", 2.0, True), ("execute", 3.0, False), ("query", 4.0, True),
+    ]
+    assert ring.records(since=4)[0] == records[-1:]
+
+
+async def test_sinks_are_drained_in_one_batch_off_the_call_path():
+    container = Container()
+
+    class SimpleTool:
+        name = "simple"
+        def do_work(self): pass
+
+    container.register(SimpleTool())
+    batches = []
+    container.add_metrics_sink(lambda record: batches.append(record))
+
+    proxy = container.get("simple")
+    for _ in range(3):
+        proxy.do_work()
+    assert batches == []          # nothing delivered inside the calls
+
+    await asyncio.sleep(0)        # the loop runs the scheduled drain
+    assert [r["method"] for r in batches] == ["do_work"] * 3
+
+
+async def test_a_sink_that_falls_a_ring_behind_counts_what_it_lost():
+    container = Container()
+
+    class SimpleTool:
+        name = "simple"
+        def do_work(self): pass
+
+    container.register(SimpleTool())
+    seen = []
+    container.add_metrics_sink(seen.append)
+
+    proxy = container.get("simple")
+    for _ in range(container._metrics_ring.capacity + 10):
+        proxy.do_work()           # the loop never yields in between
+    container.flush_metrics()
+
+    assert len(seen) == container._metrics_ring.capacity
+    assert container.sink_records_lost == 10
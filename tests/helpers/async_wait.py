@@ -59,7 +59,8 @@ async def wait_for_dlq(bus, event_name: str, timeout: float | None = None) -> No
     """
     if timeout is None:
         schedule = 0.0
-        for (ev, _cb), opts in getattr(bus, "_sub_options", {}).items():
+        for (ev, _cb), subscription in getattr(bus, "_subscriptions", {}).items():
+            opts = subscription.options
             if ev == event_name and opts.retries > 0:
                 total = sum(opts.backoff * (2 ** (attempt - 1))
                             for attempt in range(1, opts.retries + 1))
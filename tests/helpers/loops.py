@@ -0,0 +1,24 @@
+"""The event loop a suite runs on — MICROCOREOS_LOOP, as `microcoreos run` reads it.
+
+The event bus, HTTP pipeline and SQLite suites must hold on every loop the
+Kernel can boot on. Their `anyio_backend` fixture returns `loop_backend()`,
+so the same files run on either:
+
+    python -m pytest tests/tools/event_bus tests/tools/http_server tests/tools/sqlite
+    MICROCOREOS_LOOP=uvloop python -m pytest tests/tools/event_bus tests/tools/http_server tests/tools/sqlite
+
+Unlike the CLI, which falls back to asyncio with a warning, asking for uvloop
+here without it installed fails the run: a suite that quietly ran on asyncio
+twice would prove nothing about uvloop.
+"""
+import os
+
+
+def loop_backend():
+    name = (os.getenv("MICROCOREOS_LOOP") or "asyncio").strip().lower()
+    if name == "asyncio":
+        return "asyncio"
+    if name == "uvloop":
+        import uvloop   # ImportError is the answer: `uv add uvloop`
+        return ("asyncio", {"loop_factory": uvloop.new_event_loop})
+    raise ValueError(f"MICROCOREOS_LOOP={name!r}: expected asyncio or uvloop")
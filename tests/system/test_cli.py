@@ -84,6 +84,29 @@ def test_dev_without_watchfiles_reports_how_to_install(tmp_path, monkeypatch, ca
     assert "uv add --dev watchfiles" in capsys.readouterr().out
 
 
+def test_the_loop_is_asyncio_unless_configured(monkeypatch, capsys):
+    monkeypatch.delenv("MICROCOREOS_LOOP", raising=False)
+    assert cli.loop_factory() is None
+
+    monkeypatch.setenv("MICROCOREOS_LOOP", "tokio")
+    assert cli.loop_factory() is None
+    assert "Ignoring MICROCOREOS_LOOP='tokio'" in capsys.readouterr().out
+
+
+def test_uvloop_without_the_package_falls_back_and_says_how_to_install(monkeypatch, capsys):
+    monkeypatch.setenv("MICROCOREOS_LOOP", "uvloop")
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert cli.loop_factory() is None
+    assert "uv add uvloop" in capsys.readouterr().out
+
+
+def test_uvloop_is_used_when_configured(monkeypatch):
+    fake = types.SimpleNamespace(new_event_loop=lambda: None)
+    monkeypatch.setenv("MICROCOREOS_LOOP", "UVLOOP")
+    monkeypatch.setitem(sys.modules, "uvloop", fake)
+    assert cli.loop_factory() is fake.new_event_loop
+
+
 def test_env_is_loaded_from_the_project_not_from_the_package(tmp_path, monkeypatch):
     """
     Bare `load_dotenv()` searches upward from its CALLER — which, installed, is
@@ -0,0 +1,171 @@
+"""
+`microcoreos run --workers N`: the restart and shutdown policy, driven with
+fake processes — booting N real Kernels would test uvicorn, not the policy.
+"""
+
+import signal
+import socket
+
+import pytest
+
+from microcoreos import cli, supervisor
+from microcoreos.supervisor import WorkerSupervisor
+
+
+class FakeProc:
+    _next_pid = 1000
+
+    def __init__(self, worker_id):
+        FakeProc._next_pid += 1
+        self.pid = FakeProc._next_pid
+        self.worker_id = worker_id
+        self.returncode = None
+        self.signals = []
+        self.killed = False
+        self.exit_on_term = True
+
+    def poll(self):
+        return self.returncode
+
+    def send_signal(self, sig):
+        self.signals.append(sig)
+        if self.exit_on_term:
+            self.returncode = 0
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+    def wait(self):
+        return self.returncode
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def spawned():
+    return []
+
+
+@pytest.fixture
+def make(spawned):
+    def _make(workers, grace=0.2):
+        clock = Clock()
+
+        def spawn(worker_id):
+            proc = FakeProc(worker_id)
+            spawned.append(proc)
+            return proc
+
+        return WorkerSupervisor(workers, spawn, grace=grace, clock=clock), clock
+    return _make
+
+
+def test_start_spawns_one_process_per_worker(make, spawned):
+    sup, _ = make(4)
+    sup.start()
+    assert [p.worker_id for p in spawned] == [0, 1, 2, 3]
+    assert len(sup.alive()) == 4
+
+
+def test_a_crashed_worker_is_restarted_with_the_same_id(make, spawned):
+    sup, clock = make(2)
+    sup.start()
+    clock.now += supervisor.STABLE_UPTIME + 1   # a stable worker, then a crash
+    spawned[1].returncode = 1
+
+    sup.reap()   # notices the death
+    sup.reap()   # restart is due immediately: it was not crash-looping
+
+    assert sup.restarts == 1
+    assert spawned[-1].worker_id == 1
+    assert len(sup.alive()) == 2
+
+
+def test_a_crash_loop_backs_off_instead_of_spinning(make, spawned):
+    sup, clock = make(1)
+    sup.start()
+
+    spawned[-1].returncode = 1     # dies right after boot
+    sup.reap()
+    sup.reap()
+    assert sup.restarts == 0       # first retry waits 0.5s
+    clock.now += 0.5
+    sup.reap()
+    assert sup.restarts == 1
+
+    spawned[-1].returncode = 1     # and again: the delay doubles
+    sup.reap()
+    clock.now += 0.5
+    sup.reap()
+    assert sup.restarts == 1
+    clock.now += 0.5
+    sup.reap()
+    assert sup.restarts == 2
+
+
+def test_stop_forwards_sigterm_to_every_worker(make, spawned):
+    sup, _ = make(3)
+    sup.start()
+    sup.stop()
+    assert all(p.signals == [signal.SIGTERM] for p in spawned)
+    assert not any(p.killed for p in spawned)
+
+
+def test_a_worker_ignoring_sigterm_is_killed_after_the_grace(make, spawned):
+    sup, _ = make(2, grace=0.0)
+    sup.start()
+    spawned[0].exit_on_term = False
+    sup.stop()
+    assert spawned[0].killed
+    assert not spawned[1].killed
+
+
+def test_no_restart_while_stopping(make, spawned):
+    sup, _ = make(1)
+    sup.start()
+    sup.stopping = True
+    spawned[0].returncode = 0
+    sup.reap()
+    assert len(spawned) == 1
+
+
+@pytest.mark.parametrize("argv, expected", [
+    ([], 1),
+    (["--workers", "4"], 4),
+    (["--workers"], None),
+    (["--workers", "zero"], None),
+    (["--workers", "0"], None),
+])
+def test_parse_workers(argv, expected):
+    assert supervisor.parse_workers(argv) == expected
+
+
+def test_workers_refuse_the_single_process_sqlite_bus(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tools").mkdir()
+    monkeypatch.setenv("EVENT_BUS_DRIVER", "sqlite")
+    assert cli.main(["run", "--workers", "2"]) == 2
+    assert "single-process transport" in capsys.readouterr().out
+
+
+def test_invalid_workers_value_exits_two(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tools").mkdir()
+    assert cli.main(["run", "--workers", "many"]) == 2
+    assert "--workers <N>" in capsys.readouterr().out
+
+
+def test_the_shared_listener_is_inheritable():
+    sock = supervisor.bind_listener("127.0.0.1", 0)
+    try:
+        assert sock.get_inheritable()
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN)
+    finally:
+        sock.close()
@@ -0,0 +1,62 @@
+import pytest
+from tools.system.registry_tool import RegistryTool
+from domains.system.plugins.system_memory_plugin import SystemMemoryPlugin
+from domains.system.plugins.system_profile_plugin import SystemProfilePlugin
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class RecordingHttp:
+    def __init__(self):
+        self.endpoints = {}
+
+    def add_endpoint(self, path, method, handler, **kwargs):
+        self.endpoints[(method, path)] = kwargs
+
+
+class BusyRegistry:
+    def start_memory_tracing(self, frames):
+        raise RuntimeError("tracemalloc is already tracing 5 frame(s)")
+
+    async def take_memory_snapshot(self):
+        raise RuntimeError("Memory tracing is off: start it first.")
+
+    async def profile(self, seconds, interval_ms, idle, fmt):
+        raise RuntimeError("A profile is already running")
+
+    def validate_admin_token(self, token):
+        return None
+
+
+async def test_only_the_endpoints_that_change_the_process_need_the_admin_token():
+    http, registry = RecordingHttp(), RegistryTool()
+    await SystemMemoryPlugin(http, registry).on_boot()
+    await SystemProfilePlugin(http, registry).on_boot()
+
+    protected = {key for key, kwargs in http.endpoints.items() if kwargs.get("auth_validator")}
+    assert protected == {("POST", "/system/memory/tracing"), ("POST", "/system/memory/snapshots"),
+                         ("POST", "/system/profile")}
+
+
+def test_the_admin_token_is_refused_while_unset(monkeypatch):
+    tool = RegistryTool()
+    monkeypatch.delenv("SYSTEM_ADMIN_TOKEN", raising=False)
+    assert tool.validate_admin_token("") is None
+
+    monkeypatch.setenv("SYSTEM_ADMIN_TOKEN", "s3cret")
+    assert tool.validate_admin_token("s3cret") == {"sub": "admin"}
+    assert tool.validate_admin_token("guess") is None
+
+
+async def test_handlers_answer_without_an_http_context():
+    memory = SystemMemoryPlugin(RecordingHttp(), BusyRegistry())
+    profile = SystemProfilePlugin(RecordingHttp(), BusyRegistry())
+
+    assert (await memory.set_tracing({"frames": "25"}))["success"] is False
+    assert (await memory.take_snapshot({}))["success"] is False
+    assert (await profile.execute({"seconds": "1"}))["error"] == "A profile is already running"
@@ -0,0 +1,69 @@
+"""Envelope codecs (tools/event_bus/codec.py): what goes on the wire, and
+that any replica reads any label."""
+
+import pytest
+from tools.event_bus.codec import EnvelopeCodec
+from tools.event_bus.envelope import EventEnvelope
+
+
+def _envelope(**payload) -> EventEnvelope:
+    return EventEnvelope(event="user.created", payload=payload or {"id": 1},
+                         emitter="test", key="k", headers={"deadline": 1.5})
+
+
+def test_the_default_is_the_json_every_version_wrote():
+    envelope = _envelope()
+    codec = EnvelopeCodec()
+    assert codec.encode(envelope) == (envelope.model_dump_json().encode(), "json")
+    assert codec.pack(envelope) == envelope.model_dump_json()   # a TEXT row, as before
+    assert codec.unpack(envelope.model_dump_json(), EventEnvelope) == envelope
+
+
+def test_compression_starts_at_the_threshold():
+    codec = EnvelopeCodec("json", "zlib", compress_min_bytes=500)
+    small, large = _envelope(), _envelope(text="x" * 1000)
+
+    assert codec.encode(small)[1] == "json"
+    body, label = codec.encode(large)
+    assert label == "json+zlib" and len(body) < len(large.model_dump_json())
+    assert codec.decode(body, label, EventEnvelope) == large
+
+    frame = codec.pack(large)
+    assert isinstance(frame, bytes)
+    assert codec.unpack(frame, EventEnvelope) == large
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgpack"])
+def test_binary_codecs_round_trip(name):
+    pytest.importorskip(name)
+    envelope = _envelope(when="2026-10-17", ratio=0.25, tags=["a", "b"], none=None)
+    body, label = EnvelopeCodec(name).encode(envelope)
+
+    assert label == ("json" if name == "orjson" else "msgpack")
+    # The reader's own setting does not matter — only the label does.
+    assert EnvelopeCodec("json").decode(body, label, EventEnvelope) == envelope
+
+
+def test_zstd_round_trips():
+    pytest.importorskip("zstandard")
+    codec = EnvelopeCodec("json", "zstd", compress_min_bytes=0)
+    envelope = _envelope(text="y" * 1000)
+    body, label = codec.encode(envelope)
+    assert label == "json+zstd"
+    assert EnvelopeCodec().decode(body, label, EventEnvelope) == envelope
+
+
+def test_amqp_properties_carry_the_label():
+    assert EnvelopeCodec.content_type("msgpack+zstd") == ("application/msgpack", "zstd")
+    assert EnvelopeCodec.content_type("json") == ("application/json", None)
+    assert EnvelopeCodec.label_from_content_type("application/msgpack", "zstd") == "msgpack+zstd"
+    assert EnvelopeCodec.label_from_content_type(None, None) == "json"   # older publishers
+
+
+def test_unknown_settings_and_labels_are_refused():
+    with pytest.raises(ValueError):
+        EnvelopeCodec("xml")
+    with pytest.raises(ValueError):
+        EnvelopeCodec(compression="lz4")
+    with pytest.raises(ValueError):
+        EnvelopeCodec().decode(b"...", "json+lz4", EventEnvelope)
@@ -5,12 +5,13 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from tools.event_bus.event_bus_tool import EventBusTool, EventEnvelope
 from tools.event_bus.redis_streams_driver import RedisStreamsDriver, EventBusConnectionError
 from tests.helpers.async_wait import wait_until
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 # The parity requirement (Issue 22): every transport driver must pass this
 # exact suite. The redis variant skips itself if no server is reachable
@@ -263,6 +264,109 @@ async def test_delayed_delivery(bus):
     elapsed = asyncio.get_running_loop().time() - start
     assert 1.9 <= elapsed < 3.5, f"delay=2 delivered at {elapsed:.2f}s"
 
+async def test_publish_many_delivers_every_payload(bus):
+    seen = []
+
+    async def handler(env):
+        seen.append(env.payload["n"])
+
+    await bus.subscribe("test.bulk", handler)
+    await bus.publish_many("test.bulk", [{"n": n} for n in range(20)], key="k")
+
+    await wait_until(lambda: len(seen) == 20, timeout=10)
+    assert sorted(seen) == list(range(20))
+    published = [n for n in bus.get_trace_history()
+                 if n.kind == "published" and n.envelope.event == "test.bulk"]
+    assert [n.envelope.payload["n"] for n in published] == list(range(20))
+    assert all(n.envelope.key == "k" for n in published)
+
+async def test_publish_batch_mixed_events_and_delays(bus):
+    """Each envelope keeps its own event and hints; a delayed one in the batch
+    is still held for its delay."""
+    users, audits, later = AsyncMock(), AsyncMock(), AsyncMock()
+    await bus.subscribe("test.batch.user", users)
+    await bus.subscribe("test.batch.audit", audits)
+    await bus.subscribe("test.batch.later", later)
+
+    await bus.publish_batch([
+        ("test.batch.user", {"id": 1}),
+        ("test.batch.audit", {"id": 1}, {"key": "u1"}),
+        ("test.batch.later", {"id": 1}, {"delay": 2}),
+        ("test.batch.user", {"id": 2}),
+    ])
+
+    await wait_until(lambda: users.call_count == 2 and audits.call_count == 1, timeout=10)
+    later.assert_not_called()
+    await wait_until(lambda: later.called, timeout=10)
+
+async def test_publish_batch_is_all_or_nothing(bus):
+    with pytest.raises(Exception):
+        await bus.publish_batch([("test.batch.user", {"id": 1}),
+                                 ("test.batch.user", "not a dict")])
+    assert not [n for n in bus.get_trace_history() if n.envelope.event == "test.batch.user"]
+
+async def test_max_in_flight_bounds_concurrent_deliveries(bus):
+    """Every transport honors the bound; a durable reader is below it anyway
+    (it awaits each delivery before claiming the next)."""
+    running, peak, done = 0, 0, []
+
+    async def handler(env):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        done.append(env.payload["n"])
+
+    await bus.subscribe("test.bounded", handler, max_in_flight=2)
+    for n in range(10):
+        await bus.publish("test.bounded", {"n": n})
+
+    await wait_until(lambda: len(done) == 10, timeout=10)
+    assert peak <= 2 and sorted(done) == list(range(10))
+
+async def test_compressed_codec_round_trips(bus):
+    """A labelled, compressed body — delayed ones included — comes back as the
+    envelope that went in. (In-process never encodes: the bar is the same.)"""
+    from tools.event_bus.codec import EnvelopeCodec
+    if hasattr(bus._driver, "_codec"):
+        bus._driver._codec = EnvelopeCodec("json", "zlib", compress_min_bytes=0)
+    received = []
+
+    async def handler(env):
+        received.append(env.payload)
+
+    await bus.subscribe("test.codec", handler)
+    payload = {"text": "ünïcödé " * 200, "nested": {"n": [1, 2.5, None, True]}}
+    await bus.publish("test.codec", payload)
+    await bus.publish("test.codec", {"late": 1}, delay=1)
+
+    await wait_until(lambda: len(received) == 2, timeout=10)
+    assert received == [payload, {"late": 1}]
+
+async def test_subscribe_batch_hands_over_lists_and_acks_after(bus):
+    """Every envelope arrives exactly once, in lists no longer than max_batch;
+    a batch that fails is retried whole, and the redelivery is not needed
+    because the ack waits for the handler."""
+    batches, calls = [], 0
+
+    async def projector(events):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database hiccup")
+        batches.append([e.payload["n"] for e in events])
+
+    await bus.subscribe_batch("test.batched", projector, max_batch=5, max_wait_ms=50,
+                              retries=1, backoff=0.01)
+    await bus.publish_many("test.batched", [{"n": n} for n in range(12)])
+
+    await wait_until(lambda: sum(map(len, batches)) == 12, timeout=10)
+    await asyncio.sleep(0.2)
+    assert sorted(n for batch in batches for n in batch) == list(range(12))
+    assert all(len(batch) <= 5 for batch in batches)
+    assert len(batches) < 12
+
 async def test_capabilities_declared(bus):
     """Issue 30: every driver claims its semantics, and the manifest shows them."""
     caps = bus._driver.capabilities
@@ -284,9 +388,12 @@ def test_public_contract_frozen():
     assert public == {
         # BaseTool lifecycle
         "name", "setup", "get_interface_description", "on_boot_complete",
-        "on_instrument", "shutdown",
+        "on_instrument", "drain", "shutdown", "boot_complete_after", "circuit_breaker",
+        "single_flight",
         # The Bus semantic contract
         "subscribe", "unsubscribe", "publish", "request",
+        # Batched publish (Issue 45) and batch subscriptions (Issue 47)
+        "publish_many", "publish_batch", "subscribe_batch",
         # Observability
         "get_trace_history", "get_subscribers", "add_listener",
         "add_failure_listener", "SUBSCRIBER_DROPPED_EVENT",
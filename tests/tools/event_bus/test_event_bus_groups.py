@@ -1,11 +1,12 @@
 import asyncio
 import pytest
 from tools.event_bus.event_bus_tool import EventEnvelope
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
-def anyio_backend(): return "asyncio"
+def anyio_backend(): return loop_backend()
 
 async def test_consumer_groups_load_balancing(event_bus):
     """
@@ -56,3 +57,22 @@ async def test_different_groups_receive_all(event_bus):
 
     assert len(received_a) == 1
     assert len(received_b) == 1
+
+async def test_round_robin_survives_table_swaps(event_bus):
+    """Subscribing elsewhere rebuilds the dispatch table; a group's turn
+    carries on where it was instead of restarting at its first member."""
+    received = []
+
+    async def handler_a(event: EventEnvelope): received.append("a")
+    async def handler_b(event: EventEnvelope): received.append("b")
+    async def other(event: EventEnvelope): ...
+
+    await event_bus.subscribe("job.rr", handler_a, group="workers")
+    await event_bus.subscribe("job.rr", handler_b, group="workers")
+    await event_bus.publish("job.rr", {})
+    await event_bus.subscribe("job.other", other)
+    await event_bus.subscribe("job.rr", other, group="audit")
+    await event_bus.publish("job.rr", {})
+    await asyncio.sleep(0.1)
+
+    assert sorted(received) == ["a", "b"]
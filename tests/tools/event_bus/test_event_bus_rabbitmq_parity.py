@@ -14,6 +14,7 @@ import uuid
 import pytest
 
 from tools.event_bus.event_bus_tool import EventBusTool
+from tests.helpers.loops import loop_backend
 from extras.available_tools.rabbitmq.rabbitmq_driver import (
     RabbitMQDriver,
     EventBusConnectionError,
@@ -34,6 +35,12 @@ from tests.tools.event_bus.test_event_bus_broker_parity import (  # noqa: F401
     test_poisoned_escalation,
     test_rpc_unaffected,
     test_delayed_delivery,
+    test_publish_many_delivers_every_payload,
+    test_publish_batch_mixed_events_and_delays,
+    test_publish_batch_is_all_or_nothing,
+    test_max_in_flight_bounds_concurrent_deliveries,
+    test_compressed_codec_round_trips,
+    test_subscribe_batch_hands_over_lists_and_acks_after,
     test_capabilities_declared,
 )
 
@@ -42,7 +49,7 @@ pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 
 async def test_delayed_survives_publisher_death(bus):
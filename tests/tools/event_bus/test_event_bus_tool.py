@@ -2,14 +2,16 @@ import asyncio
 import threading
 
 import pytest
-from microcoreos import current_event_id_var
+from microcoreos import current_event_id_var, current_deadline_var
 from tools.event_bus.event_bus_tool import EventBusTool, EventEnvelope
+from tools.event_bus.backpressure import DeliveryGate, SpillStore, spill_path
 from tests.helpers.async_wait import wait_until
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
-def anyio_backend(): return "asyncio"
+def anyio_backend(): return loop_backend()
 
 async def test_subscribe_publish(event_bus):
     received = []
@@ -44,6 +46,85 @@ async def test_request_response(event_bus):
     result = await event_bus.request("validate", {"msg": "hello"})
     assert result == {"ok": True, "echo": "hello"}
 
+async def test_requests_share_one_reply_inbox(event_bus):
+    async def square(event: EventEnvelope):
+        await asyncio.sleep(0.01 * (5 - event.payload["n"]))   # answers out of order
+        return {"sq": event.payload["n"] ** 2}
+
+    async def silent(event: EventEnvelope):
+        await asyncio.sleep(0.2)
+        return {"late": True}
+
+    await event_bus.subscribe("math.sq", square)
+    await event_bus.subscribe("math.late", silent)
+    results = await asyncio.gather(*(event_bus.request("math.sq", {"n": n}) for n in range(5)))
+    assert [r["sq"] for r in results] == [0, 1, 4, 9, 16]
+
+    with pytest.raises(TimeoutError):
+        await event_bus.request("math.late", {}, timeout=0.05)
+    await asyncio.sleep(0.3)   # the late reply lands in the inbox and is dropped
+
+    inboxes = [e for e in event_bus.get_subscribers() if e.startswith("_reply.")]
+    assert len(inboxes) == 1
+    assert event_bus._sizes()["pending_replies"] == 0
+
+async def test_request_carries_its_deadline_to_the_responder(event_bus):
+    import time
+    from microcoreos import time_remaining
+
+    seen = []
+    async def handler(event: EventEnvelope):
+        seen.append(time_remaining())
+        return {"ok": True}
+
+    await event_bus.subscribe("budgeted", handler)
+    assert await event_bus.request("budgeted", {}, timeout=2) == {"ok": True}
+    assert 0 < seen[0] <= 2
+
+    # The caller's own deadline wins when it is sooner.
+    token = current_deadline_var.set(time.time() + 0.5)
+    try:
+        await event_bus.request("budgeted", {}, timeout=5)
+    finally:
+        current_deadline_var.reset(token)
+    assert 0 < seen[1] <= 0.5
+
+async def test_request_past_the_deadline(event_bus):
+    import time
+    from microcoreos import DeadlineExceededError
+
+    async def slow(event: EventEnvelope):
+        await asyncio.sleep(1)
+        return {"late": True}
+
+    await event_bus.subscribe("slow.rpc", slow)
+    token = current_deadline_var.set(time.time() + 0.05)
+    try:
+        with pytest.raises(DeadlineExceededError):
+            await event_bus.request("slow.rpc", {}, timeout=5)
+    finally:
+        current_deadline_var.reset(token)
+
+    token = current_deadline_var.set(time.time() - 1)
+    try:
+        with pytest.raises(DeadlineExceededError, match="not sent"):
+            await event_bus.request("slow.rpc", {})
+    finally:
+        current_deadline_var.reset(token)
+
+async def test_delivery_past_its_deadline_is_skipped(event_bus):
+    import time
+    from tools.event_bus.envelope import DEADLINE_HEADER
+
+    called = []
+    async def handler(event: EventEnvelope):
+        called.append(event)
+
+    await event_bus.subscribe("expired.rpc", handler)
+    await event_bus.publish("expired.rpc", {}, headers={DEADLINE_HEADER: time.time() - 1})
+    await wait_until(lambda: any(n.error == "deadline_exceeded" for n in event_bus.get_trace_history()))
+    assert called == []
+
 async def test_system_wide_observation_via_listener(event_bus):
     """There is no wildcard subscription: system-wide observation is
     add_listener's job (publish-side sink, zero transport cost)."""
@@ -245,6 +326,48 @@ async def test_ordering_is_per_key_not_global(event_bus):
             f"key {key!r} out of order: {seen}"
 
 
+async def test_batches_keep_per_key_order_with_publish(event_bus):
+    """A batch is one hand-off, but it joins the same per-key chains as
+    publish(): what was published before it under a key arrives before it,
+    what comes after arrives after."""
+    seen = []
+
+    async def handler(event: EventEnvelope):
+        seen.append((event.key, event.payload["n"]))
+
+    await event_bus.subscribe("order.batched", handler)
+    await event_bus.publish("order.batched", {"n": 0}, key="a")
+    await event_bus.publish_many("order.batched", [{"n": n} for n in range(1, 6)], key="a")
+    await event_bus.publish_batch([("order.batched", {"n": n}, {"key": key})
+                                   for n in range(6, 9) for key in ("a", "b")])
+    await event_bus.publish("order.batched", {"n": 9}, key="a")
+
+    await wait_until(lambda: len(seen) == 13, describe=lambda: {"seen": seen})
+    assert [n for k, n in seen if k == "a"] == list(range(10)), f"out of order: {seen}"
+    assert [n for k, n in seen if k == "b"] == [6, 7, 8]
+
+
+async def test_in_process_publish_hands_over_without_a_chain_task(event_bus):
+    """Nothing queued under the key, nothing delayed: the in-process driver
+    takes the envelope synchronously — no transport task, no chain entry. A
+    delayed publish still chains, and what follows it under its key waits."""
+    seen = []
+
+    async def handler(event: EventEnvelope):
+        seen.append(event.payload["n"])
+
+    await event_bus.subscribe("order.direct", handler)
+    await event_bus.publish("order.direct", {"n": 0})
+    assert event_bus._publish_chain == {}
+
+    await event_bus.publish("order.direct", {"n": 1}, delay=1)
+    await event_bus.publish("order.direct", {"n": 2})
+    assert "order.direct" in event_bus._publish_chain
+
+    await wait_until(lambda: len(seen) == 3, timeout=5, describe=lambda: {"seen": seen})
+    assert seen == [0, 1, 2]
+
+
 async def test_event_bus_async_listeners_and_failure_listeners(event_bus):
     listener_called = []
     failure_called = []
@@ -303,3 +426,308 @@ async def test_event_bus_get_name_unbound_function(event_bus):
 
     name = event_bus._get_name(raw_function)
     assert "raw_function" in name
+
+
+async def test_drain_waits_for_deliveries_and_their_publishes(event_bus):
+    forwarded = []
+
+    async def slow(env):
+        await asyncio.sleep(0.2)
+        await event_bus.publish("order.forwarded", env.payload)
+
+    async def sink(env):
+        forwarded.append(env.payload)
+
+    await event_bus.subscribe("order.placed", slow)
+    await event_bus.subscribe("order.forwarded", sink)
+    await event_bus.publish("order.placed", {"id": 1})
+    await asyncio.sleep(0.05)
+
+    await event_bus.drain(5)
+    assert forwarded == [{"id": 1}]
+
+
+async def test_drain_gives_up_at_its_budget(event_bus):
+    async def stuck(env):
+        await asyncio.sleep(3600)
+
+    await event_bus.subscribe("order.placed", stuck)
+    await event_bus.publish("order.placed", {"id": 1})
+    await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(event_bus.drain(0.1), timeout=2)
+    assert event_bus._pending_tasks   # left for shutdown() to cancel
+
+
+async def test_deliveries_over_the_concurrency_limit_wait_for_a_slot(event_bus):
+    from microcoreos import BasePlugin, ConcurrencyLimit
+    from microcoreos.concurrency import concurrency_limits
+
+    class WorkerPlugin(BasePlugin):
+        concurrency_limit = ConcurrencyLimit(initial_limit=1, max_limit=1)
+
+        def __init__(self):
+            self.running = self.peak = 0
+            self.done = []
+
+        async def on_job(self, event):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            self.done.append(event.payload["n"])
+
+    worker = WorkerPlugin()
+    worker._identity = "jobs.WorkerPlugin"
+    concurrency_limits.reset()
+    try:
+        await event_bus.subscribe("job.ready", worker.on_job)
+        for n in range(4):
+            await event_bus.publish("job.ready", {"n": n})
+        await wait_until(lambda: len(worker.done) == 4)
+
+        assert worker.peak == 1 and sorted(worker.done) == [0, 1, 2, 3]
+        stats = concurrency_limits.stats()[0]
+        assert stats["deferred"] >= 1 and stats["rejected"] == 0 and stats["in_flight"] == 0
+    finally:
+        concurrency_limits.reset()
+
+
+async def test_a_wildcard_concurrency_limit_leaves_the_reply_inbox_alone(event_bus, monkeypatch):
+    from microcoreos.concurrency import concurrency_limits
+
+    monkeypatch.setenv("MICROCOREOS_CONCURRENCY_LIMIT", "*")
+    concurrency_limits.reset()
+    try:
+        async def square(event):
+            await asyncio.sleep(0.01)
+            return {"n": event.payload["n"] ** 2}
+
+        await event_bus.subscribe("math.sq", square)
+        results = await asyncio.gather(
+            *(event_bus.request("math.sq", {"n": n}, timeout=2) for n in range(30)))
+
+        assert [r["n"] for r in results] == [n * n for n in range(30)]
+        assert not any("EventBusTool" in s["owner"] for s in concurrency_limits.stats())
+    finally:
+        concurrency_limits.reset()
+
+
+async def test_trace_log_samples_by_event_and_keeps_every_failure(event_bus):
+    from tools.event_bus.trace_log import TraceLog
+
+    event_bus._trace_log = TraceLog(maxlen=1000, sample_rate=0.25)
+
+    async def ok(event): ...
+
+    async def broken(event):
+        raise RuntimeError("boom")
+
+    await event_bus.subscribe("trace.ok", ok)
+    await event_bus.subscribe("trace.broken", broken)
+    for n in range(200):
+        await event_bus.publish("trace.ok", {"n": n})
+    for n in range(4):
+        await event_bus.publish("trace.broken", {"n": n})
+    await event_bus.drain(5)
+
+    history = event_bus.get_trace_history()
+    ok_nodes = [n for n in history if n.envelope.event == "trace.ok"]
+    published = {n.envelope.id for n in ok_nodes if n.kind == "published"}
+    delivered = {n.envelope.id for n in ok_nodes if n.kind == "delivered"}
+    assert 20 <= len(published) <= 80
+    assert delivered == published   # a sampled event is traced whole
+    failures = [n for n in history if n.envelope.event == "trace.broken" and n.kind == "delivered"]
+    assert len(failures) == 4 and all(not n.success and n.error == "boom" for n in failures)
+    assert failures[0].subscribers and failures[0].timestamp.tzinfo is not None
+
+
+def test_trace_log_is_a_bounded_ring(monkeypatch):
+    from tools.event_bus.trace_log import TraceLog
+
+    log = TraceLog(maxlen=3)
+    envelopes = [EventEnvelope(event="e", payload={"n": n}, emitter="t") for n in range(5)]
+    for envelope in envelopes:
+        log.published(envelope)
+    assert [n.envelope.payload["n"] for n in log.history()] == [2, 3, 4]
+
+    monkeypatch.setenv("EVENT_BUS_TRACE_MAXLEN", "0")
+    off = TraceLog()
+    off.delivered(envelopes[0], "x", False, "boom")
+    assert off.history() == []
+    with pytest.raises(ValueError):
+        TraceLog(sample_rate=2)
+
+
+async def test_a_paused_owner_is_held_until_the_set_changes(event_bus):
+    """Pausing names an owner prefix; resuming releases the held delivery at
+    once — the wait is on the set's change, not on a polling interval."""
+    seen = []
+
+    class WelcomePlugin:
+        _identity = "users.WelcomePlugin"
+
+        async def on_created(self, event):
+            seen.append(event.payload["n"])
+
+    plugin = WelcomePlugin()
+    await event_bus.subscribe("user.created", plugin.on_created)
+    event_bus._paused_owners.add("users")
+    await event_bus.publish("user.created", {"n": 1})
+    await asyncio.sleep(0.05)
+    assert seen == []
+
+    event_bus._paused_owners.add("orders")          # someone else: still held
+    await asyncio.sleep(0.05)
+    assert seen == []
+
+    resumed = asyncio.get_running_loop().time()
+    event_bus._paused_owners.discard("users")
+    await wait_until(lambda: seen == [1], timeout=1)
+    assert asyncio.get_running_loop().time() - resumed < 0.1
+
+    subscription = next(iter(event_bus._subscriptions.values()))
+    assert subscription.name == "users.WelcomePlugin.on_created"
+    assert subscription.prefixes == {"users", "users.WelcomePlugin", "users.WelcomePlugin.on_created"}
+
+
+class _Slow:
+    """A subscriber that holds every delivery until released."""
+    _identity = "jobs.SlowPlugin"
+
+    def __init__(self):
+        self.running = self.peak = 0
+        self.done = []
+        self.gate = asyncio.Event()
+
+    async def on_job(self, event):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await self.gate.wait()
+        self.running -= 1
+        self.done.append(event.payload["n"])
+
+
+async def test_a_bounded_subscriber_blocks_the_publisher_when_full(event_bus):
+    slow = _Slow()
+    await event_bus.subscribe("job.bounded", slow.on_job, max_in_flight=2, max_queue=3)
+
+    for n in range(5):   # 2 running + 3 queued: all fit
+        await event_bus.publish("job.bounded", {"n": n})
+    blocked = asyncio.create_task(event_bus.publish("job.bounded", {"n": 5}))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    [row] = event_bus.get_subscribers(queues=True)["job.bounded"]
+    assert row["subscriber"] == "jobs.SlowPlugin.on_job"
+    assert (row["in_flight"], row["queued"], row["blocked"]) == (2, 3, 1)
+    assert event_bus.get_subscribers()["job.bounded"] == ["jobs.SlowPlugin.on_job"]
+
+    slow.gate.set()
+    await blocked
+    await wait_until(lambda: len(slow.done) == 6)
+    assert slow.peak == 2 and sorted(slow.done) == list(range(6))
+
+
+async def test_drop_oldest_keeps_the_newest_and_traces_the_drop(event_bus):
+    slow = _Slow()
+    await event_bus.subscribe("job.lossy", slow.on_job, max_in_flight=1, max_queue=2,
+                              overflow="drop_oldest")
+    for n in range(6):   # never blocks: 0 runs, 1-3 are dropped, 4 and 5 wait
+        await event_bus.publish("job.lossy", {"n": n})
+
+    slow.gate.set()
+    await wait_until(lambda: len(slow.done) == 3)
+    assert slow.done == [0, 4, 5]
+    drops = [n for n in event_bus.get_trace_history() if n.error == "dropped_overflow"]
+    assert sorted(n.envelope.payload["n"] for n in drops) == [1, 2, 3]
+
+
+async def test_spill_goes_to_disk_and_comes_back_in_order(event_bus, tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_BUS_SPILL_PATH", str(tmp_path / "spill.db"))
+    slow = _Slow()
+    await event_bus.subscribe("job.spilled", slow.on_job, max_in_flight=1, max_queue=2,
+                              overflow="spill")
+    for n in range(20):
+        await event_bus.publish("job.spilled", {"n": n})
+    await wait_until(lambda: event_bus.get_subscribers(queues=True)["job.spilled"][0]["spilled"] == 17)
+
+    slow.gate.set()
+    await wait_until(lambda: len(slow.done) == 20)
+    assert slow.done == list(range(20))
+
+    with pytest.raises(ValueError):
+        await event_bus.subscribe("job.spilled", slow.on_job, max_in_flight=1, overflow="later")
+
+
+async def test_a_spilled_delivery_completes_only_when_it_runs(tmp_path):
+    """A durable driver acks when the delivery's future completes: for a
+    spilled one that must be after the handler ran, not when it hit disk."""
+    store = SpillStore(str(tmp_path / "spill.db"))
+    release, ran = asyncio.Event(), []
+
+    async def handle(envelope):
+        await release.wait()
+        ran.append(envelope.payload["n"])
+
+    gate = DeliveryGate("jobs.SlowPlugin.on_job", lambda e: asyncio.create_task(handle(e)),
+                        max_in_flight=1, max_queue=1, overflow="spill", spill=store,
+                        envelope_cls=EventEnvelope)
+    futures = [gate.submit(EventEnvelope(event="job.spilled", payload={"n": n}, emitter="test")) for n in range(5)]
+    await wait_until(lambda: gate.spilled == 3)
+    await asyncio.sleep(0.02)
+    assert not any(f.done() for f in futures)
+
+    release.set()
+    await asyncio.wait_for(asyncio.gather(*futures), 2)
+    assert ran == [0, 1, 2, 3, 4]
+    store.close()
+    assert not (tmp_path / "spill.db").exists()
+
+
+def test_each_worker_spills_to_a_file_of_its_own(monkeypatch):
+    monkeypatch.delenv("EVENT_BUS_SPILL_PATH", raising=False)
+    monkeypatch.delenv("MICROCOREOS_WORKER_ID", raising=False)
+    assert spill_path() == "event_bus_spill.db"
+    monkeypatch.setenv("MICROCOREOS_WORKER_ID", "2")
+    assert spill_path() == "event_bus_spill.worker2.db"
+    monkeypatch.setenv("EVENT_BUS_SPILL_PATH", "/var/tmp/spill.sqlite")
+    assert spill_path() == "/var/tmp/spill.worker2.sqlite"
+
+async def test_batch_handler_reports_failed_items(event_bus):
+    """Only the failed envelopes are retried; those still failing are
+    dead-lettered one by one, and the batch counts one strike."""
+    seen, dlq = [], []
+
+    async def projector(events):
+        seen.append([e.payload["n"] for e in events])
+        return {e.id: "odd row" for e in events if e.payload["n"] % 2}
+
+    async def dead_letters(event):
+        dlq.append(event.payload["original"]["payload"]["n"])
+
+    await event_bus.subscribe("_dlq.rows.imported", dead_letters)
+    await event_bus.subscribe_batch("rows.imported", projector, max_batch=10, max_wait_ms=20,
+                                    retries=1, backoff=0.01)
+    await event_bus.publish_many("rows.imported", [{"n": n} for n in range(4)])
+
+    await wait_until(lambda: len(dlq) == 2)
+    assert seen == [[0, 1, 2, 3], [1, 3]]
+    assert sorted(dlq) == [1, 3]
+    assert list(event_bus._consecutive_failures.values()) == [1]
+
+
+async def test_sync_batch_handler_and_unsubscribe_flushes(event_bus):
+    got = []
+
+    def writer(events):   # runs on the subscriber's pool, like any sync handler
+        got.append(len(events))
+
+    await event_bus.subscribe_batch("rows.synced", writer, max_batch=100, max_wait_ms=60_000)
+    for n in range(3):
+        await event_bus.publish("rows.synced", {"n": n})
+    await asyncio.sleep(0.05)
+    assert got == []   # neither full nor timed out
+
+    await event_bus.unsubscribe("rows.synced", writer)
+    await wait_until(lambda: got == [3])
@@ -14,13 +14,14 @@ import asyncio
 import pytest
 from tools.event_bus.event_bus_tool import EventBusTool, InProcessDriver
 from tools.event_bus.redis_streams_driver import RedisStreamsDriver, EventBusConnectionError
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 
 async def _make_bus(monkeypatch) -> EventBusTool:
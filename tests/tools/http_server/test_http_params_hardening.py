@@ -3,12 +3,13 @@ from httpx import AsyncClient, ASGITransport
 from tools.http_server.http_server_tool import HttpServerTool
 from unittest.mock import AsyncMock
 from pydantic import BaseModel
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 async def test_http_path_param_merging_with_body():
     """
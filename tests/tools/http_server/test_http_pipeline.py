@@ -11,6 +11,14 @@ from tools.http_server.pipeline import (
 )
 from tools.http_server.context import HttpContext
 from pydantic import BaseModel
+from tests.helpers.loops import loop_backend
+
+
+@pytest.fixture
+def anyio_backend():
+    # The pipeline runs sync work on the kernel's asyncio thread pools: any
+    # asyncio loop (asyncio's own, uvloop), never trio.
+    return loop_backend()
 
 
 class SampleModel(BaseModel):
@@ -220,3 +228,94 @@ async def test_process_request_manual_form_extraction():
     )
     assert res.status_code == 200
     assert captured.get("username") == "john"
+
+
+def _plain_request(headers: dict):
+    req = MagicMock(spec=Request)
+    req.query_params = {}
+    req.path_params = {}
+    req.headers = Headers(headers)
+    req.method = "GET"
+    req.url.path = "/budget"
+    return req
+
+
+@pytest.mark.anyio
+async def test_process_request_seeds_the_deadline_from_timeout_and_header():
+    from microcoreos import time_remaining
+
+    seen = []
+
+    async def handler(data, ctx):
+        seen.append(time_remaining())
+        return {"success": True}
+
+    await _process_request(_plain_request({}), None, handler, None, set())
+    await _process_request(_plain_request({}), None, handler, None, set(), timeout=5)
+    # The client may shorten the budget, never extend it.
+    await _process_request(_plain_request({"X-Request-Timeout": "1"}), None, handler, None, set(), timeout=5)
+    await _process_request(_plain_request({"X-Request-Timeout": "60"}), None, handler, None, set(), timeout=5)
+    await _process_request(_plain_request({"X-Request-Timeout": "nan"}), None, handler, None, set())
+
+    assert seen[0] is None
+    assert 4 < seen[1] <= 5
+    assert 0 < seen[2] <= 1
+    assert 4 < seen[3] <= 5
+    assert seen[4] is None
+
+
+@pytest.mark.anyio
+async def test_process_request_deadline_exceeded_is_504():
+    from microcoreos import DeadlineExceededError
+
+    async def handler(data, ctx):
+        raise DeadlineExceededError("db.query cancelled")
+
+    res = await _process_request(_plain_request({}), None, handler, None, set(), timeout=1)
+    assert res.status_code == 504
+    assert b"Deadline exceeded" in res.body
+
+
+@pytest.mark.anyio
+async def test_process_request_over_the_concurrency_limit_503_with_retry_after():
+    import asyncio
+    from microcoreos import BasePlugin, ConcurrencyLimit, concurrency_stats
+    from microcoreos.concurrency import concurrency_limits
+
+    class GatedPlugin(BasePlugin):
+        concurrency_limit = ConcurrencyLimit(initial_limit=1, max_limit=1)
+
+        def __init__(self):
+            self.gate = asyncio.Event()
+
+        async def execute(self, data, ctx):
+            await self.gate.wait()
+            return {"success": True}
+
+    def request():
+        req = MagicMock(spec=Request)
+        req.query_params = {}
+        req.path_params = {}
+        req.headers = Headers({})
+        req.method = "GET"
+        req.url.path = "/gated"
+        return req
+
+    plugin = GatedPlugin()
+    plugin._identity = "gates.GatedPlugin"
+    concurrency_limits.reset()
+    try:
+        first = asyncio.create_task(_process_request(request(), None, plugin.execute, None, set()))
+        await asyncio.sleep(0.01)
+
+        shed = await _process_request(request(), None, plugin.execute, None, set())
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "1"
+
+        plugin.gate.set()
+        assert (await first).status_code == 200
+        stats, = concurrency_stats()
+        assert (stats["owner"], stats["in_flight"], stats["accepted"], stats["rejected"]) == \
+            ("gates.GatedPlugin", 0, 1, 1)
+    finally:
+        concurrency_limits.reset()
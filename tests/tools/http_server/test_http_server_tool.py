@@ -1,14 +1,16 @@
 import os
+import asyncio
 
 import pytest
 from httpx import AsyncClient, ASGITransport
 from tools.http_server.http_server_tool import HttpServerTool, HttpContext
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 @pytest.fixture
 def tool():
@@ -525,3 +527,57 @@ async def test_http_server_on_boot_complete_and_shutdown(monkeypatch):
     assert t._server_task is not None
     await t.shutdown()
     assert t._server.should_exit is True
+
+
+async def test_worker_mode_serves_on_the_inherited_socket(monkeypatch):
+    """`microcoreos run --workers N`: the supervisor binds once and hands each
+    worker the descriptor — the tool must serve on it, not bind HTTP_PORT."""
+    import socket
+    from tools.http_server import http_server_tool as module
+
+    served = {}
+
+    class RecordingServer:
+        def __init__(self, config):
+            self.should_exit = False
+        async def serve(self, sockets=None):
+            served["sockets"] = sockets
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    monkeypatch.setattr(module.uvicorn, "Server", RecordingServer)
+    monkeypatch.setenv("HTTP_SOCKET_FD", str(listener.fileno()))
+
+    t = HttpServerTool()
+    await t.on_boot_complete(None)
+    await t._server_task
+
+    (sock,) = served["sockets"]
+    assert sock.fileno() == listener.fileno()
+    assert sock.getsockname() == listener.getsockname()
+    sock.detach()  # the listener owns the descriptor
+    listener.close()
+
+
+async def test_drain_stops_accepting_and_gives_up_at_its_budget():
+    """drain() tells uvicorn to stop accepting; past the budget it stops
+    waiting for open connections (force_exit) without cancelling the server."""
+    t = HttpServerTool()
+    await t.setup()
+    release = asyncio.Event()
+
+    class LingeringServer:
+        def __init__(self):
+            self.should_exit = False
+            self.force_exit = False
+        async def serve(self):
+            await release.wait()   # a connection that will not close
+
+    t._server = LingeringServer()
+    await t.on_boot_complete(None)
+    await t.drain(0.05)
+    assert t._server.should_exit and t._server.force_exit
+    assert not t._server_task.done()
+    release.set()
+    await t.shutdown()
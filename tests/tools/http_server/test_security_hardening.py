@@ -4,11 +4,12 @@ from httpx import AsyncClient, ASGITransport
 from microcoreos import current_identity_var
 from tools.event_bus.event_bus_tool import EventEnvelope
 from tools.http_server.http_server_tool import HttpServerTool, HttpContext
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
-def anyio_backend(): return "asyncio"
+def anyio_backend(): return loop_backend()
 
 @pytest.fixture
 def http_tool():
@@ -0,0 +1,134 @@
+import asyncio
+import time
+import tracemalloc
+import pytest
+from microcoreos import current_identity_var, metered, run_sync
+from microcoreos.instrumentation import install_meter
+from tools.system.accounting import ResourceAccounting, accounting
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def burn(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+async def test_cpu_is_charged_per_step_and_waiting_is_not():
+    books = ResourceAccounting()
+
+    async def handler():
+        burn(0.05)
+        await asyncio.sleep(0.1)     # waiting: wall time, not CPU
+        burn(0.05)
+        return "done"
+
+    current_identity_var.set("orders.CheckoutPlugin.execute")
+    assert await books.metered(handler()) == "done"
+
+    usage = books.stats()["orders.CheckoutPlugin"]
+    assert usage["calls"] == 1 and usage["steps"] == 2
+    assert 90 <= usage["cpu_ms"] < 150
+    assert usage["wall_ms"] >= 190
+    assert usage["handlers"]["execute"]["cpu_ms"] == usage["cpu_ms"]
+
+
+async def test_a_nested_call_is_charged_to_its_own_identity_only():
+    books = ResourceAccounting()
+
+    async def inner():
+        burn(0.05)
+
+    async def outer():
+        burn(0.05)
+        token = current_identity_var.set("billing.InvoicePlugin.on_order")
+        try:
+            await books.metered(inner())
+        finally:
+            current_identity_var.reset(token)
+
+    current_identity_var.set("orders.CheckoutPlugin.execute")
+    await books.metered(outer())
+
+    stats = books.stats()
+    assert 40 <= stats["orders.CheckoutPlugin"]["cpu_ms"] < 80
+    assert 40 <= stats["billing.InvoicePlugin"]["cpu_ms"] < 80
+
+
+async def test_sync_work_on_a_pool_is_charged_to_its_caller():
+    accounting.reset()
+    install_meter(accounting.metered, accounting.charge)
+    try:
+        current_identity_var.set("reports.RenderPlugin.render")
+        await metered(run_sync("domain.reports", burn, 0.05))
+    finally:
+        install_meter(None, None)
+
+    usage = accounting.stats()["reports.RenderPlugin"]
+    assert usage["calls"] == 1
+    assert usage["cpu_ms"] >= 45
+    accounting.reset()
+
+
+async def test_without_a_meter_installed_nothing_is_measured():
+    accounting.reset()
+    current_identity_var.set("reports.RenderPlugin.render")
+    handler = run_sync("domain.reports", burn, 0.01)
+    assert metered(handler) is handler
+    await handler
+    assert accounting.stats() == {}
+
+
+async def test_a_failing_or_cancelled_handler_is_still_charged():
+    books = ResourceAccounting()
+
+    async def boom():
+        burn(0.02)
+        raise ValueError("boom")
+
+    current_identity_var.set("x.BoomPlugin.execute")
+    with pytest.raises(ValueError):
+        await books.metered(boom())
+
+    task = asyncio.ensure_future(books.metered(asyncio.sleep(10)))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    usage = books.stats()["x.BoomPlugin"]
+    assert usage["calls"] == 2 and usage["cpu_ms"] >= 15
+
+
+async def test_allocations_are_counted_while_tracemalloc_traces():
+    books = ResourceAccounting()
+    kept = []
+
+    async def hoard():
+        kept.append(bytearray(1_000_000))
+
+    current_identity_var.set("x.HoardPlugin.execute")
+    await books.metered(hoard())
+    assert books.stats()["x.HoardPlugin"]["alloc_bytes"] == 0
+
+    tracemalloc.start()
+    try:
+        await books.metered(hoard())
+    finally:
+        tracemalloc.stop()
+    assert books.stats()["x.HoardPlugin"]["alloc_bytes"] >= 1_000_000
+
+
+def test_identities_that_name_no_plugin_method_stand_alone():
+    books = ResourceAccounting()
+    books.charge("system", 0.001)
+    books.charge("whoami", 0.002)
+    stats = books.stats()
+    assert stats["system"]["cpu_ms"] == 1.0 and stats["system"]["handlers"] == {}
+    assert stats["whoami"]["cpu_ms"] == 2.0
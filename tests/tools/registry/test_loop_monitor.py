@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+import pytest
+from microcoreos import current_identity_var
+from tools.system.loop_monitor import LoopMonitor
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monkeypatch.setenv("MICROCOREOS_LOOP_MONITOR_MS", "50")
+    monitor = LoopMonitor()
+    yield monitor
+    monitor.shutdown()
+
+
+async def blocking_handler():
+    current_identity_var.set("orders.CheckoutPlugin.execute")
+    time.sleep(0.3)     # the sync call hiding in an async handler
+
+
+async def test_a_blocking_handler_is_charged_with_the_stall(monitor):
+    assert monitor.start()
+    await asyncio.sleep(0.15)
+    await asyncio.create_task(blocking_handler())
+    await asyncio.sleep(0.15)
+
+    stats = monitor.stats()
+    assert stats["enabled"] and stats["threshold_ms"] == 50
+    assert stats["stalls"] == 1
+    [offender] = stats["offenders"]
+    assert offender["identity"] == "orders.CheckoutPlugin.execute"
+    assert offender["coroutine"] == "blocking_handler"
+    assert offender["where"].startswith("blocking_handler (tests/tools/registry/test_loop_monitor.py:")
+    assert offender["count"] == 1 and offender["max_ms"] >= 150
+    assert stats["samples"] >= 2 and stats["lag_ms"]["max"] >= 150
+
+
+async def test_a_healthy_loop_has_no_offenders(monitor):
+    assert monitor.start()
+    for _ in range(5):
+        await asyncio.sleep(0.05)
+    stats = monitor.stats()
+    assert stats["stalls"] == 0 and stats["offenders"] == []
+    assert stats["samples"] >= 1
+
+
+@pytest.mark.parametrize("threshold", [None, "0"])
+async def test_without_a_threshold_lag_is_measured_but_stalls_are_not_attributed(monkeypatch, threshold):
+    if threshold is None:
+        monkeypatch.delenv("MICROCOREOS_LOOP_MONITOR_MS", raising=False)
+    else:
+        monkeypatch.setenv("MICROCOREOS_LOOP_MONITOR_MS", threshold)
+    monitor = LoopMonitor()
+    threads = {t.name for t in threading.enumerate()}
+    try:
+        assert not monitor.start()
+        assert "loop-monitor" not in {t.name for t in threading.enumerate()} - threads
+        await asyncio.sleep(0.15)
+        await asyncio.create_task(blocking_handler())
+        await asyncio.sleep(0.15)
+        stats = monitor.stats()
+    finally:
+        monitor.shutdown()
+    assert stats["enabled"] and stats["threshold_ms"] == 0
+    assert stats["samples"] >= 2 and stats["lag_ms"]["max"] >= 150
+    assert stats["stalls"] == 0 and stats["offenders"] == []
+
+
+def test_stats_before_start_are_empty():
+    stats = LoopMonitor().stats()
+    assert stats == {"enabled": False, "threshold_ms": 0.0, "samples": 0,
+                     "lag_ms": {}, "stalls": 0, "offenders": []}
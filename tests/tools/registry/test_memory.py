@@ -0,0 +1,103 @@
+import gc
+import os
+import tracemalloc
+import pytest
+from microcoreos import track_sizes
+from tools.system.memory import MemoryInspector, MAX_SNAPSHOTS
+
+
+@pytest.fixture
+def inspector():
+    was_tracing = tracemalloc.is_tracing()
+    inspector = MemoryInspector()
+    yield inspector
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+_hoard = []
+
+
+def leak(n):
+    _hoard.extend(bytearray(1024) for _ in range(n))
+
+
+def test_tracing_is_off_until_started(inspector):
+    if tracemalloc.is_tracing():
+        pytest.skip("PYTHONTRACEMALLOC is set")
+    status = inspector.status()
+    assert status["tracing"] is False and status["traced_bytes"] == 0
+    with pytest.raises(RuntimeError):
+        inspector.take_snapshot()
+
+    assert inspector.start_tracing(frames=5)["frames"] == 5
+    with pytest.raises(RuntimeError):
+        inspector.start_tracing(frames=10)     # another limit needs a stop first
+    inspector.take_snapshot()
+    status = inspector.stop_tracing()
+    assert status["tracing"] is False and status["snapshots"] == []
+
+
+def test_diff_by_line_points_at_the_allocation(inspector):
+    inspector.start_tracing(frames=1)
+    first = inspector.take_snapshot()["id"]
+    leak(200)
+    second = inspector.take_snapshot()["id"]
+    try:
+        diff = inspector.diff(first, second, top=3)
+    finally:
+        _hoard.clear()
+
+    growth = diff["top"][0]
+    assert growth["where"].startswith(os.path.join("tests", "tools", "registry", "test_memory.py") + ":")
+    assert growth["size_diff"] >= 200 * 1024 and growth["count_diff"] >= 200
+    assert diff["size_diff"] >= 200 * 1024 and len(diff["top"]) <= 3
+
+
+def test_diff_by_owner_charges_the_named_owner(inspector):
+    inspector.start_tracing(frames=5)
+    inspector.name_owners({__file__: "orders.CheckoutPlugin"})
+    first = inspector.take_snapshot()["id"]
+    leak(200)
+    second = inspector.take_snapshot()["id"]
+    try:
+        diff = inspector.diff(first, second, group_by="owner")
+    finally:
+        _hoard.clear()
+
+    assert diff["top"][0]["owner"] == "orders.CheckoutPlugin"
+    assert diff["top"][0]["size_diff"] >= 200 * 1024
+
+    with pytest.raises(ValueError):
+        inspector.diff(first, second, group_by="module")
+    with pytest.raises(KeyError):
+        inspector.diff(first, 999)
+
+
+def test_only_the_last_snapshots_are_kept(inspector):
+    inspector.start_tracing(frames=1)
+    ids = [inspector.take_snapshot()["id"] for _ in range(MAX_SNAPSHOTS + 2)]
+    assert [s["id"] for s in inspector.status()["snapshots"]] == ids[-MAX_SNAPSHOTS:]
+
+
+def test_sizes_never_keep_their_owner_alive(inspector):
+    class Cache:
+        def __init__(self):
+            self.entries = {"a": 1, "b": 2}
+
+        def sizes(self):
+            return {"entries": len(self.entries)}
+
+        def broken(self):
+            return 1 / 0
+
+    cache = Cache()
+    track_sizes("cache", cache.sizes)
+    track_sizes("broken", cache.broken)
+    sizes = inspector.sizes()
+    assert sizes["cache"] == {"entries": 2}
+    assert "division by zero" in sizes["broken"]["error"]
+
+    del cache
+    gc.collect()
+    assert not {"cache", "broken"} & set(inspector.sizes())
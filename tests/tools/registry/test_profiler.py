@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from microcoreos import current_identity_var, run_sync
+from tools.system.profiler import ProfilerBusyError, sample_stacks
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def crunch_numbers(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+async def test_samples_are_attributed_to_the_identity_doing_the_work():
+    async def pool_work():
+        current_identity_var.set("reports.RenderPlugin.render")
+        await run_sync("domain.reports", crunch_numbers, 0.4)
+
+    async def loop_work():
+        current_identity_var.set("orders.CheckoutPlugin.execute")
+        await asyncio.sleep(0.05)
+        crunch_numbers(0.2)     # a handler hogging the event loop
+
+    profiling = asyncio.ensure_future(sample_stacks(0.3, interval_ms=5))
+    await asyncio.gather(pool_work(), loop_work())
+    profile = await profiling
+
+    lines = profile.collapsed().splitlines()
+    assert any(line.startswith("pool-domain.reports;reports.RenderPlugin.render;")
+               and "crunch_numbers" in line for line in lines)
+    assert any(line.startswith("MainThread;orders.CheckoutPlugin.execute;")
+               and "crunch_numbers" in line for line in lines)
+    assert profile.samples == sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+
+
+async def test_idle_threads_are_left_out_unless_asked_for():
+    assert not any("_worker" in line.split(";")[-1] for line in (await sample_stacks(0.05)).collapsed().splitlines())
+    await run_sync("default", lambda: None)   # at least one pool thread, waiting for work
+    idle = await sample_stacks(0.05, idle=True)
+    assert any("_worker" in line for line in idle.collapsed().splitlines())
+
+
+async def test_speedscope_output_is_a_sampled_profile_per_thread():
+    work = asyncio.ensure_future(run_sync("domain.reports", crunch_numbers, 0.2))
+    doc = (await sample_stacks(0.1, interval_ms=5)).speedscope()
+    await work
+
+    assert doc["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    frames = doc["shared"]["frames"]
+    [reports] = [p for p in doc["profiles"] if p["name"] == "pool-domain.reports"]
+    assert reports["type"] == "sampled" and reports["unit"] == "milliseconds"
+    assert len(reports["samples"]) == len(reports["weights"])
+    assert all(0 <= i < len(frames) for sample in reports["samples"] for i in sample)
+    assert reports["endValue"] == sum(reports["weights"])
+
+
+async def test_one_profile_at_a_time():
+    first = asyncio.ensure_future(sample_stacks(0.2))
+    await asyncio.sleep(0.05)
+    with pytest.raises(ProfilerBusyError):
+        await sample_stacks(0.1)
+    await first
+
+
+async def test_arguments_are_bounded():
+    with pytest.raises(ValueError):
+        await sample_stacks(0)
+    with pytest.raises(ValueError):
+        await sample_stacks(61)
+    with pytest.raises(ValueError):
+        await sample_stacks(1, interval_ms=0.5)
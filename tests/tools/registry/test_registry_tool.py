@@ -1,5 +1,13 @@
+import asyncio
+import inspect
+import pytest
+from microcoreos import metered
+from microcoreos.instrumentation import cpu_charge
 from tools.system.registry_tool import RegistryTool
+from tools.system.loop_monitor import loop_monitor
+from tools.system.memory import memory_inspector
 from microcoreos.container import Container
+from microcoreos.registry import Registry
 
 
 def test_registry_tool_uninitialized():
@@ -17,6 +25,7 @@ def test_registry_tool_uninitialized():
 
     desc = tool.get_interface_description()
     assert "Systems Registry Tool" in desc
+    tool.shutdown()
 
 
 def test_registry_tool_initialized_via_container():
@@ -50,3 +59,122 @@ def test_registry_tool_initialized_via_container():
     sinks = []
     tool.add_metrics_sink(lambda record: sinks.append(record))
     assert len(container._metrics_sinks) == 1
+
+
+def test_accounting_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MICROCOREOS_ACCOUNTING", raising=False)
+    RegistryTool().setup()
+    assert cpu_charge() is None
+
+    monkeypatch.setenv("MICROCOREOS_ACCOUNTING", "true")
+    tool = RegistryTool()
+    tool.setup()
+    try:
+        assert cpu_charge() is not None
+        handler = asyncio.sleep(0)
+        assert metered(handler) is not handler
+        handler.close()
+    finally:
+        tool.shutdown()
+    assert cpu_charge() is None
+
+
+def test_boot_complete_names_memory_owners_and_starts_the_loop_monitor(monkeypatch):
+    monkeypatch.delenv("MICROCOREOS_LOOP_MONITOR_MS", raising=False)
+    container = Container()
+    tool = RegistryTool()
+    container.register(tool)
+
+    async def boot_and_stop():
+        await tool.on_boot_complete(container)
+        try:
+            return loop_monitor.running
+        finally:
+            tool.shutdown()
+
+    assert asyncio.run(boot_and_stop())
+    assert not loop_monitor.running
+    assert memory_inspector._owners[inspect.getsourcefile(RegistryTool)] == "registry"
+
+
+def test_boot_profile_is_read_from_the_core_registry():
+    tool = RegistryTool()
+    assert tool.get_boot_profile() == {"tools": {}, "plugins": {}, "summary": {}}
+
+    core = Registry()
+    core.record_boot_timing("tools", "db", "setup", 12.3456)
+    tool._set_core_registry(core)
+    assert tool.get_boot_profile()["tools"] == {"db": {"setup": 12.346}}
+
+
+def test_latency_stats_come_from_the_container():
+    tool = RegistryTool()
+    assert tool.get_latency_stats() == []
+
+    container = Container()
+    container.register(tool)
+    container.get("registry").get_system_dump()
+    stats = tool.get_latency_stats(window_seconds=300)
+    assert [(s["tool"], s["method"], s["count"]) for s in stats] == [("registry", "get_system_dump", 1)]
+
+
+def test_executor_stats_list_the_process_pools():
+    stats = RegistryTool().get_executor_stats()
+    assert isinstance(stats, list)
+    assert all({"pool", "size", "active", "queued", "wait_ms"} <= set(s) for s in stats)
+
+
+def test_profile_returns_collapsed_stacks_or_a_speedscope_file():
+    tool = RegistryTool()
+    assert isinstance(asyncio.run(tool.profile(0.05)), str)
+    assert "profiles" in asyncio.run(tool.profile(0.05, format="speedscope"))
+    with pytest.raises(ValueError):
+        asyncio.run(tool.profile(0.05, format="pprof"))
+
+
+def test_loop_stats_come_from_the_loop_monitor():
+    stats = RegistryTool().get_loop_stats(window_seconds=30, top=5)
+    assert {"enabled", "threshold_ms", "lag_ms", "stalls", "offenders"} <= set(stats)
+
+
+def test_resource_usage_comes_from_the_accounting():
+    from tools.system.accounting import accounting
+    accounting.charge("users.CreateUserPlugin.execute", 0.004)
+    usage = RegistryTool().get_resource_usage()["users.CreateUserPlugin"]
+    assert usage["cpu_ms"] >= 4.0 and "execute" in usage["handlers"]
+
+
+def test_memory_snapshots_and_diff_go_through_the_inspector():
+    import tracemalloc
+    tool = RegistryTool()
+    report = tool.get_memory_report()
+    assert {"tracing", "traced_bytes", "snapshots", "sizes"} <= set(report)
+
+    was_tracing = tracemalloc.is_tracing()
+    tool.start_memory_tracing(frames=1)
+    try:
+        first = asyncio.run(tool.take_memory_snapshot())["id"]
+        second = asyncio.run(tool.take_memory_snapshot())["id"]
+        diff = asyncio.run(tool.diff_memory_snapshots(first, second, group_by="owner"))
+        assert (diff["from_id"], diff["to_id"], diff["group_by"]) == (first, second, "owner")
+    finally:
+        if not was_tracing:
+            assert tool.stop_memory_tracing()["snapshots"] == []
+
+
+def test_concurrency_stats_come_from_the_limiters():
+    from microcoreos import BasePlugin, ConcurrencyLimit
+    from microcoreos.concurrency import concurrency_limits
+
+    class CheckoutPlugin(BasePlugin):
+        concurrency_limit = ConcurrencyLimit(initial_limit=7)
+
+        def execute(self, data, context=None): ...
+
+    concurrency_limits.reset()
+    try:
+        concurrency_limits.limiter_for(CheckoutPlugin().execute, "orders.CheckoutPlugin.execute")
+        stats, = RegistryTool().get_concurrency_stats()
+        assert (stats["owner"], stats["limit"]) == ("orders.CheckoutPlugin", 7)
+    finally:
+        concurrency_limits.reset()
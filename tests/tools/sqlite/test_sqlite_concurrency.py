@@ -1,12 +1,13 @@
 import asyncio
 import pytest
 from tools.sqlite.sqlite_tool import SqliteTool, DatabaseError
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 @pytest.fixture
 async def db(tmp_path):
@@ -13,13 +13,14 @@ import pytest
 
 from tools.event_bus.event_bus_tool import EventBusTool
 from tools.event_bus.sqlite_driver import SQLiteDriver
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 
 @pytest.fixture
@@ -153,3 +154,42 @@ async def test_driver_selected_by_env_var(queue_path, monkeypatch):
     monkeypatch.setenv("EVENT_BUS_DRIVER", "sqlite")
     bus = EventBusTool()
     assert type(bus._driver).__name__ == "SQLiteDriver"
+
+
+async def test_drain_finishes_the_claimed_row_and_leaves_the_rest(queue_path):
+    """A draining replica acks what it started and claims nothing new: the
+    backlog waits in the queue for the next consumer, none of it redelivered."""
+    started, release = asyncio.Event(), asyncio.Event()
+    seen_a, seen_b = [], []
+
+    def make_slow():
+        async def on_event(env):
+            started.set()
+            await release.wait()
+            seen_a.append(env.payload)
+        return on_event
+
+    def make_recorder():
+        async def on_event(env):
+            seen_b.append(env.payload)
+        return on_event
+
+    bus_a = await make_bus()
+    await bus_a.subscribe("orders.created", make_slow(), group="workers")
+    for i in range(3):
+        await bus_a.publish("orders.created", {"id": i})
+    await asyncio.wait_for(started.wait(), timeout=2)
+
+    drain = asyncio.create_task(bus_a.drain(5))
+    await asyncio.sleep(0.1)
+    assert not drain.done()            # waiting for the handler, not cancelling it
+    release.set()
+    await asyncio.wait_for(drain, timeout=2)
+    await bus_a.shutdown()
+    assert seen_a == [{"id": 0}]
+
+    bus_b = await make_bus()
+    await bus_b.subscribe("orders.created", make_recorder(), group="workers")
+    await asyncio.sleep(0.3)
+    await bus_b.shutdown()
+    assert seen_b == [{"id": 1}, {"id": 2}]
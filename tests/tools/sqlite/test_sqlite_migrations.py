@@ -1,11 +1,12 @@
 import pytest
 from tools.sqlite.sqlite_tool import SqliteTool
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 @pytest.fixture
 async def db(monkeypatch, tmp_path):
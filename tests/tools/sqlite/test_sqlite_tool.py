@@ -1,13 +1,14 @@
 import pytest
 
 from tools.sqlite.sqlite_tool import SqliteTool, _normalize_sql
+from tests.helpers.loops import loop_backend
 
 pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
 def anyio_backend():
-    return "asyncio"
+    return loop_backend()
 
 
 @pytest.fixture
@@ -0,0 +1,311 @@
+"""
+Enterprise Event Bus — Bounded Delivery Queues (backpressure)
+=============================================================
+Unbounded, a burst of 100k events to a slow in-process subscriber is 100k
+pending tasks in memory. A subscription that opts in
+
+    await bus.subscribe("order.placed", self.on_order,
+                        max_in_flight=8, max_queue=1000, overflow="block")
+
+gets a DeliveryGate: at most `max_in_flight` deliveries run at once, up to
+`max_queue` more wait in a FIFO (an envelope each, no task), and past that
+the overflow policy decides:
+
+- "block":       publish() waits for room in the queue — backpressure on
+                 the publisher. A delivery that arrives some other way (a
+                 broker reader, a handler publishing to its own event) is
+                 queued anyway: block never drops.
+- "drop_oldest": the oldest queued delivery is dropped (traced as
+                 "dropped_overflow") to make room.
+- "spill":       overflow goes to a local SQLite file (EVENT_BUS_SPILL_PATH)
+                 and comes back, in order, as the queue drains. It trades
+                 memory for disk, not durability: the file is cleared at
+                 boot, like the in-process queue it relieves. A spilled
+                 delivery completes when it RUNS, not when it is written, so
+                 a durable driver never acks a message whose only copy is
+                 in the scratch file. Each worker of `run --workers N` has a
+                 file of its own.
+
+Durable drivers already bound themselves — their readers await each
+delivery before claiming the next — so in practice the queues fill with the
+in-process driver. Gates live on the event loop thread.
+"""
+
+import os
+import sqlite3
+import asyncio
+import itertools
+import threading
+import collections
+from typing import Callable, Optional
+
+from microcoreos import run_sync
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+DEFAULT_MAX_QUEUE = 1000
+DEFAULT_SPILL_PATH = "event_bus_spill.db"
+
+_gate_ids = itertools.count(1)
+
+
+class SpillStore:
+    """Overflowed envelopes (JSON) per gate, in arrival order. One process's
+    scratch file: it is emptied when opened and removed when closed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")   # scratch space, not a queue of record
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spill ("
+            "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "  subscriber TEXT NOT NULL,"
+            "  envelope TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_spill_sub ON spill (subscriber, id)")
+        self._conn.execute("DELETE FROM spill")
+        self._conn.commit()
+
+    def append(self, subscriber: str, raws: list) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO spill (subscriber, envelope) VALUES (?, ?)",
+                [(subscriber, raw) for raw in raws],
+            )
+            self._conn.commit()
+
+    def take(self, subscriber: str, limit: int) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, envelope FROM spill WHERE subscriber=? ORDER BY id LIMIT ?",
+                (subscriber, limit),
+            ).fetchall()
+            if rows:
+                self._conn.execute("DELETE FROM spill WHERE subscriber=? AND id<=?",
+                                   (subscriber, rows[-1][0]))
+                self._conn.commit()
+            return [raw for _, raw in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+
+
+class DeliveryGate:
+    """The bound of one subscription. submit() every delivery; `start` turns
+    an envelope into its running delivery task, `track` is handed the spill
+    worker's task (the Bus drains it with the deliveries)."""
+
+    def __init__(self, name: str, start: Callable, max_in_flight: int,
+                 max_queue: Optional[int] = None, overflow: str = "block",
+                 spill: Optional[SpillStore] = None, on_drop: Optional[Callable] = None,
+                 envelope_cls: Optional[type] = None, track: Optional[Callable] = None):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_queue is None:
+            max_queue = DEFAULT_MAX_QUEUE
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        validate_overflow(overflow)
+        if overflow == "spill" and spill is None:
+            raise ValueError("overflow='spill' needs a SpillStore")
+        self.name = name
+        # Spill rows are keyed by gate, not by subscriber name: one callback
+        # subscribed to two events has two gates under the same name.
+        self._spill_key = f"{name}#{next(_gate_ids)}"
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.in_flight = 0
+        self.dropped = 0
+        self.spilled = 0        # rows in the spill file
+        self.blocked = 0        # publishes that had to wait for room
+        self._start = start
+        self._spill_store = spill
+        self._on_drop = on_drop
+        self._envelope_cls = envelope_cls
+        self._track = track
+        self._queue: collections.deque = collections.deque()   # (envelope, future | None)
+        self._buffer: list = []               # (envelope, future) not yet written to the spill file
+        self._spill_futures: collections.deque = collections.deque()   # one per row, in order
+        self._spill_task: Optional[asyncio.Task] = None
+        self._room_waiters: list = []
+        self._closed = False
+
+    # ── Admission ────────────────────────────────────────────────────────────
+
+    def submit(self, envelope):
+        """The delivery task, or a future that completes when the queued or
+        spilled delivery does (a dropped one completes at once)."""
+        if self._closed:
+            return self._start(envelope)
+        spilling = bool(self.spilled or self._buffer)
+        if self.in_flight < self.max_in_flight and not self._queue and not spilling:
+            return self._launch(envelope)
+        future = asyncio.get_running_loop().create_future()
+        if not spilling and len(self._queue) < self.max_queue:
+            self._queue.append((envelope, future))
+        elif self.overflow == "drop_oldest" and self._queue:
+            old, old_future = self._queue.popleft()
+            self._drop(old, old_future)
+            self._queue.append((envelope, future))
+        elif self.overflow == "drop_oldest":   # max_queue=0: nothing to drop but this
+            self._drop(envelope, future)
+        elif self.overflow == "spill":
+            self._buffer.append((envelope, future))
+            self._ensure_spill_worker()
+        else:   # block: never drops — publish() already waited for room
+            self._queue.append((envelope, future))
+        return future
+
+    def full(self) -> bool:
+        return len(self._queue) >= self.max_queue and self.in_flight >= self.max_in_flight
+
+    async def room(self) -> None:
+        """Returns once the queue has room (see full())."""
+        if self.full():
+            self.blocked += 1
+        while self.full() and not self._closed:
+            waiter = asyncio.get_running_loop().create_future()
+            self._room_waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._room_waiters:
+                    self._room_waiters.remove(waiter)
+
+    # ── Running ──────────────────────────────────────────────────────────────
+
+    def _launch(self, envelope, future=None):
+        self.in_flight += 1
+        task = self._start(envelope)
+        task.add_done_callback(lambda t, f=future: self._finished(t, f))
+        return task
+
+    def _finished(self, task, future) -> None:
+        self.in_flight -= 1
+        if future is not None and not future.done():
+            if task.cancelled():
+                future.cancel()
+            else:
+                future.set_result(None)
+        self._pump()
+
+    def _pump(self) -> None:
+        if self._closed:
+            return
+        while self.in_flight < self.max_in_flight and self._queue:
+            envelope, future = self._queue.popleft()
+            self._launch(envelope, future)
+        if self.spilled or self._buffer:
+            self._ensure_spill_worker()
+        if not self.full():
+            waiters, self._room_waiters = self._room_waiters, []
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _drop(self, envelope, future) -> None:
+        self.dropped += 1
+        if future is not None and not future.done():
+            future.set_result(None)
+        if self._on_drop is not None:
+            self._on_drop(envelope, self.name)
+
+    # ── Spill ────────────────────────────────────────────────────────────────
+
+    def _ensure_spill_worker(self) -> None:
+        if self._spill_task is None and not self._closed:
+            self._spill_task = asyncio.create_task(self._spill_worker())
+            if self._track is not None:
+                self._track(self._spill_task)
+
+    async def _spill_worker(self) -> None:
+        # The only writer and reader of this gate's rows, so the order holds:
+        # queue, then the spill file, then the buffer not yet written.
+        store = self._spill_store
+        try:
+            while not self._closed:
+                room = self.max_queue - len(self._queue)
+                if self._buffer and (self.spilled or room <= 0):
+                    batch, self._buffer = self._buffer, []
+                    await run_sync("event_bus", store.append, self._spill_key,
+                                   [envelope.model_dump_json() for envelope, _ in batch])
+                    self._spill_futures.extend(future for _, future in batch)
+                    self.spilled += len(batch)
+                elif room > 0 and self.spilled:
+                    raws = await run_sync("event_bus", store.take, self._spill_key, room)
+                    self.spilled -= len(raws)
+                    for raw in raws:
+                        future = self._spill_futures.popleft()
+                        self._queue.append((self._envelope_cls.model_validate_json(raw), future))
+                    self._pump()
+                elif room > 0 and self._buffer:
+                    self._queue.extend(self._buffer[:room])
+                    del self._buffer[:room]
+                    self._pump()
+                else:
+                    return
+        finally:
+            self._spill_task = None
+
+    # ── Lifecycle & stats ────────────────────────────────────────────────────
+
+    def idle(self) -> bool:
+        return not (self.in_flight or self._queue or self._buffer or self.spilled)
+
+    def close(self) -> None:
+        """Shutdown: queued deliveries are abandoned, blocked publishers released."""
+        self._closed = True
+        for _, future in itertools.chain(self._queue, self._buffer):
+            if future is not None and not future.done():
+                future.cancel()
+        for future in self._spill_futures:
+            if not future.done():
+                future.cancel()
+        self._queue.clear()
+        self._buffer.clear()
+        self._spill_futures.clear()
+        for waiter in self._room_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._room_waiters = []
+        if self._spill_task is not None:
+            self._spill_task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "overflow": self.overflow,
+            "in_flight": self.in_flight,
+            "queued": len(self._queue),
+            "spilled": self.spilled + len(self._buffer),
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+        }
+
+
+def validate_overflow(overflow: str) -> None:
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {overflow!r}")
+
+
+def spill_path() -> str:
+    """EVENT_BUS_SPILL_PATH — made per worker under `run --workers N`: every
+    worker clears its file at boot, so a shared one would lose the others'
+    rows. The worker index (not the pid) keeps the name stable across
+    restarts, so a crashed worker's file is cleared by its replacement."""
+    path = os.getenv("EVENT_BUS_SPILL_PATH", DEFAULT_SPILL_PATH)
+    worker = os.getenv("MICROCOREOS_WORKER_ID")
+    if worker:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.worker{worker}{ext}"
+    return path
@@ -0,0 +1,96 @@
+"""
+Enterprise Event Bus — Batch Subscriptions
+==========================================
+A consumer that writes each event to a database pays a round trip per event.
+
+    await bus.subscribe_batch("order.placed", self.on_orders,
+                              max_batch=200, max_wait_ms=50)
+
+    async def on_orders(self, events: list[EventEnvelope]):
+        await self.db.execute_many(SQL, [e.payload for e in events])
+
+BatchCollector gathers one subscription's deliveries and hands them to the
+handler as a list: when `max_batch` have arrived, or `max_wait_ms` after the
+first one, whichever comes first. Every delivery of a batch returns the same
+future, completed when the batch's handler call (and its retries) finishes —
+so a durable driver acks the whole batch only then, exactly as it acks a
+single delivery. Collectors live on the event loop thread.
+"""
+
+import asyncio
+from typing import Callable, Optional
+
+
+class BatchCollector:
+    """The open batch of one subscription. add() every delivery; `handle`
+    is called with each full (or timed-out) list of envelopes."""
+
+    def __init__(self, max_batch: int, max_wait: float, handle: Callable,
+                 track: Optional[Callable] = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._handle = handle
+        self._track = track
+        self._envelopes: list = []
+        self._future: Optional[asyncio.Future] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+
+    def add(self, envelope) -> asyncio.Future:
+        """The future of the batch this envelope joins."""
+        loop = asyncio.get_running_loop()
+        if self._future is None:
+            self._future = loop.create_future()
+        future = self._future
+        self._envelopes.append(envelope)
+        if len(self._envelopes) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return future
+
+    def flush(self) -> None:
+        """Hand the open batch over now, full or not."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._envelopes:
+            return
+        envelopes, self._envelopes = self._envelopes, []
+        future, self._future = self._future, None
+        self.batches += 1
+        task = asyncio.create_task(self._handle(envelopes))
+        if self._track is not None:
+            self._track(task)
+        task.add_done_callback(lambda t: _settle(future, t))
+
+    def close(self) -> None:
+        """Shutdown: the open batch is abandoned (a durable transport never
+        acked it, so it redelivers)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._envelopes = []
+        if self._future is not None and not self._future.done():
+            self._future.cancel()
+        self._future = None
+
+    def __len__(self) -> int:
+        return len(self._envelopes)
+
+    def stats(self) -> dict:
+        return {"max_batch": self.max_batch, "max_wait_ms": self.max_wait * 1000,
+                "open": len(self._envelopes), "batches": self.batches}
+
+
+def _settle(future: asyncio.Future, task: asyncio.Task) -> None:
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    else:
+        future.set_result(None)
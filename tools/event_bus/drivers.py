@@ -7,7 +7,8 @@ its in-memory reference implementation. Split out of event_bus_tool.py.
 """
 
 import asyncio
-from typing import Callable, Optional, Dict, List
+import itertools
+from typing import Callable, Optional, Dict, List, Tuple
 from tools.event_bus.envelope import EventEnvelope
 
 
@@ -26,68 +27,131 @@ class EventBusDriver:
     capabilities: Dict[str, str] = {"delay": "in_bus", "retries": "in_bus", "dlq": "in_bus"}
 
     async def setup(self): pass
-    def bind(self, deliver_hook: Callable, envelope_cls: Optional[type] = None):
+    def bind(self, deliver_hook: Callable, envelope_cls: Optional[type] = None,
+             deliver_now: Optional[Callable] = None):
         """Injected by the Bus to handle message delivery.
 
         envelope_cls is the Bus's OWN EventEnvelope class: drivers must
-        deserialize with it (self._envelope_cls.model_validate_json) instead
+        deserialize with it (EnvelopeCodec.decode(..., self._envelope_cls)) instead
         of importing EventEnvelope, so envelopes always validate against the
         exact class the Bus uses for tracing.
+
+        deliver_now(envelope, callback) is the hook's synchronous form — it
+        schedules the delivery and returns its task — for drivers that
+        dispatch without awaiting anything (see publish_nowait).
         """
         self._deliver_hook = deliver_hook
         self._envelope_cls = envelope_cls or EventEnvelope
+        self._deliver_now = deliver_now
 
     async def publish(self, envelope: EventEnvelope) -> None:
         """Pure fire-and-forget transport. Returns nothing."""
         raise NotImplementedError()
 
+    async def publish_batch(self, envelopes: List[EventEnvelope]) -> None:
+        """publish() for each envelope, in list order. Override to hand the
+        whole batch to the broker in one round trip."""
+        for envelope in envelopes:
+            await self.publish(envelope)
+
+    def publish_nowait(self, envelopes: List[EventEnvelope]) -> bool:
+        """Hand the envelopes over synchronously, if this transport can do it
+        with no I/O at all. False (the default): the Bus awaits publish() /
+        publish_batch() in a task instead. Only ever called with undelayed
+        envelopes and nothing queued before them under their keys."""
+        return False
+
     async def subscribe(self, event_name: str, group: Optional[str], callback: Callable): raise NotImplementedError()
+    async def subscribe_batch(self, event_name: str, group: Optional[str], callback: Callable,
+                              max_batch: int) -> None:
+        """subscribe() for EventBusTool.subscribe_batch(). Deliveries go through
+        the same hook; the Bus gathers up to max_batch of them into one handler
+        call and returns the same future for each. A reader that awaits every
+        delivery before claiming the next would feed that batch one at a time:
+        override to claim up to max_batch, deliver them all, then await and ack
+        them together. Default: subscribe() — enough for a transport that
+        never waits between deliveries (in-process)."""
+        await self.subscribe(event_name, group, callback)
+
     async def unsubscribe(self, event_name: str, callback: Callable): raise NotImplementedError()
     async def unsubscribe_all(self, callback: Callable): raise NotImplementedError()
     def get_status(self, name_resolver: Callable) -> dict: return {"status": "abstract"}
+
+    async def stop_consuming(self) -> None:
+        """Graceful shutdown, phase one (EventBusTool.drain): stop claiming NEW
+        messages for group subscriptions, and return once the ones already
+        claimed are handled and acknowledged. What is left unclaimed stays in
+        the broker for the rest of the fleet, or for the next boot. Broadcast
+        and RPC-reply subscriptions keep flowing until shutdown() — a handler
+        still in flight may be waiting on a reply. Cancelled when the drain
+        budget runs out (unacked messages then redeliver: at-least-once).
+        Default: nothing claims ahead (in-process), nothing to stop."""
+        pass
+
     async def shutdown(self): pass
 
 
 class InProcessDriver(EventBusDriver):
-    """Memory transport. Simulates groups and handles internal delays."""
+    """Memory transport. Simulates groups and handles internal delays.
+
+    Dispatch reads `_table` — per event, an immutable tuple of (callbacks,
+    turn) entries compiled from `_groups` — and never locks: subscribe and
+    unsubscribe build a new table and swap it in whole. `turn` is None for
+    broadcast callbacks (all get the event), else the group's round-robin
+    counter: itertools.count is advanced atomically, and survives recompiles.
+    """
     def __init__(self):
         self._groups: Dict[str, Dict[Optional[str], List[Callable]]] = {}
-        self._indices: Dict[str, Dict[Optional[str], int]] = {}
-        self._lock = asyncio.Lock()
+        self._turns: Dict[Tuple[str, Optional[str]], itertools.count] = {}
+        self._table: Dict[str, tuple] = {}
+        self._deliver_now: Optional[Callable] = None
 
     async def publish(self, envelope: EventEnvelope) -> None:
         # Delay is handled by the Bus fallback (capabilities: delay=in_bus).
-        # 1. Resolve Targets (Logic moved to Driver side)
-        targets = []
-        async with self._lock:
-            if envelope.event in self._groups:
-                for group_name, callbacks in self._groups[envelope.event].items():
-                    if not callbacks: continue
-                    if group_name is None:
-                        targets.extend(callbacks)
-                    else:
-                        idx = self._indices[envelope.event].get(group_name, 0)
-                        targets.append(callbacks[idx % len(callbacks)])
-                        self._indices[envelope.event][group_name] = (idx + 1) % len(callbacks)
-
-        # 2. Trigger Delivery Hook (Inversion of Control)
-        for cb in targets:
-            # We don't await here; the driver schedules the delivery
-            asyncio.create_task(self._deliver_hook(envelope, cb))
+        self.publish_nowait([envelope])
+
+    async def publish_batch(self, envelopes: List[EventEnvelope]) -> None:
+        self.publish_nowait(envelopes)
+
+    def publish_nowait(self, envelopes: List[EventEnvelope]) -> bool:
+        table = self._table
+        deliver = self._deliver_now or self._schedule
+        for envelope in envelopes:
+            for callbacks, turn in table.get(envelope.event, ()):
+                if turn is None:
+                    for cb in callbacks:
+                        deliver(envelope, cb)
+                else:
+                    deliver(envelope, callbacks[next(turn) % len(callbacks)])
+        return True
+
+    def _schedule(self, envelope: EventEnvelope, callback: Callable) -> None:
+        # Bound without deliver_now: the driver schedules the delivery itself.
+        asyncio.create_task(self._deliver_hook(envelope, callback))
+
+    def _compile(self, event_name: str) -> None:
+        entries = tuple(
+            (tuple(callbacks),
+             None if group is None else self._turns.setdefault((event_name, group), itertools.count()))
+            for group, callbacks in self._groups.get(event_name, {}).items()
+        )
+        table = dict(self._table)
+        if entries:
+            table[event_name] = entries
+        else:
+            table.pop(event_name, None)
+        self._table = table
 
     async def subscribe(self, event_name: str, group: Optional[str], callback: Callable):
-        async with self._lock:
-            self._groups.setdefault(event_name, {}).setdefault(group, []).append(callback)
-            self._indices.setdefault(event_name, {}).setdefault(group, 0)
+        self._groups.setdefault(event_name, {}).setdefault(group, []).append(callback)
+        self._compile(event_name)
 
     async def unsubscribe(self, event_name: str, callback: Callable):
-        async with self._lock:
-            self._remove_callback(event_name, callback)
+        self._remove_callback(event_name, callback)
 
     async def unsubscribe_all(self, callback: Callable):
-        async with self._lock:
-            for event in list(self._groups.keys()):
-                self._remove_callback(event, callback)
+        for event in list(self._groups.keys()):
+            self._remove_callback(event, callback)
 
     def _remove_callback(self, event_name: str, callback: Callable):
         group_map = self._groups.get(event_name)
@@ -96,13 +160,13 @@ class InProcessDriver(EventBusDriver):
             group_map[g_name] = [cb for cb in group_map[g_name] if cb != callback]
             if not group_map[g_name]:
                 del group_map[g_name]
-                if event_name in self._indices and g_name in self._indices[event_name]:
-                    del self._indices[event_name][g_name]
+                self._turns.pop((event_name, g_name), None)
         if not group_map:
             del self._groups[event_name]
+        self._compile(event_name)
 
     def get_status(self, name_resolver: Callable) -> dict:
         return {
-            event: [name_resolver(cb) for g in groups.values() for cb in g]
-            for event, groups in self._groups.items()
+            event: [name_resolver(cb) for callbacks, _ in entries for cb in callbacks]
+            for event, entries in self._table.items()
         }
@@ -12,6 +12,11 @@ from typing import Any, Optional, Dict, List
 from pydantic import BaseModel, Field, ConfigDict
 
 
+# headers[DEADLINE_HEADER]: absolute wall-clock deadline (epoch seconds) set by
+# request(); past it the requester is no longer waiting for the reply.
+DEADLINE_HEADER = "deadline"
+
+
 class EventEnvelope(BaseModel):
     """The Universal Contract for any message traveling through the system."""
     model_config = ConfigDict(frozen=True)
@@ -53,3 +58,4 @@ class SubOptions(BaseModel):
     """Configuration for a specific subscription."""
     retries: int = 0
     backoff: float = 0.5
+    offload: Optional[str] = None
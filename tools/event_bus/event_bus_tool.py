@@ -7,12 +7,20 @@ PUBLIC CONTRACT (what plugins use):
 ────────────────────────────────────────────────────────────────────────────────
     await bus.publish("user.created", {"id": 1}, key=None, priority=None,
                       delay=None, ttl=None, correlation_id=None)
+    await bus.publish_many("user.imported", [{"id": 1}, {"id": 2}], key=None, ...)
+    await bus.publish_batch([("user.created", {"id": 1}),
+                             ("audit.logged", {"id": 1}, {"key": "u1"})])
     await bus.subscribe("user.created", self.on_event, group=None, retries=0,
-                        backoff=0.5, broadcast=False)
+                        backoff=0.5, broadcast=False, offload=None,
+                        max_in_flight=None, max_queue=None, overflow="block")
+    await bus.subscribe_batch("user.created", self.on_events, max_batch=100,
+                              max_wait_ms=50, group=None, retries=0, backoff=0.5)
     reply = await bus.request("user.lookup", {"id": 1}, timeout=5)
     await bus.unsubscribe("user.created", self.on_event)
 
     Subscribers ALWAYS receive an EventEnvelope: async def on_event(self, event: EventEnvelope)
+    — except offload="process" subscribers: module-level functions run in a
+    worker process, called with event.payload (microcoreos/offload.py).
 
 CONSUMER IDENTITY (how replicas are recognized — Elastic Monolith core rule):
     group=None (default)  → the Bus derives a STABLE group from the callback
@@ -46,15 +54,23 @@ interface below (reference implementation: InProcessDriver).
 
 To swap to Kafka/RabbitMQ/Redis Streams:
     1. Implement EventBusDriver (publish / subscribe / unsubscribe /
-       unsubscribe_all / get_status / setup / shutdown).
+       unsubscribe_all / get_status / setup / shutdown, and stop_consuming
+       if the broker hands out messages ahead of the handlers — drain()).
     2. publish() is pure fire-and-forget: serialize the EventEnvelope
-       (envelope.model_dump_json()) and hand it to the broker. Map hints:
+       (EnvelopeCodec.encode(), codec.py — body plus a label for the
+       message's header) and hand it to the broker. Map hints:
        key → partition key (Kafka), priority → message priority (RabbitMQ),
        ttl → broker-side expiration. For delay, declare a capability claim
        (Issue 30): `capabilities = {"delay": "native", ...}` means YOUR
        publish() persists the delayed envelope broker-side (crash-safe);
        leave the default "in_bus" and the Bus sleeps the delay for you
        (publisher-memory only — a crash during the wait loses the event).
+       publish_batch(envelopes) is optional: the default publishes them one
+       by one. Override it to hand a whole batch over in one round trip
+       (one transaction, a pipeline, a producer batch), in list order.
+       publish_nowait(envelopes) is for transports with no I/O at all
+       (in-memory): return True after dispatching synchronously, and the Bus
+       skips its per-publish transport task. Default False.
     3. On message arrival, deserialize with self._envelope_cls (injected by
        the Bus via bind(), so a Bus constructed with a custom envelope class
        still validates against its own) and call
@@ -70,18 +86,28 @@ To swap to Kafka/RabbitMQ/Redis Streams:
 Plugins are unaffected: same envelope, same API, same semantics.
 """
 
-import collections
 import importlib
+import itertools
 import uuid
+import time
 import asyncio
 import inspect
 import os
 from datetime import datetime, timezone
 from typing import Callable, Optional, Dict, List, Tuple, Set
 from microcoreos import BaseTool
-from microcoreos import current_event_id_var, current_identity_var
+from microcoreos import (
+    current_event_id_var, current_identity_var, current_deadline_var,
+    DeadlineExceededError, time_remaining, limiter_for, metered, pool_for, prepare_offload,
+    run_in_process, run_sync, track_sizes,
+)
 from tools.event_bus.envelope import EventEnvelope, TraceNode, TraceRecord, SubOptions  # noqa: F401 — re-export
+from tools.event_bus.envelope import DEADLINE_HEADER
 from tools.event_bus.drivers import EventBusDriver, InProcessDriver
+from tools.event_bus.trace_log import TraceLog
+from tools.event_bus.subscriptions import Subscription, PausedOwners
+from tools.event_bus.backpressure import DeliveryGate, SpillStore, spill_path, validate_overflow
+from tools.event_bus.batching import BatchCollector
 
 # EventEnvelope, TraceNode, TraceRecord, SubOptions live in envelope.py and
 # EventBusDriver / InProcessDriver live in drivers.py — re-exported above so
@@ -93,11 +119,12 @@ from tools.event_bus.drivers import EventBusDriver, InProcessDriver
 
 class EventBusTool(BaseTool):
     _MAX_CONSECUTIVE_FAILURES = 5
+    _FLUSH_TIMEOUT = 2.0   # seconds shutdown() waits for queued publishes
     SUBSCRIBER_DROPPED_EVENT = "system.subscriber.dropped"
 
     def __init__(self, driver: Optional[EventBusDriver] = None):
         self._driver = driver or self._driver_from_env()
-        self._trace_log: collections.deque = collections.deque(maxlen=500)
+        self._trace_log = TraceLog()
         self._listeners: list = []
         self._failure_listeners: list = []
         self._consecutive_failures: dict[tuple[str, str], int] = {}
@@ -105,15 +132,30 @@ class EventBusTool(BaseTool):
         # Ordering unit → the last publish handed to the transport for it.
         # See publish(): this is what keeps same-key publishes in call order.
         self._publish_chain: Dict[str, asyncio.Task] = {}
-        self._sub_options: Dict[Tuple[str, Callable], SubOptions] = {}
+        # (event, callback) → its Subscription: name, options and pause
+        # prefixes resolved once at subscribe(), read on every delivery.
+        self._subscriptions: Dict[Tuple[str, Callable], Subscription] = {}
+        # Bounded subscriptions (backpressure.py): every gate until it is
+        # unsubscribed and idle, and per event the ones whose overflow
+        # blocks publish().
+        self._gates: Set[DeliveryGate] = set()
+        self._blocking_gates: Dict[str, List[DeliveryGate]] = {}
+        self._spill: Optional[SpillStore] = None
         # Chaos/ops pause (Issue 34): owner identities ("domain.Class", or a
         # bare domain prefix) whose deliveries are held. Deliberately NOT
         # public API (the contract is frozen — Issue 36): mutated only by the
         # chaos extras plugin via its sanctioned raw-tool introspection.
-        self._paused_owners: Set[str] = set()
+        self._paused_owners: Set[str] = PausedOwners()
+        # RPC (request()): one reply inbox per bus instance, "_reply.<id>",
+        # subscribed on the first request and shared by all of them; each
+        # waits on its future in _replies, keyed by correlation id.
+        self._instance_id = uuid.uuid4().hex[:12]
+        self._inbox: Optional[str] = None
+        self._inbox_lock = asyncio.Lock()
+        self._replies: Dict[str, asyncio.Future] = {}
 
         # Bind the delivery hook (and OUR envelope class — see EventBusDriver.bind)
-        self._driver.bind(self._deliver, EventEnvelope)
+        self._driver.bind(self._deliver, EventEnvelope, deliver_now=self._deliver_now)
 
     @staticmethod
     def _driver_from_env() -> EventBusDriver:
@@ -152,22 +194,68 @@ class EventBusTool(BaseTool):
 
     async def setup(self) -> None:
         await self._driver.setup()
+        track_sizes(self.name, self._sizes)
         print(f"[System] EventBusTool: Online (Universal Driver: {self._driver.__class__.__name__}).")
 
+    def _sizes(self) -> dict:
+        """What grows with traffic, for leak hunting (tools/system/memory.py)."""
+        return {
+            "trace_log": len(self._trace_log),
+            "pending_tasks": len(self._pending_tasks),
+            "publish_chains": len(self._publish_chain),
+            "subscriptions": len(self._subscriptions),
+            "consecutive_failures": len(self._consecutive_failures),
+            "listeners": len(self._listeners) + len(self._failure_listeners),
+            "paused_owners": len(self._paused_owners),
+            "pending_replies": len(self._replies),
+            "queued_deliveries": sum(g.stats()["queued"] for g in self._gates),
+            "open_batches": sum(len(sub.batch) for sub in self._subscriptions.values()
+                                if sub.batch is not None),
+        }
+
     def get_interface_description(self) -> str:
         return """
         Universal Event Bus (event_bus):
         - publish(event_name, data, **kwargs): Broadcast an event.
-        - subscribe(event_name, callback, group=None, retries=0, backoff=0.5, broadcast=False):
+        - publish_many(event_name, payloads, **kwargs): publish() for each payload
+          (same hints), handed to the transport as ONE batch — one transaction,
+          pipeline or producer batch instead of a round trip per event. For
+          bulk imports.
+        - publish_batch(events): The same for mixed events: a list of
+          (event_name, data) or (event_name, data, {{hints}}) tuples.
+          Both keep per-key order, with each other and with publish(). A
+          payload that fails validation publishes none of the batch.
+        - subscribe(event_name, callback, group=None, retries=0, backoff=0.5, broadcast=False,
+                    offload=None, max_in_flight=None, max_queue=None, overflow="block"):
           Listen for events. group=None derives a STABLE group from the callback identity:
           replicas of the same plugin consume each event exactly once across the fleet,
           while distinct plugins each get their own copy. Use group="pool" for explicit
           worker pools, broadcast=True ONLY for instance-local concerns (every replica
           receives a copy — e.g. local cache invalidation).
+          offload="process" runs a CPU-bound MODULE-LEVEL function fn(payload) -> dict | None
+          in a worker process, off the GIL (its return value is the RPC reply, as usual).
+          max_in_flight=N bounds concurrent deliveries to this subscriber; up to
+          max_queue (default 1000) more wait in a queue, and past that overflow
+          decides: "block" (publish() waits), "drop_oldest", or "spill" (to a
+          local SQLite file, delivered in order as the queue drains).
+        - subscribe_batch(event_name, callback, max_batch=100, max_wait_ms=50, group=None,
+                          retries=0, backoff=0.5, broadcast=False):
+          subscribe(), but callback(events: list[EventEnvelope]) gets up to max_batch
+          envelopes at once, or what arrived within max_wait_ms — for bulk writes
+          (db execute_many). Raising retries the whole list; returning
+          {{envelope.id: error}} retries (then dead-letters) just those envelopes.
+          Durable transports ack the batch once the callback finishes.
         - request(event_name, data, timeout=5): Async RPC (returns dict).
+          Bounded by the caller's deadline (current_deadline_var) when that is
+          sooner: then raises DeadlineExceededError instead of TimeoutError.
+          The deadline rides in the envelope headers; the responder skips the
+          request once it has passed, and its tool calls are held to it.
         - unsubscribe(event_name, callback): Stop listening.
-        - get_trace_history() -> List[TraceNode]: Last 500 event records.
-        - get_subscribers() -> dict: Current subscriber map.
+        - get_trace_history() -> List[TraceNode]: Last 500 event records
+          (EVENT_BUS_TRACE_MAXLEN; EVENT_BUS_TRACE_SAMPLE traces a share of events,
+          failed deliveries always).
+        - get_subscribers(queues=False) -> dict: Current subscriber map. queues=True:
+          per subscriber {{subscriber, bounded, in_flight, queued, spilled, dropped, ...}}.
         - add_listener(callback): Sink for all events (record: dict).
         - add_failure_listener(callback): Sink for errors (record: dict).
         
@@ -210,39 +298,164 @@ class EventBusTool(BaseTool):
                    caps=self._driver.capabilities)
 
     async def subscribe(self, event_name: str, callback: Callable, group: Optional[str] = None,
-                        retries: int = 0, backoff: float = 0.5, broadcast: bool = False):
-        self._sub_options[(event_name, callback)] = SubOptions(retries=retries, backoff=backoff)
+                        retries: int = 0, backoff: float = 0.5, broadcast: bool = False,
+                        offload: Optional[str] = None, max_in_flight: Optional[int] = None,
+                        max_queue: Optional[int] = None, overflow: str = "block"):
+        if offload is not None:
+            if offload != "process":
+                raise ValueError(f"offload must be 'process' or None, got {offload!r}")
+            prepare_offload(callback)
+        subscription = Subscription(
+            self._get_name(callback), callback,
+            SubOptions(retries=retries, backoff=backoff, offload=offload),
+        )
+        if max_in_flight is not None:
+            subscription.gate = await self._gate(event_name, callback, subscription,
+                                                 max_in_flight, max_queue, overflow)
+        elif max_queue is not None:
+            raise ValueError("max_queue bounds the queue behind max_in_flight: set both")
+        self._subscriptions[(event_name, callback)] = subscription
+        await self._driver.subscribe(event_name, self._group_for(event_name, subscription, group,
+                                                                 broadcast), callback)
+
+    async def subscribe_batch(self, event_name: str, callback: Callable, max_batch: int = 100,
+                              max_wait_ms: float = 50, group: Optional[str] = None,
+                              retries: int = 0, backoff: float = 0.5, broadcast: bool = False):
+        """subscribe(), but the handler gets a LIST of envelopes (batching.py):
+        up to max_batch of them, or what arrived within max_wait_ms."""
+        subscription = Subscription(self._get_name(callback), callback,
+                                    SubOptions(retries=retries, backoff=backoff))
+        subscription.batch = BatchCollector(
+            max_batch, max_wait_ms / 1000,
+            lambda envelopes: self._deliver_batch(envelopes, callback, subscription),
+            track=self._track,
+        )
+        self._subscriptions[(event_name, callback)] = subscription
+        await self._driver.subscribe_batch(
+            event_name, self._group_for(event_name, subscription, group, broadcast),
+            callback, max_batch,
+        )
+
+    @staticmethod
+    def _group_for(event_name: str, subscription: Subscription, group: Optional[str],
+                   broadcast: bool) -> Optional[str]:
         if group is None and not broadcast and not event_name.startswith("_reply."):
             # Stable consumer identity: every replica runs the same code and
             # derives the same group → the fleet consumes each event exactly
             # once per logical consumer. Distinct plugins → distinct groups →
             # each still receives its own copy. Within a single instance this
             # is indistinguishable from the old broadcast behavior.
-            group = self._get_name(callback)
-        await self._driver.subscribe(event_name, group, callback)
+            return subscription.name
+        return group
+
+    async def _gate(self, event_name, callback, subscription, max_in_flight, max_queue,
+                    overflow) -> DeliveryGate:
+        validate_overflow(overflow)
+        if overflow == "spill" and self._spill is None:
+            self._spill = await run_sync("event_bus", SpillStore, spill_path())
+        gate = DeliveryGate(
+            subscription.name,
+            lambda envelope: self._start_delivery(envelope, callback, subscription),
+            max_in_flight, max_queue, overflow,
+            spill=self._spill, on_drop=self._dropped, envelope_cls=EventEnvelope,
+            track=self._track,
+        )
+        self._gates.add(gate)
+        if overflow == "block":
+            self._blocking_gates.setdefault(event_name, []).append(gate)
+        return gate
+
+    def _dropped(self, envelope: EventEnvelope, sub_name: str) -> None:
+        self._trace_log.delivered(envelope, sub_name, False, "dropped_overflow", 0)
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+
+    async def _wait_for_room(self, event_names) -> None:
+        """publish()'s backpressure: wait while a blocking subscriber of these
+        events has a full queue — unless that subscriber is the one
+        publishing (it would be waiting on itself)."""
+        me = current_identity_var.get()
+        for event_name in event_names:
+            for gate in self._blocking_gates.get(event_name, ()):
+                if gate.full() and gate.name != me:
+                    await gate.room()
 
     async def unsubscribe(self, event_name: str, callback: Callable):
-        for key in list(self._sub_options.keys()):
+        for key in list(self._subscriptions.keys()):
             if key[1] == callback:
-                del self._sub_options[key]
+                dropped = self._subscriptions.pop(key)
+                if dropped.gate is not None:
+                    self._release_gate(key[0], dropped.gate)
+                if dropped.batch is not None:
+                    dropped.batch.flush()   # what it collected is still delivered
         await self._driver.unsubscribe(event_name, callback)
 
+    def _release_gate(self, event_name: str, gate: DeliveryGate) -> None:
+        # What it already holds still drains; it just stops blocking publishers.
+        blocking = self._blocking_gates.get(event_name, [])
+        if gate in blocking:
+            blocking.remove(gate)
+            if not blocking:
+                del self._blocking_gates[event_name]
+        if gate.idle():
+            self._gates.discard(gate)
+
     async def publish(self, event_name: str, data: dict, **kwargs):
+        if self._blocking_gates:
+            await self._wait_for_room((event_name,))
+        envelope = self._envelope(event_name, data, kwargs)
+        self._record_published(envelope)
+        print(f"[EventBus] 📣 {envelope.event} [{envelope.id[:8]}]")
+        self._hand_over([envelope])
+
+    async def publish_many(self, event_name: str, payloads: list, **kwargs):
+        """publish() for every payload, with the same hints, handed to the
+        transport as ONE batch (EventBusDriver.publish_batch)."""
+        await self._publish_envelopes(
+            [self._envelope(event_name, data, dict(kwargs)) for data in payloads]
+        )
+
+    async def publish_batch(self, events: list):
+        """publish_many() for mixed events: (event_name, data) or
+        (event_name, data, {hints}) tuples, handed over in list order."""
+        await self._publish_envelopes(
+            [self._envelope(event[0], event[1], dict(event[2]) if len(event) > 2 else {})
+             for event in events]
+        )
+
+    async def _publish_envelopes(self, envelopes: list) -> None:
+        # Every envelope is built before any is recorded: one that does not
+        # validate publishes none of the batch.
+        if not envelopes:
+            return
+        if self._blocking_gates:
+            await self._wait_for_room(dict.fromkeys(e.event for e in envelopes))
+        for envelope in envelopes:
+            self._record_published(envelope)
+        events = {e.event for e in envelopes}
+        print(f"[EventBus] 📣 {' '.join(sorted(events))} ×{len(envelopes)} [{envelopes[0].id[:8]}…]")
+        self._hand_over(envelopes)
+
+    def _envelope(self, event_name: str, data: dict, kwargs: dict) -> EventEnvelope:
         kwargs.pop("emitter", None)
-        envelope = EventEnvelope(
+        return EventEnvelope(
             event=event_name, payload=data,
             emitter=current_identity_var.get() or "system",
             parent_id=current_event_id_var.get(),
             **kwargs
         )
-        
+
+    def _record_published(self, envelope: EventEnvelope) -> None:
         # 1. Record Publication (Tracing)
         # Note: In a distributed system, we don't know the subscribers yet.
-        record = TraceNode(kind="published", envelope=envelope)
-        self._trace_log.append(record)
-        
+        self._trace_log.published(envelope)
+        if not self._listeners:
+            return   # nobody to build the listener record for
+
         raw_record = {
-            **envelope.model_dump(), 
+            **envelope.model_dump(),
             "kind": "published",
             "payload_keys": list(envelope.payload.keys()),
             "timestamp": envelope.timestamp.timestamp()
@@ -255,9 +468,8 @@ class EventBusTool(BaseTool):
                     self._pending_tasks.add(task)
                     task.add_done_callback(self._pending_tasks.discard)
             except Exception: pass
-        
-        print(f"[EventBus] 📣 {envelope.event} [{envelope.id[:8]}]")
 
+    def _hand_over(self, envelopes: list) -> None:
         # 2. Hand over to Driver — fire and forget for the CALLER, ordered
         #    for the transport.
         #
@@ -277,13 +489,27 @@ class EventBusTool(BaseTool):
         #    the guarantee every broker actually makes (Kafka orders per
         #    partition, SQS FIFO per MessageGroupId, RabbitMQ per queue).
         #    Different keys still publish in parallel; only same-key ones queue.
-        unit = envelope.key or envelope.event
-        previous = self._publish_chain.get(unit)
-        task = asyncio.create_task(self._transport_publish_after(previous, envelope))
-        self._publish_chain[unit] = task
+        #    A batch waits for the tail of every unit it holds, and becomes it.
+        #
+        #    Nothing queued under those units and nothing delayed: a driver
+        #    that dispatches without I/O (in-process) takes the envelopes
+        #    right here — in call order by construction, with no chain task.
+        chain = self._publish_chain
+        if len(envelopes) == 1:
+            envelope = envelopes[0]
+            units = [envelope.key or envelope.event]
+        else:
+            units = list(dict.fromkeys(e.key or e.event for e in envelopes))
+        previous = [chain[u] for u in units if u in chain]
+        if not previous and not any(e.delay and e.delay > 0 for e in envelopes) \
+                and self._driver.publish_nowait(envelopes):
+            return
+        task = asyncio.create_task(self._transport_publish_after(previous, envelopes))
         self._pending_tasks.add(task)
         task.add_done_callback(self._pending_tasks.discard)
-        task.add_done_callback(lambda t, u=unit: self._release_chain(u, t))
+        for unit in units:
+            chain[unit] = task
+            task.add_done_callback(lambda t, u=unit: self._release_chain(u, t))
 
     def _release_chain(self, unit: str, task: asyncio.Task) -> None:
         """Drop a finished chain tail so `_publish_chain` cannot grow forever.
@@ -295,16 +521,19 @@ class EventBusTool(BaseTool):
         if self._publish_chain.get(unit) is task:
             del self._publish_chain[unit]
 
-    async def _transport_publish_after(self, previous, envelope: EventEnvelope) -> None:
-        if previous is not None:
+    async def _transport_publish_after(self, previous: list, envelopes: list) -> None:
+        for predecessor in previous:
             # Wait for the predecessor to reach the transport, but never inherit
             # its fate: one publish failing must not silently drop every later
             # message under the same key.
             try:
-                await previous
+                await predecessor
             except Exception:
                 pass
-        await self._transport_publish(envelope)
+        if len(envelopes) == 1:
+            await self._transport_publish(envelopes[0])
+        else:
+            await self._transport_publish_batch(envelopes)
 
     async def _transport_publish(self, envelope: EventEnvelope) -> None:
         """Universal software fallbacks (Issue 30) + hand-off to the driver.
@@ -318,21 +547,76 @@ class EventBusTool(BaseTool):
             await asyncio.sleep(envelope.delay)
         await self._driver.publish(envelope)
 
+    async def _transport_publish_batch(self, envelopes: list) -> None:
+        """_transport_publish() for a batch. The in_bus delay fallback keeps
+        what successive publish() calls would do: an envelope waits for its
+        own delay after everything before it under its key, while other keys
+        go ahead — each group of envelopes due at once is one hand-off."""
+        if self._driver.capabilities.get("delay") == "native" or not any(
+                e.delay and e.delay > 0 for e in envelopes):
+            await self._driver.publish_batch(envelopes)
+            return
+        waited: dict = {}
+        due = []
+        for envelope in envelopes:
+            unit = envelope.key or envelope.event
+            waited[unit] = waited.get(unit, 0) + max(envelope.delay or 0, 0)
+            due.append((waited[unit], envelope))
+        due.sort(key=lambda d: d[0])
+        slept = 0
+        for at, run in itertools.groupby(due, key=lambda d: d[0]):
+            if at > slept:
+                await asyncio.sleep(at - slept)
+                slept = at
+            await self._driver.publish_batch([envelope for _, envelope in run])
+
     async def request(self, event_name: str, data: dict, timeout: float = 5):
+        # Deadline: the caller's own (current_deadline_var), or `timeout` from
+        # now if that comes first. It travels in the envelope headers so the
+        # responder skips — or stops retrying — work nobody waits for anymore.
+        remaining = time_remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"Deadline passed before request('{event_name}') — not sent.")
+        by_deadline = remaining is not None and remaining < timeout
+        if by_deadline:
+            timeout = remaining
+        deadline = time.time() + timeout
+
+        reply_to = self._inbox or await self._open_inbox()
         correlation_id = str(uuid.uuid4())
-        reply_to = f"_reply.{event_name}.{uuid.uuid4().hex[:8]}"
         future = asyncio.get_running_loop().create_future()
-        
-        async def _collector(env: EventEnvelope):
-            if env.correlation_id == correlation_id and not future.done():
-                future.set_result(env.payload)
-        
-        await self.subscribe(reply_to, _collector)
+        self._replies[correlation_id] = future
         try:
-            await self.publish(event_name, data, reply_to=reply_to, correlation_id=correlation_id)
-            return await asyncio.wait_for(future, timeout=timeout)
+            await self.publish(event_name, data, reply_to=reply_to, correlation_id=correlation_id,
+                               headers={DEADLINE_HEADER: deadline})
+            try:
+                return await asyncio.wait_for(future, timeout=timeout)
+            except TimeoutError:
+                if by_deadline:
+                    raise DeadlineExceededError(
+                        f"request('{event_name}') abandoned: the deadline passed before the reply."
+                    ) from None
+                raise
         finally:
-            await self.unsubscribe(reply_to, _collector)
+            # Answered, timed out or cancelled: a reply that arrives later
+            # finds no future and is dropped.
+            self._replies.pop(correlation_id, None)
+
+    async def _open_inbox(self) -> str:
+        """Subscribes this instance's reply inbox, once. Before this, every
+        request() subscribed (and then unsubscribed) an event of its own —
+        on a broker, a consumer group or a consumer per call."""
+        async with self._inbox_lock:
+            if self._inbox is None:
+                inbox = f"_reply.{self._instance_id}"
+                await self.subscribe(inbox, self._on_reply)
+                self._inbox = inbox
+        return self._inbox
+
+    async def _on_reply(self, envelope: EventEnvelope) -> None:
+        future = self._replies.pop(envelope.correlation_id, None)
+        if future is not None and not future.done():
+            future.set_result(envelope.payload)
 
     # ── Internal Engine ─────────────────────────────────────────────────────────
 
@@ -342,13 +626,34 @@ class EventBusTool(BaseTool):
         Returns the delivery task so distributed drivers can await handler
         completion before acknowledging to the broker (crash-safe delivery).
         """
-        task = asyncio.create_task(self._do_deliver(envelope, callback))
+        return self._deliver_now(envelope, callback)
+
+    def _deliver_now(self, envelope: EventEnvelope, callback: Callable) -> asyncio.Future:
+        """_deliver() without the coroutine around it (EventBusDriver.bind).
+        A bounded subscription's gate may queue it: then it returns a future
+        that completes with the delivery."""
+        subscription = self._subscriptions.get((envelope.event, callback))
+        if subscription is not None:
+            if subscription.gate is not None:
+                return subscription.gate.submit(envelope)
+            if subscription.batch is not None:
+                return subscription.batch.add(envelope)
+        return self._start_delivery(envelope, callback, subscription)
+
+    def _start_delivery(self, envelope: EventEnvelope, callback: Callable,
+                        subscription: Optional[Subscription] = None) -> asyncio.Task:
+        task = asyncio.create_task(self._do_deliver(envelope, callback, subscription))
         self._pending_tasks.add(task)
         task.add_done_callback(self._pending_tasks.discard)
         return task
 
-    async def _do_deliver(self, envelope: EventEnvelope, callback: Callable):
-        sub_name = self._get_name(callback)
+    async def _do_deliver(self, envelope: EventEnvelope, callback: Callable,
+                          subscription: Optional[Subscription] = None):
+        if subscription is None:
+            subscription = self._subscriptions.get((envelope.event, callback))
+        if subscription is None:   # delivered without subscribe() (tests, tooling)
+            subscription = Subscription(self._get_name(callback), callback, SubOptions())
+        sub_name = subscription.name
 
         # Chaos/ops pause (Issue 34): hold the delivery while this
         # subscriber's owner is paused — BEFORE the TTL check, so a message
@@ -358,77 +663,189 @@ class EventBusTool(BaseTool):
         # BROKER-side and drains on resume. (In-process: deliveries pile up
         # as pending tasks in this process' memory — gone on a crash, like
         # everything in-process.)
-        while any(sub_name == p or sub_name.startswith(p + ".")
-                  for p in self._paused_owners):
-            await asyncio.sleep(0.2)
-
-        # Feature 1: TTL Check
-        if envelope.ttl is not None:
-            age = (datetime.now(timezone.utc) - envelope.timestamp).total_seconds()
-            if age > envelope.ttl:
-                node = TraceNode(
-                    kind="delivered", envelope=envelope, subscribers=[sub_name],
-                    success=False, error="ttl_expired", attempts=0
-                )
-                self._trace_log.append(node)
+        # The pause names an owner prefix ("users", "users.WelcomePlugin"):
+        # a lookup of the subscription's precomputed prefixes, and the wait
+        # ends when the paused set changes, not on a polling tick.
+        while self._paused_owners.holds(subscription):
+            await self._paused_owners.changed()
+
+        # Adaptive concurrency limit (microcoreos/concurrency.py): over the
+        # owner's limit, wait in line for a slot. Like a pause, this comes
+        # before the TTL check, and drivers ack only once it is delivered.
+        limiter = limiter_for(callback, sub_name)
+        if limiter is not None:
+            await limiter.acquire()
+        attempt_started, last_error = None, None
+
+        try:
+            # Feature 1: TTL Check
+            if envelope.ttl is not None:
+                age = (datetime.now(timezone.utc) - envelope.timestamp).total_seconds()
+                if age > envelope.ttl:
+                    self._trace_log.delivered(envelope, sub_name, False, "ttl_expired", 0)
+                    return
+
+            # Feature 1b: Deadline Check — the requester has stopped waiting.
+            deadline = envelope.headers.get(DEADLINE_HEADER) if envelope.headers else None
+            if deadline is not None and deadline <= time.time():
+                self._trace_log.delivered(envelope, sub_name, False, "deadline_exceeded", 0)
                 return
 
-        # Feature 2: Resolve Subscription Options
-        options = self._sub_options.get((envelope.event, callback)) or SubOptions()
+            # Feature 2: Resolve Subscription Options
+            options = subscription.options
 
-        t1 = current_event_id_var.set(envelope.id)
-        t2 = current_identity_var.set(sub_name)
+            t1 = current_event_id_var.set(envelope.id)
+            t2 = current_identity_var.set(sub_name)
+            t3 = current_deadline_var.set(deadline)
         
-        success = False
-        last_error = None
-        attempts = 0
+            success = False
+            last_error = None
+            attempts = 0
         
-        try:
-            # Retry Loop
-            while attempts <= options.retries:
-                attempts += 1
-                try:
-                    if inspect.iscoroutinefunction(callback):
-                        result = await callback(envelope)
-                    else:
-                        # stdlib, not starlette: the bus must not depend on
-                        # the HTTP tool's framework — they are swapped
-                        # separately. to_thread copies the context, which
-                        # the event-id and identity vars ride on.
-                        result = await asyncio.to_thread(callback, envelope)
-
-                    if envelope.reply_to and result is not None:
-                        await self.publish(
-                            envelope.reply_to, 
-                            result if isinstance(result, dict) else {"result": result},
-                            correlation_id=envelope.correlation_id
-                        )
+            try:
+                # Retry Loop
+                while attempts <= options.retries:
+                    attempts += 1
+                    attempt_started = time.perf_counter()
+                    try:
+                        if options.offload == "process":
+                            # CPU-bound, in a worker process (offload.py): it
+                            # gets the payload — an envelope holds no more it can use.
+                            result = await metered(run_in_process(callback, envelope.payload))
+                        elif subscription.is_coroutine:
+                            result = await metered(callback(envelope))
+                        else:
+                            # The subscriber's own pool (executors.py), never the
+                            # HTTP tool's framework — they are swapped separately.
+                            # run_sync copies the context, which the event-id,
+                            # identity and deadline vars ride on.
+                            result = await metered(run_sync(pool_for(callback), callback, envelope))
+
+                        if envelope.reply_to and result is not None:
+                            await self.publish(
+                                envelope.reply_to, 
+                                result if isinstance(result, dict) else {"result": result},
+                                correlation_id=envelope.correlation_id
+                            )
                     
-                    success = True
-                    self._consecutive_failures.pop((sub_name, envelope.event), None)
-                    break
-                except Exception as e:
-                    last_error = e
-                    if attempts <= options.retries:
-                        wait = options.backoff * (2 ** (attempts - 1))
-                        await asyncio.sleep(wait)
+                        success = True
+                        self._consecutive_failures.pop((sub_name, envelope.event), None)
+                        break
+                    except Exception as e:
+                        last_error = e
+                        if deadline is not None and deadline <= time.time():
+                            break   # no retry can answer in time
+                        if attempts <= options.retries:
+                            wait = options.backoff * (2 ** (attempts - 1))
+                            await asyncio.sleep(wait)
             
-            # Record Trace Node (delivered)
-            node = TraceNode(
-                kind="delivered", envelope=envelope, subscribers=[sub_name],
-                success=success, error=str(last_error) if not success else None,
-                attempts=attempts
-            )
-            self._trace_log.append(node)
+                # Record Trace Node (delivered)
+                self._trace_log.delivered(
+                    envelope, sub_name, success,
+                    str(last_error) if not success else None, attempts
+                )
+
+                # A handler cut off by the requester's deadline is not poisoned:
+                # no dead-letter, no strike toward auto-unsubscribe.
+                if not success and not isinstance(last_error, DeadlineExceededError):
+                    await self._handle_final_failure(last_error, sub_name, envelope, callback, attempts)
 
-            if not success:
-                await self._handle_final_failure(last_error, sub_name, envelope, callback, attempts)
+            finally:
+                current_deadline_var.reset(t3)
+                current_event_id_var.reset(t1)
+                current_identity_var.reset(t2)
+        finally:
+            if limiter is not None:
+                limiter.release(attempt_started, isinstance(last_error, DeadlineExceededError))
+
+    async def _deliver_batch(self, envelopes: list, callback: Callable,
+                             subscription: Subscription) -> None:
+        """_do_deliver() for a batch subscription: one handler call per list.
+        Retries repeat the call, for the whole list when it raises, or for
+        just the envelopes it returns as failed ({envelope.id: error})."""
+        sub_name = subscription.name
+        while self._paused_owners.holds(subscription):
+            await self._paused_owners.changed()
+
+        limiter = limiter_for(callback, sub_name)
+        if limiter is not None:
+            await limiter.acquire()
+        attempt_started, last_error = None, None
+        try:
+            # TTL and deadline, per envelope: the expired ones leave the batch.
+            now, live, deadlines = datetime.now(timezone.utc), [], []
+            for envelope in envelopes:
+                if envelope.ttl is not None and (now - envelope.timestamp).total_seconds() > envelope.ttl:
+                    self._trace_log.delivered(envelope, sub_name, False, "ttl_expired", 0)
+                    continue
+                deadline = envelope.headers.get(DEADLINE_HEADER) if envelope.headers else None
+                if deadline is not None and deadline <= time.time():
+                    self._trace_log.delivered(envelope, sub_name, False, "deadline_exceeded", 0)
+                    continue
+                if deadline is not None:
+                    deadlines.append(deadline)
+                live.append(envelope)
+            if not live:
+                return
 
+            options = subscription.options
+            # No single event caused what the handler publishes: no parent id.
+            t1 = current_identity_var.set(sub_name)
+            t2 = current_deadline_var.set(min(deadlines) if deadlines else None)
+            pending, failed, attempts = live, {}, 0
+            try:
+                while attempts <= options.retries:
+                    attempts += 1
+                    attempt_started = time.perf_counter()
+                    try:
+                        if subscription.is_coroutine:
+                            result = await metered(callback(pending))
+                        else:
+                            result = await metered(run_sync(pool_for(callback), callback, pending))
+                        failed = self._failed_items(result, pending)
+                    except Exception as e:
+                        last_error = e
+                        failed = {envelope.id: e for envelope in pending}
+                    for envelope in pending:
+                        if envelope.id not in failed:
+                            self._trace_log.delivered(envelope, sub_name, True, None, attempts)
+                    pending = [envelope for envelope in pending if envelope.id in failed]
+                    if not pending:
+                        break
+                    if attempts <= options.retries:
+                        await asyncio.sleep(options.backoff * (2 ** (attempts - 1)))
+            finally:
+                current_deadline_var.reset(t2)
+                current_identity_var.reset(t1)
+
+            if not pending:
+                self._consecutive_failures.pop((sub_name, live[0].event), None)
+                return
+            for envelope in pending:
+                self._trace_log.delivered(envelope, sub_name, False, str(failed[envelope.id]), attempts)
+            # One strike per failed batch toward auto-unsubscribe; every
+            # failed envelope is reported (and dead-lettered) on its own.
+            await self._record_strike(failed[pending[0].id], sub_name, pending[0], callback)
+            for envelope in pending:
+                await self._report_failure(failed[envelope.id], sub_name, envelope, attempts)
         finally:
-            current_event_id_var.reset(t1)
-            current_identity_var.reset(t2)
+            if limiter is not None:
+                limiter.release(attempt_started, isinstance(last_error, DeadlineExceededError))
+
+    @staticmethod
+    def _failed_items(result, batch: list) -> dict:
+        """A batch handler's per-item failures: it may return {envelope.id: error}
+        for the envelopes it could not handle. Anything else: all succeeded."""
+        if not isinstance(result, dict) or not result:
+            return {}
+        ids = {envelope.id for envelope in batch}
+        return {envelope_id: error for envelope_id, error in result.items() if envelope_id in ids}
 
     async def _handle_final_failure(self, e, sub_name, envelope, callback, attempts):
+        await self._record_strike(e, sub_name, envelope, callback)
+        await self._report_failure(e, sub_name, envelope, attempts)
+
+    async def _record_strike(self, e, sub_name, envelope, callback):
         # Poisoned-handler logic
         fail_key = (sub_name, envelope.event)
         count = self._consecutive_failures.get(fail_key, 0) + 1
@@ -438,7 +855,11 @@ class EventBusTool(BaseTool):
         if count >= self._MAX_CONSECUTIVE_FAILURES:
             self._consecutive_failures.pop(fail_key, None)
             await self._driver.unsubscribe(envelope.event, callback)
-            self._sub_options.pop((envelope.event, callback), None)
+            dropped = self._subscriptions.pop((envelope.event, callback), None)
+            if dropped is not None and dropped.gate is not None:
+                self._release_gate(envelope.event, dropped.gate)
+            if dropped is not None and dropped.batch is not None:
+                dropped.batch.flush()
             # Make the silent drop observable. Guard: a dropped subscriber OF
             # this very event must not re-trigger it (self-reference loop).
             if envelope.event != self.SUBSCRIBER_DROPPED_EVENT:
@@ -449,6 +870,7 @@ class EventBusTool(BaseTool):
                     "consecutive_failures": count,
                 })
 
+    async def _report_failure(self, e, sub_name, envelope, attempts):
         # Notify failure listeners
         failure_record = {"event": envelope.event, "event_id": envelope.id, "subscriber": sub_name, "error": str(e), "attempts": attempts}
         for fl in self._failure_listeners:
@@ -472,7 +894,7 @@ class EventBusTool(BaseTool):
                 }
                 await self.publish(f"_dlq.{envelope.event}", dlq_payload, correlation_id=envelope.correlation_id)
 
-    def get_trace_history(self) -> List[TraceNode]: return list(self._trace_log)
+    def get_trace_history(self) -> List[TraceNode]: return self._trace_log.history()
     def add_listener(self, cb): self._listeners.append(cb)
     def add_failure_listener(self, cb): self._failure_listeners.append(cb)
 
@@ -494,13 +916,71 @@ class EventBusTool(BaseTool):
         module = getattr(cb, "__module__", None) or "anonymous"
         return f"{module}.{getattr(cb, '__qualname__', 'anonymous')}"
 
-    def get_subscribers(self) -> dict:
-        return self._driver.get_status(name_resolver=self._get_name)
+    def get_subscribers(self, queues: bool = False) -> dict:
+        """{event: [subscriber names]}. With queues=True, {event: [{...}]}:
+        each subscriber's name and, when bounded, its queue depth (when
+        batched, its open batch)."""
+        status = self._driver.get_status(name_resolver=self._get_name)
+        if not queues:
+            return status
+        subs = {(event, sub.name): sub for (event, _), sub in self._subscriptions.items()}
+        detailed = {}
+        for event, names in status.items():
+            detailed[event] = []
+            for name in names:
+                sub = subs.get((event, name))
+                gate = sub.gate if sub is not None else None
+                batch = sub.batch if sub is not None else None
+                row = {"subscriber": name, "bounded": gate is not None}
+                if gate is not None:
+                    row.update(gate.stats())
+                if batch is not None:
+                    row.update(batch.stats())
+                detailed[event].append(row)
+        return detailed
+
+    async def drain(self, timeout: float) -> None:
+        """Graceful shutdown, phase one: stop claiming broker messages, then
+        wait up to `timeout` seconds for every delivery and publish in flight
+        — including the publishes and deliveries those start in turn."""
+        deadline = time.monotonic() + timeout
+        try:
+            await asyncio.wait_for(self._driver.stop_consuming(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for subscription in list(self._subscriptions.values()):
+            if subscription.batch is not None:
+                subscription.batch.flush()   # no reason to wait out max_wait_ms
+        while self._pending_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"[EventBus] ⚠️ Drain budget spent with {len(self._pending_tasks)} task(s) in flight.")
+                return
+            await asyncio.wait(set(self._pending_tasks), timeout=remaining)
 
     async def shutdown(self):
+        # Work that finished after drain() (a late HTTP request, say) may
+        # still have publishes on their way to the transport: flush them
+        # before the cancel below turns them into lost events.
+        chains = [t for t in self._publish_chain.values() if not t.done()]
+        if chains:
+            await asyncio.wait(chains, timeout=self._FLUSH_TIMEOUT)
+        for gate in self._gates:
+            gate.close()   # queued deliveries are abandoned, like pending tasks
+        for subscription in self._subscriptions.values():
+            if subscription.batch is not None:
+                subscription.batch.close()
         if self._pending_tasks:
             print(f"[EventBus] Cleaning up {len(self._pending_tasks)} pending tasks...")
             for task in self._pending_tasks:
                 task.cancel()
             await asyncio.gather(*self._pending_tasks, return_exceptions=True)
+        for future in self._replies.values():
+            future.cancel()   # nothing can answer them now
+        self._replies.clear()
         await self._driver.shutdown()
+        self._inbox = None
+        if self._spill is not None:
+            spill, self._spill = self._spill, None
+            await run_sync("event_bus", spill.close)
+
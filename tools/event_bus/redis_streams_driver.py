@@ -34,6 +34,10 @@ TRANSPORT MAPPING:
     key / priority         → accepted but no-ops: a stream is already totally
         ordered, and Streams have no message priority
     ttl                    → enforced Bus-side at delivery (age check)
+    encoding               → EVENT_BUS_CODEC / EVENT_BUS_COMPRESSION (codec.py).
+        Plain JSON is the field "json", as ever; anything else is the field
+        "env" labelled by the field "codec". Delayed envelopes are parked as
+        JSON whatever the codec: the promotion script reads their event name.
 
 CONFIGURATION (env vars):
 ─────────────────────────────────────────────────────────────────
@@ -64,6 +68,7 @@ from redis import exceptions as redis_exceptions
 from typing import Callable, Optional
 from microcoreos import ToolUnavailableError
 from tools.event_bus.event_bus_tool import EventBusDriver
+from tools.event_bus.codec import EnvelopeCodec, CODEC_HEADER
 
 
 class EventBusConnectionError(ToolUnavailableError):
@@ -75,13 +80,14 @@ class _Subscription:
     """One reader loop: (event, callback) consuming a stream via a consumer group."""
 
     def __init__(self, event: str, stream: str, group: str, consumer: str,
-                 callback: Callable, ephemeral: bool):
+                 callback: Callable, ephemeral: bool, batch: int = 1):
         self.event = event
         self.stream = stream
         self.group = group
         self.consumer = consumer
         self.callback = callback
         self.ephemeral = ephemeral  # broadcast groups are destroyed on unsubscribe
+        self.batch = batch          # entries delivered (and acked) together
         self.task: Optional[asyncio.Task] = None
 
 
@@ -118,6 +124,8 @@ class RedisStreamsDriver(EventBusDriver):
         self._redis: aioredis.Redis | None = None
         self._subs: list[_Subscription] = []
         self._promoter_task: asyncio.Task | None = None
+        self._draining = False
+        self._codec = EnvelopeCodec()
 
     # ─── LIFECYCLE ────────────────────────────────────────
 
@@ -130,6 +138,9 @@ class RedisStreamsDriver(EventBusDriver):
             password=self._password or None,
             socket_connect_timeout=self._connect_timeout,
             decode_responses=True,
+            # Binary codecs: bytes that are not UTF-8 survive the round trip
+            # as surrogates, and _decode() turns them back into the bytes.
+            encoding_errors="surrogateescape",
         )
         try:
             await self._redis.ping()
@@ -171,13 +182,42 @@ class RedisStreamsDriver(EventBusDriver):
             except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError) as e:
                 raise EventBusConnectionError(f"Redis broker unreachable: {e}") from e
             return
-        fields = {"json": envelope.model_dump_json()}
+        fields = self._fields(envelope)
         try:
             await self._redis.xadd(f"{self.STREAM_PREFIX}{envelope.event}", fields,
                                    maxlen=self._maxlen, approximate=True)
         except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError) as e:
             raise EventBusConnectionError(f"Redis broker unreachable: {e}") from e
 
+    async def publish_batch(self, envelopes) -> None:
+        # One pipeline, one round trip. Not MULTI/EXEC: the batch is not
+        # atomic, the same as publishing its envelopes one by one.
+        pipe = self._redis.pipeline(transaction=False)
+        now = time.time()
+        for envelope in envelopes:
+            if envelope.delay and envelope.delay > 0:
+                pipe.zadd(self.DELAYED_KEY,
+                          {envelope.model_dump_json(): now + envelope.delay})
+            else:
+                pipe.xadd(f"{self.STREAM_PREFIX}{envelope.event}", self._fields(envelope),
+                          maxlen=self._maxlen, approximate=True)
+        try:
+            await pipe.execute()
+        except (redis_exceptions.ConnectionError, redis_exceptions.TimeoutError) as e:
+            raise EventBusConnectionError(f"Redis broker unreachable: {e}") from e
+
+    def _fields(self, envelope) -> dict:
+        body, label = self._codec.encode(envelope)
+        if label == "json":
+            return {"json": body}   # what every version reads
+        return {"env": body, CODEC_HEADER: label}
+
+    def _decode(self, fields: dict):
+        if "json" in fields:
+            return self._envelope_cls.model_validate_json(fields["json"])
+        return self._codec.decode(fields["env"].encode("utf-8", "surrogateescape"),
+                                  fields[CODEC_HEADER], self._envelope_cls)
+
     async def _promote_delayed(self) -> None:
         """Poll loop: run the atomic promotion script every DELAY_POLL_MS."""
         while True:
@@ -194,7 +234,8 @@ class RedisStreamsDriver(EventBusDriver):
 
     # ─── TRANSPORT: subscribe / readers ───────────────────
 
-    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable):
+    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable,
+                        batch: int = 1):
         stream = f"{self.STREAM_PREFIX}{event_name}"
         ephemeral = group is None
         group_name = group if group is not None else f"_bcast_{uuid.uuid4().hex[:12]}"
@@ -208,20 +249,27 @@ class RedisStreamsDriver(EventBusDriver):
             if "BUSYGROUP" not in str(e):
                 raise
 
-        sub = _Subscription(event_name, stream, group_name, consumer, callback, ephemeral)
+        sub = _Subscription(event_name, stream, group_name, consumer, callback, ephemeral, batch)
         sub.task = asyncio.create_task(self._reader(sub))
         self._subs.append(sub)
 
+    async def subscribe_batch(self, event_name: str, group: Optional[str], callback: Callable,
+                              max_batch: int):
+        await self.subscribe(event_name, group, callback, batch=max_batch)
+
     # How often each reader looks for entries abandoned by a dead consumer
     # (durable groups only). The idle threshold itself is EVENT_BUS_CLAIM_IDLE_MS.
     CLAIM_EVERY_S = 30.0
 
     async def _reader(self, sub: _Subscription) -> None:
         last_claim = time.monotonic()
-        while True:
+        # Draining: durable readers stop before their next read (within the
+        # 1s block); broadcast/reply readers keep going until shutdown.
+        while sub.ephemeral or not self._draining:
             try:
                 response = await self._redis.xreadgroup(
-                    sub.group, sub.consumer, {sub.stream: ">"}, count=16, block=1000
+                    sub.group, sub.consumer, {sub.stream: ">"}, count=max(16, sub.batch),
+                    block=1000
                 )
                 # Crash recovery: periodically adopt messages left pending by
                 # consumers (replicas) that died mid-handler.
@@ -229,7 +277,7 @@ class RedisStreamsDriver(EventBusDriver):
                     last_claim = time.monotonic()
                     _, claimed, *_ = await self._redis.xautoclaim(
                         sub.stream, sub.group, sub.consumer,
-                        min_idle_time=self._claim_idle_ms, count=16,
+                        min_idle_time=self._claim_idle_ms, count=max(16, sub.batch),
                     )
                     await self._process(sub, claimed)
             except asyncio.CancelledError:
@@ -246,12 +294,30 @@ class RedisStreamsDriver(EventBusDriver):
             for _, messages in response or []:
                 await self._process(sub, messages)
 
+    async def stop_consuming(self) -> None:
+        self._draining = True
+        await asyncio.gather(*[s.task for s in self._subs if not s.ephemeral and s.task is not None],
+                             return_exceptions=True)
+
     async def _process(self, sub: _Subscription, messages) -> None:
-        for msg_id, fields in messages or []:
-            try:
-                envelope = self._envelope_cls.model_validate_json(fields["json"])
-                delivery = await self._deliver_hook(envelope, sub.callback)
-                if delivery is not None:
+        # One entry at a time — or, for a batch subscription, sub.batch
+        # entries delivered before any is awaited, so the Bus can gather
+        # them into one handler call, then acked together.
+        messages = messages or []
+        for start in range(0, len(messages), sub.batch):
+            chunk = messages[start:start + sub.batch]
+            deliveries = []
+            for msg_id, fields in chunk:
+                try:
+                    deliveries.append((msg_id, await self._deliver_hook(self._decode(fields),
+                                                                        sub.callback)))
+                except Exception as e:
+                    # Corrupt/foreign message: never let it kill the reader.
+                    print(f"[RedisStreamsDriver] ⚠️ Undeliverable message {msg_id} on {sub.stream}: {e}")
+            for msg_id, delivery in deliveries:
+                if delivery is None:
+                    continue
+                try:
                     # Ack AFTER the handler (and its Bus-side retries) finishes:
                     # a replica dying mid-handler leaves the message pending,
                     # and a surviving consumer reclaims it (at-least-once).
@@ -259,10 +325,9 @@ class RedisStreamsDriver(EventBusDriver):
                     # escalation) — cancelling this reader must not cancel the
                     # in-flight delivery that triggered it (await cycle).
                     await asyncio.shield(delivery)
-            except Exception as e:
-                # Corrupt/foreign message: never let it kill the reader.
-                print(f"[RedisStreamsDriver] ⚠️ Undeliverable message {msg_id} on {sub.stream}: {e}")
-            await self._redis.xack(sub.stream, sub.group, msg_id)
+                except Exception as e:
+                    print(f"[RedisStreamsDriver] ⚠️ Undeliverable message {msg_id} on {sub.stream}: {e}")
+            await self._redis.xack(sub.stream, sub.group, *[msg_id for msg_id, _ in chunk])
 
     # ─── TRANSPORT: unsubscribe ───────────────────────────
 
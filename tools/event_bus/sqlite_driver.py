@@ -60,6 +60,8 @@ CONFIGURATION (env vars, read in __init__, zero I/O):
     EVENT_BUS_SQLITE_SYNCHRONOUS  default "FULL" — the honest durability
         setting (fsync per commit). "NORMAL" trades a small crash window for
         throughput. This is the documented cost of the durable rung.
+    EVENT_BUS_CODEC / EVENT_BUS_COMPRESSION — row encoding (codec.py). Plain
+        JSON rows stay TEXT; any other codec is a labelled BLOB frame.
 
 DELIVERY GUARANTEE: at-least-once. A row is deleted only AFTER the handler
 (including Bus-side retries/DLQ) finishes — rows claimed by a process that
@@ -76,20 +78,28 @@ import asyncio
 import threading
 from typing import Callable, Optional
 
+from microcoreos import run_sync
+
 from tools.event_bus.event_bus_tool import EventBusDriver
+from tools.event_bus.codec import EnvelopeCodec
 
 _SYNC_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
 
+def _delay(envelope) -> int:
+    return envelope.delay if envelope.delay and envelope.delay > 0 else 0
+
+
 class _Subscription:
     """One consumer: (event, group, callback). Durable ones own a reader task."""
 
     def __init__(self, event: str, group: Optional[str], callback: Callable,
-                 ephemeral: bool):
+                 ephemeral: bool, batch: int = 1):
         self.event = event
         self.group = group
         self.callback = callback
         self.ephemeral = ephemeral
+        self.batch = batch   # rows claimed (and acked) together
         self.task: Optional[asyncio.Task] = None
 
 
@@ -119,6 +129,8 @@ class SQLiteDriver(EventBusDriver):
         self._subs: list[_Subscription] = []
         self._wakeup = asyncio.Event()
         self._publish_count = 0
+        self._draining = False
+        self._codec = EnvelopeCodec()
 
     # ─── LIFECYCLE ────────────────────────────────────────
 
@@ -152,60 +164,80 @@ class SQLiteDriver(EventBusDriver):
             conn.commit()
             return conn
 
-        self._conn = await asyncio.to_thread(_open)
+        self._conn = await run_sync("event_bus", _open)
         print(f"[System] SQLiteDriver: Durable local transport ready ({self._path}).")
 
+    async def stop_consuming(self) -> None:
+        # Readers check the flag before each claim; a row already claimed is
+        # handled and acked first. Only durable subscriptions have readers.
+        self._draining = True
+        self._wakeup.set()
+        await asyncio.gather(*[s.task for s in self._subs if s.task is not None],
+                             return_exceptions=True)
+
     async def shutdown(self) -> None:
         for sub in self._subs:
             await self._stop_subscription(sub)
         self._subs.clear()
         if self._conn is not None:
             conn, self._conn = self._conn, None
-            # A cancelled to_thread task can return before its worker thread
+            # A cancelled run_sync task can return before its worker thread
             # actually stops (cancellation can't interrupt a running thread),
-            # so a reader's _ack/_claim_one may still be mid-execute here.
+            # so a reader's _ack/_claim may still be mid-execute here.
             # Route close() through the same lock so it waits its turn
             # instead of racing the connection out from under that thread.
             def _close():
                 with self._db_lock:
                     conn.close()
-            await asyncio.to_thread(_close)
+            await run_sync("event_bus", _close)
 
     # ─── TRANSPORT: publish ───────────────────────────────
 
     async def publish(self, envelope) -> None:
-        delay = envelope.delay if envelope.delay and envelope.delay > 0 else 0
-        due_at = time.time() + delay
-        raw = envelope.model_dump_json()
+        await self.publish_batch([envelope])
+
+    async def publish_batch(self, envelopes) -> None:
+        # One transaction (one fsync under synchronous=FULL) for the batch.
+        now = time.time()
+        rows = [(env, _delay(env), self._codec.pack(env)) for env in envelopes]
 
-        def _stage() -> list:
+        def _stage() -> set:
+            matched: set = set()
+            groups: dict[str, list] = {}
             with self._db_lock:
-                matched = self._conn.execute(
-                    "SELECT event, grp FROM groups WHERE event = ?",
-                    (envelope.event,),
-                ).fetchall()
-                for sub_event, grp in matched:
-                    self._conn.execute(
-                        "INSERT INTO deliveries (event, grp, envelope, due_at, status, created_at) "
-                        "VALUES (?, ?, ?, ?, 'pending', ?)",
-                        (sub_event, grp, raw, due_at, time.time()),
-                    )
+                for env, delay, raw in rows:
+                    if env.event not in groups:
+                        groups[env.event] = self._conn.execute(
+                            "SELECT event, grp FROM groups WHERE event = ?",
+                            (env.event,),
+                        ).fetchall()
+                    for sub_event, grp in groups[env.event]:
+                        self._conn.execute(
+                            "INSERT INTO deliveries (event, grp, envelope, due_at, status, created_at) "
+                            "VALUES (?, ?, ?, ?, 'pending', ?)",
+                            (sub_event, grp, raw, now + delay, now),
+                        )
+                        matched.add((sub_event, grp))
                 self._conn.commit()
-                return matched
+            return matched
 
-        matched = await asyncio.to_thread(_stage)
+        matched = await run_sync("event_bus", _stage)
         if matched:
             self._wakeup.set()
-            self._publish_count += 1
-            if self._maxlen > 0 and self._publish_count % self.PRUNE_EVERY == 0:
-                await asyncio.to_thread(self._prune, matched)
+            before = self._publish_count
+            self._publish_count += len(rows)
+            if self._maxlen > 0 and self._publish_count // self.PRUNE_EVERY > before // self.PRUNE_EVERY:
+                await run_sync("event_bus", self._prune, sorted(matched))
 
         # Ephemeral broadcasts are in-memory by design (never survive reboot).
-        if delay:
-            await asyncio.sleep(delay)
-        for sub in [s for s in self._subs
-                    if s.ephemeral and s.event == envelope.event]:
-            asyncio.create_task(self._deliver_hook(envelope, sub.callback))
+        slept = 0
+        for env, delay, _ in sorted(rows, key=lambda row: row[1]):
+            if delay > slept:
+                await asyncio.sleep(delay - slept)
+                slept = delay
+            for sub in [s for s in self._subs
+                        if s.ephemeral and s.event == env.event]:
+                asyncio.create_task(self._deliver_hook(env, sub.callback))
 
     def _prune(self, matched: list) -> None:
         with self._db_lock:
@@ -220,9 +252,10 @@ class SQLiteDriver(EventBusDriver):
 
     # ─── TRANSPORT: subscribe / readers ───────────────────
 
-    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable):
+    async def subscribe(self, event_name: str, group: Optional[str], callback: Callable,
+                        batch: int = 1):
         ephemeral = group is None
-        sub = _Subscription(event_name, group, callback, ephemeral)
+        sub = _Subscription(event_name, group, callback, ephemeral, batch)
 
         if not ephemeral:
             # Registering the group is the "$" moment: fan-out starts with the
@@ -236,33 +269,39 @@ class SQLiteDriver(EventBusDriver):
                     )
                     self._conn.commit()
 
-            await asyncio.to_thread(_register)
+            await run_sync("event_bus", _register)
             sub.task = asyncio.create_task(self._reader(sub))
 
         self._subs.append(sub)
 
-    def _claim_one(self, sub: _Subscription):
-        """Atomic claim: competing consumers of a group never share a row."""
+    async def subscribe_batch(self, event_name: str, group: Optional[str], callback: Callable,
+                              max_batch: int):
+        await self.subscribe(event_name, group, callback, batch=max_batch)
+
+    def _claim(self, sub: _Subscription) -> list:
+        """Atomic claim of up to sub.batch rows: competing consumers of a
+        group never share a row."""
         with self._db_lock:
-            row = self._conn.execute(
-                "UPDATE deliveries SET status='processing' WHERE id = ("
+            rows = self._conn.execute(
+                "UPDATE deliveries SET status='processing' WHERE id IN ("
                 "  SELECT id FROM deliveries WHERE event=? AND grp=? "
-                "  AND status='pending' AND due_at<=? ORDER BY id LIMIT 1) "
+                "  AND status='pending' AND due_at<=? ORDER BY id LIMIT ?) "
                 "RETURNING id, envelope",
-                (sub.event, sub.group, time.time()),
-            ).fetchone()
+                (sub.event, sub.group, time.time(), sub.batch),
+            ).fetchall()
             self._conn.commit()
-            return row
+            return sorted(rows)   # RETURNING order is unspecified
 
-    def _ack(self, row_id: int) -> None:
+    def _ack(self, row_ids: list) -> None:
         with self._db_lock:
-            self._conn.execute("DELETE FROM deliveries WHERE id=?", (row_id,))
+            self._conn.executemany("DELETE FROM deliveries WHERE id=?",
+                                   [(row_id,) for row_id in row_ids])
             self._conn.commit()
 
     async def _reader(self, sub: _Subscription) -> None:
-        while True:
-            row = await asyncio.to_thread(self._claim_one, sub)
-            if row is None:
+        while not self._draining:
+            rows = await run_sync("event_bus", self._claim, sub)
+            if not rows:
                 # Idle: in-process publishes wake us instantly; the timeout
                 # only matters for due delays and nothing-published lulls.
                 self._wakeup.clear()
@@ -272,11 +311,21 @@ class SQLiteDriver(EventBusDriver):
                     pass
                 continue
 
-            row_id, raw = row
-            try:
-                envelope = self._envelope_cls.model_validate_json(raw)
-                delivery = await self._deliver_hook(envelope, sub.callback)
-                if delivery is not None:
+            # One row, unless this is a batch subscription: then every row
+            # claimed is delivered before any is awaited, so the Bus can
+            # gather them into one handler call.
+            deliveries = []
+            for row_id, raw in rows:
+                try:
+                    envelope = self._codec.unpack(raw, self._envelope_cls)
+                    deliveries.append((row_id, await self._deliver_hook(envelope, sub.callback)))
+                except Exception as e:
+                    # Corrupt row: never let it kill the reader (acked below).
+                    print(f"[SQLiteDriver] ⚠️ Undeliverable row {row_id} on {sub.event}: {e}")
+            for row_id, delivery in deliveries:
+                if delivery is None:
+                    continue
+                try:
                     # Ack (DELETE) only AFTER the handler and its Bus-side
                     # retries finish: a process dying here leaves the row
                     # 'processing', reset to pending at next boot (redelivery).
@@ -284,12 +333,11 @@ class SQLiteDriver(EventBusDriver):
                     # escalation) — cancelling this reader must not cancel the
                     # in-flight delivery that triggered it.
                     await asyncio.shield(delivery)
-            except asyncio.CancelledError:
-                raise  # row stays 'processing' → redelivered next boot
-            except Exception as e:
-                # Corrupt row: never let it kill the reader (acked below).
-                print(f"[SQLiteDriver] ⚠️ Undeliverable row {row_id} on {sub.event}: {e}")
-            await asyncio.to_thread(self._ack, row_id)
+                except asyncio.CancelledError:
+                    raise  # rows stay 'processing' → redelivered next boot
+                except Exception as e:
+                    print(f"[SQLiteDriver] ⚠️ Undeliverable row {row_id} on {sub.event}: {e}")
+            await run_sync("event_bus", self._ack, [row_id for row_id, _ in rows])
 
     # ─── TRANSPORT: unsubscribe ───────────────────────────
 
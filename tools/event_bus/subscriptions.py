@@ -0,0 +1,79 @@
+"""
+Enterprise Event Bus — Subscription Records & Paused Owners
+===========================================================
+What the delivery path needs to know about a subscriber never changes after
+subscribe(): its name, its options, whether it is a coroutine function and
+the owner prefixes a pause can name. Subscription resolves all of it once,
+so a delivery reads attributes instead of formatting names, introspecting
+the callback and scanning the paused set.
+
+PausedOwners is the bus's held-owners set (Issue 34). It stays a plain set
+to its one writer, the chaos extras plugin (add / discard / clear), and
+wakes held deliveries on every change instead of leaving them to poll.
+"""
+
+import asyncio
+import inspect
+from typing import Callable
+
+from tools.event_bus.envelope import SubOptions
+
+
+class Subscription:
+    """One (event, callback) subscription, resolved once."""
+    __slots__ = ("name", "options", "is_coroutine", "prefixes", "gate", "batch")
+
+    def __init__(self, name: str, callback: Callable, options: SubOptions):
+        self.name = name
+        self.options = options
+        self.is_coroutine = inspect.iscoroutinefunction(callback)
+        # "users.WelcomePlugin.on_created" → itself, "users.WelcomePlugin",
+        # "users": every identity a pause may name to hold this subscriber.
+        parts = name.split(".")
+        self.prefixes = frozenset(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+        self.gate = None   # a DeliveryGate when bounded (backpressure.py)
+        self.batch = None  # a BatchCollector for subscribe_batch() (batching.py)
+
+
+class PausedOwners(set):
+    """A set of owner identities that notifies waiters when it changes."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._waiters: list = []
+
+    def holds(self, subscription: Subscription) -> bool:
+        return bool(self) and not self.isdisjoint(subscription.prefixes)
+
+    async def changed(self) -> None:
+        """Returns at the next change to the set."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _notify(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+
+
+def _notifying(name: str):
+    method = getattr(set, name)
+
+    def mutate(self, *args):
+        result = method(self, *args)
+        self._notify()
+        return result
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("add", "discard", "remove", "pop", "clear", "update", "difference_update",
+              "intersection_update", "symmetric_difference_update",
+              "__ior__", "__iand__", "__isub__", "__ixor__"):
+    setattr(PausedOwners, _name, _notifying(_name))
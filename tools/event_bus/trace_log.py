@@ -0,0 +1,90 @@
+"""
+Enterprise Event Bus — Compact Trace Log
+========================================
+The bus records every publication and every delivery. Building a Pydantic
+TraceNode on each of those hops was a measurable share of the bus's CPU
+under load, for a history that is only read when someone opens a trace view.
+
+TraceLog keeps slotted records instead — the envelope (already built and
+immutable, so kept by reference, never copied), the outcome and a float
+clock — in a ring of `maxlen` records. They become TraceNodes only when
+history() is read.
+
+Sampling keeps 1 in 1/`sample_rate` envelopes, decided by the envelope id:
+a sampled event keeps its publication AND all its deliveries, on every
+replica, so a causal tree is never half there. Failed deliveries are always
+kept — they are what the history is read for.
+
+    EVENT_BUS_TRACE_MAXLEN=500    # records kept (0: no trace history)
+    EVENT_BUS_TRACE_SAMPLE=1.0    # share of events traced, 0..1
+"""
+
+import os
+import time
+import zlib
+import collections
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from tools.event_bus.envelope import EventEnvelope, TraceNode
+
+
+class _Trace:
+    __slots__ = ("kind", "envelope", "subscriber", "success", "error", "attempts", "at")
+
+    def __init__(self, kind, envelope, subscriber, success, error, attempts, at):
+        self.kind = kind
+        self.envelope = envelope
+        self.subscriber = subscriber
+        self.success = success
+        self.error = error
+        self.attempts = attempts
+        self.at = at
+
+    def to_node(self) -> TraceNode:
+        return TraceNode.model_construct(
+            kind=self.kind, envelope=self.envelope,
+            subscribers=[self.subscriber] if self.subscriber else [],
+            success=self.success, error=self.error, attempts=self.attempts,
+            timestamp=datetime.fromtimestamp(self.at, timezone.utc),
+        )
+
+
+class TraceLog:
+    """The bus's trace history: append is cheap, reading builds TraceNodes."""
+
+    def __init__(self, maxlen: Optional[int] = None, sample_rate: Optional[float] = None):
+        if maxlen is None:
+            maxlen = int(os.getenv("EVENT_BUS_TRACE_MAXLEN", "500"))
+        if sample_rate is None:
+            sample_rate = float(os.getenv("EVENT_BUS_TRACE_SAMPLE", "1.0"))
+        if maxlen < 0:
+            raise ValueError("EVENT_BUS_TRACE_MAXLEN must be >= 0")
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("EVENT_BUS_TRACE_SAMPLE must be between 0 and 1")
+        self.maxlen = maxlen
+        self.sample_rate = sample_rate
+        self._records: collections.deque = collections.deque(maxlen=maxlen)
+        self._threshold = int(sample_rate * 2 ** 32)
+
+    def sampled(self, envelope: EventEnvelope) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        return zlib.crc32(envelope.id.encode()) < self._threshold
+
+    def published(self, envelope: EventEnvelope) -> None:
+        if self.maxlen and self.sampled(envelope):
+            self._records.append(_Trace("published", envelope, None, True, None, None, time.time()))
+
+    def delivered(self, envelope: EventEnvelope, subscriber: str, success: bool,
+                  error: Optional[str] = None, attempts: Optional[int] = None) -> None:
+        if self.maxlen and (not success or self.sampled(envelope)):
+            self._records.append(
+                _Trace("delivered", envelope, subscriber, success, error, attempts, time.time())
+            )
+
+    def history(self) -> List[TraceNode]:
+        return [record.to_node() for record in list(self._records)]
+
+    def __len__(self) -> int:
+        return len(self._records)
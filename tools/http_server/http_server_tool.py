@@ -18,6 +18,9 @@ PUBLIC CONTRACT (what plugins use):
         response_model=UserResponse,      # Optional: Pydantic model → OpenAPI response schema
         auth_validator=self._validate,    # Optional: token validator (see AUTH section)
         has_files=False,                  # Optional: if True, enables multipart/form-data
+        timeout=2.0,                      # Optional: time budget in seconds (default HTTP_REQUEST_TIMEOUT)
+        offload=None,                     # Optional: "process" runs a module-level handler(data)
+                                          # in a worker process (microcoreos/offload.py)
     )
 
     # Serve static files from a directory. Only DEFAULT_STATIC_EXTENSIONS are
@@ -81,6 +84,10 @@ RESPONSE CONTRACT:
     # Validation failure — handled automatically (HTTP 422, envelope format)
     # {"success": False, "error": "<first validation message>", "details": [...]}
 
+    # Time budget exhausted — a tool call or bus request raised
+    # DeadlineExceededError (HTTP 504, envelope format)
+    # {"success": False, "error": "Deadline exceeded"}
+
     # Unhandled exception — caught by the tool (HTTP 500, envelope format)
     # {"success": False, "error": "Internal server error"}
     # (exception details are logged server-side, NOT exposed to clients)
@@ -126,7 +133,7 @@ REPLACEMENT STANDARD (implement this to swap the backend):
     1. Create tools/aiohttp_server/aiohttp_server_tool.py  lint:no-path
     2. name = "http"                               ← same injection key, plugins are unaffected
     3. Implement the public methods:
-          add_endpoint(path, method, handler, tags, request_model, response_model, auth_validator, has_files)
+          add_endpoint(path, method, handler, tags, request_model, response_model, auth_validator, has_files, timeout, offload)
           mount_static(path, directory_path, html=False, allow_extensions=None)
           add_ws_endpoint(path, on_connect, on_disconnect, auth_validator)
           add_sse_endpoint(path, generator, tags, auth_validator)
@@ -140,24 +147,26 @@ REPLACEMENT STANDARD (implement this to swap the backend):
     6. For auth: call auth_validator(token), inject payload into data["_auth"]
     7. On auth failure: return HTTP 401 with {"success": False, "error": "..."}
     8. On unhandled exception: return HTTP 500 with {"success": False, "error": "Internal server error"}
+    9. Worker mode: when HTTP_SOCKET_FD is set, serve on that inherited listening
+       socket instead of binding HTTP_HOST:HTTP_PORT (`microcoreos run --workers N`).
 
     Plugins will NOT require any changes.
 """
 
 import os
 import stat
+import socket
 import asyncio
 import inspect
 import uvicorn
 from typing import Optional, Callable
 from fastapi.exceptions import RequestValidationError
-from microcoreos import BaseTool
+from microcoreos import BaseTool, pool_for, prepare_offload, run_sync
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Depends, File, UploadFile, Security
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.concurrency import run_in_threadpool
 
 # HttpContext and the request-processing pipeline were split out into their
 # own modules (mechanical move, no behavior change). Re-exported here since
@@ -181,9 +190,15 @@ DEFAULT_STATIC_EXTENSIONS = frozenset({
 
 class HttpServerTool(BaseTool):
 
+    # Start serving only after an observability tool has instrumented the
+    # app: Starlette refuses new middleware once the first request built it.
+    boot_complete_after = ("telemetry",)
+
     def __init__(self):
         self.app = FastAPI(title="MicroCoreOS Gateway")
         self._port: int = int(os.getenv("HTTP_PORT", 5000))
+        # Default time budget per request (seconds); unset or 0 = no deadline.
+        self._request_timeout: Optional[float] = float(os.getenv("HTTP_REQUEST_TIMEOUT", "0") or 0) or None
         self._server: Optional[uvicorn.Server] = None
         self._pending_endpoints: list[dict] = []
         self._pending_mounts: list[dict] = []
@@ -282,6 +297,17 @@ class HttpServerTool(BaseTool):
         log_level = os.getenv("HTTP_LOG_LEVEL", "warning")
         config = uvicorn.Config(self.app, host=host, port=self._port, log_level=log_level)
         self._server = uvicorn.Server(config)
+        # Worker mode (`microcoreos run --workers N`): the supervisor bound the
+        # listening socket once and every worker accepts on that same
+        # descriptor. Binding our own here would fail with "address in use".
+        inherited_fd = os.getenv("HTTP_SOCKET_FD")
+        if inherited_fd:
+            sock = socket.socket(fileno=int(inherited_fd))
+            self._server_task = asyncio.create_task(self._server.serve(sockets=[sock]))
+            worker = os.getenv("MICROCOREOS_WORKER_ID", "?")
+            print(f"[HttpServer] Worker {worker} serving on the shared socket → "
+                  f"http://localhost:{self._port}/docs")
+            return
         self._server_task = asyncio.create_task(self._server.serve())
         print(f"[HttpServer] Server active → http://localhost:{self._port}/docs")
 
@@ -298,6 +324,28 @@ class HttpServerTool(BaseTool):
             print("[HttpServerTool] opentelemetry-instrumentation-fastapi not installed — "
                   "HTTP driver spans unavailable. ToolProxy spans still active.")
 
+    async def drain(self, timeout: float) -> None:
+        """
+        Stops accepting connections and waits up to `timeout` seconds for the
+        requests in flight. uvicorn itself closes idle keep-alive connections
+        and WebSockets (1012 "service restart"); SSE streams hold the drain
+        until their client leaves or the budget runs out. Out of budget, the
+        server stops waiting for them (force_exit) and shutdown() finishes it.
+        """
+        if not (self._server and self._server_task):
+            return
+        self._server.should_exit = True
+        try:
+            # shield(): running out of budget must not cancel the server
+            # mid-response — it is told to give up, and does so itself.
+            await asyncio.wait_for(asyncio.shield(self._server_task), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if not self._server_task.done():
+                print("[HttpServer] ⚠️ Drain budget spent — closing the remaining connections.")
+                self._server.force_exit = True
+
     async def shutdown(self) -> None:
         if self._server:
             self._server.should_exit = True
@@ -324,10 +372,17 @@ class HttpServerTool(BaseTool):
               tokens via the "Authorize" button (documentation-only; real check unaffected).
         - CAPABILITIES:
             - add_endpoint(path, method, handler, tags=None, request_model=None,
-                           response_model=None, auth_validator=None, has_files=False):
+                           response_model=None, auth_validator=None, has_files=False,
+                           timeout=None, offload=None):
                 - has_files: if True, enables multipart/form-data. Request model fields 
                   become Form fields. To use a file: file = data["_files"][0]; 
                   await s3.upload_fileobj(file.filename, file.file, content_type=file.content_type)
+                - timeout: the request's time budget in seconds (default HTTP_REQUEST_TIMEOUT,
+                  unset = none). Clients may shorten it with X-Request-Timeout. Tool calls and
+                  bus requests past the deadline raise DeadlineExceededError → HTTP 504.
+                - offload: "process" runs a CPU-bound handler in a worker process, off the
+                  GIL. The handler must be a module-level function handler(data) -> dict
+                  (no HttpContext, no tools); not combinable with has_files.
             - mount_static(path, directory_path, html=False, allow_extensions=None):
                 Serve static files from a directory. Deny by default: only files whose
                 extension is allowed are served (default DEFAULT_STATIC_EXTENSIONS; pass
@@ -373,11 +428,22 @@ class HttpServerTool(BaseTool):
         response_model=None,
         auth_validator: Optional[Callable] = None,
         has_files: bool = False,
+        timeout: Optional[float] = None,
+        offload: Optional[str] = None,
     ) -> None:
         """
         Registers an HTTP endpoint. Buffered until on_boot_complete() to allow
         correct path ordering (static routes before parameterized ones).
+        `timeout` (seconds) overrides HTTP_REQUEST_TIMEOUT for this endpoint.
+        `offload="process"` runs handler(data) in a worker process; the handler
+        is checked here, so a bound method fails at boot, not on first request.
         """
+        if offload is not None:
+            if offload != "process":
+                raise ValueError(f"offload must be 'process' or None, got {offload!r}")
+            if has_files:
+                raise ValueError(f"Endpoint {method} {path}: offload='process' cannot receive uploaded files.")
+            prepare_offload(handler)
         self._pending_endpoints.append({
             "path": path,
             "method": method,
@@ -387,6 +453,8 @@ class HttpServerTool(BaseTool):
             "response_model": response_model,
             "auth_validator": auth_validator,
             "has_files": has_files,
+            "timeout": timeout,
+            "offload": offload,
         })
 
     def register_pre_mount_hook(self, hook: Callable[[list[dict]], None]) -> None:
@@ -555,7 +623,7 @@ class HttpServerTool(BaseTool):
                     if inspect.iscoroutinefunction(auth_validator):
                         auth_payload = await auth_validator(token)
                     else:
-                        auth_payload = await run_in_threadpool(auth_validator, token)
+                        auth_payload = await run_sync("http", auth_validator, token)
                 if not auth_payload:
                     # Rejected before accept(): no handshake, nothing to close
                     # gracefully, and on_connect is never reached.
@@ -570,13 +638,13 @@ class HttpServerTool(BaseTool):
                 if inspect.iscoroutinefunction(on_connect):
                     await on_connect(*args)
                 else:
-                    await run_in_threadpool(on_connect, *args)
+                    await run_sync(pool_for(on_connect, "http"), on_connect, *args)
             except WebSocketDisconnect:
                 if on_disconnect:
                     if inspect.iscoroutinefunction(on_disconnect):
                         await on_disconnect(conn)
                     else:
-                        await run_in_threadpool(on_disconnect, conn)
+                        await run_sync(pool_for(on_disconnect, "http"), on_disconnect, conn)
             except Exception as e:
                 print(f"[HttpServer] WebSocket error on {path}: {e}")
                 if on_disconnect:
@@ -584,7 +652,7 @@ class HttpServerTool(BaseTool):
                         if inspect.iscoroutinefunction(on_disconnect):
                             await on_disconnect(conn)
                         else:
-                            await run_in_threadpool(on_disconnect, conn)
+                            await run_sync(pool_for(on_disconnect, "http"), on_disconnect, conn)
                     except Exception:
                         pass
 
@@ -662,6 +730,10 @@ class HttpServerTool(BaseTool):
         response_model = ep["response_model"]
         auth_validator = ep["auth_validator"]
         has_files = ep.get("has_files", False)
+        timeout = ep.get("timeout")
+        if timeout is None:
+            timeout = self._request_timeout
+        offload = ep.get("offload")
 
         # Unique operation ID for OpenAPI
         clean_path = path.replace("/", "_").replace("{", "").replace("}", "")
@@ -675,18 +747,22 @@ class HttpServerTool(BaseTool):
         # __signature__ is overridden below to control what Swagger shows.
         if request_model and method == "GET":
             async def fastapi_wrapper(request: Request, params: request_model = Depends(), **kwargs):
-                return await _process_request(request, params, handler, auth_validator, self._paused_owners)
+                return await _process_request(request, params, handler, auth_validator, self._paused_owners,
+                                              timeout=timeout, offload=offload)
         elif has_files:
             # If we have files and a request model, we want the model fields to show up as Form fields.
             # We pass kwargs to _process_request which will contain both path params and Form params.
             async def fastapi_wrapper(request: Request, files: Optional[list[UploadFile]] = File(None), **kwargs):
-                return await _process_request(request, kwargs, handler, auth_validator, self._paused_owners, files=files)
+                return await _process_request(request, kwargs, handler, auth_validator, self._paused_owners,
+                                              files=files, timeout=timeout)
         elif request_model:
             async def fastapi_wrapper(request: Request, body: request_model = None, **kwargs):
-                return await _process_request(request, body, handler, auth_validator, self._paused_owners)
+                return await _process_request(request, body, handler, auth_validator, self._paused_owners,
+                                              timeout=timeout, offload=offload)
         else:
             async def fastapi_wrapper(request: Request, **kwargs):
-                return await _process_request(request, None, handler, auth_validator, self._paused_owners)
+                return await _process_request(request, None, handler, auth_validator, self._paused_owners,
+                                              timeout=timeout, offload=offload)
 
         # Override __signature__ to control OpenAPI documentation.
         # Always remove **kwargs; add explicit path params and Form params if present.
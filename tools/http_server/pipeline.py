@@ -9,14 +9,17 @@ _process_request), so they were extracted as free functions instead of
 being left behind as artificially-parameterized methods.
 """
 
+import time
 import uuid
 import inspect
 from typing import Optional, Any, Callable
 from pydantic import BaseModel
-from microcoreos import current_identity_var, current_event_id_var
+from microcoreos import (
+    current_identity_var, current_event_id_var, current_deadline_var, DeadlineExceededError,
+    limiter_for, metered, pool_for, run_sync, run_in_process,
+)
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.concurrency import run_in_threadpool
 
 from tools.http_server.context import HttpContext
 from tools.http_server.types import UploadedFile
@@ -55,7 +58,7 @@ async def _sse_response(request: Request, generator: Callable, auth_validator: O
         if inspect.iscoroutinefunction(auth_validator):
             payload = await auth_validator(token)
         else:
-            payload = await run_in_threadpool(auth_validator, token)
+            payload = await run_sync("http", auth_validator, token)
         if not payload:
             return JSONResponse(
                 status_code=401,
@@ -87,16 +90,26 @@ async def _process_request(
     auth_validator: Optional[Callable],
     paused_owners: set,
     files: Optional[list] = None,
+    timeout: Optional[float] = None,
+    offload: Optional[str] = None,
 ) -> Any:
     """
     Core request processing pipeline. Executed for every incoming HTTP request.
 
     Phases:
         1. Data Assembly   — merge path params + query params + body into one flat dict
-        2. Context Seeding — set causality ContextVars (event_id, identity)
+        2. Context Seeding — set causality ContextVars (event_id, identity, deadline)
         3. Authentication  — validate token if auth_validator is provided → inject into data["_auth"]
         4. Dispatch        — call the plugin handler (async or sync)
         5. Response        — serialize result as JSONResponse with the correct status code
+
+    `timeout` is the endpoint's time budget in seconds (None: no deadline). A
+    client may shorten it, never extend it, with X-Request-Timeout. Tool calls
+    and bus RPCs made past the deadline fail with DeadlineExceededError, which
+    answers 504.
+
+    `offload="process"` calls handler(data) in a worker process (offload.py):
+    no HttpContext crosses over, so the response is the result, 200 or 400.
     """
     # ── Phase 1: Data Assembly ─────────────────────────────────────────────
     data: dict = {}
@@ -152,10 +165,13 @@ async def _process_request(
         identity = getattr(handler, "__name__", "unknown")
     id_token = current_event_id_var.set(request_id)
     ident_token = current_identity_var.set(identity)
+    budget = _request_budget(request, timeout)
+    deadline_token = current_deadline_var.set(time.time() + budget if budget is not None else None)
     print(
         f"[HttpServer] → {request.method} {request.url.path}"
         f"  req={request_id[:8]}  identity={identity}"
     )
+    limiter, admitted_at, overloaded = limiter_for(handler, identity), None, False
 
     try:
         # Chaos/ops pause (Issue 34): the paused owner's endpoints answer
@@ -167,6 +183,17 @@ async def _process_request(
                 content={"success": False, "error": "Service temporarily unavailable (paused)"},
             )
 
+        # Adaptive concurrency limit (microcoreos/concurrency.py): over its
+        # owner's limit, shed the request before it costs anything.
+        if limiter is not None:
+            if not limiter.try_acquire():
+                return JSONResponse(
+                    status_code=503,
+                    headers={"Retry-After": str(limiter.retry_after)},
+                    content={"success": False, "error": "Service overloaded, retry later"},
+                )
+            admitted_at = time.perf_counter()
+
         context = HttpContext()
 
         # ── Phase 3: Authentication ────────────────────────────────────────
@@ -180,7 +207,7 @@ async def _process_request(
             if inspect.iscoroutinefunction(auth_validator):
                 payload = await auth_validator(token)
             else:
-                payload = await run_in_threadpool(auth_validator, token)
+                payload = await run_sync("http", auth_validator, token)
 
             if not payload:
                 return JSONResponse(
@@ -190,10 +217,15 @@ async def _process_request(
             data["_auth"] = payload
 
         # ── Phase 4: Handler Dispatch ──────────────────────────────────────
-        if inspect.iscoroutinefunction(handler):
-            result = await handler(data, context)
+        # metered(): its CPU and wall time are charged to `identity`.
+        if offload == "process":
+            result = await metered(run_in_process(handler, data))
+        elif inspect.iscoroutinefunction(handler):
+            result = await metered(handler(data, context))
         else:
-            result = await run_in_threadpool(handler, data, context)
+            # The handler's own pool (its plugin's, or its domain's): a slow
+            # sync plugin queues behind itself, not in front of everyone.
+            result = await metered(run_sync(pool_for(handler, "http"), handler, data, context))
 
         status_code = context.status_code
         if not context._status_explicit and isinstance(result, dict) and result.get("success") is False:
@@ -228,6 +260,14 @@ async def _process_request(
         context.apply_to(json_response)
         return json_response
 
+    except DeadlineExceededError as e:
+        # The time budget ran out mid-request: the remaining work was dropped.
+        overloaded = True
+        print(f"[HttpServer] ⏱️ Deadline exceeded in '{identity}': {e}")
+        return JSONResponse(
+            status_code=504,
+            content={"success": False, "error": "Deadline exceeded"},
+        )
     except Exception as e:
         # Unhandled exception: log the real error server-side, return generic message to client.
         print(f"[HttpServer] 💥 Unhandled exception in '{identity}': {e}")
@@ -236,12 +276,32 @@ async def _process_request(
             content={"success": False, "error": "Internal server error"},
         )
     finally:
+        if admitted_at is not None:
+            limiter.release(admitted_at, overloaded)
+        current_deadline_var.reset(deadline_token)
         current_identity_var.reset(ident_token)
         current_event_id_var.reset(id_token)
 
 
 # ── Utilities ────────────────────────────────────────────────────────────────
 
+def _request_budget(request: Request, timeout: Optional[float]) -> Optional[float]:
+    """
+    Seconds this request may take: the endpoint's timeout, shortened by the
+    client's X-Request-Timeout (an upstream service forwards what is left of
+    its own budget). Malformed or non-positive headers are ignored.
+    """
+    raw = request.headers.get("X-Request-Timeout")
+    if raw:
+        try:
+            asked = float(raw)
+        except ValueError:
+            asked = None
+        if asked is not None and 0 < asked < float("inf"):
+            return asked if timeout is None else min(asked, timeout)
+    return timeout
+
+
 def _extract_ws_token(websocket) -> Optional[str]:
     """
     Token for a WebSocket handshake: Authorization header, then the `token`
@@ -41,7 +41,7 @@ REPLACEMENT STANDARD (e.g. Redis — same name "state", plugins unaffected):
 import time
 import copy
 import threading
-from microcoreos import BaseTool
+from microcoreos import BaseTool, track_sizes
 
 _NO_EXPIRY = None
 
@@ -64,8 +64,15 @@ class StateTool(BaseTool):
         return "state"
 
     def setup(self):
+        track_sizes(self.name, self._sizes)
         print("[System] StateTool: In-memory store ready and thread-safe.")
 
+    def _sizes(self) -> dict:
+        """Namespaces and keys held, for leak hunting (tools/system/memory.py).
+        Expired keys count until they are read or listed."""
+        with self._lock:
+            return {"namespaces": len(self._state), "keys": sum(len(ns) for ns in self._state.values())}
+
     def get_interface_description(self) -> str:
         return """
         Key-Value State Tool (state):
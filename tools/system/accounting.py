@@ -0,0 +1,147 @@
+"""
+Resource accounting — which plugin is burning the CPU, in its own code.
+
+ToolProxy times every tool call, but a plugin can spend its time between
+calls: parsing, building responses, a loop over rows. Accounting charges
+that to the identity doing it (current_identity_var), per handler:
+
+- calls, wall_ms — each HTTP handler, bus delivery and on_boot the
+  infrastructure runs through metered(), start to finish;
+- cpu_ms, steps — CPU time (time.thread_time) of every step of the handler's
+  coroutine on the loop thread, and of every piece of sync work it runs on an
+  executor pool (executors.py). Time spent waiting is not CPU and is not
+  charged; a nested metered() call is charged to its own identity only;
+- alloc_bytes — with tracemalloc tracing (PYTHONTRACEMALLOC=1), the growth of
+  traced memory across the handler's steps on the loop thread: what it
+  allocated and still held when it yielded. Other threads allocating
+  meanwhile blur it; it is an indicator, not a ledger. Zero when tracemalloc
+  is off (it slows every allocation down, hence opt-in).
+
+Opt-in, like tracemalloc: with MICROCOREOS_ACCOUNTING=true the registry
+tool installs it at setup (microcoreos/instrumentation.py). Otherwise the
+kernel's seams stay a no-op — metering wraps every step of every handler.
+
+Counters only grow, since boot: a dashboard reads them twice and divides the
+difference by the interval, as with any counter. Memory is bounded by the
+number of handler identities, never by traffic. A pool thread and the loop
+charging the same identity at the same instant can lose an update — a
+metric, not a ledger.
+"""
+
+import time
+import types
+import threading
+import tracemalloc
+
+from microcoreos.context import current_identity_var
+
+_CALLS, _WALL, _CPU, _STEPS, _ALLOC = range(5)
+
+
+class _Nesting(threading.local):
+    """CPU seconds and bytes already charged on this thread — lets an outer
+    step leave out what a metered() call inside it charged for itself."""
+    cpu = 0.0
+    alloc = 0
+
+
+_nesting = _Nesting()
+
+
+class ResourceAccounting:
+    """Per-identity calls, wall time, CPU time, steps and allocations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage: dict[str, list] = {}
+
+    def _row(self, identity) -> list:
+        identity = identity or "system"     # the var's default, if set to None
+        row = self._usage.get(identity)
+        if row is None:
+            with self._lock:
+                row = self._usage.setdefault(identity, [0, 0.0, 0.0, 0, 0])
+        return row
+
+    def charge(self, identity: str, cpu: float) -> None:
+        """CPU seconds `identity` spent outside metered(): one piece of its
+        sync work, on a pool thread."""
+        row = self._row(identity)
+        row[_CPU] += cpu
+        row[_STEPS] += 1
+
+    @types.coroutine
+    def metered(self, awaitable):
+        """`await metered(handler(...))`: awaits it, charging its steps to the
+        identity current when metered() was called."""
+        row = self._row(current_identity_var.get())
+        it = awaitable.__await__()
+        thread_time, tracing, traced = time.thread_time, tracemalloc.is_tracing(), tracemalloc.get_traced_memory
+        nesting = _nesting
+        started = time.perf_counter()
+        row[_CALLS] += 1
+        value, error = None, None
+        try:
+            while True:
+                cpu_before, nested_cpu = thread_time(), nesting.cpu
+                if tracing:
+                    mem_before, nested_alloc = traced()[0], nesting.alloc
+                try:
+                    yielded = it.throw(error) if error is not None else it.send(value)
+                    done = False
+                except StopIteration as stop:
+                    yielded, done = stop.value, True
+                finally:
+                    spent = thread_time() - cpu_before
+                    row[_CPU] += spent - (nesting.cpu - nested_cpu)
+                    row[_STEPS] += 1
+                    nesting.cpu = nested_cpu + spent
+                    if tracing:
+                        grown = max(0, traced()[0] - mem_before)
+                        row[_ALLOC] += max(0, grown - (nesting.alloc - nested_alloc))
+                        nesting.alloc = nested_alloc + grown
+                if done:
+                    return yielded
+                try:
+                    value, error = (yield yielded), None
+                except GeneratorExit:
+                    it.close()
+                    raise
+                except BaseException as e:   # cancellation, thrown into the handler
+                    value, error = None, e
+        finally:
+            row[_WALL] += time.perf_counter() - started
+
+    def stats(self) -> dict:
+        """Per plugin ("domain.ClassName", or the bare identity when it names
+        no plugin method), its totals and a breakdown per handler."""
+        with self._lock:
+            usage = {identity: list(row) for identity, row in self._usage.items()}
+        out = {}
+        for identity, row in sorted(usage.items()):
+            owner, _, handler = identity.rpartition(".")
+            if owner.count(".") != 1:
+                owner, handler = identity, ""
+            entry = out.setdefault(owner, {**_as_dict([0, 0.0, 0.0, 0, 0]), "handlers": {}})
+            for key, value in _as_dict(row).items():
+                entry[key] = round(entry[key] + value, 3)
+            if handler:
+                entry["handlers"][handler] = _as_dict(row)
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._usage = {}
+
+
+def _as_dict(row: list) -> dict:
+    return {
+        "calls": row[_CALLS],
+        "wall_ms": round(row[_WALL] * 1000, 3),
+        "cpu_ms": round(row[_CPU] * 1000, 3),
+        "steps": row[_STEPS],
+        "alloc_bytes": row[_ALLOC],
+    }
+
+
+accounting = ResourceAccounting()
@@ -0,0 +1,196 @@
+"""
+Event loop lag monitor — who is blocking the loop, and for how long.
+
+All I/O, HTTP handling and bus delivery share one asyncio loop. A sync call
+hiding in an async handler (requests.get, time.sleep, a big json.dumps)
+stalls every one of them, and nothing else in the system measures it.
+
+Two parts, started by the registry tool once the system has booted and
+stopped with it:
+
+- A ticker task on the loop sleeps TICK_SECONDS at a time and counts how late
+  it woke up: that delay is the loop lag, kept as a sliding-window histogram
+  (histograms.py) like tool latency. It always runs.
+- A watchdog thread checks the ticker's heartbeat. Once the loop has been
+  blocked for the threshold, it reads the loop thread's stack, the task that
+  is running, and that task's identity (current_identity_var). When the
+  ticker wakes up again, the stall is charged to that suspect. It runs only
+  with a threshold set.
+
+Offenders are grouped by (identity, coroutine, where). `where` is the
+innermost frame in project code: the line that blocked, not the socket call
+deep inside a library. A blocked plain callback has no task: its identity
+and coroutine are "-".
+
+    MICROCOREOS_LOOP_MONITOR_MS=100    # stall threshold; unset or 0: no watchdog
+
+Cost while the loop is healthy: one short timer every TICK_SECONDS, plus,
+with a threshold, a thread that reads one float a few times per threshold.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+from microcoreos.histograms import LatencyHistograms
+from tools.system.profiler import task_identity
+
+TICK_SECONDS = 0.1
+DEFAULT_THRESHOLD_MS = 0.0   # lag only, no stall attribution
+MAX_OFFENDERS = 100
+
+
+def _threshold_from_env() -> float:
+    raw = os.getenv("MICROCOREOS_LOOP_MONITOR_MS")
+    if not raw:
+        return DEFAULT_THRESHOLD_MS
+    try:
+        threshold = float(raw)
+    except ValueError:
+        threshold = -1.0
+    if not 0 <= threshold < float("inf"):
+        print(f"[LoopMonitor] ⚠️ Ignoring MICROCOREOS_LOOP_MONITOR_MS={raw!r}: not a number of ms.")
+        return DEFAULT_THRESHOLD_MS
+    return threshold
+
+
+def _where(frame, cwd: str) -> str:
+    """The innermost frame in project code (else the innermost frame)."""
+    leaf = frame
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(cwd) and "site-packages" not in path:
+            break
+        frame = frame.f_back
+    frame = frame or leaf
+    if frame is None:
+        return "-"
+    path = frame.f_code.co_filename
+    if path.startswith(cwd):
+        path = path[len(cwd):]
+    name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+    return f"{name} ({path}:{frame.f_lineno})"
+
+
+def _coroutine(task) -> str:
+    coro = task.get_coro() if task is not None else None
+    return getattr(coro, "__qualname__", None) or "-"
+
+
+class LoopMonitor:
+    """Loop lag histogram plus the worst loop-blocking offenders."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = LatencyHistograms()
+        self._observe = self._timings.bind("loop", "lag")
+        self._offenders: dict[tuple[str, str, str], dict] = {}
+        self._suspect = None
+        self._stalls = 0
+        self._threshold_ms = 0.0
+        self._task = None
+        self._stop = None
+        self._beat = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> bool:
+        """Starts measuring the running loop's lag. True when stalls are
+        attributed too (a threshold is set), False for lag alone."""
+        self.shutdown()
+        self._threshold_ms = _threshold_from_env()
+        loop = asyncio.get_running_loop()
+        self._beat = time.perf_counter()
+        self._task = loop.create_task(self._tick(), name="microcoreos.loop_monitor")
+        if not self._threshold_ms:
+            return False
+        self._stop = threading.Event()
+        threading.Thread(
+            target=self._watch, args=(loop, threading.get_ident(), self._stop),
+            name="loop-monitor", daemon=True,
+        ).start()
+        return True
+
+    def shutdown(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = self._stop = None
+
+    async def _tick(self) -> None:
+        threshold = self._threshold_ms
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            now = self._beat = time.perf_counter()
+            lag_ms = max(0.0, (now - before - TICK_SECONDS) * 1000)
+            self._observe(lag_ms, now, True)
+            if threshold and lag_ms >= threshold:
+                self._record_stall(lag_ms)
+
+    def _watch(self, loop, loop_thread: int, stop: threading.Event) -> None:
+        cwd = os.getcwd() + os.sep
+        limit = (TICK_SECONDS * 1000 + self._threshold_ms) / 1000
+        blamed_beat = None
+        while not stop.wait(max(self._threshold_ms / 4000, 0.005)):
+            beat = self._beat
+            if beat == blamed_beat or time.perf_counter() - beat < limit:
+                continue
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                continue
+            task = asyncio.current_task(loop)
+            suspect = (task_identity(loop) or "-", _coroutine(task), _where(frame, cwd))
+            with self._lock:
+                self._suspect = suspect
+            blamed_beat = beat
+
+    def _record_stall(self, lag_ms: float) -> None:
+        with self._lock:
+            key, self._suspect = self._suspect or ("-", "-", "-"), None
+            self._stalls += 1
+            entry = self._offenders.get(key)
+            if entry is None:
+                if len(self._offenders) >= MAX_OFFENDERS:
+                    least = min(self._offenders, key=lambda k: self._offenders[k]["total_ms"])
+                    del self._offenders[least]
+                identity, coroutine, where = key
+                entry = self._offenders[key] = {
+                    "identity": identity, "coroutine": coroutine, "where": where,
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_seen": 0.0,
+                }
+                print(f"[LoopMonitor] ⚠️ Event loop blocked {lag_ms:.0f}ms by {identity} "
+                      f"({coroutine}) at {where}")
+            entry["count"] += 1
+            entry["total_ms"] += lag_ms
+            entry["max_ms"] = max(entry["max_ms"], lag_ms)
+            entry["last_seen"] = time.time()
+
+    def stats(self, window_seconds: float = 60.0, top: int = 10) -> dict:
+        """Lag percentiles over the last `window_seconds` (max 300), and the
+        `top` offenders by total blocked time since start."""
+        summary = self._timings.summary(time.perf_counter(), window_seconds)
+        lag = summary[0] if summary else None
+        with self._lock:
+            offenders = sorted(self._offenders.values(), key=lambda o: -o["total_ms"])[:top]
+            offenders = [
+                {**o, "total_ms": round(o["total_ms"], 3), "max_ms": round(o["max_ms"], 3)}
+                for o in offenders
+            ]
+            stalls = self._stalls
+        return {
+            "enabled": self.running,
+            "threshold_ms": self._threshold_ms,
+            "samples": lag["count"] if lag else 0,
+            "lag_ms": lag["latency_ms"] if lag else {},
+            "stalls": stalls,
+            "offenders": offenders,
+        }
+
+
+loop_monitor = LoopMonitor()
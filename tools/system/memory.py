@@ -0,0 +1,204 @@
+"""
+Memory snapshots and diffs — leak hunting on a live process.
+
+A slow leak shows after days, not in a test. This module lets an operator
+look at a running instance, in three steps:
+
+    start_tracing(frames=25)     # tracemalloc on — off by default
+    take_snapshot()              # now ... and again in an hour
+    diff(1, 2, group_by="owner") # what grew in between, and whose it is
+
+Tracing is off until started, and it can be stopped at any time. While on,
+every allocation is slower and tracemalloc uses memory of its own
+(`tracemalloc_bytes`). Snapshots are kept in memory: the last MAX_SNAPSHOTS.
+
+A diff groups by:
+- "line": the file:line of the allocation;
+- "owner": who caused it — the plugin or tool whose code is on the
+  allocating stack (the innermost such frame). Only as deep as `frames`
+  reaches: with frames=1 a plugin calling into a library is charged to the
+  library.
+
+Growable framework containers report their sizes with no tracing at all
+(sizes()): the bus trace log, pending tasks, subscriptions, state
+namespaces, SSE queues... Anything can add its own with track_sizes(), from
+microcoreos (instrumentation.py):
+
+    track_sizes("event_bus", self._sizes)   # () -> {"pending_tasks": 3, ...}
+"""
+
+import os
+import sys
+import time
+import threading
+import tracemalloc
+
+from microcoreos.instrumentation import tracked_sizes
+
+MAX_SNAPSHOTS = 10
+MAX_FRAMES = 100
+GROUPS = ("line", "owner")
+
+
+class MemoryInspector:
+    """On-demand tracemalloc snapshots, their diffs, and tracked container sizes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, tuple[dict, tracemalloc.Snapshot]] = {}
+        self._next_id = 1
+        self._owners: dict[str, str] = {}
+
+    # ── Container sizes ───────────────────────────────────────────────────────
+
+    def sizes(self) -> dict:
+        return tracked_sizes()
+
+    def name_owners(self, owners: dict[str, str]) -> None:
+        """Source file → owner ("domain.ClassName", a tool name). The registry
+        tool names every plugin's and tool's file once the system has booted."""
+        with self._lock:
+            self._owners = dict(owners)
+
+    # ── Tracing and snapshots ─────────────────────────────────────────────────
+
+    def start_tracing(self, frames: int = 25) -> dict:
+        if not 1 <= frames <= MAX_FRAMES:
+            raise ValueError(f"frames must be between 1 and {MAX_FRAMES}")
+        if tracemalloc.is_tracing():
+            if tracemalloc.get_traceback_limit() != frames:
+                raise RuntimeError(f"tracemalloc is already tracing {tracemalloc.get_traceback_limit()} "
+                                   "frame(s); stop it first to change that.")
+            return self.status()
+        tracemalloc.start(frames)
+        return self.status()
+
+    def stop_tracing(self) -> dict:
+        """Stops tracing and drops the snapshots (they cannot be diffed with
+        anything taken after a restart of tracing)."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def take_snapshot(self) -> dict:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is off: start it first.")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        stats = snapshot.statistics("filename")
+        with self._lock:
+            summary = {
+                "id": self._next_id,
+                "taken_at": time.time(),
+                "size": sum(s.size for s in stats),
+                "count": sum(s.count for s in stats),
+            }
+            self._next_id += 1
+            self._snapshots[summary["id"]] = (summary, snapshot)
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                del self._snapshots[min(self._snapshots)]
+        return dict(summary)
+
+    def diff(self, from_id: int, to_id: int, group_by: str = "line", top: int = 20) -> dict:
+        """What changed between two snapshots, biggest growth first."""
+        if group_by not in GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUPS)}")
+        if top < 1:
+            raise ValueError("top must be at least 1")
+        with self._lock:
+            old, new = self._snapshots.get(from_id), self._snapshots.get(to_id)
+        missing = [i for i, s in ((from_id, old), (to_id, new)) if s is None]
+        if missing:
+            raise KeyError(f"No snapshot {missing[0]} (kept: the last {MAX_SNAPSHOTS}).")
+
+        if group_by == "line":
+            rows = [
+                {"where": _frame_label(stat.traceback[-1]), "size_diff": stat.size_diff,
+                 "size": stat.size, "count_diff": stat.count_diff, "count": stat.count}
+                for stat in new[1].compare_to(old[1], "lineno")
+            ]
+        else:
+            rows = self._by_owner(old[1], new[1])
+        rows.sort(key=lambda r: (-r["size_diff"], -r["size"]))
+        return {
+            "from_id": from_id, "to_id": to_id, "group_by": group_by,
+            "seconds": round(new[0]["taken_at"] - old[0]["taken_at"], 3),
+            "size_diff": sum(r["size_diff"] for r in rows),
+            "top": rows[:top],
+        }
+
+    def _by_owner(self, old, new) -> list:
+        cwd = os.getcwd() + os.sep
+        with self._lock:
+            owners = dict(self._owners)
+        cache: dict[tracemalloc.Traceback, str] = {}
+        totals: dict[str, list] = {}
+        for sign, snapshot in ((-1, old), (1, new)):
+            for stat in snapshot.statistics("traceback"):
+                owner = cache.get(stat.traceback)
+                if owner is None:
+                    owner = cache[stat.traceback] = _owner(stat.traceback, owners, cwd)
+                row = totals.setdefault(owner, [0, 0, 0, 0])   # size, count, old size, old count
+                if sign > 0:
+                    row[0] += stat.size
+                    row[1] += stat.count
+                else:
+                    row[2] += stat.size
+                    row[3] += stat.count
+        return [
+            {"owner": owner, "size_diff": size - old_size, "size": size,
+             "count_diff": count - old_count, "count": count}
+            for owner, (size, count, old_size, old_count) in totals.items()
+        ]
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [dict(summary) for _, (summary, _) in sorted(self._snapshots.items())]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "tracemalloc_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": snapshots,
+        }
+
+    def report(self) -> dict:
+        return {**self.status(), "sizes": self.sizes()}
+
+
+def _frame_label(frame) -> str:
+    path = frame.filename
+    cwd = os.getcwd() + os.sep
+    if path.startswith(cwd):
+        path = path[len(cwd):]
+    return f"{path}:{frame.lineno}"
+
+
+def _owner(traceback, owners: dict, cwd: str) -> str:
+    """The innermost plugin or tool on the stack, else where the allocation
+    happened: the kernel, a library, or the standard library."""
+    for frame in reversed(traceback):   # innermost first
+        path = frame.filename
+        if path in owners:
+            return owners[path]
+        if path.startswith(cwd):
+            parts = path[len(cwd):].split(os.sep)
+            if parts[0] in ("domains", "tools") and len(parts) > 2:
+                return f"{parts[0]}/{parts[1]}"
+    path = traceback[-1].filename
+    if path.startswith(cwd):
+        return path[len(cwd):].split(os.sep)[0]
+    if "site-packages" in path:
+        return path.split("site-packages" + os.sep, 1)[1].split(os.sep)[0]
+    if path.startswith(sys.prefix) or path.startswith(sys.base_prefix) or path.startswith("<"):
+        return "stdlib"
+    return path
+
+
+memory_inspector = MemoryInspector()
@@ -0,0 +1,211 @@
+"""
+Sampling profiler — look inside a slow instance without attaching anything.
+
+    profile = await sample_stacks(seconds=10)
+    profile.collapsed()     # "thread;identity;frame;...;frame count" lines
+    profile.speedscope()    # https://www.speedscope.app file (dict)
+
+A sampler thread exists only while a profile runs: installed and idle, this
+costs nothing. Running, it wakes every `interval_ms`, reads every thread's
+current stack (sys._current_frames) and counts identical stacks — the process
+is never paused, and no trace hook is installed.
+
+Each sample is attributed to the identity doing the work, as logs and
+metrics are (current_identity_var):
+- on the event loop thread, the identity in the context of the task running
+  at that instant;
+- on a pool thread (executors.py), the identity of the caller whose work it
+  runs — the context copy the pool runs it in;
+- anywhere else, "-".
+
+Idle samples — the loop waiting in select(), a pool thread waiting for work,
+any thread blocked in threading's wait() — are dropped unless idle=True: the
+default profile shows where the CPU went, not where threads waited. The
+sampler reads a thread's stack when that thread lets go of the GIL: a loop
+that awaits constantly tends to be caught in select(), one that hogs the
+loop is caught in the code hogging it.
+
+One profile at a time per process; a second one raises ProfilerBusyError.
+"""
+
+import os
+import re
+import sys
+import time
+import asyncio
+import threading
+import collections
+
+from microcoreos.context import current_identity_var
+from microcoreos.executors import pool_work, run_sync
+
+MAX_SECONDS = 60.0
+MAX_DEPTH = 128
+
+# The function each pool thread runs work in (executors.pool_work): a frame
+# of it on a stack holds, as `context`, the caller's context copy.
+_POOL_WORK_CODE = pool_work.__code__
+
+# Leaf frames of a thread that is waiting, not working.
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),       # concurrent.futures: waiting for work
+    ("threading.py", "wait"),
+}
+
+# Pool threads are named "pool-<name>_<n>": one row per pool, not per thread.
+_THREAD_INDEX = re.compile(r"_\d+$")
+
+_busy = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Another profile is already running in this process."""
+
+
+class Profile:
+    """Stack sample counts, keyed by (thread, identity, frames root-first)."""
+
+    def __init__(self, counts: dict, labels: dict, interval_ms: float, seconds: float):
+        self.counts = counts
+        self._labels = labels       # frame → (name, file, line)
+        self.interval_ms = interval_ms
+        self.seconds = seconds
+
+    @property
+    def samples(self) -> int:
+        return sum(self.counts.values())
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope,
+        inferno): one `thread;identity;frame;...;frame count` line per stack."""
+        lines = []
+        for (thread, identity, stack), count in sorted(self.counts.items(), key=lambda i: -i[1]):
+            frames = [f"{name} ({file}:{line})" for name, file, line in (self._labels[f] for f in stack)]
+            lines.append(";".join([thread, identity, *frames]) + f" {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> dict:
+        """A speedscope file: one sampled profile per thread, the identity as
+        each sample's root frame. Weights are milliseconds."""
+        frames, index = [], {}
+
+        def frame_id(key):
+            if key not in index:
+                index[key] = len(frames)
+                name, file, line = key
+                frames.append({"name": name, "file": file, "line": line} if file else {"name": name})
+            return index[key]
+
+        by_thread = collections.defaultdict(lambda: ([], []))
+        for (thread, identity, stack), count in self.counts.items():
+            samples, weights = by_thread[thread]
+            samples.append([frame_id((f"[{identity}]", None, None))]
+                           + [frame_id(self._labels[f]) for f in stack])
+            weights.append(count * self.interval_ms)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "microcoreos",
+            "name": f"MicroCoreOS profile ({self.seconds:g}s, every {self.interval_ms:g}ms)",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in sorted(by_thread.items())
+            ],
+        }
+
+
+def _label(code, cwd: str) -> tuple:
+    path = code.co_filename
+    if path.startswith(cwd):
+        path = path[len(cwd):].lstrip(os.sep)
+    return (getattr(code, "co_qualname", code.co_name), path, code.co_firstlineno)
+
+
+def _pool_identity(frame):
+    while frame is not None:
+        if frame.f_code is _POOL_WORK_CODE:
+            context = frame.f_locals.get("context")
+            return context.get(current_identity_var) if context is not None else None
+        frame = frame.f_back
+    return None
+
+
+def task_identity(loop):
+    """The identity of the task running on `loop` right now, or None."""
+    task = asyncio.current_task(loop)
+    get_context = getattr(task, "get_context", None)   # Python 3.12+
+    if get_context is None:
+        return None
+    return get_context().get(current_identity_var)
+
+
+def _sample(seconds: float, interval: float, loop, loop_thread: int, idle: bool):
+    me = threading.get_ident()
+    cwd = os.getcwd() + os.sep
+    counts = collections.Counter()
+    labels = {}
+    names = {}
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        frames = sys._current_frames()
+        if not frames.keys() <= names.keys():   # a thread started since
+            names = {t.ident: _THREAD_INDEX.sub("", t.name) for t in threading.enumerate()}
+
+        for tid, frame in frames.items():
+            if tid == me:
+                continue
+            leaf = frame.f_code
+            if not idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                continue
+            if tid == loop_thread:
+                identity = task_identity(loop)
+            else:
+                identity = _pool_identity(frame)
+
+            stack = []
+            depth = 0
+            while frame is not None and depth < MAX_DEPTH:
+                code = frame.f_code
+                if code not in labels:
+                    labels[code] = _label(code, cwd)
+                stack.append(code)
+                frame = frame.f_back
+                depth += 1
+            stack.reverse()
+            counts[(names.get(tid, str(tid)), identity or "-", tuple(stack))] += 1
+
+        time.sleep(interval)
+
+    return counts, labels
+
+
+async def sample_stacks(seconds: float, interval_ms: float = 10.0, idle: bool = False) -> Profile:
+    """Samples every thread of this process for `seconds` (max 60), every
+    `interval_ms` (1-1000). Must be awaited on the event loop it should
+    attribute to."""
+    if not 0 < seconds <= MAX_SECONDS:
+        raise ValueError(f"seconds must be > 0 and <= {MAX_SECONDS:g}")
+    if not 1 <= interval_ms <= 1000:
+        raise ValueError("interval_ms must be between 1 and 1000")
+    if not _busy.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running.")
+    try:
+        loop = asyncio.get_running_loop()
+        counts, labels = await run_sync(
+            "profiler", _sample, seconds, interval_ms / 1000, loop, threading.get_ident(), idle,
+        )
+    finally:
+        _busy.release()
+    return Profile(dict(counts), labels, interval_ms, seconds)
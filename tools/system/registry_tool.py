@@ -1,4 +1,14 @@
-from microcoreos import BaseTool
+import os
+import sys
+import hmac
+import inspect
+
+from microcoreos import BaseTool, concurrency_stats, executor_stats, run_sync
+from microcoreos.instrumentation import install_meter
+from tools.system.accounting import accounting
+from tools.system.loop_monitor import loop_monitor
+from tools.system.memory import memory_inspector
+from tools.system.profiler import sample_stacks
 
 
 class RegistryTool(BaseTool):
@@ -6,6 +16,10 @@ class RegistryTool(BaseTool):
     Proxy Tool that exposes the Core Registry and metrics to Plugins.
     Receives the registry and container references at registration time via Container,
     so they are available immediately in on_boot() — no timing dependency.
+
+    It also owns the runtime observability the kernel only has seams for
+    (microcoreos/instrumentation.py): resource accounting from setup(), the
+    loop monitor once the system has booted, memory owners for diffs.
     """
     def __init__(self):
         self._core_registry = None
@@ -24,7 +38,30 @@ class RegistryTool(BaseTool):
         self._container = container
 
     def setup(self):
-        pass
+        if os.getenv("MICROCOREOS_ACCOUNTING", "false").strip().lower() == "true":
+            install_meter(accounting.metered, accounting.charge)
+
+    async def on_boot_complete(self, container):
+        memory_inspector.name_owners(self._memory_owners(container))
+        loop_monitor.start()   # after boot: imports and setup() block on purpose
+
+    def shutdown(self):
+        loop_monitor.shutdown()
+        install_meter(None, None)
+
+    def _memory_owners(self, container) -> dict:
+        """Source file → tool name or "domain.ClassName", for diffs by owner."""
+        owners = {}
+        for tool in container.get_raw_tools():
+            owners[_source_file(type(tool))] = tool.name
+        for name, info in self.get_system_dump().get("plugins", {}).items():
+            prefix = f"domains.{info.get('domain')}."
+            for module_name, module in list(sys.modules.items()):
+                cls = getattr(module, info.get("class", ""), None) if module_name.startswith(prefix) else None
+                if inspect.isclass(cls) and cls.__module__ == module_name:
+                    owners[_source_file(cls)] = name
+        owners.pop(None, None)
+        return owners
 
     def get_interface_description(self) -> str:
         return """
@@ -53,12 +90,86 @@ class RegistryTool(BaseTool):
                 DEAD only after 5 consecutive failures (success resets the streak).
                 A tool that silently stopped responding may still show "OK".
             - get_domain_metadata() -> dict: Detailed analysis of models and schemas.
+            - get_boot_profile() -> dict: How long the last boot spent, and where.
+                {"tools":   {"<tool>":   {"import", "setup", "on_boot_complete": ms}},
+                 "plugins": {"<plugin>": {"import", "on_boot": ms}},
+                 "summary": {"total_ms", "stages": {stage: ms},
+                             "critical_path": [{"stage", "name", "ms"}, ...]}}
+                critical_path names the one slowest entry per stage — the
+                component that actually held the boot back.
             - get_metrics() -> list[dict]: Last 1000 tool call records.
                 Each record: {tool, method, duration_ms, success, timestamp}.
                 Use to build /system/metrics or feed into an observability sink.
+            - get_latency_stats(window_seconds=60) -> list[dict]: Latency per
+                (tool, method) over a sliding window (10s resolution, max 300s),
+                from bounded-memory histograms that see EVERY call:
+                [{"tool", "method", "count", "errors", "error_rate",
+                  "latency_ms": {"p50", "p90", "p95", "p99", "max"},
+                  "coalesced", "coalesce_ratio"}, ...]
+                Percentiles are within ~6% of the true value. coalesced counts
+                calls single-flight served from an identical in-flight call.
+            - get_executor_stats(window_seconds=60) -> list[dict]: The thread pools that
+                run sync work (plugin handlers per domain, "http", "event_bus", "auth", ...):
+                [{"pool", "size", "active", "queued", "completed", "errors",
+                  "wait_ms": {"p50", ..., "max"}, "run_ms": {...}}, ...]
+                queued > 0 or a rising wait_ms means the pool is saturated.
+            - get_concurrency_stats() -> list[dict]: Adaptive concurrency limits of the
+                plugins that have one (microcoreos/concurrency.py):
+                [{"owner", "limit", "in_flight", "waiting", "accepted", "rejected",
+                  "deferred", "decreases", "baseline_ms"}, ...]
+                rejected: HTTP requests shed with 503; deferred: bus deliveries
+                that waited for a slot. Counters since boot.
+            - get_resource_usage() -> dict: What each plugin's own code costs
+                (tools/system/accounting.py), counted since boot:
+                {"<domain>.<ClassName>": {"calls", "wall_ms", "cpu_ms", "steps", "alloc_bytes",
+                                          "handlers": {"<method>": {same keys}}}}
+                cpu_ms is CPU time of its handlers' steps and of their sync work
+                on the pools — waiting is not included. alloc_bytes needs
+                tracemalloc (PYTHONTRACEMALLOC=1), else 0. Counters: diff two
+                reads for a rate. {} unless MICROCOREOS_ACCOUNTING=true.
+            - get_loop_stats(window_seconds=60, top=10) -> dict: How long the event loop
+                was blocked, and by whom (tools/system/loop_monitor.py):
+                {"enabled", "threshold_ms", "samples", "lag_ms": {"p50", ..., "max"},
+                 "stalls", "offenders": [{"identity", "coroutine", "where", "count",
+                                          "total_ms", "max_ms", "last_seen"}, ...]}
+                lag_ms covers the window; offenders (worst total first) and stalls
+                count every loop block >= threshold_ms since boot. Lag is always
+                measured; stalls and offenders need MICROCOREOS_LOOP_MONITOR_MS
+                (threshold_ms 0: not attributed).
+            - async profile(seconds=10, interval_ms=10, idle=False, format="collapsed") -> str | dict:
+                Samples every thread's stack for `seconds` (max 60), attributing each
+                sample to the identity doing the work (current_identity_var).
+                format="collapsed": "thread;identity;frame;...;frame count" lines
+                (flamegraph.pl, speedscope); format="speedscope": a speedscope.app file.
+                idle=True keeps samples of threads that are only waiting.
+                Costs nothing when not running; one profile at a time
+                (tools.system.profiler.ProfilerBusyError); ValueError on bad arguments.
+            - get_memory_report() -> dict: Memory, for leak hunting (tools/system/memory.py):
+                {"tracing", "frames", "traced_bytes", "peak_bytes", "tracemalloc_bytes",
+                 "snapshots": [{"id", "taken_at", "size", "count"}, ...],
+                 "sizes": {"<owner>": {"<container>": int, ...}}}
+                sizes (trace log, pending tasks, state namespaces, SSE queues...)
+                cost nothing and need no tracing.
+            - start_memory_tracing(frames=25) -> dict / stop_memory_tracing() -> dict:
+                tracemalloc on (1..100 frames per allocation) / off, dropping the
+                snapshots. Off by default: tracing slows every allocation down.
+                Both return the report without "sizes".
+            - async take_memory_snapshot() -> dict: {"id", "taken_at", "size", "count"};
+                the last 10 are kept. RuntimeError while tracing is off.
+            - async diff_memory_snapshots(from_id, to_id, group_by="line", top=20) -> dict:
+                {"from_id", "to_id", "group_by", "seconds", "size_diff",
+                 "top": [{"where"|"owner", "size_diff", "size", "count_diff", "count"}, ...]}
+                group_by="line": file:line of the allocation; "owner": the plugin
+                or tool whose code is on the allocating stack. Biggest growth first.
+                KeyError for an unknown snapshot, ValueError on bad arguments.
+            - validate_admin_token(token) -> dict | None: {"sub": "admin"} when `token`
+                is SYSTEM_ADMIN_TOKEN, else None — always None while it is unset.
+                The auth_validator of the /system endpoints that change the
+                process (memory tracing, snapshots, profiling).
             - add_metrics_sink(callback): Register a sink for real-time metric records.
                 Signature: callback(record: dict).
-                Called synchronously on every tool method call — keep it fast.
+                Called in batches on the event loop right after the calls
+                (never inside them) — keep it fast.
             - update_tool_status(name, status, message=None): Manually override a tool's health status.
                 status: "OK" | "FAIL" | "DEAD".
                 Intended for health-check plugins that verify tools proactively.
@@ -74,11 +185,63 @@ class RegistryTool(BaseTool):
             return {}
         return self._core_registry.get_domain_metadata()
 
+    def get_boot_profile(self) -> dict:
+        if not self._core_registry:
+            return {"tools": {}, "plugins": {}, "summary": {}}
+        return self._core_registry.get_boot_profile()
+
     def get_metrics(self) -> list:
         if not self._container:
             return []
         return self._container.get_metrics()
 
+    def get_latency_stats(self, window_seconds: float = 60.0) -> list:
+        if not self._container:
+            return []
+        return self._container.get_latency_stats(window_seconds)
+
+    def get_executor_stats(self, window_seconds: float = 60.0) -> list:
+        return executor_stats(window_seconds)
+
+    def get_concurrency_stats(self) -> list:
+        return concurrency_stats()
+
+    def get_resource_usage(self) -> dict:
+        return accounting.stats()
+
+    def get_loop_stats(self, window_seconds: float = 60.0, top: int = 10) -> dict:
+        return loop_monitor.stats(window_seconds, top)
+
+    def get_memory_report(self) -> dict:
+        return memory_inspector.report()
+
+    def start_memory_tracing(self, frames: int = 25) -> dict:
+        return memory_inspector.start_tracing(frames)
+
+    def stop_memory_tracing(self) -> dict:
+        return memory_inspector.stop_tracing()
+
+    async def take_memory_snapshot(self) -> dict:
+        # Walks every traced block: off the loop.
+        return await run_sync(self.name, memory_inspector.take_snapshot)
+
+    async def diff_memory_snapshots(self, from_id: int, to_id: int,
+                                    group_by: str = "line", top: int = 20) -> dict:
+        return await run_sync(self.name, memory_inspector.diff, from_id, to_id, group_by, top)
+
+    async def profile(self, seconds: float = 10.0, interval_ms: float = 10.0,
+                      idle: bool = False, format: str = "collapsed"):
+        if format not in ("collapsed", "speedscope"):
+            raise ValueError("format must be 'collapsed' or 'speedscope'")
+        result = await sample_stacks(seconds, interval_ms, idle)
+        return result.collapsed() if format == "collapsed" else result.speedscope()
+
+    def validate_admin_token(self, token: str):
+        expected = os.getenv("SYSTEM_ADMIN_TOKEN", "")
+        if expected and hmac.compare_digest(token.encode(), expected.encode()):
+            return {"sub": "admin"}
+        return None
+
     def add_metrics_sink(self, callback):
         if not self._container:
             return
@@ -88,3 +251,10 @@ class RegistryTool(BaseTool):
         if not self._core_registry:
             return
         self._core_registry.update_tool_status(name, status, message)
+
+
+def _source_file(cls) -> str | None:
+    try:
+        return inspect.getsourcefile(cls)
+    except TypeError:
+        return None
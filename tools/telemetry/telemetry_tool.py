@@ -132,12 +132,17 @@ class TelemetryTool(BaseTool):
                 description="Number of tool method calls",
             )
 
+            # One attribute dict per (tool, method, success), built once: the
+            # set is as small as the tool surface, the call rate is not.
+            attribute_sets = {}
+
             def metrics_sink(record: dict):
-                attributes = {
-                    "tool": record["tool"],
-                    "method": record["method"],
-                    "success": record["success"],
-                }
+                key = (record["tool"], record["method"], record["success"])
+                attributes = attribute_sets.get(key)
+                if attributes is None:
+                    attributes = attribute_sets[key] = {
+                        "tool": key[0], "method": key[1], "success": key[2],
+                    }
                 duration_histogram.record(record["duration_ms"], attributes=attributes)
                 call_counter.add(1, attributes=attributes)
 